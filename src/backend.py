@@ -0,0 +1,352 @@
+'''
+Pluggable compute backends for the fused CLT kernel: ply stiffness transformation, ABD assembly, mid-plane solve
+and ply stress recovery of many small laminates.
+
+The 'numpy' backend is built from the vectorized clt kernels. The 'numba' backend compiles a fused loop kernel
+that keeps every 3x3 and 6x6 operation in registers, which avoids the NumPy dispatch overhead that dominates for
+small laminates. It is used automatically when numba is installed. The backend can be chosen with set_backend or
+the COMPYSITE_BACKEND environment variable.
+
+The loop kernel is compiled for float64 only, single and mixed precision policies (see precision) always run on the
+NumPy backend.
+'''
+
+import os
+import warnings
+from typing import Union
+
+import numpy as np
+
+from conversion import transformation_matrix_2D
+from precision import PrecisionPolicy, resolve
+import clt
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _jit(func):
+    '''Compiles a kernel with numba when available, otherwise returns the plain Python function.'''
+
+    if numba is None:
+        return func
+
+    return numba.njit(cache=True, fastmath=False)(func)
+
+
+_prange = numba.prange if numba is not None else range
+
+
+def _analyze_numpy(Q, theta, thickness, NM, local=True, precision=None):
+
+    policy = resolve(precision)
+
+    Q_bar = clt.transformed_reduced_stiffness(Q.astype(policy.accumulate), theta.astype(policy.accumulate))
+    z = clt.ply_heights(thickness.astype(policy.accumulate))
+
+    ABD = clt.ABD_matrix(Q_bar, z)
+    strain = clt.solve_ABD(ABD[:, None], NM, refine=policy.refine)
+
+    # Ply stresses are recovered in the storage type
+    e_0 = policy.cast(strain)
+    z_mid = policy.cast(0.5 * (z[..., 1:] + z[..., :-1]))
+    e = e_0[:, :, None, :3] + z_mid[:, None, :, None] * e_0[:, :, None, 3:]
+    stress = np.einsum('lpij,lnpj->lnpi', policy.cast(Q_bar), e)
+
+    if local:
+        stress = np.einsum('lpij,lnpj->lnpi', transformation_matrix_2D(policy.cast(theta)), stress)
+
+    return ABD, strain, stress
+
+
+def _solve_6x6(M, b, x):
+    '''Gaussian elimination with partial pivoting of a single 6x6 system for several right hand sides (rows of b).'''
+
+    A = M.copy()
+    B = b.copy()
+    n = 6
+
+    for k in range(n):
+        p = k
+        for i in range(k + 1, n):
+            if abs(A[i, k]) > abs(A[p, k]):
+                p = i
+        if p != k:
+            for j in range(n):
+                A[k, j], A[p, j] = A[p, j], A[k, j]
+            for r in range(B.shape[0]):
+                B[r, k], B[r, p] = B[r, p], B[r, k]
+
+        for i in range(k + 1, n):
+            f = A[i, k] / A[k, k]
+            for j in range(k, n):
+                A[i, j] -= f * A[k, j]
+            for r in range(B.shape[0]):
+                B[r, i] -= f * B[r, k]
+
+    for r in range(B.shape[0]):
+        for i in range(n - 1, -1, -1):
+            s = B[r, i]
+            for j in range(i + 1, n):
+                s -= A[i, j] * x[r, j]
+            x[r, i] = s / A[i, i]
+
+
+def _transformation(theta, T):
+    '''Planar stress transformation matrix, see conversion.transformation_matrix_2D.'''
+
+    c = np.cos(theta)
+    s = np.sin(theta)
+
+    T[0, 0] = c * c
+    T[0, 1] = s * s
+    T[0, 2] = 2 * c * s
+    T[1, 0] = s * s
+    T[1, 1] = c * c
+    T[1, 2] = -2 * c * s
+    T[2, 0] = -c * s
+    T[2, 1] = c * s
+    T[2, 2] = c * c - s * s
+
+
+def _analyze_loops(Q, theta, thickness, NM, local, ABD, strain, stress):
+
+    n_layups, n_plies = theta.shape
+    n_loads = NM.shape[1]
+
+    for l in _prange(n_layups):
+        T = np.empty((3, 3))
+        T_inv = np.empty((3, 3))
+        Q_bar = np.empty((n_plies, 3, 3))
+        z_mid = np.empty(n_plies)
+
+        h = 0.0
+        for p in range(n_plies):
+            h += thickness[l, p]
+        z0 = -h / 2
+
+        for i in range(6):
+            for j in range(6):
+                ABD[l, i, j] = 0.0
+
+        for p in range(n_plies):
+            # Q_bar = T(-theta) Q T(-theta)^T
+            _transformation(-theta[l, p], T_inv)
+            for i in range(3):
+                for j in range(3):
+                    acc = 0.0
+                    for m in range(3):
+                        for k in range(3):
+                            acc += T_inv[i, m] * Q[l, p, m, k] * T_inv[j, k]
+                    Q_bar[p, i, j] = acc
+
+            # Through-thickness integrals of 1, z and z^2
+            z1 = z0 + thickness[l, p]
+            h0 = z1 - z0
+            h1 = (z1 * z1 - z0 * z0) / 2
+            h2 = (z1 * z1 * z1 - z0 * z0 * z0) / 3
+            z_mid[p] = (z0 + z1) / 2
+            z0 = z1
+
+            for i in range(3):
+                for j in range(3):
+                    q = Q_bar[p, i, j]
+                    ABD[l, i, j] += h0 * q
+                    ABD[l, i, j + 3] += h1 * q
+                    ABD[l, i + 3, j] += h1 * q
+                    ABD[l, i + 3, j + 3] += h2 * q
+
+        _solve_6x6(ABD[l], NM[l], strain[l])
+
+        for p in range(n_plies):
+            if local:
+                _transformation(theta[l, p], T)
+            for n in range(n_loads):
+                e0 = strain[l, n, 0] + z_mid[p] * strain[l, n, 3]
+                e1 = strain[l, n, 1] + z_mid[p] * strain[l, n, 4]
+                e2 = strain[l, n, 2] + z_mid[p] * strain[l, n, 5]
+
+                s0 = Q_bar[p, 0, 0] * e0 + Q_bar[p, 0, 1] * e1 + Q_bar[p, 0, 2] * e2
+                s1 = Q_bar[p, 1, 0] * e0 + Q_bar[p, 1, 1] * e1 + Q_bar[p, 1, 2] * e2
+                s2 = Q_bar[p, 2, 0] * e0 + Q_bar[p, 2, 1] * e1 + Q_bar[p, 2, 2] * e2
+
+                if local:
+                    stress[l, n, p, 0] = T[0, 0] * s0 + T[0, 1] * s1 + T[0, 2] * s2
+                    stress[l, n, p, 1] = T[1, 0] * s0 + T[1, 1] * s1 + T[1, 2] * s2
+                    stress[l, n, p, 2] = T[2, 0] * s0 + T[2, 1] * s1 + T[2, 2] * s2
+                else:
+                    stress[l, n, p, 0] = s0
+                    stress[l, n, p, 1] = s1
+                    stress[l, n, p, 2] = s2
+
+
+# The loop kernel compiled with numba, or the plain Python loops used to check it without numba
+_solve_6x6 = _jit(_solve_6x6)
+_transformation = _jit(_transformation)
+if numba is not None:
+    _analyze_compiled = numba.njit(cache=True, parallel=True)(_analyze_loops)
+else:
+    _analyze_compiled = _analyze_loops
+
+
+def _analyze_numba(Q, theta, thickness, NM, local=True):
+
+    n_layups, n_plies = theta.shape
+    n_loads = NM.shape[1]
+
+    ABD = np.empty((n_layups, 6, 6))
+    strain = np.empty((n_layups, n_loads, 6))
+    stress = np.empty((n_layups, n_loads, n_plies, 3))
+
+    _analyze_compiled(
+        np.ascontiguousarray(Q), np.ascontiguousarray(theta), np.ascontiguousarray(thickness),
+        np.ascontiguousarray(NM), local, ABD, strain, stress,
+    )
+
+    return ABD, strain, stress
+
+
+_BACKENDS = {'numpy': _analyze_numpy, 'numba': _analyze_numba}
+_backend = None
+
+
+def available_backends() -> list:
+    '''Backends usable in this environment.'''
+
+    return ['numpy', 'numba'] if numba is not None else ['numpy']
+
+
+def set_backend(name: str = None) -> str:
+    '''
+    Selects the compute backend.
+
+    Args:
+        name (str, optional): 'numpy' or 'numba'. Defaults to the COMPYSITE_BACKEND environment variable, or numba
+                              when it is installed. A COMPYSITE_BACKEND=numba setting without numba installed
+                              falls back to 'numpy' with a warning, an explicit 'numba' raises ImportError.
+
+    Returns:
+        str: The selected backend.
+    '''
+
+    global _backend
+
+    explicit = name is not None
+    if name is None:
+        name = os.environ.get('COMPYSITE_BACKEND', 'numba' if numba is not None else 'numpy')
+
+    if name not in _BACKENDS:
+        raise ValueError(f'Unknown backend {name!r}, expected one of {list(_BACKENDS)}.')
+
+    if name == 'numba' and numba is None:
+        if explicit:
+            raise ImportError('The numba backend requires numba.')
+
+        warnings.warn('COMPYSITE_BACKEND=numba but numba is not installed, using the numpy backend.')
+        name = 'numpy'
+
+    _backend = name
+
+    return name
+
+
+def get_backend() -> str:
+    '''Name of the current compute backend.'''
+
+    if _backend is None:
+        set_backend()
+
+    return _backend
+
+
+def analyze(
+    Q: np.ndarray,
+    theta_rad: np.ndarray,
+    thickness: np.ndarray,
+    NM: np.ndarray,
+    local: bool = True,
+    backend: str = None,
+    precision: Union[str, PrecisionPolicy] = None,
+):
+    '''
+    Fused laminate analysis of many layups with the same number of plies: ply stiffness transformation, ABD
+    assembly, mid-plane solve and recovery of the ply mid-height stresses.
+
+    Args:
+        Q (np.ndarray): Reduced ply stiffnesses in the lamina axes with shape (n_layups, n_plies, 3, 3).
+        theta_rad (np.ndarray): Ply orientations in radians with shape (n_layups, n_plies).
+        thickness (np.ndarray): Ply thicknesses with shape (n_layups, n_plies).
+        NM (np.ndarray): Resultants [Nx, Ny, Nxy, Mx, My, Mxy] with shape (n_layups, n_loads, 6).
+        local (bool, optional): Ply stresses in the lamina axes. Defaults to True.
+        backend (str, optional): Backend used for this call. Defaults to get_backend().
+        precision (str, PrecisionPolicy, optional): Precision policy. Defaults to the current policy. Policies
+                                                    other than float64 run on the NumPy backend.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: ABD matrices (n_layups, 6, 6), mid-plane strains and curvatures
+                                                   (n_layups, n_loads, 6) and ply stresses (n_layups, n_loads, n_plies, 3).
+    '''
+
+    Q = np.asarray(Q, dtype=float)
+    theta_rad = np.asarray(theta_rad, dtype=float)
+    thickness = np.asarray(thickness, dtype=float)
+    NM = np.asarray(NM, dtype=float)
+
+    backend = backend or get_backend()
+    if backend == 'numba' and numba is None:
+        raise ImportError('The numba backend requires numba.')
+
+    policy = resolve(precision)
+    if policy.dtype != np.float64 or backend == 'numpy':
+        return _analyze_numpy(Q, theta_rad, thickness, NM, local, policy)
+
+    return _BACKENDS[backend](Q, theta_rad, thickness, NM, local)
+
+
+def laminate_arrays(laminate) -> tuple:
+    '''
+    Reduced ply stiffness, orientations and thicknesses of a Laminate or TableLaminate, shaped for analyze
+    with a single layup.
+    '''
+
+    if hasattr(laminate, 'material_ids'):
+        Q = laminate.table.Q[laminate.material_ids]
+        theta = np.deg2rad(laminate.orientations)
+        thickness = laminate.ply_thickness
+    else:
+        Q = np.stack([lamina.matrices.C_reduced for lamina in laminate.lamina])
+        theta = np.array([lamina.props.orientation for lamina in laminate.lamina])
+        thickness = np.diff(laminate._z)
+
+    return Q[None], theta[None], thickness[None]
+
+
+def check_equivalence(n_layups: int = 50, n_plies: int = 8, n_loads: int = 4, seed: int = 0) -> float:
+    '''
+    Compares the loop kernel (compiled with numba, or plain Python without it) against the NumPy backend on
+    random layups.
+
+    Returns:
+        float: Largest relative difference of the ABD matrices, strains and ply stresses.
+    '''
+
+    rng = np.random.default_rng(seed)
+
+    E1 = rng.uniform(50e9, 200e9, (n_layups, n_plies))
+    E2 = rng.uniform(5e9, 15e9, (n_layups, n_plies))
+    v = np.stack([np.zeros_like(E1), np.zeros_like(E1), rng.uniform(0.2, 0.4, E1.shape)], axis=-1)
+    G = np.stack([np.ones_like(E1), np.ones_like(E1), rng.uniform(3e9, 7e9, E1.shape)], axis=-1)
+    Q = clt.reduced_stiffness(np.stack([E1, E2, E2], axis=-1), v, G)
+
+    theta = np.deg2rad(rng.choice([0, 45, -45, 90, 30, -60], (n_layups, n_plies)))
+    thickness = rng.uniform(0.1e-3, 0.3e-3, (n_layups, n_plies))
+    NM = rng.standard_normal((n_layups, n_loads, 6)) * np.array([1e5, 1e5, 1e4, 10, 10, 1])
+
+    reference = _analyze_numpy(Q, theta, thickness, NM, precision='double')
+    result = _analyze_numba(Q, theta, thickness, NM)
+
+    return max(
+        float(np.abs(a - b).max() / np.abs(a).max()) for a, b in zip(reference, result)
+    )
@@ -0,0 +1,577 @@
+import time
+import numpy as np
+
+from Compysite import Material, Lamina, Laminate
+
+
+def _timer(func, *args, repeat: int = 3, **kwargs) -> float:
+    '''Returns the best wall time of repeated calls in seconds.'''
+
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def _example_laminate(angles=(0, 45, -45, 90, 90, -45, 45, 0)) -> Laminate:
+
+    E = np.array([181, 10.3, 10.3]) * 1e9
+    v = np.array([0, 0.28, 0.28])
+    G = np.array([1, 7.17, 7.17]) * 1e9
+
+    lam = Laminate()
+    layer = Lamina(mat_composite=Material(E, v, G), thickness=0.125e-3)
+
+    for angle in angles:
+        lam.add_lamina(layer, angle)
+
+    return lam
+
+
+def fatigue_throughput(n_samples: int = 1_000_000, chunk: int = 100_000):
+    from fatigue import FatigueDamage, SNCurve
+
+    lam = _example_laminate()
+    rng = np.random.default_rng(0)
+
+    # Narrow band load history for the in-plane resultants
+    t = np.arange(n_samples)
+    NM = np.zeros((n_samples, 6))
+    NM[:, 0] = 2e5 * np.sin(0.02 * t) + 2e4 * rng.standard_normal(n_samples)
+    NM[:, 2] = 5e4 * np.sin(0.013 * t)
+
+    stresses = lam.get_ply_stresses(NM)
+
+    curves = [
+        SNCurve(1.5e9, 12, 1.5e9, 1.2e9),
+        SNCurve(60e6, 10, 40e6, 200e6),
+        SNCurve(70e6, 10, 70e6, 70e6),
+    ]
+
+    def run():
+        damage = FatigueDamage(curves, lam.num_layers)
+        for i in range(0, n_samples, chunk):
+            damage.update(stresses[i : i + chunk])
+        return damage.damage
+
+    dt = _timer(run)
+
+    print(f'Rainflow + Miner: {stresses.size / dt * 1e-6:.1f} M values/s')
+    print(f'                  {n_samples / dt * 1e-6:.2f} M load samples/s ({lam.num_layers} plies)')
+
+
+def ritz_throughput(n_layups: int = 20, n_terms=(8, 20), boundary=('SSSS', 'SSCC')):
+    import ritz
+    from plate import bending_stiffness
+
+    rng = np.random.default_rng(0)
+    layups = [_example_laminate(rng.choice([0, 45, -45, 90], 16)) for _ in range(n_layups)]
+    D = bending_stiffness(layups)
+
+    try:
+        import scipy  # noqa: F401
+        methods = ('dense', 'sparse', 'lobpcg')
+    except ImportError:
+        methods = ('dense',)
+
+    for bc in boundary:
+        for n in n_terms:
+            basis = ritz.ritz_basis(0.5, 0.3, bc, n)
+            print(f'Ritz {bc}, {n}x{n} terms, pattern density {basis.density:.2f}')
+
+            for method in methods:
+                dt_b = _timer(ritz.buckling, D, basis, (1, 0, 0.3), 2, method, repeat=1)
+                dt_f = _timer(ritz.frequencies, D, basis, 2.0, 3, method, repeat=1)
+                print(f'    {method:>7}: buckling {n_layups / dt_b:8.1f} layups/s, frequencies {n_layups / dt_f:8.1f} layups/s')
+
+
+def service_latency(
+    n_clients: int = 32, n_requests: int = 4000, n_layups: int = 20, max_delay: float = 0.002, processes: int = 0
+):
+    import asyncio
+    import json
+    import os
+    import tempfile
+    from service import AnalysisService
+
+    rng = np.random.default_rng(0)
+    material = {'E': [181e9, 10.3e9, 10.3e9], 'v': [0.4, 0.28, 0.28], 'G': [3.7e9, 7.17e9, 7.17e9], 'thickness': 1.25e-4}
+    layups = [
+        {'materials': {'cf': material}, 'plies': [['cf', float(a)] for a in rng.choice([0, 45, -45, 90], 16)]}
+        for _ in range(n_layups)
+    ]
+
+    requests = [
+        json.dumps({
+            'id': i,
+            'laminate': layups[rng.integers(n_layups)],
+            'loads': (rng.standard_normal((rng.integers(1, 50), 6)) * 1e3).tolist(),
+            'outputs': ['strain', 'ply_stress'],
+        }).encode() + b'\n'
+        for i in range(n_requests)
+    ]
+
+    async def client(path, lines, latencies):
+        reader, writer = await asyncio.open_unix_connection(path, limit=2 ** 24)
+        for line in lines:
+            start = time.perf_counter()
+            writer.write(line)
+            await reader.readline()
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+        await writer.wait_closed()
+
+    async def run():
+        path = os.path.join(tempfile.mkdtemp(), 'compysite.sock')
+        latencies = []
+
+        async with AnalysisService(max_delay=max_delay, processes=processes, pool_threshold=1) as service:
+            server = asyncio.create_task(service.serve_unix(path))
+            while not os.path.exists(path):
+                await asyncio.sleep(0.001)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(client(path, requests[i::n_clients], latencies) for i in range(n_clients)))
+            elapsed = time.perf_counter() - start
+
+            # Let the server see the closed connections before shutting it down
+            await asyncio.sleep(0.05)
+            server.cancel()
+            print(f'Service ({n_clients} clients, {processes} processes): {n_requests / elapsed:.0f} requests/s')
+            print(f'    latency p50 {np.percentile(latencies, 50) * 1e3:.2f} ms, p99 {np.percentile(latencies, 99) * 1e3:.2f} ms')
+            print(f'    {service.requests / service.batches:.1f} requests/batch, cache hits {service.cache.hits}, misses {service.cache.misses}')
+
+    asyncio.run(run())
+
+
+def backend_speedup(n_layups: int = 2000, n_plies: int = 8):
+    import backend
+
+    print(f'Backend equivalence (loop kernel vs NumPy): {backend.check_equivalence():.1e} max relative difference')
+
+    lam = _example_laminate()
+    Q, theta, thickness = backend.laminate_arrays(lam)
+    NM = np.array([[[1e5, 0, 1e4, 10, 0, 1]]])
+
+    def per_laminate_objects():
+        for _ in range(n_layups):
+            lam.midplane_strain(NM[0])
+            lam.get_ply_stresses(NM[0])
+
+    rng = np.random.default_rng(0)
+    Q_batch = np.broadcast_to(Q, (n_layups, n_plies, 3, 3))
+    theta_batch = np.deg2rad(rng.choice([0, 45, -45, 90], (n_layups, n_plies)))
+    t_batch = np.broadcast_to(thickness, (n_layups, n_plies))
+    NM_batch = np.broadcast_to(NM, (n_layups, 1, 6))
+
+    dt = _timer(per_laminate_objects, repeat=1)
+    print(f'Laminate.midplane_strain + get_ply_stresses: {dt / n_layups * 1e6:8.1f} us/laminate')
+
+    for name in backend.available_backends():
+        backend.analyze(Q, theta, thickness, NM, backend=name)
+
+        def per_laminate():
+            for _ in range(n_layups):
+                backend.analyze(Q, theta, thickness, NM, backend=name)
+
+        dt = _timer(per_laminate, repeat=1)
+        dt_batch = _timer(backend.analyze, Q_batch, theta_batch, t_batch, NM_batch, backend=name)
+        print(f'{name:>5} backend: {dt / n_layups * 1e6:8.1f} us/laminate, batched {dt_batch / n_layups * 1e6:6.2f} us/laminate')
+
+
+def precision_study(n_samples: int = 200_000, chunk: int = 20_000):
+    from stochastic import MonteCarloLaminate, Scatter
+    from precision import POLICIES
+
+    fiber = Material(np.array([230, 15, 15]) * 1e9, np.array([0.5, 0.2, 0.2]), np.array([5, 15, 15]) * 1e9)
+    matrix = Material(np.array([3.5, 3.5, 3.5]) * 1e9, np.array([0.35, 0.35, 0.35]), np.array([1.3, 1.3, 1.3]) * 1e9)
+    NM = np.array([[1e5, 0, 1e4, 10, 0, 1], [0, -2e5, 0, 0, 5, 0]])
+
+    mc = MonteCarloLaminate(
+        fiber, matrix, 0.6, 0.125e-3, [0, 45, -45, 90, 90, -45, 45, 0], NM,
+        scatter={'E_f': 0.05, 'Vol_f': 0.03, 'thickness': 0.02, 'angle': Scatter(1.0, relative=False)},
+    )
+    samples = mc.sample(chunk, seed=0)
+
+    mc.precision = 'double'
+    reference = mc.evaluate(samples)
+
+    for name in POLICIES:
+        mc.precision = name
+        result = mc.evaluate(samples)
+
+        errors = ', '.join(
+            f'{key} {np.max(np.abs(result[key] - ref)) / np.max(np.abs(ref)):.1e}' for key, ref in reference.items()
+        )
+        sample_bytes = sum(values.nbytes for values in result.values()) / chunk
+
+        def run():
+            for _ in range(n_samples // chunk):
+                mc.evaluate(samples)
+
+        dt = _timer(run, repeat=1)
+        print(f'{name:>6}: {n_samples / dt:10.0f} samples/s, {sample_bytes:5.0f} B/sample, max relative error: {errors}')
+
+
+def calibration_speed(n_specimens: int = 40, n_fits: int = 1000):
+    from compositeMaterial import CompositeMaterial
+    from calibration import PARAMETERS, calibrate, constituent_materials, constituent_parameters, micromechanics
+
+    fiber = Material(np.array([233, 23.1, 23.1]) * 1e9, np.array([0.2, 0.4, 0.4]), np.array([8.27, 8.96, 8.96]) * 1e9,
+                     np.array([-0.54, 10.1, 10.1]) * 1e-6)
+    matrix = Material(4.62e9, 0.36, 0, 41.4e-6)
+    guess_fiber = Material(fiber.props.E * 1.3, fiber.props.v * 0.8, fiber.props.G * 0.7, fiber.props.alpha * 1.5)
+    guess_matrix = Material(3e9, 0.3, 0, 30e-6)
+
+    rng = np.random.default_rng(0)
+    Vol_f = rng.uniform(0.3, 0.7, n_specimens)
+    measured = micromechanics(constituent_parameters(fiber, matrix), Vol_f)
+    measured = measured * (1 + 0.01 * rng.standard_normal(measured.shape))
+
+    dt = _timer(calibrate, Vol_f, measured, guess_fiber, guess_matrix)
+    print(f'calibrate: {dt * 1e3:8.2f} ms per fit of {n_specimens} specimens')
+
+    idx = rng.integers(0, n_specimens, (n_fits, n_specimens))
+    dt = _timer(calibrate, Vol_f[idx], measured[idx], guess_fiber, guess_matrix, repeat=1)
+    print(f'calibrate: {dt / n_fits * 1e3:8.2f} ms per fit, {n_fits} bootstrap fits in one call')
+
+    try:
+        from scipy.optimize import least_squares
+    except ImportError:
+        return
+
+    # Reference: generic optimizer around the scalar _create_composite, finite difference Jacobian
+    x0 = np.array([float(v) for v in constituent_parameters(guess_fiber, guess_matrix).values()])
+    scale = np.sqrt(np.mean(measured ** 2, axis=0))
+
+    def residual(x):
+        mat_f, mat_m = constituent_materials(dict(zip(PARAMETERS, x * x0)))
+        out = []
+        for V, row in zip(Vol_f, measured):
+            c = CompositeMaterial()._create_composite(mat_f, mat_m, V)
+            E, v, G, alpha = c.props.E, c.props.v, c.props.G, c.props.alpha
+            out.append((np.array([E[0], E[1], v[2], v[0], G[2], G[0], alpha[0], alpha[1]]) - row) / scale)
+        return np.concatenate(out)
+
+    dt = _timer(least_squares, residual, np.ones(len(x0)), repeat=1)
+    print(f'scipy least_squares on the scalar path: {dt * 1e3:8.2f} ms per fit')
+
+
+def ply_memory(n_plies: int = 100_000):
+    import tracemalloc
+
+    layer = _example_laminate().lamina[0]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    plies = [layer.copy() for _ in range(n_plies)]
+    dt = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'Lamina.copy: {size / len(plies):6.0f} B/ply, {dt / n_plies * 1e6:6.1f} us/ply')
+
+
+def optimizer_throughput(generations: int = 50, population_size: int = 50, islands: int = 4):
+    from failure import PlyStrength
+    from optimizer import StackingOptimizer
+
+    layer = _example_laminate().lamina[0]
+    strength = PlyStrength(1.5e9, 1.2e9, 50e6, 200e6, 70e6)
+    NM = np.array([[-200e3, 0, 0, 0, 0, 0], [0, 100e3, 50e3, 0, 0, 0]])
+
+    opt = StackingOptimizer(layer, (0, 45, 90), 48, NM, strength, length=0.5, width=0.3, n_terms=5)
+
+    # Candidates per second of the vectorized evaluation against the Laminate object path
+    genes = np.random.default_rng(0).integers(0, 4, (1000, opt.n_genes))
+    dt = _timer(opt.evaluate, genes)
+    print(f'vectorized evaluation: {len(genes) / dt:10.0f} designs/s')
+
+    def scalar(genes):
+        for row in genes:
+            lam = opt.laminate(row)
+            lam.get_ply_stresses(NM)
+
+    dt = _timer(scalar, genes[:100], repeat=1)
+    print(f'Laminate objects:      {100 / dt:10.0f} designs/s (strength only)')
+
+    for processes in (0, islands):
+        start = time.perf_counter()
+        result = opt.run(generations, population_size, islands=islands, processes=processes, seed=0)
+        dt = time.perf_counter() - start
+        print(
+            f'{islands} islands, {processes} processes: {dt:6.2f} s, {result.evaluations} analyses, '
+            f'{result.cache_hits} memo hits, {len(result.angles)} plies'
+        )
+
+
+def taper_stations(n_stations: int = 500, n_plies: int = 48, n_loads: int = 10):
+    from material_table import MaterialTable
+    from taper import TaperedLaminate
+
+    table = MaterialTable()
+    ply = table.add(_example_laminate().lamina[0])
+
+    rng = np.random.default_rng(0)
+    angles = rng.choice([0.0, 45.0, -45.0, 90.0], n_plies)
+    drops = np.where(rng.random(n_plies) < 0.5, rng.uniform(0, 1, n_plies), np.inf)
+    NM = rng.normal(size=(n_loads, n_stations, 6)) * 1e3
+
+    def tapered():
+        taper = TaperedLaminate.from_drop_positions(table, ply, angles, drops, np.linspace(0, 1, n_stations))
+        return taper.get_ply_stresses(NM)
+
+    def independent():
+        taper = TaperedLaminate.from_drop_positions(table, ply, angles, drops, np.linspace(0, 1, n_stations))
+        for i in range(n_stations):
+            taper.station(i).get_ply_stresses(NM[:, i])
+
+    dt_taper = _timer(tapered)
+    dt_stations = _timer(independent, repeat=1)
+    print(f'{n_stations} stations, {n_loads} loads: tapered {dt_taper * 1e3:8.2f} ms, '
+          f'independent laminates {dt_stations * 1e3:8.2f} ms')
+
+
+def surrogate_query(n_queries: int = 10_000):
+    from surrogate import ABDSurface
+
+    mat_f = Material(
+        np.array([233, 23.1, 23.1]) * 1e9, np.array([0.40, 0.20, 0.20]), np.array([8.27, 8.96, 8.96]) * 1e9
+    )
+    mat_m = Material(4.62e9, 0.36, 0)
+    angles = [0, 'theta', '-theta', 90, 90, '-theta', 'theta', 0]
+    grid = {'theta': np.linspace(0, 90, 19), 'Vol_f': np.linspace(0.4, 0.7, 7), 'scale': np.linspace(0.8, 1.2, 5)}
+
+    start = time.perf_counter()
+    surface = ABDSurface(mat_f, mat_m, angles, 0.125e-3, grid)
+    print(f'table of {np.prod(surface.shape)} nodes: {(time.perf_counter() - start) * 1e3:8.2f} ms, {surface.nbytes} B')
+
+    rng = np.random.default_rng(0)
+    points = np.stack(
+        [rng.uniform(0, 90, n_queries), rng.uniform(0.4, 0.7, n_queries), rng.uniform(0.8, 1.2, n_queries)], axis=-1
+    )
+    exact = surface.evaluate(points)
+
+    for method in ('linear', 'cubic'):
+        dt = _timer(surface.query, points, method)
+        values = surface.query(points, method)
+        error = np.abs(values - exact).max(axis=0)
+        ABD_error = error[[0, 6, 11]].max() / np.abs(exact[:, [0, 6, 11]]).max()
+        moduli_error = (error[21:] / np.abs(exact[:, 21:]).max(axis=0)).max()
+        print(f'{method:6s}: {dt / n_queries * 1e6:6.2f} us/query, A error {ABD_error:.1e}, '
+              f'moduli error {moduli_error:.1e}')
+
+    def objects(points):
+        for theta, Vol_f, scale in points:
+            layer = Lamina(mat_fiber=mat_f, mat_matrix=mat_m, Vol_fiber=Vol_f, thickness=0.125e-3 * scale)
+            Laminate().add_stack(layer, [0, theta, -theta, 90, 90, -theta, theta, 0])
+
+    dt = _timer(objects, points[:100], repeat=1)
+    print(f'Lamina and Laminate objects: {dt / 100 * 1e6:8.2f} us/query')
+
+
+def environment_sweep(n_states: int = 10_000):
+    from properties import PropertyCurve
+    from material_table import MaterialTable, TableLaminate
+
+    T = np.array([-55.0, 20.0, 80.0, 120.0])
+    E = np.array([181, 10.3, 10.3]) * 1e9
+    G = np.array([3.7, 7.17, 7.17]) * 1e9
+    alpha = np.array([-0.02, 23, 23]) * 1e-6
+    curves = {
+        'E': PropertyCurve(T, np.array([[1.02, 1.1, 1.1], [1, 1, 1], [0.98, 0.85, 0.85], [0.95, 0.7, 0.7]]) * E),
+        'G': PropertyCurve(T, np.array([1.1, 1.0, 0.8, 0.6])[:, None] * G),
+        'alpha': PropertyCurve(T, np.array([[5, 0.95, 0.95], [1, 1, 1], [-0.5, 1.1, 1.1], [-1, 1.2, 1.2]]) * alpha),
+    }
+    mat = Material(E, [0.4, 0.28, 0.28], G, alpha, [0, 0.6e-2, 0.6e-2], curves=curves)
+
+    table = MaterialTable()
+    lam = TableLaminate.from_stacking('[0/±45/90]2s', table.add(mat, thickness=0.125e-3), table=table)
+
+    rng = np.random.default_rng(0)
+    T_states, C_states = rng.uniform(-55, 120, n_states), rng.uniform(0, 0.01, n_states)
+
+    dt = _timer(lam.environmental_response, T_states, C_states)
+    print(f'environmental_response: {dt / n_states * 1e6:8.3f} us/state')
+
+    def rebuild(T_states, C_states):
+        for T, C in zip(T_states, C_states):
+            state = MaterialTable()
+            ply = state.add(mat.at(T, C), thickness=0.125e-3)
+            rebuilt = TableLaminate.from_stacking('[0/±45/90]2s', ply, table=state)
+            rebuilt.hygrothermal_resultants(T - 20, C)
+
+    dt = _timer(rebuild, T_states[:200], C_states[:200], repeat=1)
+    print(f'rebuilt laminates:      {dt / 200 * 1e6:8.3f} us/state')
+
+
+def viscoelastic_stepping(steps=(250, 500, 1000, 2000), n_loads: int = 10):
+    from viscoelastic import PronySeries, ViscoelasticLaminate, _convolution_solve
+
+    mat_f = Material(
+        np.array([233, 23.1, 23.1]) * 1e9, np.array([0.40, 0.20, 0.20]), np.array([8.27, 8.96, 8.96]) * 1e9
+    )
+    matrix = PronySeries(1.5e9, (1.0e9, 0.8e9, 0.6e9), (10.0, 1e3, 1e5), v=0.36)
+    lam = ViscoelasticLaminate(mat_f, matrix, 0.6, 0.125e-3, [0, 45, -45, 90, 90, -45, 45, 0])
+
+    rng = np.random.default_rng(0)
+    for n_steps in steps:
+        times = np.linspace(0, 1e5, n_steps)
+        NM = rng.normal(size=(n_steps, n_loads, 6)) * 1e3
+
+        dt_recursive = _timer(lam.solve, times, NM)
+        dt_convolution = _timer(_convolution_solve, lam, times, NM, repeat=1)
+        strain = lam.solve(times, NM)
+        error = np.abs(strain - _convolution_solve(lam, times, NM)).max() / np.abs(strain).max()
+        print(
+            f'{n_steps:5d} steps: recursive {dt_recursive * 1e3:8.2f} ms, '
+            f'convolution {dt_convolution * 1e3:9.2f} ms, difference {error:.1e}'
+        )
+
+
+def nonlinear_path(n_steps: int = 100):
+    from nonlinear import HahnTsai
+
+    lam = Laminate.from_stacking('[0/±45/90]8s', _example_laminate().lamina[0])
+    NM = np.array([[0, 0, 3e5, 0, 0, 0], [2e5, 0, 1e5, 0, 0, 0], [0, 0, 1e5, 0, 0, 20]])
+    law = HahnTsai(2e-25)
+
+    # Full Newton factorizes the tangent every iteration, modified Newton keeps it while the residual drops
+    for method in ('newton', 'modified'):
+        dt = _timer(lam.solve_nonlinear, NM, law, n_steps=n_steps, method=method)
+        result = lam.solve_nonlinear(NM, law, n_steps=n_steps, method=method)
+        print(
+            f'{method:8s}: {dt * 1e3:7.2f} ms, {result.iterations.sum():4d} iterations, '
+            f'{result.factorizations:4d} factorizations, converged {bool(result.converged.all())}'
+        )
+
+
+def envelope_refinement(n_grid: int = 400):
+    from envelope import unit_ply_stresses
+    from failure import PlyStrength, strength_ratio
+
+    lam = _example_laminate()
+    strength = PlyStrength(1.5e9, 1.2e9, 50e6, 200e6, 70e6)
+
+    # Adaptive rays with closed-form strength ratios
+    dt = _timer(lam.failure_envelope, strength, ('Nx', 'Ny'), tol=1e-4)
+    env = lam.failure_envelope(strength, ('Nx', 'Ny'), tol=1e-4)
+    print(f'adaptive 2D: {dt * 1e3:7.2f} ms, {env.evaluations:6d} evaluations')
+
+    dt = _timer(lam.failure_envelope, strength, ('Nx', 'Ny', 'Nxy'), repeat=1)
+    env = lam.failure_envelope(strength, ('Nx', 'Ny', 'Nxy'))
+    print(f'adaptive 3D: {dt * 1e3:7.2f} ms, {env.evaluations:6d} evaluations, {len(env.triangles)} triangles')
+
+    # Brute force grid over the same 2D load range, resolving the boundary only to the grid spacing
+    Q_bar, _, T = lam._ply_matrices()
+    stresses = unit_ply_stresses(lam._ABD, Q_bar, T, lam._z)
+    extent = 1.1 * np.abs(lam.failure_envelope(strength, ('Nx', 'Ny')).points).max(axis=0)
+
+    def grid():
+        Nx, Ny = np.meshgrid(*(np.linspace(-e, e, n_grid) for e in extent))
+        NM = np.zeros((n_grid * n_grid, 6))
+        NM[:, 0], NM[:, 1] = Nx.ravel(), Ny.ravel()
+        stress = np.einsum('fpij,nj->nfpi', stresses, NM)
+        return strength_ratio(stress, strength).min(axis=(1, 2)) < 1
+
+    dt = _timer(grid, repeat=1)
+    print(f'grid 2D:     {dt * 1e3:7.2f} ms, {n_grid * n_grid:6d} evaluations, resolution {1 / n_grid:.1e}')
+
+
+def notched_screening(n_layups: int = 1000, n_plies: int = 16, n_loads: int = 5):
+    import clt
+    from conversion import transformation_matrix_2D
+    from failure import PlyStrength
+    from notched import NotchedLaminate
+
+    layer = _example_laminate().lamina[0]
+    strength = PlyStrength(1.5e9, 1.2e9, 50e6, 200e6, 70e6)
+
+    # Random symmetric layups of 0, +-45 and 90 plies, built directly from the ply matrices
+    rng = np.random.default_rng(0)
+    half = rng.choice([0, 45, -45, 90], size=(n_layups, n_plies // 2))
+    theta = np.deg2rad(np.concatenate([half, half[:, ::-1]], axis=1))
+    Q_bar = clt.transformed_reduced_stiffness(layer.matrices.Q_bar_reduced, theta)
+    T = transformation_matrix_2D(theta)
+    z = clt.ply_heights(np.full((n_layups, n_plies), layer.props.thickness))
+    ABD = clt.ABD_matrix(Q_bar, z)
+    N = rng.normal(size=(n_loads, 3)) * 1e5
+
+    notched = NotchedLaminate(ABD, Q_bar, T, z, strength)
+    for method in ('point', 'average'):
+        dt = _timer(notched.strength_ratio, N, 3e-3, 1e-3, method, repeat=1)
+        print(f'{method:7s} stress: {n_layups * n_loads / dt:8.0f} layup-loads/s')
+
+    def scalar():
+        for i in range(100):
+            NotchedLaminate(ABD[i], Q_bar[i], T[i], z[i], strength).strength_ratio(N, 3e-3, 1e-3)
+
+    dt = _timer(scalar, repeat=1)
+    print(f'per layup:      {100 * n_loads / dt:8.0f} layup-loads/s')
+
+
+def joint_sweep(n_layups: int = 50, n_loads: int = 10, n_fasteners: int = 4):
+    import clt
+    from conversion import transformation_matrix_2D
+    from failure import PlyStrength
+    from joint import BoltedJoint
+    from notched import NotchedLaminate
+
+    layer = _example_laminate().lamina[0]
+    strength = PlyStrength(1.5e9, 1.2e9, 50e6, 200e6, 70e6)
+
+    # Random symmetric 16-ply layups for both plates
+    rng = np.random.default_rng(0)
+    half = rng.choice([0, 45, -45, 90], size=(n_layups, 8))
+    theta = np.deg2rad(np.concatenate([half, half[:, ::-1]], axis=1))
+    Q_bar = clt.transformed_reduced_stiffness(layer.matrices.Q_bar_reduced, theta)
+    z = clt.ply_heights(np.full(theta.shape, layer.props.thickness))
+    plates = NotchedLaminate(clt.ABD_matrix(Q_bar, z), Q_bar, transformation_matrix_2D(theta), z, strength)
+
+    # Every combination of the layups of the two plates, pitches and diameters
+    layups_1, layups_2, pitch, diameter = (
+        grid.ravel() for grid in np.meshgrid(np.arange(n_layups), np.arange(n_layups), [20e-3, 30e-3], [5e-3, 6e-3])
+    )
+    Nx = np.linspace(-5e5, 5e5, n_loads)
+
+    def batched():
+        joint = BoltedJoint(
+            plates, plates, n_fasteners, pitch, 30e-3, diameter, 110e9, layups_1=layups_1, layups_2=layups_2
+        )
+        return joint.solve(Nx, bearing_strength=600e6, distance=1e-3)
+
+    dt = _timer(batched, repeat=1)
+    print(f'batched joints:   {len(pitch) * n_loads / dt:10.0f} configuration-loads/s ({len(pitch)} configurations)')
+
+    def scalar():
+        for c in range(100):
+            joint = BoltedJoint(
+                plates, plates, n_fasteners, pitch[c], 30e-3, diameter[c], 110e9, layups_1=layups_1[c], layups_2=layups_2[c]
+            )
+            joint.solve(Nx, bearing_strength=600e6, distance=1e-3)
+
+    dt = _timer(scalar, repeat=1)
+    print(f'separate joints:  {100 * n_loads / dt:10.0f} configuration-loads/s')
+
+
+if __name__ == '__main__':
+    fatigue_throughput()
+    ritz_throughput()
+    service_latency()
+    service_latency(processes=4)
+    backend_speedup()
+    precision_study()
+    calibration_speed()
+    ply_memory()
+    optimizer_throughput()
+    taper_stations()
+    surrogate_query()
+    environment_sweep()
+    viscoelastic_stepping()
+    nonlinear_path()
+    envelope_refinement()
+    notched_screening()
+    joint_sweep()
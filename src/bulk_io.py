@@ -0,0 +1,527 @@
+'''
+Columnar bulk input and output of layups, load cases and ply results.
+
+Tables are handled as dictionaries of equally long column arrays and streamed in chunks of rows, so millions of
+rows are mapped straight into the vectorized laminate kernels without creating Lamina or Laminate objects.
+Supported formats are NumPy structured arrays (.npy), one array per column (.npz), CSV with a header row, and
+Parquet (.parquet) when pyarrow is installed.
+
+Layup tables hold one row per ply with the columns layup, material, angle (degrees) and optionally thickness and
+ply (stacking position, bottom first). Load tables hold one row per load case with the columns layup and
+Nx, Ny, Nxy, Mx, My, Mxy, and optionally case. The identifier columns layup, material, ply and case are integers,
+all other columns are floats.
+'''
+
+import os
+import shutil
+import tempfile
+import zipfile
+from typing import Dict, Iterator, Sequence, Union
+from itertools import islice
+
+import numpy as np
+
+from conversion import transformation_matrix_2D
+from material_table import MaterialTable
+from precision import PrecisionPolicy, resolve
+import clt
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+except ImportError:
+    pyarrow = None
+
+
+LOAD_COLUMNS = ('Nx', 'Ny', 'Nxy', 'Mx', 'My', 'Mxy')
+STRAIN_COLUMNS = ('e_x', 'e_y', 'g_xy', 'k_x', 'k_y', 'k_xy')
+INTEGER_COLUMNS = ('layup', 'material', 'ply', 'case')
+
+
+def _format(path: str) -> str:
+
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext not in ('.npy', '.npz', '.csv', '.parquet'):
+        raise ValueError(f'Unsupported table format {ext!r}, expected .npy, .npz, .csv or .parquet.')
+
+    if ext == '.parquet' and pyarrow is None:
+        raise ImportError('Reading and writing Parquet requires pyarrow.')
+
+    return ext
+
+
+def read_columns(
+    path: str, chunk_rows: int = 1_000_000, columns: Sequence[str] = None
+) -> Iterator[Dict[str, np.ndarray]]:
+    '''
+    Reads a table in chunks of rows. Structured .npy files are memory mapped, the columns of .npz files are
+    loaded whole and CSV files are parsed chunk by chunk.
+
+    Args:
+        path (str): Table file (.npy, .npz, .csv or .parquet).
+        chunk_rows (int, optional): Rows per chunk. Defaults to 1000000.
+        columns (Sequence[str], optional): Columns to read. Defaults to all columns.
+
+    Yields:
+        Dict[str, np.ndarray]: Column arrays of the next chunk.
+    '''
+
+    ext = _format(path)
+
+    if ext == '.npy':
+        data = np.load(path, mmap_mode='r')
+        names = columns or data.dtype.names
+        for start in range(0, len(data), chunk_rows):
+            chunk = data[start : start + chunk_rows]
+            yield {name: np.array(chunk[name]) for name in names}
+
+    elif ext == '.npz':
+        with np.load(path) as data:
+            names = columns or data.files
+            arrays = {name: data[name] for name in names}
+        n_rows = len(next(iter(arrays.values()))) if arrays else 0
+        for start in range(0, n_rows, chunk_rows):
+            yield {name: array[start : start + chunk_rows] for name, array in arrays.items()}
+
+    elif ext == '.csv':
+        with open(path) as f:
+            header = [name.strip() for name in f.readline().strip().split(',')]
+            names = columns or header
+            usecols = [header.index(name) for name in names]
+
+            while True:
+                lines = list(islice(f, chunk_rows))
+                if not lines:
+                    break
+                values = np.loadtxt(lines, delimiter=',', usecols=usecols, ndmin=2)
+                yield {name: _column_type(name, values[:, i]) for i, name in enumerate(names)}
+
+    else:
+        for batch in parquet.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield {name: batch.column(name).to_numpy() for name in batch.schema.names}
+
+
+def _column_type(name: str, values: np.ndarray) -> np.ndarray:
+    '''CSV values are parsed as floats, the identifier columns (INTEGER_COLUMNS) are returned as integers.'''
+
+    if name not in INTEGER_COLUMNS:
+        return values
+
+    if not np.all(values == np.round(values)):
+        raise ValueError(f'Column {name!r} must hold integers.')
+
+    return values.astype(np.int64)
+
+
+def read_table(path: str, columns: Sequence[str] = None) -> Dict[str, np.ndarray]:
+    '''Reads a whole table into column arrays.'''
+
+    chunks = list(read_columns(path, columns=columns))
+
+    if not chunks:
+        return {}
+
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+
+class ColumnWriter:
+    def __init__(self, path: str, float_format: str = '%.9g'):
+        '''
+        Streams a table to disk chunk by chunk. The columns and their types are fixed by the first chunk.
+        NumPy files are assembled from per-column temporary files on close, so memory use stays bounded.
+
+        Args:
+            path (str): Output file (.npy, .npz, .csv or .parquet).
+            float_format (str, optional): Format of floating point values in CSV files. Defaults to '%.9g'.
+        '''
+
+        self.path = path
+        self.format = _format(path)
+        self.float_format = float_format
+        self.n_rows = 0
+
+        self._dtypes = None
+        self._file = None
+        self._tmpdir = None
+        self._parts = None
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, columns: Dict[str, np.ndarray]) -> None:
+        '''Appends a chunk of rows given as column arrays.'''
+
+        columns = {name: np.asarray(values) for name, values in columns.items()}
+
+        if self._dtypes is None:
+            self._open(columns)
+
+        if list(columns) != list(self._dtypes):
+            raise ValueError(f'Expected the columns {list(self._dtypes)}, got {list(columns)}.')
+
+        n_rows = len(next(iter(columns.values())))
+
+        if self.format == '.csv':
+            if n_rows:
+                fmt = [
+                    '%d' if np.issubdtype(dtype, np.integer) else self.float_format
+                    for dtype in self._dtypes.values()
+                ]
+                data = np.column_stack([columns[name] for name in self._dtypes])
+                np.savetxt(self._file, data, fmt=fmt, delimiter=',')
+
+        elif self.format == '.parquet':
+            self._writer.write_table(pyarrow.table(columns))
+
+        elif self.format == '.npy':
+            record = np.empty(n_rows, dtype=list(self._dtypes.items()))
+            for name in self._dtypes:
+                record[name] = columns[name]
+            record.tofile(self._parts)
+
+        else:
+            for name, dtype in self._dtypes.items():
+                np.asarray(columns[name], dtype=dtype).tofile(self._parts[name])
+
+        self.n_rows += n_rows
+
+    def _open(self, columns: Dict[str, np.ndarray]) -> None:
+
+        self._dtypes = {name: values.dtype for name, values in columns.items()}
+
+        if self.format == '.csv':
+            self._file = open(self.path, 'w')
+            self._file.write(','.join(self._dtypes) + '\n')
+
+        elif self.format == '.parquet':
+            schema = pyarrow.table(columns).schema
+            self._writer = parquet.ParquetWriter(self.path, schema)
+
+        else:
+            self._tmpdir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(self.path)))
+            if self.format == '.npy':
+                self._parts = open(os.path.join(self._tmpdir, 'records'), 'wb')
+            else:
+                self._parts = {
+                    name: open(os.path.join(self._tmpdir, str(i)), 'wb') for i, name in enumerate(self._dtypes)
+                }
+
+    def close(self) -> None:
+
+        if self.format == '.csv' and self._file is not None:
+            self._file.close()
+
+        elif self.format == '.parquet' and self._writer is not None:
+            self._writer.close()
+
+        elif self.format == '.npy' and self._parts is not None:
+            self._parts.close()
+            dtype = np.dtype(list(self._dtypes.items()))
+            with open(self.path, 'wb') as f:
+                _write_npy(f, dtype, self.n_rows, self._parts.name)
+
+        elif self.format == '.npz' and self._parts is not None:
+            with zipfile.ZipFile(self.path, 'w', zipfile.ZIP_STORED, allowZip64=True) as zf:
+                for name, part in self._parts.items():
+                    part.close()
+                    with zf.open(name + '.npy', 'w', force_zip64=True) as f:
+                        _write_npy(f, self._dtypes[name], self.n_rows, part.name)
+
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+        self._file = self._parts = self._writer = None
+
+
+def _write_npy(f, dtype: np.dtype, n_rows: int, raw_path: str) -> None:
+    '''Writes the .npy header followed by the raw data of a temporary file.'''
+
+    header = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (n_rows,)}
+    np.lib.format.write_array_header_2_0(f, header)
+
+    with open(raw_path, 'rb') as raw:
+        shutil.copyfileobj(raw, f, 2 ** 24)
+
+
+def write_table(path: str, columns: Dict[str, np.ndarray], **kwargs) -> None:
+    '''Writes a whole table given as column arrays.'''
+
+    with ColumnWriter(path, **kwargs) as writer:
+        writer.write(columns)
+
+
+class LayupBatch:
+    def __init__(
+        self,
+        layup: np.ndarray,
+        material: np.ndarray,
+        angle: np.ndarray,
+        thickness: np.ndarray = None,
+        ply: np.ndarray = None,
+        table: MaterialTable = None,
+        precision: Union[str, PrecisionPolicy] = None,
+    ):
+        '''
+        Many layups given as ply rows, stored as padded (n_layups, max_plies) arrays. Padding plies have zero
+        thickness and do not contribute to the laminate stiffness.
+
+        Args:
+            layup (np.ndarray): Layup id of every ply row.
+            material (np.ndarray): Material id (into the table) of every ply row.
+            angle (np.ndarray): Ply orientation in degrees.
+            thickness (np.ndarray, optional): Ply thickness. Defaults to the table thickness of the material.
+            ply (np.ndarray, optional): Stacking position within the layup, bottom first. Defaults to the row order.
+            table (MaterialTable, optional): Material table. Required for the stiffness matrices.
+            precision (str, PrecisionPolicy, optional): Precision of the load case analysis. The ABD matrices are
+                                                        always assembled in float64, strains are computed in the
+                                                        accumulation type and ply stresses in the storage type of
+                                                        the policy. Defaults to the current policy.
+        '''
+
+        layup = np.asarray(layup)
+        material = np.asarray(material, dtype=int)
+        angle = np.asarray(angle, dtype=float)
+
+        if layup.size == 0:
+            raise ValueError('A layup batch needs at least one ply row, got an empty layup list.')
+
+        self.table = table
+        self.precision: PrecisionPolicy = resolve(precision)
+
+        if thickness is None:
+            if table is None:
+                raise ValueError('Ply thickness or a material table is required.')
+            thickness = table._invariants()['thickness'][material]
+        thickness = np.asarray(thickness, dtype=float)
+
+        # Order the rows by layup, then by stacking position (row order if not given), without a Python loop
+        position = np.arange(len(layup)) if ply is None else np.asarray(ply)
+        order = np.lexsort((position, layup))
+
+        self.layup_ids, inverse, self.n_plies = np.unique(layup[order], return_inverse=True, return_counts=True)
+
+        n_layups, max_plies = len(self.layup_ids), int(self.n_plies.max())
+        starts = np.concatenate([[0], np.cumsum(self.n_plies)[:-1]])
+        column = np.arange(len(layup)) - starts[inverse]
+
+        self.material = np.zeros((n_layups, max_plies), dtype=int)
+        self.angle = np.zeros((n_layups, max_plies))
+        self.thickness = np.zeros((n_layups, max_plies))
+        self.mask = np.zeros((n_layups, max_plies), dtype=bool)
+
+        self.material[inverse, column] = material[order]
+        self.angle[inverse, column] = angle[order]
+        self.thickness[inverse, column] = thickness[order]
+        self.mask[inverse, column] = True
+
+        # Mid-plane is the middle of the real plies, padding is appended on top with zero thickness
+        self.z = clt.ply_heights(self.thickness)
+
+        self._ABD = None
+        self._compliance = None
+        self._response = {}
+
+    @classmethod
+    def read(
+        cls, path: str, table: MaterialTable, chunk_rows: int = 1_000_000, precision: Union[str, PrecisionPolicy] = None
+    ) -> 'LayupBatch':
+        '''Reads the layups from a ply table file.'''
+
+        columns = {}
+        for chunk in read_columns(path, chunk_rows):
+            for name, values in chunk.items():
+                columns.setdefault(name, []).append(values)
+        columns = {name: np.concatenate(values) for name, values in columns.items()}
+
+        return cls(
+            columns['layup'],
+            columns['material'],
+            columns['angle'],
+            columns.get('thickness'),
+            columns.get('ply'),
+            table,
+            precision,
+        )
+
+    def __len__(self):
+        return len(self.layup_ids)
+
+    def index(self, layup: np.ndarray) -> np.ndarray:
+        '''Position of the given layup ids in the batch.'''
+
+        layup = np.asarray(layup)
+        idx = np.searchsorted(self.layup_ids, layup)
+        idx = np.minimum(idx, len(self.layup_ids) - 1)
+
+        if not np.array_equal(self.layup_ids[idx], layup):
+            missing = np.setdiff1d(layup, self.layup_ids)
+            raise KeyError(f'Unknown layup ids {missing[:10].tolist()}.')
+
+        return idx
+
+    def _Q_bar(self) -> np.ndarray:
+        return clt.transformed_reduced_stiffness(self.table.Q[self.material], np.deg2rad(self.angle))
+
+    @property
+    def ABD(self) -> np.ndarray:
+        '''ABD matrices with shape (n_layups, 6, 6).'''
+
+        if self._ABD is None:
+            self._ABD = clt.ABD_matrix(self._Q_bar(), self.z)
+
+        return self._ABD
+
+    @property
+    def compliance(self) -> np.ndarray:
+        '''Inverse ABD matrices with shape (n_layups, 6, 6), shared by all load cases of a layup.'''
+
+        if self._compliance is None:
+            self._compliance = np.linalg.inv(self.ABD).astype(self.precision.accumulate)
+
+        return self._compliance
+
+    def midplane_strain(self, layup: np.ndarray, NM: np.ndarray) -> np.ndarray:
+        '''
+        Mid-plane strains and curvatures of load cases on the given layups.
+
+        Args:
+            layup (np.ndarray): Layup id of every load case with shape (n_cases,).
+            NM (np.ndarray): Resultants with shape (n_cases, 6).
+
+        Returns:
+            np.ndarray: Strains and curvatures with shape (n_cases, 6).
+        '''
+
+        NM = np.asarray(NM).astype(self.precision.accumulate, copy=False)
+
+        return np.einsum('nij,nj->ni', self.compliance[self.index(layup)], NM)
+
+    def stress_response(self, local: bool = True) -> np.ndarray:
+        '''
+        Ply mid-height stresses per unit resultant, with shape (n_layups, max_plies, 3, 6). This folds Q_bar, the
+        through-thickness strain distribution, the inverse ABD matrix and (for local=True) the transformation to the
+        lamina axes into one matrix per ply. Padding plies have a zero response.
+        '''
+
+        if local not in self._response:
+            z_mid = 0.5 * (self.z[..., 1:] + self.z[..., :-1])
+
+            # Ply strain from the mid-plane strains and curvatures, e = [I, z I] [e0, k]
+            strain = np.concatenate(
+                [np.broadcast_to(np.eye(3), z_mid.shape + (3, 3)), z_mid[..., None, None] * np.eye(3)], axis=-1
+            )
+
+            response = self._Q_bar() @ strain @ self.compliance[:, None]
+
+            if local:
+                response = transformation_matrix_2D(np.deg2rad(self.angle)) @ response
+
+            response = np.where(self.mask[..., None, None], response, 0.0)
+            self._response[local] = self.precision.cast(response)
+
+        return self._response[local]
+
+    def ply_stresses(
+        self, layup: np.ndarray, NM: np.ndarray, local: bool = True, block_rows: int = 8192
+    ) -> np.ndarray:
+        '''
+        Stresses at the mid-height of every ply of load cases on the given layups.
+
+        Args:
+            layup (np.ndarray): Layup id of every load case with shape (n_cases,).
+            NM (np.ndarray): Resultants with shape (n_cases, 6).
+            local (bool, optional): Stresses in the lamina axes [s1, s2, t12]. Defaults to True.
+            block_rows (int, optional): Load cases gathered at once, bounds the temporary memory. Defaults to 8192.
+
+        Returns:
+            np.ndarray: Ply stresses with shape (n_cases, max_plies, 3). Padding plies hold zeros.
+        '''
+
+        idx = self.index(layup)
+        response = self.stress_response(local)
+        NM = self.precision.cast(NM)
+
+        stress = np.empty((len(idx),) + response.shape[1:3], dtype=response.dtype)
+        for start in range(0, len(idx), block_rows):
+            block = slice(start, start + block_rows)
+            np.einsum('npij,nj->npi', response[idx[block]], NM[block], out=stress[block])
+
+        return stress
+
+
+def analyze_loads(
+    layups: LayupBatch,
+    loads_path: str,
+    ply_path: str = None,
+    strain_path: str = None,
+    chunk_rows: int = 100_000,
+    local: bool = True,
+) -> int:
+    '''
+    Streams a load case table through the layups and writes the results in columns.
+
+    The strain table has one row per load case with the columns case, layup and e_x, e_y, g_xy, k_x, k_y, k_xy.
+    The ply table has one row per load case and ply with the columns case, layup, ply, material, angle and
+    s1, s2, t12 (or sx, sy, txy for local=False).
+
+    Args:
+        layups (LayupBatch): Layups referenced by the load cases.
+        loads_path (str): Load case table.
+        ply_path (str, optional): Output file of the ply stresses. Defaults to None.
+        strain_path (str, optional): Output file of the mid-plane strains. Defaults to None.
+        chunk_rows (int, optional): Load cases per chunk. Defaults to 100000.
+        local (bool, optional): Ply stresses in the lamina axes. Defaults to True.
+
+    Returns:
+        int: Number of load cases processed.
+    '''
+
+    stress_columns = ('s1', 's2', 't12') if local else ('sx', 'sy', 'txy')
+    ply_writer = ColumnWriter(ply_path) if ply_path else None
+    strain_writer = ColumnWriter(strain_path) if strain_path else None
+
+    n_cases = 0
+
+    try:
+        for chunk in read_columns(loads_path, chunk_rows):
+            n = len(chunk['layup'])
+            case = chunk['case'] if 'case' in chunk else np.arange(n_cases, n_cases + n)
+            NM = np.column_stack([chunk[name] for name in LOAD_COLUMNS]).astype(float)
+
+            if strain_writer is not None:
+                strain = layups.midplane_strain(chunk['layup'], NM)
+                strain_writer.write(
+                    {'case': case, 'layup': chunk['layup'], **dict(zip(STRAIN_COLUMNS, strain.T))}
+                )
+
+            if ply_writer is not None:
+                idx = layups.index(chunk['layup'])
+                stress = layups.ply_stresses(chunk['layup'], NM, local)
+
+                # Long format rows of the real plies only
+                rows, plies = np.nonzero(layups.mask[idx])
+                ply_writer.write(
+                    {
+                        'case': case[rows],
+                        'layup': chunk['layup'][rows],
+                        'ply': plies + 1,
+                        'material': layups.material[idx[rows], plies],
+                        'angle': layups.angle[idx[rows], plies],
+                        **dict(zip(stress_columns, stress[rows, plies].T)),
+                    }
+                )
+
+            n_cases += n
+
+    finally:
+        for writer in (ply_writer, strain_writer):
+            if writer is not None:
+                writer.close()
+
+    return n_cases
@@ -0,0 +1,386 @@
+'''
+Inverse micromechanics: back-calculation of fiber and matrix properties from measured lamina properties.
+
+The forward model is the micromechanics of compositeMaterial.composite_properties (rule of mixtures, Halpin-Tsai,
+the G23 stress partitioning model and the thermal expansion formulas) for a transversely isotropic fiber and an
+isotropic matrix. Its Jacobian with respect to the constituent properties is evaluated analytically for all
+specimens at once, and the least-squares fit over all specimens (and over any number of independent fits) is
+solved in a single vectorized Levenberg-Marquardt loop.
+'''
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple, Union
+
+from material import Material
+
+
+# Constituent parameters. The matrix is isotropic with G_m = E_m / (2 (1 + v_m)). The fiber v23 does not enter the
+# lamina properties and can not be identified.
+PARAMETERS = ('E1_f', 'E2_f', 'v12_f', 'G12_f', 'G23_f', 'alpha1_f', 'alpha2_f', 'E_m', 'v_m', 'alpha_m')
+
+# Lamina properties of the forward model
+OUTPUTS = ('E1', 'E2', 'v12', 'v23', 'G12', 'G23', 'alpha1', 'alpha2')
+
+# Parameters fitted in log space to keep them positive, the expansion coefficients are fitted linearly
+_POSITIVE = np.array([not name.startswith('alpha') for name in PARAMETERS])
+
+_UNIT = np.eye(len(PARAMETERS))
+_INDEX = {name: i for i, name in enumerate(PARAMETERS)}
+
+
+def _d(name: str) -> np.ndarray:
+    '''Gradient of a parameter with respect to all parameters.'''
+
+    return _UNIT[_INDEX[name]]
+
+
+def constituent_parameters(mat_fiber: Material, mat_matrix: Material) -> Dict[str, np.ndarray]:
+    '''
+    Reads the calibration parameters of a fiber and a matrix material.
+
+    Args:
+        mat_fiber (Material): Fiber material.
+        mat_matrix (Material): Matrix material, its first components are used as the isotropic properties.
+
+    Returns:
+        Dict[str, np.ndarray]: Parameters by name, see PARAMETERS.
+    '''
+
+    E_f, v_f, G_f = mat_fiber.get_properties()
+    alpha_f, _ = mat_fiber.get_expansion_properties()
+    E_m, v_m, _ = mat_matrix.get_properties()
+    alpha_m, _ = mat_matrix.get_expansion_properties()
+
+    values = (E_f[0], E_f[1], v_f[2], G_f[2], G_f[0], alpha_f[0], alpha_f[1], E_m[0], v_m[0], alpha_m[0])
+
+    return {name: np.asarray(value, dtype=float) for name, value in zip(PARAMETERS, values)}
+
+
+def constituent_materials(params: Dict[str, np.ndarray]) -> Tuple[Material, Material]:
+    '''
+    Builds the fiber and matrix materials of a set of calibration parameters.
+
+    Returns:
+        Tuple[Material, Material]: Fiber and matrix material.
+    '''
+
+    p = {name: np.asarray(params[name], dtype=float) for name in PARAMETERS}
+    v23_f = np.asarray(params.get('v23_f', 0.2), dtype=float)
+
+    def vector(a, b, c):
+        return np.stack(np.broadcast_arrays(a, b, c), axis=-1)
+
+    fiber = Material(
+        vector(p['E1_f'], p['E2_f'], p['E2_f']),
+        vector(v23_f, p['v12_f'], p['v12_f']),
+        vector(p['G23_f'], p['G12_f'], p['G12_f']),
+        vector(p['alpha1_f'], p['alpha2_f'], p['alpha2_f']),
+    )
+
+    G_m = p['E_m'] / (2 * (1 + p['v_m']))
+    matrix = Material(
+        vector(p['E_m'], p['E_m'], p['E_m']),
+        vector(p['v_m'], p['v_m'], p['v_m']),
+        vector(G_m, G_m, G_m),
+        vector(p['alpha_m'], p['alpha_m'], p['alpha_m']),
+    )
+
+    return fiber, matrix
+
+
+def _halpin_tsai(M_f, M_m, Vol_f, xi):
+    '''Halpin-Tsai modulus and its partial derivatives with respect to the fiber and matrix modulus.'''
+
+    r = M_f / M_m
+    n = (r - 1) / (r + xi)
+    M = M_m * (1 + xi * n * Vol_f) / (1 - n * Vol_f)
+
+    # dM/dn * dn/dr
+    dM_dr = M_m * Vol_f * (1 + xi) / (1 - n * Vol_f) ** 2 * (1 + xi) / (r + xi) ** 2
+
+    return M, dM_dr / M_m, M / M_m - dM_dr * r / M_m
+
+
+def micromechanics(
+    params: Dict[str, np.ndarray], Vol_f: np.ndarray, array_geometry: int = 1, jacobian: bool = False
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    '''
+    Lamina properties of the constituent parameters, with the analytic Jacobian.
+
+    Args:
+        params (Dict[str, np.ndarray]): Constituent parameters by name with shape (...), see PARAMETERS.
+        Vol_f (np.ndarray): Fiber volume fractions with shape (...).
+        array_geometry (int, optional): Halpin-Tsai geometric constant. 1 = Hexagonal array, 2 = Square array. Defaults to 1.
+        jacobian (bool, optional): Also return the Jacobian. Defaults to False.
+
+    Returns:
+        np.ndarray: Lamina properties with shape (..., 8), see OUTPUTS.
+        np.ndarray: Jacobian d(outputs)/d(parameters) with shape (..., 8, 10), if jacobian is True.
+    '''
+
+    p = {name: np.asarray(params[name], dtype=float) for name in PARAMETERS}
+    xi = array_geometry
+    V = np.asarray(Vol_f, dtype=float)
+    W = 1 - V
+
+    E1_f, E2_f, v12_f, G12_f, G23_f = p['E1_f'], p['E2_f'], p['v12_f'], p['G12_f'], p['G23_f']
+    a1_f, a2_f, E_m, v_m, a_m = p['alpha1_f'], p['alpha2_f'], p['E_m'], p['v_m'], p['alpha_m']
+
+    def grad(*terms):
+        '''Sums coefficient * gradient pairs into a gradient with shape (..., n_parameters).'''
+        return sum(np.asarray(c)[..., None] * g for c, g in terms)
+
+    # Isotropic matrix shear modulus
+    G_m = E_m / (2 * (1 + v_m))
+    dG_m = grad((G_m / E_m, _d('E_m')), (-G_m / (1 + v_m), _d('v_m')))
+
+    # Rule of mixtures and Halpin-Tsai moduli
+    E1 = E1_f * V + E_m * W
+    dE1 = grad((V, _d('E1_f')), (W, _d('E_m')))
+
+    E2, dE2_f, dE2_m = _halpin_tsai(E2_f, E_m, V, xi)
+    dE2 = grad((dE2_f, _d('E2_f')), (dE2_m, _d('E_m')))
+
+    G12, dG12_f, dG12_m = _halpin_tsai(G12_f, G_m, V, xi)
+    dG12 = grad((dG12_f, _d('G12_f')), (dG12_m, dG_m))
+
+    # Out of plane shear modulus, stress partitioning parameter n_23
+    g, f = G_m, G23_f
+    n = (3 - 4 * v_m + g / f) / (4 * (1 - v_m))
+    dn = grad((1 / (4 * (1 - v_m) * f), dG_m), (-g / (4 * (1 - v_m) * f ** 2), _d('G23_f')),
+              ((g / f - 1) / (4 * (1 - v_m) ** 2), _d('v_m')))
+
+    num = V + n * W
+    den = n * W + V * g / f
+    G23 = g * num / den
+    dG23 = grad(
+        (num / den * (1 - g * V / (f * den)), dG_m),
+        (g * num / den ** 2 * V * g / f ** 2, _d('G23_f')),
+        (g * W * (den - num) / den ** 2, dn),
+    )
+
+    # Poisson's ratios, rule of mixtures and transverse isotropy
+    v12 = v12_f * V + v_m * W
+    dv12 = grad((V, _d('v12_f')), (W, _d('v_m')))
+
+    v23 = E2 / (2 * G23) - 1
+    dv23 = grad((1 / (2 * G23), dE2), (-E2 / (2 * G23 ** 2), dG23))
+
+    # Thermal expansion
+    A = a1_f * E1_f * V + a_m * E_m * W
+    dA = grad((E1_f * V, _d('alpha1_f')), (a1_f * V, _d('E1_f')), (E_m * W, _d('alpha_m')), (a_m * W, _d('E_m')))
+    alpha1 = A / E1
+    dalpha1 = grad((1 / E1, dA), (-A / E1 ** 2, dE1))
+
+    high = V > 0.25
+    alpha2 = np.where(
+        high,
+        a2_f * V + (1 + v_m) * a_m * W,
+        (1 + v12_f) * a2_f * V + (1 + v_m) * a_m * W - alpha1 * v12,
+    )
+    dalpha2 = np.where(
+        high[..., None],
+        grad((V, _d('alpha2_f')), (a_m * W, _d('v_m')), ((1 + v_m) * W, _d('alpha_m'))),
+        grad(
+            ((1 + v12_f) * V, _d('alpha2_f')),
+            (a2_f * V, _d('v12_f')),
+            (a_m * W, _d('v_m')),
+            ((1 + v_m) * W, _d('alpha_m')),
+            (-v12, dalpha1),
+            (-alpha1, dv12),
+        ),
+    )
+
+    values = np.stack(np.broadcast_arrays(E1, E2, v12, v23, G12, G23, alpha1, alpha2), axis=-1)
+
+    if not jacobian:
+        return values
+
+    gradients = (dE1, dE2, dv12, dv23, dG12, dG23, dalpha1, dalpha2)
+    J = np.stack([np.broadcast_to(d, values.shape[:-1] + (len(PARAMETERS),)) for d in gradients], axis=-2)
+
+    return values, J
+
+
+@dataclass
+class CalibrationResult:
+    '''
+    Result of an inverse micromechanics fit.
+
+    Attributes:
+        params (Dict[str, np.ndarray]): Fitted constituent parameters with shape (...).
+        std (Dict[str, np.ndarray]): Standard errors of the free parameters from the linearized covariance.
+        residual (np.ndarray): Scaled residuals (prediction - measurement) / scale with shape (..., n_specimens, 8),
+                               zero for missing measurements.
+        cost (np.ndarray): Half the sum of squared scaled residuals with shape (...).
+        iterations (int): Levenberg-Marquardt iterations.
+        converged (np.ndarray): Convergence flag of every fit with shape (...).
+    '''
+
+    params: Dict[str, np.ndarray]
+    std: Dict[str, np.ndarray]
+    residual: np.ndarray
+    cost: np.ndarray
+    iterations: int
+    converged: np.ndarray
+
+    def materials(self) -> Tuple[Material, Material]:
+        '''Fitted fiber and matrix materials.'''
+
+        return constituent_materials(self.params)
+
+
+def _measurements(measured: Union[Dict[str, np.ndarray], np.ndarray], shape: tuple) -> np.ndarray:
+    '''Measured lamina properties as an array with shape (..., n_specimens, 8), NaN where not measured.'''
+
+    if not isinstance(measured, dict):
+        return np.broadcast_to(np.asarray(measured, dtype=float), shape + (len(OUTPUTS),))
+
+    unknown = set(measured) - set(OUTPUTS)
+    if unknown:
+        raise KeyError(f'Unknown lamina properties {sorted(unknown)}, expected a subset of {list(OUTPUTS)}.')
+
+    return np.stack(
+        [np.broadcast_to(np.asarray(measured.get(name, np.nan), dtype=float), shape) for name in OUTPUTS], axis=-1
+    )
+
+
+def calibrate(
+    Vol_f: np.ndarray,
+    measured: Union[Dict[str, np.ndarray], np.ndarray],
+    mat_fiber: Material,
+    mat_matrix: Material,
+    free: Sequence[str] = None,
+    array_geometry: int = 1,
+    weights: Union[Dict[str, float], np.ndarray] = None,
+    max_iter: int = 100,
+    tol: float = 1e-10,
+) -> CalibrationResult:
+    '''
+    Fits constituent properties to measured lamina properties of specimens with different fiber volume fractions.
+
+    Residuals are scaled per lamina property by the RMS of its measurements. Moduli and Poisson's ratios are fitted
+    in log space, expansion coefficients linearly. All specimens, and independent fits given by leading dimensions
+    of the measurements, are solved in one Levenberg-Marquardt loop with the analytic Jacobian of micromechanics.
+
+    Args:
+        Vol_f (np.ndarray): Fiber volume fraction of every specimen with shape (..., n_specimens).
+        measured (Dict[str, np.ndarray], np.ndarray): Measured lamina properties by name (see OUTPUTS), each with
+                                                      shape (..., n_specimens), or an array with shape
+                                                      (..., n_specimens, 8). Missing values are NaN.
+        mat_fiber (Material): Initial fiber material, also provides the fixed parameters.
+        mat_matrix (Material): Initial matrix material, also provides the fixed parameters.
+        free (Sequence[str], optional): Names of the fitted parameters. Defaults to all parameters.
+        array_geometry (int, optional): Halpin-Tsai geometric constant. Defaults to 1.
+        weights (Dict[str, float], np.ndarray, optional): Weights of the lamina properties. Defaults to 1.
+        max_iter (int, optional): Maximum number of iterations. Defaults to 100.
+        tol (float, optional): Relative tolerance on the parameter step and the cost reduction. Defaults to 1e-10.
+
+    Returns:
+        CalibrationResult: Fitted parameters and fit statistics.
+    '''
+
+    free = list(PARAMETERS if free is None else free)
+    unknown = set(free) - set(PARAMETERS)
+    if unknown:
+        raise KeyError(f'Unknown parameters {sorted(unknown)}, expected a subset of {list(PARAMETERS)}.')
+
+    Vol_f = np.asarray(Vol_f, dtype=float)
+    if isinstance(measured, dict):
+        shape = np.broadcast_shapes(Vol_f.shape, *(np.shape(value) for value in measured.values()))
+    else:
+        shape = np.broadcast_shapes(Vol_f.shape, np.shape(measured)[:-1])
+
+    data = _measurements(measured, shape)
+    batch = data.shape[:-2]
+    Vol_f = np.broadcast_to(Vol_f, data.shape[:-1])
+
+    # Residual scaling and weights, missing measurements have zero weight
+    mask = np.isfinite(data)
+    count = np.sum(mask, axis=-2, keepdims=True)
+    scale = np.sqrt(np.sum(np.where(mask, data ** 2, 0.0), axis=-2, keepdims=True) / np.maximum(count, 1))
+    scale = np.where(scale > 0, scale, 1.0)
+
+    if weights is None:
+        w = np.ones(len(OUTPUTS))
+    elif isinstance(weights, dict):
+        w = np.array([weights.get(name, 1.0) for name in OUTPUTS], dtype=float)
+    else:
+        w = np.asarray(weights, dtype=float)
+    w = np.sqrt(w) * mask / scale
+    data = np.where(mask, data, 0.0)
+
+    # Free parameters in the fitted variables x, p = p0 exp(x) or p = p0 + s x
+    initial = constituent_parameters(mat_fiber, mat_matrix)
+    cols = np.array([_INDEX[name] for name in free])
+    p0 = np.stack([np.broadcast_to(initial[name], batch) for name in PARAMETERS], axis=-1)
+    positive = _POSITIVE[cols]
+    s = np.where(positive, 1.0, np.where(p0[..., cols] != 0, np.abs(p0[..., cols]), 1e-6))
+
+    def parameters(x):
+        p = p0.copy()
+        p[..., cols] = np.where(positive, p0[..., cols] * np.exp(x), p0[..., cols] + s * x)
+        return p
+
+    def evaluate(x):
+        p = parameters(x)
+        params = {name: p[..., i, None] for i, name in enumerate(PARAMETERS)}
+        values, J = micromechanics(params, Vol_f, array_geometry, jacobian=True)
+        r = ((values - data) * w).reshape(batch + (-1,))
+        dp_dx = np.where(positive, p[..., cols], s)
+        J = (J[..., cols] * w[..., None] * dp_dx[..., None, None, :]).reshape(batch + (-1, len(cols)))
+        return r, J
+
+    x = np.zeros(batch + (len(cols),))
+    lam = np.full(batch, 1e-3)
+    converged = np.zeros(batch, dtype=bool)
+    r, J = evaluate(x)
+    cost = 0.5 * np.sum(r ** 2, axis=-1)
+
+    iteration = 0
+    for iteration in range(1, max_iter + 1):
+        A = np.swapaxes(J, -1, -2) @ J
+        g = np.einsum('...rp,...r->...p', J, r)
+
+        # Marquardt damping of the diagonal, a small floor keeps unidentifiable parameters in place
+        diag = np.diagonal(A, axis1=-2, axis2=-1)
+        damping = lam[..., None] * np.maximum(diag, 1e-12 * np.max(diag, axis=-1, keepdims=True) + 1e-300)
+        step = -np.linalg.solve(A + damping[..., None] * np.eye(len(cols)), g[..., None])[..., 0]
+        step = np.where(converged[..., None], 0.0, step)
+
+        r_new, J_new = evaluate(x + step)
+        cost_new = 0.5 * np.sum(r_new ** 2, axis=-1)
+
+        accept = np.isfinite(cost_new) & (cost_new <= cost) & ~converged
+        x = np.where(accept[..., None], x + step, x)
+        r = np.where(accept[..., None], r_new, r)
+        J = np.where(accept[..., None, None], J_new, J)
+
+        reduction = cost - np.where(accept, cost_new, cost)
+        cost = np.where(accept, cost_new, cost)
+        lam = np.where(accept, np.maximum(lam / 3, 1e-12), np.minimum(lam * 4, 1e12))
+
+        small_step = np.max(np.abs(step), axis=-1) <= tol * (1 + np.max(np.abs(x), axis=-1))
+        converged |= (accept & ((reduction <= tol * cost) | small_step)) | (cost <= 1e-30) | (lam >= 1e12)
+
+        if np.all(converged):
+            break
+
+    # Linearized standard errors of the free parameters
+    p = parameters(x)
+    n_res = np.sum(mask.reshape(batch + (-1,)), axis=-1)
+    sigma2 = 2 * cost / np.maximum(n_res - len(cols), 1)
+    A = np.swapaxes(J, -1, -2) @ J
+    cov = np.linalg.pinv(A) * sigma2[..., None, None]
+    dp_dx = np.where(positive, p[..., cols], s)
+    std_x = np.sqrt(np.maximum(np.diagonal(cov, axis1=-2, axis2=-1), 0))
+
+    return CalibrationResult(
+        params={name: p[..., i] for i, name in enumerate(PARAMETERS)},
+        std={name: dp_dx[..., k] * std_x[..., k] for k, name in enumerate(free)},
+        residual=r.reshape(data.shape),
+        cost=cost,
+        iterations=iteration,
+        converged=converged,
+    )
@@ -0,0 +1,412 @@
+'''
+Vectorized Classical Laminate Theory kernels. All functions operate on stacks of plies and broadcast over
+any leading (batch) dimensions so that many plies, layups or load cases are evaluated in one call.
+
+The kernels compute in the precision of their inputs: float32 arrays stay float32 (see precision.py), anything
+else is evaluated in float64.
+'''
+
+import numpy as np
+
+from conversion import transformation_matrix_2D, _float_array
+
+
+def reduced_stiffness(E: np.ndarray, v: np.ndarray, G: np.ndarray) -> np.ndarray:
+    '''
+    Planar (reduced) stiffness matrix of orthotropic plies.
+
+    Args:
+        E (np.ndarray): Elastic moduli [E1, E2, E3] with shape (..., 3).
+        v (np.ndarray): Poisson's ratios [v23, v13, v12] with shape (..., 3).
+        G (np.ndarray): Shear moduli [G23, G13, G12] with shape (..., 3).
+
+    Returns:
+        np.ndarray: Reduced stiffness matrices Q with shape (..., 3, 3).
+    '''
+
+    E, v, G = np.broadcast_arrays(_float_array(E), _float_array(v), _float_array(G))
+    dtype = np.result_type(E, v, G)
+
+    E1, E2 = E[..., 0], E[..., 1]
+    v12 = v[..., 2]
+    v21 = v12 * E2 / E1
+    denom = 1 - v12 * v21
+
+    Q = np.zeros(E.shape[:-1] + (3, 3), dtype=dtype)
+    Q[..., 0, 0] = E1 / denom
+    Q[..., 1, 1] = E2 / denom
+    Q[..., 0, 1] = Q[..., 1, 0] = v12 * E2 / denom
+    Q[..., 2, 2] = G[..., 2]
+
+    return Q
+
+
+def transformed_reduced_stiffness(Q: np.ndarray, theta_rad: np.ndarray) -> np.ndarray:
+    '''
+    Rotates reduced stiffness matrices into the laminate axes, Q_bar = T^-1 Q T^-T.
+
+    Args:
+        Q (np.ndarray): Reduced stiffness matrices with shape (..., 3, 3).
+        theta_rad (np.ndarray): Ply orientations in radians broadcastable with Q[..., 0, 0].
+
+    Returns:
+        np.ndarray: Transformed reduced stiffness matrices with shape (..., 3, 3).
+    '''
+
+    # The inverse of the stress transformation is the transformation by the opposite angle
+    T_inv = transformation_matrix_2D(-_float_array(theta_rad).astype(np.result_type(Q, np.float32), copy=False))
+
+    return T_inv @ Q @ np.swapaxes(T_inv, -1, -2)
+
+
+def transformed_shear_stiffness(G: np.ndarray, theta_rad: np.ndarray) -> np.ndarray:
+    '''
+    Transverse shear stiffness [[C44, C45], [C45, C55]] of orthotropic plies rotated into the laminate axes.
+
+    Args:
+        G (np.ndarray): Shear moduli [G23, G13, G12] with shape (..., 3).
+        theta_rad (np.ndarray): Ply orientations in radians broadcastable with G[..., 0].
+
+    Returns:
+        np.ndarray: Transverse shear stiffness matrices with shape (..., 2, 2).
+    '''
+
+    G = _float_array(G)
+    theta_rad = _float_array(theta_rad)
+
+    c, s = np.cos(theta_rad), np.sin(theta_rad)
+    G23, G13 = G[..., 0], G[..., 1]
+
+    Q = np.empty(np.broadcast_shapes(G23.shape, theta_rad.shape) + (2, 2), dtype=np.result_type(G, theta_rad))
+    Q[..., 0, 0] = G23 * c ** 2 + G13 * s ** 2
+    Q[..., 1, 1] = G23 * s ** 2 + G13 * c ** 2
+    Q[..., 0, 1] = Q[..., 1, 0] = (G23 - G13) * c * s
+
+    return Q
+
+
+def ply_heights(thickness: np.ndarray) -> np.ndarray:
+    '''
+    Ply interface heights measured from the laminate mid-plane.
+
+    Args:
+        thickness (np.ndarray): Ply thicknesses with shape (..., n_plies).
+
+    Returns:
+        np.ndarray: Interface heights with shape (..., n_plies + 1).
+    '''
+
+    thickness = _float_array(thickness)
+
+    z = np.zeros(thickness.shape[:-1] + (thickness.shape[-1] + 1,), dtype=thickness.dtype)
+    np.cumsum(thickness, axis=-1, out=z[..., 1:])
+    z -= 0.5 * z[..., -1:]
+
+    return z
+
+
+def ABD_matrix(
+    Q_bar: np.ndarray, z: np.ndarray, Q_shear: np.ndarray = None, shear_correction: float = 5 / 6
+) -> np.ndarray:
+    '''
+    Assembles the laminate stiffness matrix from the ply stiffnesses and interface heights. When the transverse
+    shear stiffnesses of the plies are given, the first-order shear deformation (FSDT) matrix ABDH is returned,
+
+        [N, M, Q] = [[A, B, 0], [B, D, 0], [0, 0, H]] [e0, k, g],   H = k_s sum (z_k - z_k-1) [[C44, C45], [C45, C55]]
+
+    with the transverse shear resultants Q = [Qy, Qx] and strains g = [g_yz, g_xz] in Voigt (23, 13) order.
+
+    Args:
+        Q_bar (np.ndarray): Transformed reduced ply stiffnesses with shape (..., n_plies, 3, 3).
+        z (np.ndarray): Interface heights with shape (..., n_plies + 1).
+        Q_shear (np.ndarray, optional): Transformed transverse shear ply stiffnesses [[C44, C45], [C45, C55]] with
+                                        shape (..., n_plies, 2, 2). Defaults to None.
+        shear_correction (float, optional): Shear correction factor k_s applied to H. Defaults to 5/6.
+
+    Returns:
+        np.ndarray: ABD matrices with shape (..., 6, 6), or ABDH matrices with shape (..., 8, 8).
+    '''
+
+    z = _float_array(z)
+    z0, z1 = z[..., :-1], z[..., 1:]
+
+    # Through-thickness integrals of 1, z and z^2 for every ply
+    h = np.stack([z1 - z0, (z1 ** 2 - z0 ** 2) / 2, (z1 ** 3 - z0 ** 3) / 3], axis=-2)
+
+    A, B, D = np.moveaxis(np.einsum('...mk,...kij->...mij', h, Q_bar), -3, 0)
+
+    n = 6 if Q_shear is None else 8
+    ABD = np.zeros(A.shape[:-2] + (n, n), dtype=A.dtype)
+    ABD[..., :3, :3] = A
+    ABD[..., :3, 3:6] = B
+    ABD[..., 3:6, :3] = B
+    ABD[..., 3:6, 3:6] = D
+
+    if Q_shear is not None:
+        ABD[..., 6:, 6:] = shear_correction * np.einsum('...k,...kij->...ij', h[..., 0, :], Q_shear)
+
+    return ABD
+
+
+def is_symmetric(ABD: np.ndarray, rtol: float = 1e-10) -> np.ndarray:
+    '''
+    Checks for a vanishing coupling matrix B, relative to the geometric mean of the A and D magnitudes.
+
+    Args:
+        ABD (np.ndarray): ABD matrices with shape (..., 6, 6).
+        rtol (float, optional): Relative tolerance. Defaults to 1e-10.
+
+    Returns:
+        np.ndarray: True where B = 0.
+    '''
+
+    A = np.abs(ABD[..., :3, :3]).max(axis=(-1, -2))
+    B = np.abs(ABD[..., :3, 3:]).max(axis=(-1, -2))
+    D = np.abs(ABD[..., 3:, 3:]).max(axis=(-1, -2))
+
+    return B <= rtol * np.sqrt(A * D)
+
+
+def is_balanced(ABD: np.ndarray, rtol: float = 1e-10) -> np.ndarray:
+    '''
+    Checks for vanishing extension-shear coupling terms A16 and A26.
+
+    Args:
+        ABD (np.ndarray): ABD matrices with shape (..., 6, 6).
+        rtol (float, optional): Relative tolerance. Defaults to 1e-10.
+
+    Returns:
+        np.ndarray: True where A16 = A26 = 0.
+    '''
+
+    A = np.abs(ABD[..., :3, :3])
+    scale = A.max(axis=(-1, -2))
+
+    return np.maximum(A[..., 0, 2], A[..., 1, 2]) <= rtol * scale
+
+
+def solve_ABD(
+    ABD: np.ndarray, NM: np.ndarray, symmetric: bool = False, balanced: bool = False, refine: int = 0
+) -> np.ndarray:
+    '''
+    Solves the laminate constitutive equations for the mid-plane strains and curvatures.
+
+    When the laminate is symmetric (B = 0) the membrane and bending problems decouple into two 3x3
+    systems. When it is also balanced (A16 = A26 = 0) the membrane shear strain decouples further.
+
+    Single precision systems are equilibrated (scaled to a unit diagonal) before they are factorized, since the
+    membrane and bending terms differ by many orders of magnitude. They are solved with a Cholesky factorization
+    vectorized over the batch, computed once per ABD matrix and shared by all load cases and refinement steps, with
+    separate membrane and bending blocks when symmetric. With refine > 0 the single precision solution is improved
+    by iterative refinement with float64 residuals of the given ABD, so a float64 ABD is solved to nearly float64
+    accuracy. The result is then float64.
+
+    Args:
+        ABD (np.ndarray): ABD matrices with shape (..., 6, 6).
+        NM (np.ndarray): Force and moment resultants with shape (..., 6), broadcastable against ABD.
+        symmetric (bool, optional): Use the decoupled membrane/bending solve. Defaults to False.
+        balanced (bool, optional): Decouple the membrane shear strain, requires symmetric. Defaults to False.
+        refine (int, optional): Float64 refinement steps of a single precision solve. Defaults to 0 (solve in the
+                                precision of ABD).
+
+    Returns:
+        np.ndarray: Mid-plane strains and curvatures [e_x, e_y, g_xy, k_x, k_y, k_xy] with shape (..., 6).
+    '''
+
+    ABD = _float_array(ABD)
+    NM = _float_array(NM)
+
+    if ABD.dtype == np.float32 or refine:
+        blocks = (slice(0, 3), slice(3, 6)) if symmetric else (slice(0, 6),)
+        factor = _cholesky_single(ABD.astype(np.float32, copy=False), blocks)
+        strain = _cholesky_solve(factor, NM.astype(np.float32, copy=False))
+
+        if refine:
+            NM_64 = NM.astype(np.float64, copy=False)
+            strain = strain.astype(np.float64)
+
+            for _ in range(refine):
+                residual = NM_64 - (ABD @ strain[..., None])[..., 0]
+                strain += _cholesky_solve(factor, residual.astype(np.float32))
+
+        return strain
+
+    if not symmetric:
+        return _solve(ABD, NM)
+
+    shape = np.broadcast_shapes(ABD.shape[:-2], NM.shape[:-1])
+    strain = np.empty(shape + (6,), dtype=np.result_type(ABD, NM))
+
+    A = ABD[..., :3, :3]
+
+    if balanced:
+        strain[..., :2] = _solve(A[..., :2, :2], NM[..., :2])
+        strain[..., 2] = NM[..., 2] / A[..., 2, 2]
+    else:
+        strain[..., :3] = _solve(A, NM[..., :3])
+
+    strain[..., 3:] = _solve(ABD[..., 3:, 3:], NM[..., 3:])
+
+    return strain
+
+
+def _cholesky_single(M: np.ndarray, blocks: tuple) -> tuple:
+    '''
+    Single precision Cholesky factors (S M S) = L L^T of symmetric positive definite matrices with symmetric
+    diagonal scaling S = diag(M)^-1/2, one factor per diagonal block. The factors are lists of the entries of L,
+    so the factorization loops over the few matrix entries and every operation is vectorized over the batch.
+    '''
+
+    scale = 1 / np.sqrt(np.abs(np.diagonal(M, axis1=-2, axis2=-1)))
+
+    factors = []
+    for block in blocks:
+        rows = list(range(M.shape[-1]))[block]
+        L = [[None] * len(rows) for _ in rows]
+
+        for j, col in enumerate(rows):
+            for i in range(j, len(rows)):
+                a = M[..., rows[i], col] * (scale[..., rows[i]] * scale[..., col])
+                a = a - sum(L[i][k] * L[j][k] for k in range(j))
+                L[i][j] = np.sqrt(a) if i == j else a / L[j][j]
+
+        factors.append((rows, L))
+
+    return scale, factors
+
+
+def _cholesky_solve(factor: tuple, b: np.ndarray) -> np.ndarray:
+    '''Solves M x = b with the factors of _cholesky_single, b with shape (..., n) broadcastable against M.'''
+
+    scale, factors = factor
+    b = b * scale
+    x = np.empty_like(b)
+
+    for rows, L in factors:
+        y = [b[..., row] for row in rows]
+        n = len(rows)
+
+        # Forward substitution L y = S b, then back substitution L^T y = y
+        for i in range(n):
+            y[i] = (y[i] - sum(L[i][k] * y[k] for k in range(i))) / L[i][i]
+        for i in reversed(range(n)):
+            y[i] = (y[i] - sum(L[k][i] * y[k] for k in range(i + 1, n))) / L[i][i]
+
+        for row, values in zip(rows, y):
+            x[..., row] = values
+
+    return x * scale
+
+
+def solve_ABDH(
+    ABDH: np.ndarray, NMQ: np.ndarray, symmetric: bool = False, balanced: bool = False
+) -> np.ndarray:
+    '''
+    Solves the first-order shear deformation laminate equations. The transverse shear problem is always
+    decoupled from the membrane and bending problem, which is solved with solve_ABD.
+
+    Args:
+        ABDH (np.ndarray): ABDH matrices with shape (..., 8, 8).
+        NMQ (np.ndarray): Resultants [Nx, Ny, Nxy, Mx, My, Mxy, Qy, Qx] with shape (..., 8), broadcastable against ABDH.
+        symmetric (bool, optional): Use the decoupled membrane/bending solve. Defaults to False.
+        balanced (bool, optional): Decouple the membrane shear strain, requires symmetric. Defaults to False.
+
+    Returns:
+        np.ndarray: Mid-plane strains, curvatures and transverse shear strains [..., g_yz, g_xz] with shape (..., 8).
+    '''
+
+    ABDH = np.asarray(ABDH, dtype=float)
+    NMQ = np.asarray(NMQ, dtype=float)
+
+    shape = np.broadcast_shapes(ABDH.shape[:-2], NMQ.shape[:-1])
+    strain = np.empty(shape + (8,))
+
+    strain[..., :6] = solve_ABD(ABDH[..., :6, :6], NMQ[..., :6], symmetric, balanced)
+    strain[..., 6:] = _solve(ABDH[..., 6:, 6:], NMQ[..., 6:])
+
+    return strain
+
+
+def transverse_shear_stress(
+    ABD: np.ndarray, Q_bar: np.ndarray, z: np.ndarray, Q: np.ndarray, n_points: int = 5
+):
+    '''
+    Through-thickness transverse shear stress profiles recovered from the in-plane stresses by integrating the
+    equilibrium equations
+
+        t_xz(z) = -int (s_x,x + t_xy,y) dz,    t_yz(z) = -int (t_xy,x + s_y,y) dz
+
+    from the bottom surface. The moment gradients follow from the shear resultants assuming Mx,x = Qx, My,y = Qy
+    and vanishing twisting moment and membrane force gradients. The stresses are linear in z within each ply so
+    the integrals are evaluated exactly for all plies and load cases at once. The profiles vanish at both
+    surfaces and integrate to the applied shear resultants.
+
+    Args:
+        ABD (np.ndarray): ABD matrix with shape (6, 6).
+        Q_bar (np.ndarray): Transformed reduced ply stiffnesses with shape (n_plies, 3, 3).
+        z (np.ndarray): Interface heights with shape (n_plies + 1,).
+        Q (np.ndarray): Transverse shear resultants [Qy, Qx] with shape (..., 2).
+        n_points (int, optional): Evaluation points per ply, including both ply faces. Defaults to 5.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Heights with shape (n_plies, n_points) and the stresses [t_yz, t_xz] with
+                                       shape (..., n_plies, n_points, 2).
+    '''
+
+    Q = np.asarray(Q, dtype=float)
+    z = np.asarray(z, dtype=float)
+
+    # Mid-plane strain and curvature gradients for the unit moment gradients Mx,x = 1 and My,y = 1
+    unit = np.zeros((6, 2))
+    unit[3, 0] = unit[4, 1] = 1
+    de = np.linalg.solve(ABD[:6, :6], unit)
+
+    # In-plane stress gradients a + b z of every ply with shape (n_plies, 3, [d/dx, d/dy])
+    a = Q_bar @ de[:3]
+    b = Q_bar @ de[3:]
+
+    # Integrands per unit [Qy, Qx]: t_xz from t_xy,y and s_x,x, t_yz from s_y,y and t_xy,x
+    a_xz = np.stack([a[:, 2, 1], a[:, 0, 0]], axis=-1)
+    b_xz = np.stack([b[:, 2, 1], b[:, 0, 0]], axis=-1)
+    a_yz = np.stack([a[:, 1, 1], a[:, 2, 0]], axis=-1)
+    b_yz = np.stack([b[:, 1, 1], b[:, 2, 0]], axis=-1)
+
+    # Integrals from the bottom face of each ply to the evaluation points
+    z0, z1 = z[:-1], z[1:]
+    zp = z0[:, None] + (z1 - z0)[:, None] * np.linspace(0, 1, n_points)
+
+    dz = (zp - z0[:, None])[..., None]
+    dz2 = (zp ** 2 - z0[:, None] ** 2)[..., None] / 2
+
+    ply_xz = a_xz[:, None] * dz + b_xz[:, None] * dz2
+    ply_yz = a_yz[:, None] * dz + b_yz[:, None] * dz2
+
+    # Accumulated contribution of the plies below
+    below_xz = np.cumsum(ply_xz[:, -1], axis=0) - ply_xz[:, -1]
+    below_yz = np.cumsum(ply_yz[:, -1], axis=0) - ply_yz[:, -1]
+
+    # Unit profiles with shape (n_plies, n_points, [t_yz, t_xz], [Qy, Qx])
+    unit_profiles = -np.stack([ply_yz + below_yz[:, None], ply_xz + below_xz[:, None]], axis=-2)
+
+    tau = np.einsum('pnij,...j->...pni', unit_profiles, Q)
+
+    return zp, tau
+
+
+def _solve(M: np.ndarray, b: np.ndarray) -> np.ndarray:
+    '''
+    Batched linear solve of M x = b with broadcasting. A single matrix is factorized once for all
+    right hand sides.
+    '''
+
+    n = M.shape[-1]
+
+    if M.ndim == 2:
+        x = np.linalg.solve(M, b.reshape(-1, n).T).T
+        return x.reshape(b.shape)
+
+    shape = np.broadcast_shapes(M.shape[:-2], b.shape[:-1])
+    M = np.broadcast_to(M, shape + (n, n))
+    b = np.broadcast_to(b, shape + (n,))
+
+    return np.linalg.solve(M, b[..., None])[..., 0]
@@ -1,4 +1,5 @@
 import numpy as np
+from typing import Union
 from material import Material
 
 
@@ -8,6 +9,8 @@ class CompositeMaterial:
     equivalent composite from the matrix and fiber components
     '''
 
+    __slots__ = ()
+
     def _halpin_tsai(
         self, M_f: float, M_m: float, V_f: float, array_geometry: int = 1
     ) -> float:
@@ -239,3 +242,75 @@ class CompositeMaterial:
 
         # Return the created composite
         return Material(_E, _v, _G, _alpha)
+
+
+def composite_properties(
+    E_f: np.ndarray,
+    v_f: np.ndarray,
+    G_f: np.ndarray,
+    alpha_f: np.ndarray,
+    E_m: np.ndarray,
+    v_m: np.ndarray,
+    G_m: np.ndarray,
+    alpha_m: np.ndarray,
+    Vol_f: np.ndarray,
+    array_geometry: int = 1,
+) -> Union[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Vectorized form of CompositeMaterial._create_composite. Constituent properties are arrays with a
+    trailing dimension of 3 in the [23, 13, 12] (or [1, 2, 3]) convention of Material and broadcast
+    over any leading (sample) dimensions.
+
+    Args:
+        E_f, v_f, G_f, alpha_f (np.ndarray): Fiber properties with shape (..., 3).
+        E_m, v_m, G_m, alpha_m (np.ndarray): Matrix properties with shape (..., 3).
+        Vol_f (np.ndarray): Fiber volume fraction with shape (...).
+        array_geometry (int, optional): Halpin-Tsai geometric constant. 1 = Hexagonal array, 2 = Square array. Defaults to 1.
+
+    Returns:
+        E, v, G, alpha (np.ndarray): Effective composite properties with shape (..., 3).
+    '''
+
+    E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m = (
+        np.asarray(p, dtype=float)
+        for p in (E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m)
+    )
+
+    xi = array_geometry
+    Vol_f = np.asarray(Vol_f, dtype=float)
+    Vol_m = 1 - Vol_f
+
+    def halpin_tsai(M_f, M_m):
+        _n = (M_f / M_m - 1) / (M_f / M_m + xi)
+        return M_m * (1 + xi * _n * Vol_f) / (1 - _n * Vol_f)
+
+    # Elastic modulus, rule of mixtures and Halpin-Tsai
+    E_1 = E_f[..., 0] * Vol_f + E_m[..., 0] * Vol_m
+    E_2 = halpin_tsai(E_f[..., 1], E_m[..., 1])
+    E = np.stack(np.broadcast_arrays(E_1, E_2, E_2), axis=-1)
+
+    # Shear modulus
+    G_12 = halpin_tsai(G_f[..., 1], G_m[..., 1])
+
+    v_m_23, G_m_23, G_f_23 = v_m[..., 0], G_m[..., 0], G_f[..., 0]
+    n_23 = (3 - 4 * v_m_23 + G_m_23 / G_f_23) / (4 * (1 - v_m_23))
+    G_23 = G_m_23 * (Vol_f + n_23 * Vol_m) / (n_23 * Vol_m + Vol_f * (G_m_23 / G_f_23))
+    G = np.stack(np.broadcast_arrays(G_23, G_12, G_12), axis=-1)
+
+    # Poisson's ratio, rule of mixtures with the 23 plane from transverse isotropy
+    v = v_f * Vol_f[..., None] + v_m * Vol_m[..., None]
+    v = np.broadcast_to(v, E.shape).copy()
+    v[..., 0] = E[..., 2] / (2 * G[..., 0]) - 1
+
+    # Thermal expansion
+    alpha_1 = (alpha_f[..., 0] * E_f[..., 0] * Vol_f + alpha_m[..., 0] * E_m[..., 0] * Vol_m) / E_1
+    alpha_2 = np.where(
+        Vol_f > 0.25,
+        alpha_f[..., 1] * Vol_f + (1 + v_m[..., 1]) * alpha_m[..., 1] * Vol_m,
+        (1 + v_f[..., 1]) * alpha_f[..., 1] * Vol_f
+        + (1 + v_m[..., 1]) * alpha_m[..., 1] * Vol_m
+        - alpha_1 * v[..., 2],
+    )
+    alpha = np.stack(np.broadcast_arrays(alpha_1, alpha_2, alpha_2), axis=-1)
+
+    return E, v, G, alpha
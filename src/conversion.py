@@ -6,6 +6,10 @@ from material import Material
 
 @dataclass
 class ConversionMatrices:
+    __slots__ = (
+        'mat', 'S', 'S_reduced', 'S_bar', 'S_bar_reduced', 'C', 'C_reduced', 'Q_bar', 'Q_bar_reduced', 'T_2D', 'T_3D'
+    )
+
     S: np.ndarray
     S_reduced: np.ndarray
     S_bar: np.ndarray
@@ -119,36 +123,11 @@ class ConversionMatrices:
 
     def transformation_matrix_2D(self, theta_rad: float = 0) -> np.ndarray:
 
-        c = np.cos(theta_rad)
-        s = np.sin(theta_rad)
-
-        T = np.array(
-            [
-                [c ** 2, s ** 2, 2 * c * s],
-                [s ** 2, c ** 2, -2 * c * s],
-                [-c * s, c * s, c ** 2 - s ** 2],
-            ]
-        )
-
-        return T
+        return transformation_matrix_2D(theta_rad)
 
     def transformation_matrix_3D(self, theta_rad: float = 0) -> np.ndarray:
 
-        c = np.cos(theta_rad)
-        s = np.sin(theta_rad)
-
-        T = np.array(
-            [
-                [c ** 2, s ** 2, 0, 0, 0, 2 * c * s],
-                [s ** 2, c ** 2, 0, 0, 0, -2 * c * s],
-                [0, 0, 1, 0, 0, 0],
-                [0, 0, 0, c, s, 0],
-                [0, 0, 0, -s, c, 0],
-                [-c * s, c * s, 0, 0, 0, c ** 2 - s ** 2],
-            ]
-        )
-
-        return T
+        return transformation_matrix_3D(theta_rad)
 
     def _transformed_compliance_matrix_2D(self, theta_rad: float = 0) -> np.ndarray:
         '''
@@ -168,85 +147,234 @@ class ConversionMatrices:
         return S_bar_reduced
 
 
+# Voigt ordering [11, 22, 33, 23, 13, 12] as (row, column) index maps into a 3x3 tensor
+_VOIGT_ROW = np.array([0, 1, 2, 1, 0, 0])
+_VOIGT_COL = np.array([0, 1, 2, 2, 2, 1])
+
+# Voigt position of every tensor component
+_TENSOR_INDEX = np.array([[0, 5, 4], [5, 1, 3], [4, 3, 2]])
+
+# Scale factors between tensor (epsilon) and engineering (gamma) shear strains
+_GAMMA_TENSOR = np.array([[1.0, 2.0, 2.0], [2.0, 1.0, 2.0], [2.0, 2.0, 1.0]])
+_EPSILON_TENSOR = 1 / _GAMMA_TENSOR
+_GAMMA_VEC = np.array([1.0, 1.0, 1.0, 2.0, 2.0, 2.0])
+_EPSILON_VEC = 1 / _GAMMA_VEC
+
+
+def _float_array(values) -> np.ndarray:
+    '''Array of floating point values, single precision input stays single precision.'''
+
+    values = np.asarray(values)
+
+    return values if values.dtype in (np.float32, np.float64) else values.astype(float)
+
+
+def _axis_matrix(theta_rad, rows) -> np.ndarray:
+    '''
+    Builds (..., 3, 3) matrices from rows of the form (kind, ...) where every entry is 0, 1, 'c', 's' or '-s'.
+    '''
+
+    theta_rad = np.asarray(theta_rad, dtype=float)
+    c, s = np.cos(theta_rad), np.sin(theta_rad)
+    values = {'c': c, 's': s, '-s': -s, 0: 0.0, 1: 1.0}
+
+    M = np.empty(theta_rad.shape + (3, 3))
+    for i, row in enumerate(rows):
+        for j, entry in enumerate(row):
+            M[..., i, j] = values[entry]
+
+    return M
+
+
+def R_x(theta_rad):
+    '''Rotation matrix about the x-axis'''
+    return _axis_matrix(theta_rad, ((1, 0, 0), (0, 'c', '-s'), (0, 's', 'c')))
+
+
+def R_y(theta_rad):
+    '''Rotation matrix about the y-axis'''
+    return _axis_matrix(theta_rad, (('c', 0, 's'), (0, 1, 0), ('-s', 0, 'c')))
+
+
+def R_z(theta_rad):
+    '''Rotation matrix about the z-axis'''
+    return _axis_matrix(theta_rad, (('c', '-s', 0), ('s', 'c', 0), (0, 0, 1)))
+
+
+def T_x(theta_rad):
+    '''Transformation matrix about the x-axis'''
+    return _axis_matrix(theta_rad, ((1, 0, 0), (0, 'c', 's'), (0, '-s', 'c')))
+
+
+def T_y(theta_rad):
+    '''Transformation matrix about the y-axis'''
+    return _axis_matrix(theta_rad, (('c', 0, '-s'), (0, 1, 0), ('s', 0, 'c')))
+
+
 def T_z(theta_rad):
     '''Transformation matrix about the z-axis'''
-    return np.array(
-        [
-            [np.cos(theta_rad), np.cos(np.pi / 2 - theta_rad), 0],
-            [np.cos(theta_rad + np.pi / 2), np.cos(theta_rad), 0],
-            [0, 0, 1],
-        ]
-    )
+    return _axis_matrix(theta_rad, (('c', 's', 0), ('-s', 'c', 0), (0, 0, 1)))
+
+
+def transformation_matrix_2D(theta_rad) -> np.ndarray:
+    '''
+    Planar stress transformation matrices [s11, s22, s12] for an array of orientations about the z-axis.
+
+    Args:
+        theta_rad (np.ndarray): Orientations in radians with any shape (...).
+
+    Returns:
+        np.ndarray: Transformation matrices with shape (..., 3, 3).
+    '''
+
+    theta_rad = _float_array(theta_rad)
+
+    c = np.cos(theta_rad)
+    s = np.sin(theta_rad)
+    cc, ss, cs = c * c, s * s, c * s
+
+    T = np.empty(theta_rad.shape + (3, 3), dtype=theta_rad.dtype)
+    T[..., 0, 0] = cc
+    T[..., 0, 1] = ss
+    T[..., 0, 2] = 2 * cs
+    T[..., 1, 0] = ss
+    T[..., 1, 1] = cc
+    T[..., 1, 2] = -2 * cs
+    T[..., 2, 0] = -cs
+    T[..., 2, 1] = cs
+    T[..., 2, 2] = cc - ss
+
+    return T
+
+
+def transformation_matrix_3D(theta_rad) -> np.ndarray:
+    '''
+    Voigt stress transformation matrices [s11, s22, s33, s23, s13, s12] for an array of orientations about the z-axis.
+
+    Args:
+        theta_rad (np.ndarray): Orientations in radians with any shape (...).
+
+    Returns:
+        np.ndarray: Transformation matrices with shape (..., 6, 6).
+    '''
+
+    theta_rad = _float_array(theta_rad)
+
+    c = np.cos(theta_rad)
+    s = np.sin(theta_rad)
+
+    T = np.zeros(theta_rad.shape + (6, 6), dtype=theta_rad.dtype)
+
+    # In-plane components share the planar transformation
+    T[..., np.array([0, 1, 5])[:, None], np.array([0, 1, 5])] = transformation_matrix_2D(theta_rad)
+    T[..., 2, 2] = 1
+    T[..., 3, 3] = c
+    T[..., 3, 4] = s
+    T[..., 4, 3] = -s
+    T[..., 4, 4] = c
+
+    return T
 
 
 def create_tensor_3D(_11, _22, _33, _23=0, _13=0, _12=0):
-    """Create a 3D tensor given the x, y, z, xy, xz, yz values"""
-    return np.array([[_11, _12, _13], [_12, _22, _23], [_13, _23, _33]])
+    """Create a 3D tensor given the x, y, z, yz, xz, xy values. Array arguments return a stack of tensors (..., 3, 3)."""
+    return vec_to_tensor(np.stack(np.broadcast_arrays(_11, _22, _33, _23, _13, _12), axis=-1))
+
+
+def tensor_to_vec(tensor, out=None):
+    '''
+    Create a Voigt vector [11, 22, 33, 23, 13, 12] from a given 3D tensor or a stack of tensors.
+
+    Args:
+        tensor (np.ndarray): Tensor(s) with shape (..., 3, 3).
+        out (np.ndarray, optional): Output array with shape (..., 6). Defaults to None.
+
+    Returns:
+        np.ndarray: Voigt vector(s) with shape (..., 6).
+    '''
+    tensor = np.asarray(tensor)
 
+    if out is None:
+        return tensor[..., _VOIGT_ROW, _VOIGT_COL]
 
-def tensor_to_vec(tensor):
-    '''Create a vector from a given 3D tensor'''
-    return np.array([*np.diag(tensor), tensor[1, 2], tensor[0, 2], tensor[0, 1]])
+    out[...] = tensor[..., _VOIGT_ROW, _VOIGT_COL]
+    return out
 
 
-def to_gamma(strain_tensor) -> np.ndarray:
+def vec_to_tensor(vec, out=None):
+    '''
+    Create a symmetric 3D tensor from a Voigt vector [11, 22, 33, 23, 13, 12] or a stack of vectors.
+
+    Args:
+        vec (np.ndarray): Voigt vector(s) with shape (..., 6).
+        out (np.ndarray, optional): Output array with shape (..., 3, 3). Defaults to None.
+
+    Returns:
+        np.ndarray: Tensor(s) with shape (..., 3, 3).
+    '''
+    vec = np.asarray(vec)
+
+    if out is None:
+        return vec[..., _TENSOR_INDEX]
+
+    out[...] = vec[..., _TENSOR_INDEX]
+    return out
+
+
+def to_gamma(strain_tensor, out=None) -> np.ndarray:
     '''
     Converts a given strain tensor into a matrix with shear strain in terms of gamma.
 
     Parameters:
-        strain_tensor (np.ndarray): Strain tensor in terms of epsilon.
+        strain_tensor (np.ndarray): Strain tensor(s) in terms of epsilon with shape (..., 3, 3), or Voigt vector(s) with shape (..., 6).
+        out (np.ndarray, optional): Output array with the shape of strain_tensor. Defaults to None.
 
     Returns:
         gamma_matrix (np.ndarray):  Strain matrix in terms of gamma.
     '''
-    _strain_tensor = strain_tensor.copy()
-
-    _gamma_matrix = _strain_tensor + (_strain_tensor - _strain_tensor * np.eye(3))
+    strain_tensor = np.asarray(strain_tensor)
+    scale = _GAMMA_VEC if strain_tensor.shape[-1] == 6 else _GAMMA_TENSOR
 
-    return _gamma_matrix
+    return np.multiply(strain_tensor, scale, out=out)
 
 
-def to_epsilon(strain_matrix) -> np.ndarray:
+def to_epsilon(strain_matrix, out=None) -> np.ndarray:
     '''
-    Converts a given strain matrix into a strain tensor with shear strain in terms of gamma.
+    Converts a given strain matrix into a strain tensor with shear strain in terms of epsilon.
 
     Parameters:
-        strain_matrix (np.ndarray): Strain matrix in terms of gamma.
+        strain_matrix (np.ndarray): Strain matrix(es) in terms of gamma with shape (..., 3, 3), or Voigt vector(s) with shape (..., 6).
+        out (np.ndarray, optional): Output array with the shape of strain_matrix. Defaults to None.
 
     Returns:
         epsilon_tensor (np.ndarray):  Strain tensor in terms of epsilon.
     '''
-    _strain_matrix = strain_matrix.copy()
+    strain_matrix = np.asarray(strain_matrix)
+    scale = _EPSILON_VEC if strain_matrix.shape[-1] == 6 else _EPSILON_TENSOR
 
-    _epsilon_tensor = _strain_matrix * np.eye(3) + 0.5 * (
-        _strain_matrix - _strain_matrix * np.eye(3)
-    )
-
-    return _epsilon_tensor
+    return np.multiply(strain_matrix, scale, out=out)
 
 
-def transformation_3D(tensor, rot_matrix, theta, theta_radians=False):
+def transformation_3D(tensor, rot_matrix, theta, theta_radians=False, out=None):
     '''
         Return the transformed 3D tensor. Shear outputs are in terms of epsilon.
 
             Parameters:
-                tensor (numpy.ndarray):        Cauchy tensor
-                rot_matrix (numpy.ndarray):    Rotation matrix
-                theta (float):                 Angle of rotation
-                radians (bool):                True if theta is given in radians 
+                tensor (numpy.ndarray):        Cauchy tensor(s) with shape (..., 3, 3)
+                rot_matrix (callable):         Rotation matrix function, e.g. T_z, returning (..., 3, 3) for an array of angles
+                theta (float, numpy.ndarray):  Angle(s) of rotation broadcastable against the tensor stack
+                radians (bool):                True if theta is given in radians
+                out (numpy.ndarray):           Output array with shape (..., 3, 3), optional
 
             Returns:
                 prime (numpy.ndarray):   Transformed matrix
         '''
 
-    _tensor = tensor.copy()
-
     # Convert to radians and evaluate the rotation matrix
-    _theta = theta if theta_radians else theta * np.pi / 180
+    _theta = theta if theta_radians else np.asarray(theta) * np.pi / 180
     _R = rot_matrix(_theta)
 
     # Transformation equation
-    _prime = _R.dot(_tensor).dot(_R.T)
-
-    return _prime
+    _prime = np.matmul(_R, tensor)
 
+    return np.matmul(_prime, np.swapaxes(_R, -1, -2), out=out)
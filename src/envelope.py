@@ -0,0 +1,443 @@
+'''
+Failure envelopes of laminates in the space of two or three force and moment resultants.
+
+Every envelope point lies on a ray from the origin of the load space. With linear CLT the ply stresses scale with
+the load, so the first-ply failure load along a ray is the closed-form strength ratio of the ply stresses of the
+unit load. Envelopes of nonlinear or progressive analyses use radial bisection of a failure predicate instead. In
+both cases all rays of a refinement level are evaluated at once.
+
+The rays are refined adaptively where the envelope bends. An interval between two rays (2D) or a triangle of rays
+(3D) is split when the envelope point on the bisecting ray deviates from the straight chord between its neighbours
+by more than the relative tolerance.
+'''
+
+import numpy as np
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Sequence, Tuple, Union
+
+from failure import PlyStrength, strength_ratio
+
+COMPONENTS = ('Nx', 'Ny', 'Nxy', 'Mx', 'My', 'Mxy')
+
+
+@dataclass
+class FailureEnvelope:
+    '''
+    Failure envelope sampled on rays of the load space.
+
+    Attributes:
+        components (Tuple[str, ...]): Load resultants spanning the envelope, see COMPONENTS.
+        directions (np.ndarray): Unit ray directions in the scaled load space with shape (n_rays, n_components),
+                                 ordered by angle in 2D.
+        radius (np.ndarray): Failure load factor of every ray in the scaled load space with shape (n_rays,).
+        scale (np.ndarray): Load scale of every component with shape (n_components,).
+        critical_ply (np.ndarray): Index of the first failing ply of every ray, -1 for failure predicates.
+        triangles (np.ndarray): Outward oriented triangles of the 3D envelope with shape (n_triangles, 3), None
+                                in 2D.
+        evaluations (int): Number of ray evaluations, including the refinement probes.
+    '''
+
+    components: Tuple[str, ...]
+    directions: np.ndarray
+    radius: np.ndarray
+    scale: np.ndarray
+    critical_ply: np.ndarray
+    triangles: np.ndarray
+    evaluations: int
+
+    @property
+    def points(self) -> np.ndarray:
+        '''Envelope points in the units of the load resultants with shape (n_rays, n_components).'''
+
+        return self.radius[:, None] * self.directions * self.scale
+
+    @property
+    def NM(self) -> np.ndarray:
+        '''Failure load resultants [Nx, Ny, Nxy, Mx, My, Mxy] of every ray with shape (n_rays, 6).'''
+
+        NM = np.zeros((len(self.radius), 6))
+        NM[:, [COMPONENTS.index(name) for name in self.components]] = self.points
+
+        return NM
+
+
+def unit_ply_stresses(ABD: np.ndarray, Q_bar: np.ndarray, T: np.ndarray, z: np.ndarray) -> np.ndarray:
+    '''
+    Local ply stresses [s1, s2, t12] at the bottom and top of every ply per unit load resultant, for one or many
+    layups.
+
+    Args:
+        ABD (np.ndarray): Laminate stiffness matrices with shape (..., 6, 6).
+        Q_bar (np.ndarray): Transformed reduced ply stiffnesses with shape (..., n_plies, 3, 3).
+        T (np.ndarray): Planar stress transformations of the plies with shape (..., n_plies, 3, 3).
+        z (np.ndarray): Ply interface heights with shape (..., n_plies + 1).
+
+    Returns:
+        np.ndarray: Stress influence matrices with shape (2, ..., n_plies, 3, 6).
+    '''
+
+    compliance = np.linalg.inv(ABD)[..., None, :, :]
+    heights = np.stack([z[..., :-1], z[..., 1:]])[..., None, None]
+
+    return (T @ Q_bar) @ (compliance[..., :3, :] + heights * compliance[..., 3:, :])
+
+
+def _first_ply_failure(
+    stresses: np.ndarray, strength: PlyStrength, criterion: str, loads: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    '''Closed-form first-ply failure load factors and critical plies of the loads (n_rays, 6).'''
+
+    # (n_rays, 2, n_plies, 3), array valued strengths broadcast against the plies
+    stress = np.einsum('fpij,nj->nfpi', stresses, loads)
+    R = strength_ratio(stress, strength, criterion)
+
+    R = R.reshape(len(loads), -1)
+    index = np.argmin(R, axis=-1)
+
+    return R[np.arange(len(loads)), index], index % stresses.shape[1]
+
+
+def _radial_bisection(
+    fails: Callable, loads: np.ndarray, upper: np.ndarray, tol: float, max_expansions: int
+) -> Tuple[np.ndarray, int]:
+    '''
+    Load factors of first failure along every ray by bisection of the failure predicate fails(NM) -> bool with NM
+    of shape (n, 6). Only the rays that are not yet resolved are evaluated. Returns the factors and the number of
+    predicate evaluations.
+    '''
+
+    lower = np.zeros(len(loads))
+    upper = np.where(np.isfinite(upper) & (upper > 0), upper, 1.0)
+    resolved = np.zeros(len(loads), dtype=bool)
+    evaluations = 0
+
+    # Expand the upper bound until every ray fails
+    for _ in range(max_expansions):
+        active = np.flatnonzero(~resolved)
+        if len(active) == 0:
+            break
+        failed = np.asarray(fails(upper[active, None] * loads[active]), dtype=bool)
+        evaluations += len(active)
+        resolved[active[failed]] = True
+        lower[active[~failed]] = upper[active[~failed]]
+        upper[active[~failed]] *= 2
+
+    # Rays that never fail have an infinite radius
+    upper[~resolved] = np.inf
+
+    while True:
+        active = np.flatnonzero(resolved & (upper - lower > tol * upper))
+        if len(active) == 0:
+            break
+        middle = 0.5 * (lower[active] + upper[active])
+        failed = np.asarray(fails(middle[:, None] * loads[active]), dtype=bool)
+        evaluations += len(active)
+        upper[active[failed]] = middle[failed]
+        lower[active[~failed]] = middle[~failed]
+
+    return np.where(resolved, 0.5 * (lower + upper), np.inf), evaluations
+
+
+def _deviation(p_a: np.ndarray, p_b: np.ndarray, p_m: np.ndarray) -> np.ndarray:
+    '''Distance of the points p_m from the chords p_a p_b relative to |p_m|, 0 where a radius is infinite.'''
+
+    chord = p_b - p_a
+    offset = p_m - p_a
+    length = np.sum(chord * chord, axis=-1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = np.sum(offset * chord, axis=-1) / length
+        distance = np.linalg.norm(offset - t[:, None] * chord, axis=-1)
+        deviation = distance / np.linalg.norm(p_m, axis=-1)
+
+    return np.where(np.isfinite(deviation), deviation, 0.0)
+
+
+def _point(angle: np.ndarray, radius: np.ndarray) -> np.ndarray:
+    return radius[:, None] * np.stack([np.cos(angle), np.sin(angle)], axis=-1)
+
+
+def _envelope_2D(rays: Callable, n_directions: int, tol: float, max_level: int):
+    '''Adaptive refinement of the angular intervals between the rays of a 2D envelope.'''
+
+    angles = np.linspace(0, 2 * np.pi, n_directions, endpoint=False)
+    radius, ply = rays(np.stack([np.cos(angles), np.sin(angles)], axis=-1))
+
+    # Intervals to test, as the angles of their ends
+    lo, hi = angles, np.roll(angles, -1)
+    hi[-1] += 2 * np.pi
+    r_lo, r_hi = radius, np.roll(radius, -1)
+
+    for _ in range(max_level):
+        mid = 0.5 * (lo + hi)
+        directions = np.stack([np.cos(mid), np.sin(mid)], axis=-1)
+        r_mid, p_mid = rays(directions)
+
+        angles = np.concatenate([angles, mid % (2 * np.pi)])
+        radius = np.concatenate([radius, r_mid])
+        ply = np.concatenate([ply, p_mid])
+
+        split = _deviation(_point(lo, r_lo), _point(hi, r_hi), _point(mid, r_mid)) > tol
+        if not np.any(split):
+            break
+
+        lo, hi = np.concatenate([lo[split], mid[split]]), np.concatenate([mid[split], hi[split]])
+        r_lo, r_hi = np.concatenate([r_lo[split], r_mid[split]]), np.concatenate([r_mid[split], r_hi[split]])
+
+    order = np.argsort(angles)
+    directions = np.stack([np.cos(angles[order]), np.sin(angles[order])], axis=-1)
+
+    return directions, radius[order], ply[order], None
+
+
+class _SphereMesh:
+    '''Red refined triangulation of the unit sphere with edge midpoints shared between neighbouring triangles.'''
+
+    def __init__(self):
+
+        self.vertices = [np.array(v, dtype=float) for v in np.concatenate([np.eye(3), -np.eye(3)])]
+        self.leaves = set()
+        self.midpoints = {}
+        self.parent = {}
+        self.split = set()
+
+        # Leaves of every edge, and leaves that may have become unbalanced by the last refinements
+        self.adjacent = defaultdict(set)
+        self.pending = []
+
+        for triangle in ((0, 1, 2), (1, 3, 2), (3, 4, 2), (4, 0, 2), (1, 0, 5), (3, 1, 5), (4, 3, 5), (0, 4, 5)):
+            self._add(triangle)
+
+    @staticmethod
+    def edges(triangle):
+        i, j, k = triangle
+        return (min(i, j), max(i, j)), (min(j, k), max(j, k)), (min(k, i), max(k, i))
+
+    def _add(self, triangle) -> None:
+        self.leaves.add(triangle)
+        for edge in self.edges(triangle):
+            self.adjacent[edge].add(triangle)
+
+    def midpoint(self, edge) -> int:
+        if edge not in self.midpoints:
+            v = self.vertices[edge[0]] + self.vertices[edge[1]]
+            self.vertices.append(v / np.sqrt(v @ v))
+            m = len(self.vertices) - 1
+            self.midpoints[edge] = m
+            self.parent[(min(edge[0], m), max(edge[0], m))] = edge
+            self.parent[(min(edge[1], m), max(edge[1], m))] = edge
+        return self.midpoints[edge]
+
+    def refine(self, triangle) -> list:
+        '''Splits a leaf into 4 children through its edge midpoints.'''
+
+        i, j, k = triangle
+        a, b, c = (self.midpoint(edge) for edge in self.edges(triangle))
+        self.leaves.remove(triangle)
+
+        for edge in self.edges(triangle):
+            self.adjacent[edge].discard(triangle)
+            self.split.add(edge)
+            self.pending.extend(self.adjacent[edge])
+            if edge in self.parent:
+                self.pending.extend(self.adjacent[self.parent[edge]])
+
+        children = [(i, a, c), (a, j, b), (c, b, k), (a, b, c)]
+        for child in children:
+            self._add(child)
+        self.pending.extend(children)
+
+        return children
+
+    def _unbalanced(self, triangle) -> bool:
+        '''More than one split edge, or an edge whose halves are split again (hanging nodes of two levels).'''
+
+        split = [edge for edge in self.edges(triangle) if edge in self.split]
+        if len(split) > 1:
+            return True
+
+        for edge in split:
+            m = self.midpoints[edge]
+            if (min(edge[0], m), max(edge[0], m)) in self.split or (min(edge[1], m), max(edge[1], m)) in self.split:
+                return True
+
+        return False
+
+    def close(self) -> list:
+        '''Refines leaves until every leaf has at most one hanging midpoint, returns the new leaves.'''
+
+        children = []
+        while self.pending:
+            suspects, self.pending = set(self.pending), []
+            for triangle in suspects:
+                if triangle in self.leaves and self._unbalanced(triangle):
+                    children.extend(self.refine(triangle))
+
+        return children
+
+    def triangles(self) -> np.ndarray:
+        '''Conforming triangulation, leaves with a hanging midpoint are split in two.'''
+
+        triangles = []
+        for triangle in self.leaves:
+            i, j, k = triangle
+            ij, jk, ki = self.edges(triangle)
+            if ij in self.split:
+                m = self.midpoints[ij]
+                triangles.extend([(i, m, k), (m, j, k)])
+            elif jk in self.split:
+                m = self.midpoints[jk]
+                triangles.extend([(i, j, m), (i, m, k)])
+            elif ki in self.split:
+                m = self.midpoints[ki]
+                triangles.extend([(i, j, m), (m, j, k)])
+            else:
+                triangles.append(triangle)
+
+        return np.array(sorted(triangles), dtype=int)
+
+
+def _envelope_3D(rays: Callable, n_directions: int, tol: float, max_level: int):
+    '''Adaptive refinement of a triangulated 3D envelope starting from a subdivided octahedron.'''
+
+    mesh = _SphereMesh()
+    radius, ply = np.zeros(0), np.zeros(0, dtype=int)
+
+    def evaluate():
+        nonlocal radius, ply
+        n = len(radius)
+        if len(mesh.vertices) > n:
+            r, p = rays(np.array(mesh.vertices[n:]))
+            radius, ply = np.concatenate([radius, r]), np.concatenate([ply, p])
+
+    while len(mesh.vertices) < n_directions:
+        for triangle in list(mesh.leaves):
+            mesh.refine(triangle)
+    evaluate()
+
+    candidates = list(mesh.leaves)
+    for _ in range(max_level):
+        # Probe the midpoints of all edges of the candidates at once
+        edges = sorted({edge for triangle in candidates for edge in mesh.edges(triangle)})
+        middle = np.array([mesh.midpoint(edge) for edge in edges])
+        evaluate()
+
+        vertices = np.array(mesh.vertices)
+        points = radius[:, None] * vertices
+        a, b = np.array(edges).T
+        curved = dict(zip(edges, _deviation(points[a], points[b], points[middle]) > tol))
+
+        marked = [t for t in candidates if t in mesh.leaves and any(curved[edge] for edge in mesh.edges(t))]
+        if not marked:
+            break
+
+        candidates = []
+        for triangle in marked:
+            if triangle in mesh.leaves:
+                candidates.extend(mesh.refine(triangle))
+        candidates.extend(mesh.close())
+        evaluate()
+
+    # Drop the probes that did not become mesh vertices
+    triangles = mesh.triangles()
+    used, triangles = np.unique(triangles, return_inverse=True)
+
+    return np.array(mesh.vertices)[used], radius[used], ply[used], triangles.reshape(-1, 3)
+
+
+def failure_envelope(
+    ABD: np.ndarray,
+    Q_bar: np.ndarray,
+    T: np.ndarray,
+    z: np.ndarray,
+    strength: PlyStrength = None,
+    components: Sequence[Union[str, int]] = ('Nx', 'Ny'),
+    criterion: str = 'tsai_wu',
+    fails: Callable = None,
+    n_directions: int = 32,
+    tol: float = 1e-3,
+    max_level: int = 6,
+    scale: np.ndarray = None,
+    radial_tol: float = 1e-4,
+    max_expansions: int = 30,
+) -> FailureEnvelope:
+    '''
+    Failure envelope of a laminate over two (2D) or three (3D) load resultants.
+
+    Args:
+        ABD (np.ndarray): Laminate stiffness matrix with shape (6, 6).
+        Q_bar (np.ndarray): Transformed reduced ply stiffnesses with shape (n_plies, 3, 3).
+        T (np.ndarray): Planar stress transformations of the plies with shape (n_plies, 3, 3).
+        z (np.ndarray): Ply interface heights with shape (n_plies + 1,).
+        strength (PlyStrength, optional): Ply strengths for the closed-form first-ply failure. Defaults to None.
+        components (Sequence[Union[str, int]], optional): Names (see COMPONENTS) or indices of the load resultants.
+                                                           Defaults to ('Nx', 'Ny').
+        criterion (str, optional): Failure criterion, see failure.strength_ratio. Defaults to 'tsai_wu'.
+        fails (Callable, optional): Failure predicate fails(NM) -> bool of loads with shape (n, 6), e.g. of a
+                                    nonlinear or progressive analysis. Replaces the closed-form first-ply failure,
+                                    which then only serves as the initial bracket. Defaults to None.
+        n_directions (int, optional): Initial number of rays. Defaults to 32.
+        tol (float, optional): Largest deviation of the envelope from the chords between rays, relative to the
+                               radius. Defaults to 1e-3.
+        max_level (int, optional): Largest number of refinement levels. Defaults to 6.
+        scale (np.ndarray, optional): Load scale of every component. Defaults to the mean first-ply failure
+                                      loads along the component axes, or 1 without strengths.
+        radial_tol (float, optional): Relative tolerance of the radial bisection. Defaults to 1e-4.
+        max_expansions (int, optional): Largest number of doublings of the bisection bracket, rays that do not
+                                        fail get an infinite radius. Defaults to 30.
+
+    Returns:
+        FailureEnvelope: Rays, radii and critical plies of the envelope.
+    '''
+
+    names = tuple(COMPONENTS[c] if isinstance(c, (int, np.integer)) else c for c in components)
+    unknown = [name for name in names if name not in COMPONENTS]
+    if unknown:
+        raise ValueError(f'Unknown load components {unknown}, expected names of {COMPONENTS} or indices.')
+    if len(names) not in (2, 3) or len(set(names)) != len(names):
+        raise ValueError('A failure envelope needs two or three distinct load components.')
+    if strength is None and fails is None:
+        raise ValueError('A failure envelope needs ply strengths or a failure predicate.')
+
+    index = [COMPONENTS.index(name) for name in names]
+    stresses = unit_ply_stresses(ABD, Q_bar, T, z) if strength is not None else None
+
+    def loads(directions):
+        NM = np.zeros((len(directions), 6))
+        NM[:, index] = directions
+        return NM
+
+    if scale is None:
+        scale = np.ones(len(names))
+        if strength is not None:
+            axes = np.concatenate([np.eye(len(names)), -np.eye(len(names))])
+            R = _first_ply_failure(stresses, strength, criterion, loads(axes))[0].reshape(2, -1)
+            R = np.where(np.isfinite(R), R, np.nan)
+            scale = np.where(np.isfinite(np.nanmean(R, axis=0)), np.nanmean(R, axis=0), 1.0)
+    scale = np.asarray(scale, dtype=float)
+
+    evaluations = 0
+
+    def rays(directions):
+        nonlocal evaluations
+        NM = loads(directions * scale)
+
+        if strength is not None:
+            radius, ply = _first_ply_failure(stresses, strength, criterion, NM)
+        else:
+            radius, ply = np.ones(len(NM)), np.full(len(NM), -1)
+
+        if fails is None:
+            evaluations += len(NM)
+            return radius, ply
+
+        radius, count = _radial_bisection(fails, NM, radius, radial_tol, max_expansions)
+        evaluations += count
+
+        return radius, np.full(len(NM), -1)
+
+    envelope = _envelope_2D if len(names) == 2 else _envelope_3D
+    directions, radius, ply, triangles = envelope(rays, n_directions, tol, max_level)
+
+    return FailureEnvelope(names, directions, radius, scale, ply, triangles, evaluations)
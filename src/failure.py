@@ -0,0 +1,108 @@
+'''
+Vectorized first-ply failure criteria of unidirectional plies under plane stress.
+
+Every criterion returns the strength ratio R, the factor by which the given ply stresses can be scaled until the
+ply fails (R < 1 means failure). Since CLT is linear, R of the ply stresses is also the load factor of the applied
+load resultants.
+'''
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Union
+
+
+@dataclass(frozen=True)
+class PlyStrength:
+    '''
+    Lamina strengths in the material axes, all given as positive values.
+
+    Attributes:
+        Xt (float, np.ndarray): Longitudinal tensile strength.
+        Xc (float, np.ndarray): Longitudinal compressive strength.
+        Yt (float, np.ndarray): Transverse tensile strength.
+        Yc (float, np.ndarray): Transverse compressive strength.
+        S (float, np.ndarray): In-plane shear strength.
+        F12 (float, optional): Normalized Tsai-Wu interaction coefficient F12 / sqrt(F11 F22). Defaults to -0.5.
+    '''
+
+    Xt: Union[float, np.ndarray]
+    Xc: Union[float, np.ndarray]
+    Yt: Union[float, np.ndarray]
+    Yc: Union[float, np.ndarray]
+    S: Union[float, np.ndarray]
+    F12: float = -0.5
+
+
+def max_stress(stress: np.ndarray, strength: PlyStrength) -> np.ndarray:
+    '''Strength ratio of the maximum stress criterion.'''
+
+    s1, s2, t12 = stress[..., 0], stress[..., 1], stress[..., 2]
+
+    with np.errstate(divide='ignore'):
+        R1 = np.where(s1 > 0, strength.Xt, strength.Xc) / np.abs(s1)
+        R2 = np.where(s2 > 0, strength.Yt, strength.Yc) / np.abs(s2)
+        R12 = strength.S / np.abs(t12)
+
+    return np.minimum(np.minimum(R1, R2), R12)
+
+
+def tsai_hill(stress: np.ndarray, strength: PlyStrength) -> np.ndarray:
+    '''Strength ratio of the Tsai-Hill criterion, with the tensile or compressive strengths chosen by sign.'''
+
+    s1, s2, t12 = stress[..., 0], stress[..., 1], stress[..., 2]
+
+    X = np.where(s1 > 0, strength.Xt, strength.Xc)
+    Y = np.where(s2 > 0, strength.Yt, strength.Yc)
+
+    index = s1 ** 2 / X ** 2 - s1 * s2 / X ** 2 + s2 ** 2 / Y ** 2 + t12 ** 2 / strength.S ** 2
+
+    with np.errstate(divide='ignore'):
+        return 1 / np.sqrt(index)
+
+
+def tsai_wu(stress: np.ndarray, strength: PlyStrength) -> np.ndarray:
+    '''
+    Strength ratio of the Tsai-Wu criterion, the positive root of
+
+        a R^2 + b R - 1 = 0,   a = F11 s1^2 + F22 s2^2 + F66 t12^2 + 2 F12 s1 s2,   b = F1 s1 + F2 s2
+    '''
+
+    s1, s2, t12 = stress[..., 0], stress[..., 1], stress[..., 2]
+    Xt, Xc, Yt, Yc, S = strength.Xt, strength.Xc, strength.Yt, strength.Yc, strength.S
+
+    F1 = 1 / Xt - 1 / Xc
+    F2 = 1 / Yt - 1 / Yc
+    F11 = 1 / (Xt * Xc)
+    F22 = 1 / (Yt * Yc)
+    F66 = 1 / S ** 2
+    F12 = strength.F12 * np.sqrt(F11 * F22)
+
+    a = F11 * s1 ** 2 + F22 * s2 ** 2 + F66 * t12 ** 2 + 2 * F12 * s1 * s2
+    b = F1 * s1 + F2 * s2
+
+    # Numerically stable root, 2 / (b + sqrt(b^2 + 4a)), which also covers a = 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        root = b + np.sqrt(b ** 2 + 4 * a)
+        return np.where(root > 0, 2 / root, np.inf)
+
+
+CRITERIA = {'max_stress': max_stress, 'tsai_hill': tsai_hill, 'tsai_wu': tsai_wu}
+
+
+def strength_ratio(stress: np.ndarray, strength: PlyStrength, criterion: str = 'tsai_wu') -> np.ndarray:
+    '''
+    First-ply failure strength ratio of ply stresses.
+
+    Args:
+        stress (np.ndarray): Ply stresses [s1, s2, t12] in the material axes with shape (..., 3).
+        strength (PlyStrength): Ply strengths, array valued strengths broadcast against stress[..., 0].
+        criterion (str, optional): 'max_stress', 'tsai_hill' or 'tsai_wu'. Defaults to 'tsai_wu'.
+
+    Returns:
+        np.ndarray: Strength ratios with shape (...), inf for unstressed plies.
+    '''
+
+    if criterion not in CRITERIA:
+        raise ValueError(f'Unknown failure criterion {criterion!r}, expected one of {list(CRITERIA)}.')
+
+    return CRITERIA[criterion](np.asarray(stress, dtype=float), strength)
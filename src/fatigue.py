@@ -0,0 +1,448 @@
+import numpy as np
+from dataclasses import dataclass, fields
+from typing import Sequence, Union
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+@dataclass
+class Cycles:
+    '''
+    Counted load cycles. Every entry belongs to one channel (a single stress component of a single ply).
+    Full cycles have a count of 1.0 and residual half cycles a count of 0.5.
+    '''
+
+    ranges: np.ndarray
+    means: np.ndarray
+    counts: np.ndarray
+    channels: np.ndarray
+
+
+@dataclass
+class SNCurve:
+    '''
+    Basquin S-N curve with an optional Goodman mean stress correction.
+
+        N = (S_f / S_a) ** m
+
+    Attributes:
+        S_f (float): Fatigue strength coefficient (stress amplitude for failure in a single cycle).
+        m (float): Inverse slope of the S-N curve.
+        ultimate_tension (float, optional): Tensile strength used by the Goodman correction. Defaults to inf.
+        ultimate_compression (float, optional): Compressive strength (positive value) used by the Goodman
+                                                correction for negative mean stresses. Defaults to inf.
+        endurance (float, optional): Equivalent amplitude below which cycles cause no damage. Defaults to 0.
+    '''
+
+    S_f: Union[float, np.ndarray]
+    m: Union[float, np.ndarray]
+    ultimate_tension: Union[float, np.ndarray] = np.inf
+    ultimate_compression: Union[float, np.ndarray] = np.inf
+    endurance: Union[float, np.ndarray] = 0.0
+
+
+def _flatten_history(history: np.ndarray) -> np.ndarray:
+    '''
+    Reorders a (n_samples, ...) history into one contiguous block per channel. Every block is
+    terminated by a NaN separator so that no comparison made on neighbouring values can span
+    two channels.
+
+    Returns:
+        np.ndarray: Channel-major values with separators.
+    '''
+
+    history = np.asarray(history, dtype=float)
+    n_samples = history.shape[0]
+    n_channels = int(np.prod(history.shape[1:], dtype=int))
+
+    x = np.empty((n_channels, n_samples + 1))
+    x[:, :n_samples] = history.reshape(n_samples, n_channels).T
+    x[:, n_samples] = np.nan
+
+    return x.ravel()
+
+
+def _channels(x: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    '''Returns the channel of the given positions in a separated channel-major array.'''
+
+    return np.searchsorted(np.flatnonzero(np.isnan(x)), idx)
+
+
+def _turning_points(x: np.ndarray) -> np.ndarray:
+    '''
+    Reduces channel-major values to their peaks and valleys. The first and last point of every channel
+    are always kept so that a channel can be continued by a later chunk.
+    '''
+
+    d = np.diff(x)
+
+    # Remove plateaus (repeated values) within a channel, separators always differ
+    if not d.all():
+        keep = np.ones(x.size, dtype=bool)
+        keep[1:] = d != 0
+        x = x[keep]
+        d = np.diff(x)
+
+    # A turning point changes the sign of the slope
+    keep = np.ones(x.size, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        np.less(d[:-1] * d[1:], 0, out=keep[1:-1])
+
+    # A NaN slope marks a channel boundary or the separator itself
+    boundary = np.isnan(d)
+    keep[1:-1] |= boundary[:-1]
+    keep[1:-1] |= boundary[1:]
+
+    return x[keep]
+
+
+def _four_point_stack(x, first, second, keep):
+    '''
+    Single pass four-point rainflow count with one stack per channel. For the top four stack points S1..S4
+    the inner pair (S2, S3) is a closed cycle when |S2 - S3| <= |S1 - S2| and |S2 - S3| <= |S3 - S4|, it
+    is removed and the check is repeated. A separator flushes the stack of the finished channel as its residual.
+
+    Args:
+        x: Turning points with separators (an array, or a list for the plain Python loop).
+        first, second (np.ndarray): Receive the positions of S2 and S3 of every closed cycle.
+        keep (np.ndarray): Receives the residual mask of x, including the separators.
+
+    Returns:
+        int: Number of closed cycles.
+    '''
+
+    stack = np.empty(len(x), dtype=np.int64)
+    top = 0
+    n = 0
+
+    for i in range(len(x)):
+        value = x[i]
+
+        if value != value:
+            for k in range(top):
+                keep[stack[k]] = True
+            keep[i] = True
+            top = 0
+            continue
+
+        stack[top] = i
+        top += 1
+
+        while top >= 4:
+            s1 = x[stack[top - 4]]
+            s2 = x[stack[top - 3]]
+            s3 = x[stack[top - 2]]
+            s4 = value
+            inner = abs(s3 - s2)
+            if inner > abs(s2 - s1) or inner > abs(s4 - s3):
+                break
+            first[n] = stack[top - 3]
+            second[n] = stack[top - 2]
+            n += 1
+            stack[top - 3] = i
+            top -= 2
+
+    return n
+
+
+if numba is not None:
+    _four_point_stack = numba.njit(cache=True)(_four_point_stack)
+
+
+def _extract_cycles(x: np.ndarray):
+    '''
+    Four-point rainflow extraction of all channels, linear in the number of turning points.
+
+    Vectorized passes over all channels remove the non-overlapping closed cycles as long as every pass removes a
+    large share of the points, which is the case for irregular histories. The remaining points are counted by a
+    single pass of a stack per channel (compiled with numba when available), which also handles the histories
+    that close only one cycle per pass, such as a ring-down before a large excursion. The count does not depend
+    on the order in which closed cycles are removed.
+
+    Returns:
+        ranges, means, channels (np.ndarray): Closed full cycles.
+        x (np.ndarray): Residual turning points with separators.
+    '''
+
+    ranges, means, channels = [], [], []
+
+    while x.size >= 4:
+
+        r = np.abs(np.diff(x))
+
+        # Candidate index i refers to the points i..i+3, comparisons with a separator are always False
+        candidate = r[1:-1] <= r[:-2]
+        candidate &= r[1:-1] <= r[2:]
+
+        # Neighbouring candidates share a point, so only every other candidate of a run is accepted
+        idx = np.arange(candidate.size)
+        start = candidate.copy()
+        start[1:] &= ~candidate[:-1]
+        run_start = np.maximum.accumulate(np.where(start, idx, 0))
+        candidate &= (idx - run_start) % 2 == 0
+
+        i = np.flatnonzero(candidate)
+
+        # Leave the rest to the stack once a pass removes less than an eighth of the points
+        if 16 * i.size < x.size:
+            break
+
+        ranges.append(r[i + 1])
+        means.append(0.5 * (x[i + 1] + x[i + 2]))
+        channels.append(_channels(x, i))
+
+        keep = np.ones(x.size, dtype=bool)
+        keep[i + 1] = False
+        keep[i + 2] = False
+        x = x[keep]
+
+    if x.size >= 4:
+        first = np.empty(x.size // 2, dtype=np.int64)
+        second = np.empty(x.size // 2, dtype=np.int64)
+        keep = np.zeros(x.size, dtype=bool)
+
+        n = _four_point_stack(x if numba is not None else x.tolist(), first, second, keep)
+        first, second = first[:n], second[:n]
+
+        ranges.append(np.abs(x[second] - x[first]))
+        means.append(0.5 * (x[first] + x[second]))
+        channels.append(_channels(x, first))
+        x = x[keep]
+
+    cycles = (
+        np.concatenate(ranges + [np.zeros(0)]),
+        np.concatenate(means + [np.zeros(0)]),
+        np.concatenate(channels + [np.zeros(0, dtype=int)]),
+    )
+
+    return cycles, x
+
+
+def _half_cycles(x: np.ndarray) -> Cycles:
+    '''Counts the residual turning points of every channel as half cycles.'''
+
+    if x.size < 2:
+        return Cycles(np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0, dtype=int))
+
+    ranges = np.abs(np.diff(x))
+    same = ~np.isnan(ranges)
+    i = np.flatnonzero(same)
+
+    return Cycles(
+        ranges[i], 0.5 * (x[i] + x[i + 1]), np.full(i.size, 0.5), _channels(x, i),
+    )
+
+
+class RainflowCounter:
+    def __init__(self, n_channels: int):
+        '''
+        Streaming rainflow counter for many independent channels. Each call to update counts the cycles
+        closed by the new chunk, the open residual is carried over to the next chunk.
+
+        Args:
+            n_channels (int): Number of independent channels (e.g. n_plies * 3).
+        '''
+
+        self.n_channels: int = n_channels
+        self._residual = np.zeros(0)
+
+    def update(self, history: np.ndarray) -> Cycles:
+        '''
+        Counts the full cycles closed by a new chunk of the history.
+
+        Args:
+            history (np.ndarray): Chunk of shape (n_samples, ...) where the trailing dimensions hold n_channels values.
+
+        Returns:
+            Cycles: Full cycles closed within the chunk.
+        '''
+
+        history = np.asarray(history, dtype=float)
+        n_samples = len(history)
+        n_channels = int(np.prod(history.shape[1:], dtype=int))
+
+        if n_channels != self.n_channels:
+            raise ValueError(
+                f'Expected {self.n_channels} channels per sample, received {n_channels}.'
+            )
+
+        if n_samples == 0:
+            return Cycles(np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0, dtype=int))
+
+        x = _flatten_history(history)
+
+        # Continue every channel from its residual by inserting it in front of the channel block
+        res = self._residual
+        if res.size:
+            values = ~np.isnan(res)
+            positions = _channels(res, np.flatnonzero(values)) * (n_samples + 1)
+            x = np.insert(x, positions, res[values])
+
+        x = _turning_points(x)
+        (ranges, means, channels), self._residual = _extract_cycles(x)
+
+        return Cycles(ranges, means, np.ones(ranges.size), channels)
+
+    def residual(self) -> Cycles:
+        '''
+        Returns the open residual of every channel counted as half cycles. The counter state is unchanged.
+
+        Returns:
+            Cycles: Residual half cycles.
+        '''
+
+        return _half_cycles(self._residual)
+
+    def reset(self) -> None:
+
+        self._residual = np.zeros(0)
+
+
+def rainflow(history: np.ndarray) -> Cycles:
+    '''
+    Rainflow counts a complete history including the residual half cycles.
+
+    Args:
+        history (np.ndarray): History of shape (n_samples, ...). Every trailing index is an independent channel.
+
+    Returns:
+        Cycles: Full and half cycles of every channel. Channels are numbered in C order of the trailing dimensions.
+    '''
+
+    history = np.asarray(history, dtype=float)
+    counter = RainflowCounter(int(np.prod(history.shape[1:], dtype=int)))
+
+    full = counter.update(history)
+    half = counter.residual()
+
+    return Cycles(
+        np.concatenate([full.ranges, half.ranges]),
+        np.concatenate([full.means, half.means]),
+        np.concatenate([full.counts, half.counts]),
+        np.concatenate([full.channels, half.channels]),
+    )
+
+
+def cycles_to_failure(
+    amplitude: np.ndarray,
+    mean: np.ndarray,
+    curve: SNCurve,
+    mean_correction: str = 'goodman',
+) -> np.ndarray:
+    '''
+    Evaluates the number of cycles to failure for the given stress amplitudes and mean stresses.
+
+    Args:
+        amplitude (np.ndarray): Stress amplitudes.
+        mean (np.ndarray): Mean stresses.
+        curve (SNCurve): S-N curve. Curve parameters must broadcast against the amplitudes.
+        mean_correction (str, optional): 'goodman' or None. Defaults to 'goodman'.
+
+    Returns:
+        np.ndarray: Cycles to failure (inf for cycles below the endurance limit).
+    '''
+
+    S_a = np.asarray(amplitude, dtype=float)
+
+    if mean_correction == 'goodman':
+        mean = np.asarray(mean, dtype=float)
+        strength = np.where(mean >= 0, curve.ultimate_tension, curve.ultimate_compression)
+        S_a = S_a / np.maximum(1 - np.abs(mean) / strength, 0)
+
+    elif mean_correction is not None:
+        raise ValueError(f'Unknown mean stress correction: {mean_correction}')
+
+    with np.errstate(divide='ignore'):
+        N = (curve.S_f / S_a) ** curve.m
+
+    return np.where(S_a <= curve.endurance, np.inf, N)
+
+
+class FatigueDamage:
+    def __init__(
+        self,
+        curves: Sequence[SNCurve],
+        n_plies: int,
+        mean_correction: str = 'goodman',
+    ):
+        '''
+        Miner's rule damage accumulator for ply stress histories of shape (n_samples, n_plies, 3), such as
+        those recovered with Laminate.get_ply_stresses. Every stress component is a separate failure criterion
+        with its own S-N curve. Histories can be passed in chunks.
+
+        Args:
+            curves (Sequence[SNCurve]): S-N curves for the [s1, s2, t12] components. Curve parameters
+                                        may also be arrays of shape (n_plies,) to vary the curves per ply.
+            n_plies (int): Number of plies in the stress histories.
+            mean_correction (str, optional): Mean stress correction, 'goodman' or None. Defaults to 'goodman'.
+        '''
+
+        if len(curves) != 3:
+            raise ValueError('An S-N curve is required for each of the [s1, s2, t12] components.')
+
+        self.n_plies: int = n_plies
+        self.mean_correction: str = mean_correction
+        self.counter = RainflowCounter(n_plies * 3)
+
+        # Gather the curve parameters per channel (ply major, component minor)
+        def per_channel(name):
+            values = [np.broadcast_to(getattr(c, name), (n_plies,)) for c in curves]
+            return np.stack(values, axis=1).ravel().astype(float)
+
+        self._curve = SNCurve(
+            per_channel('S_f'),
+            per_channel('m'),
+            per_channel('ultimate_tension'),
+            per_channel('ultimate_compression'),
+            per_channel('endurance'),
+        )
+
+        self._damage = np.zeros(n_plies * 3)
+        self.n_samples: int = 0
+
+    def _cycle_damage(self, cycles: Cycles) -> np.ndarray:
+
+        ch = cycles.channels
+        curve = SNCurve(*(getattr(self._curve, f.name)[ch] for f in fields(self._curve)))
+
+        N = cycles_to_failure(0.5 * cycles.ranges, cycles.means, curve, self.mean_correction)
+
+        return np.bincount(ch, weights=cycles.counts / N, minlength=self.n_plies * 3)
+
+    def update(self, ply_stresses: np.ndarray) -> None:
+        '''
+        Accumulates the damage of the cycles closed by a new chunk of ply stresses.
+
+        Args:
+            ply_stresses (np.ndarray): Ply stress chunk with shape (n_samples, n_plies, 3).
+        '''
+
+        self._damage += self._cycle_damage(self.counter.update(ply_stresses))
+        self.n_samples += len(ply_stresses)
+
+    @property
+    def damage(self) -> np.ndarray:
+        '''
+        Miner's rule damage sum of every ply and criterion, including the open residual counted as half cycles.
+
+        Returns:
+            np.ndarray: Damage with shape (n_plies, 3).
+        '''
+
+        total = self._damage + self._cycle_damage(self.counter.residual())
+
+        return total.reshape(self.n_plies, 3)
+
+    def life(self) -> np.ndarray:
+        '''
+        Number of repetitions of the accumulated history until the damage sum reaches one.
+
+        Returns:
+            np.ndarray: Repetitions to failure for every ply and criterion.
+        '''
+
+        with np.errstate(divide='ignore'):
+            return 1 / self.damage
@@ -0,0 +1,308 @@
+'''
+Load distribution of single-row multi-fastener lap joints between two laminated plates.
+
+Each fastener column of width w is a spring network: the plate segments between the fasteners are axial springs
+with the membrane stiffness w / (a11 p) of the laminate (a11 = (ABD^-1)[0, 0], p the fastener pitch), and the
+fasteners are shear springs with the Huth flexibility
+
+    C = ((t1 + t2) / (2 d))^a (b / n) (1 / (t1 E1) + 1 / (n t2 E2) + 1 / (2 t1 E3) + 1 / (2 n t2 E3))
+
+with the plate thicknesses t, the membrane moduli E1, E2 = 1 / (t a11), the fastener modulus E3, the diameter d
+and n = 1 (single shear) or 2 (double shear). Plate 1 is loaded before the first fastener and plate 2 is supported
+after the last one. The networks of all configurations are solved as one batched linear system for a unit load,
+the distributions of all load cases follow by scaling.
+
+At every fastener and plate the bearing stress F / (d t) and the bypass load are fed into a bearing-bypass check:
+the open-hole strength ratio of the bypass load (notched.NotchedLaminate) and the bearing strength ratio are
+combined with the linear interaction 1 / R = 1 / R_bypass + 1 / R_bearing.
+'''
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Tuple
+
+from notched import NotchedLaminate
+
+# Huth constants (a, b) of the fastener flexibility
+HUTH = {
+    'bolted_metal': (2 / 3, 3.0),
+    'riveted_metal': (2 / 5, 2.2),
+    'bolted_graphite': (2 / 3, 4.2),
+}
+
+_SHEAR_PLANES = {'single': 1, 'double': 2}
+
+
+def huth_flexibility(
+    t1: np.ndarray,
+    E1: np.ndarray,
+    t2: np.ndarray,
+    E2: np.ndarray,
+    d: np.ndarray,
+    E_fastener: float,
+    shear: str = 'single',
+    joint_type: str = 'bolted_graphite',
+) -> np.ndarray:
+    '''
+    Huth fastener flexibility, all arguments broadcast.
+
+    Args:
+        t1, t2 (np.ndarray): Plate thicknesses.
+        E1, E2 (np.ndarray): Plate moduli in the load direction.
+        d (np.ndarray): Fastener diameters.
+        E_fastener (float): Fastener modulus.
+        shear (str, optional): 'single' or 'double' shear. Defaults to 'single'.
+        joint_type (str, optional): Key of HUTH. Defaults to 'bolted_graphite'.
+
+    Returns:
+        np.ndarray: Flexibilities (displacement per load).
+    '''
+
+    if joint_type not in HUTH:
+        raise ValueError(f'Unknown joint type {joint_type!r}, expected one of {list(HUTH)}.')
+    if shear not in _SHEAR_PLANES:
+        raise ValueError(f'Unknown shear type {shear!r}, expected single or double.')
+
+    a, b = HUTH[joint_type]
+    n = _SHEAR_PLANES[shear]
+
+    return ((t1 + t2) / (2 * d)) ** a * (b / n) * (
+        1 / (t1 * E1) + 1 / (n * t2 * E2) + 1 / (2 * t1 * E_fastener) + 1 / (2 * n * t2 * E_fastener)
+    )
+
+
+def _per_fastener(value, n_config: int, count: int) -> np.ndarray:
+    '''Scalars or per configuration values (n_config,) repeated, or per fastener values (n_config, count).'''
+
+    value = np.asarray(value, dtype=float)
+    if value.ndim < 2:
+        value = value.reshape(-1, 1)
+
+    return np.broadcast_to(value, (n_config, count))
+
+
+@dataclass
+class JointResult:
+    '''
+    Fastener loads and bearing-bypass state of every configuration, load case, fastener and plate.
+
+    Attributes:
+        fastener_load (np.ndarray): Fastener shear loads with shape (n_config, n_loads, n_fasteners).
+        bypass_load (np.ndarray): Loads passing every fastener in plates 1 and 2 with shape
+                                  (n_config, n_loads, n_fasteners, 2).
+        bearing_stress (np.ndarray): Bearing stresses F / (d t) with shape (n_config, n_loads, n_fasteners, 2).
+        bypass_stress (np.ndarray): Gross bypass stresses B / (w t) with shape (n_config, n_loads, n_fasteners, 2).
+        ratio (np.ndarray): Bearing-bypass strength ratios with shape (n_config, n_loads, n_fasteners, 2), None
+                            without a strength evaluation.
+    '''
+
+    fastener_load: np.ndarray
+    bypass_load: np.ndarray
+    bearing_stress: np.ndarray
+    bypass_stress: np.ndarray
+    ratio: np.ndarray = None
+
+    @property
+    def strength_ratio(self) -> np.ndarray:
+        '''Lowest strength ratio over the fasteners and plates with shape (n_config, n_loads).'''
+
+        return self.ratio.min(axis=(-2, -1))
+
+    @property
+    def critical(self) -> Tuple[np.ndarray, np.ndarray]:
+        '''Critical fastener and plate indices with shape (n_config, n_loads).'''
+
+        index = self.ratio.reshape(self.ratio.shape[:2] + (-1,)).argmin(axis=-1)
+
+        return index // 2, index % 2
+
+
+class BoltedJoint:
+    def __init__(
+        self,
+        plate_1: NotchedLaminate,
+        plate_2: NotchedLaminate,
+        n_fasteners: int,
+        pitch,
+        width,
+        diameter,
+        E_fastener: float,
+        shear: str = 'single',
+        joint_type: str = 'bolted_graphite',
+        layups_1: np.ndarray = None,
+        layups_2: np.ndarray = None,
+    ):
+        '''
+        Single-row lap joints for many configurations of layups and geometries.
+
+        Args:
+            plate_1 (NotchedLaminate): Layups of the loaded plate.
+            plate_2 (NotchedLaminate): Layups of the supported plate.
+            n_fasteners (int): Fasteners in the row.
+            pitch (float, np.ndarray): Fastener pitch, per configuration (n_config,) or per segment
+                                       (n_config, n_fasteners - 1).
+            width (float, np.ndarray): Width of the fastener column, per configuration (n_config,).
+            diameter (float, np.ndarray): Fastener diameter, per configuration (n_config,) or per fastener
+                                          (n_config, n_fasteners).
+            E_fastener (float): Fastener modulus.
+            shear (str, optional): 'single' or 'double' shear. Defaults to 'single'.
+            joint_type (str, optional): Huth constants, see HUTH. Defaults to 'bolted_graphite'.
+            layups_1 (np.ndarray, optional): Layup index of plate 1 of every configuration. Defaults to the
+                                             configuration index (or 0 for a single layup).
+            layups_2 (np.ndarray, optional): Layup index of plate 2 of every configuration. Defaults as layups_1.
+        '''
+
+        self.plates = (plate_1, plate_2)
+        self.n_fasteners = int(n_fasteners)
+
+        sizes = [np.shape(value)[0] for value in (pitch, width, diameter, layups_1, layups_2) if np.ndim(value) > 0]
+        sizes += [plate.n_layups for plate, layups in zip(self.plates, (layups_1, layups_2)) if layups is None]
+        n_config = max(sizes, default=1)
+
+        self.layups = tuple(
+            np.broadcast_to(np.arange(plate.n_layups) if layups is None else np.asarray(layups, dtype=int), n_config)
+            for plate, layups in zip(self.plates, (layups_1, layups_2))
+        )
+        self.pitch = _per_fastener(pitch, n_config, self.n_fasteners - 1)
+        self.width = np.broadcast_to(np.asarray(width, dtype=float), n_config)
+        self.diameter = _per_fastener(diameter, n_config, self.n_fasteners)
+
+        # Plate thicknesses and membrane compliances a11 per unit width, (n_config, 2)
+        self.thickness = np.stack([plate.thickness[i] for plate, i in zip(self.plates, self.layups)], axis=-1)
+        a11 = np.stack([plate.compliance[i, 0, 0] for plate, i in zip(self.plates, self.layups)], axis=-1)
+        a11 = a11 / self.thickness
+
+        modulus = 1 / (self.thickness * a11)
+        self.flexibility = huth_flexibility(
+            self.thickness[:, :1],
+            modulus[:, :1],
+            self.thickness[:, 1:],
+            modulus[:, 1:],
+            self.diameter,
+            E_fastener,
+            shear,
+            joint_type,
+        )
+
+        # Spring stiffnesses of the plate segments (n_config, n_fasteners - 1, 2) and fasteners (n_config, n_fasteners)
+        self.plate_stiffness = self.width[:, None, None] / (a11[:, None] * self.pitch[..., None])
+        self.fastener_stiffness = 1 / self.flexibility
+
+        self.distribution = self._unit_distribution()
+
+    @property
+    def n_config(self) -> int:
+        return len(self.width)
+
+    def stiffness_matrix(self) -> np.ndarray:
+        '''
+        Batched stiffness matrices of the spring networks with shape (n_config, 2 n, 2 n), the displacements of
+        plate 1 first. Plate 2 is supported after the last fastener with the stiffness of that fastener, the
+        distribution does not depend on the support stiffness.
+        '''
+
+        n = self.n_fasteners
+        k_plate, k_fastener = self.plate_stiffness, self.fastener_stiffness
+
+        K = np.zeros((self.n_config, 2 * n, 2 * n))
+        i, j = np.arange(n), np.arange(n - 1)
+
+        for plate, offset in ((0, 0), (1, n)):
+            k = k_plate[..., plate]
+            K[:, offset + i, offset + i] = np.pad(k, ((0, 0), (1, 0))) + np.pad(k, ((0, 0), (0, 1))) + k_fastener
+            K[:, offset + j, offset + j + 1] = K[:, offset + j + 1, offset + j] = -k
+
+        K[:, i, n + i] = K[:, n + i, i] = -k_fastener
+        K[:, -1, -1] += k_fastener[:, -1]
+
+        return K
+
+    def _unit_distribution(self) -> np.ndarray:
+        '''Fastener loads per unit joint load with shape (n_config, n_fasteners).'''
+
+        rhs = np.zeros((self.n_config, 2 * self.n_fasteners, 1))
+        rhs[:, 0] = 1
+        u = np.linalg.solve(self.stiffness_matrix(), rhs)[..., 0]
+
+        return self.fastener_stiffness * (u[:, :self.n_fasteners] - u[:, self.n_fasteners:])
+
+    def _bypass_ratio(self, bypass: np.ndarray, distance: float, method: str, n_theta: int) -> np.ndarray:
+        '''
+        Open-hole strength ratios of the gross bypass stresses B / (w t) with shape (n_config, n_loads, n_f, 2).
+        Only the distinct pairs of layup and diameter are evaluated, for a unit tension and compression.
+        '''
+
+        # Open-hole ratios of unit tension and compression are scaled by the bypass force resultants B / w
+        N = bypass / self.width[:, None, None, None]
+        unit = np.array([[1.0, 0, 0], [-1.0, 0, 0]])
+        ratio = np.full(N.shape, np.inf)
+
+        for p, plate in enumerate(self.plates):
+            layups = np.broadcast_to(self.layups[p][:, None], self.diameter.shape)
+            keys = np.stack([layups.ravel(), self.diameter.ravel()], axis=-1)
+            pairs, inverse = np.unique(keys, axis=0, return_inverse=True)
+
+            table = np.zeros((len(pairs), 2))
+            for diameter in np.unique(pairs[:, 1]):
+                rows = np.flatnonzero(pairs[:, 1] == diameter)
+                table[rows] = plate.strength_ratio(
+                    unit, 0.5 * diameter, distance, method, n_theta, layups=pairs[rows, 0].astype(int)
+                )[0]
+
+            # (n_config, n_fasteners, 2) unit ratios, tension and compression
+            table = table[inverse.ravel()].reshape(self.diameter.shape + (2,))
+            unit_ratio = np.where(N[..., p] >= 0, table[:, None, :, 0], table[:, None, :, 1])
+            with np.errstate(divide='ignore'):
+                ratio[..., p] = unit_ratio / np.abs(N[..., p])
+
+        return ratio
+
+    def solve(
+        self,
+        Nx: np.ndarray,
+        bearing_strength=None,
+        distance: float = None,
+        method: str = 'point',
+        n_theta: int = 360,
+    ) -> JointResult:
+        '''
+        Fastener loads and bearing-bypass strength ratios of many load cases.
+
+        Args:
+            Nx (np.ndarray): Joint loads per unit width with shape (n_loads,) or (n_config, n_loads), the load of a
+                             fastener column is Nx w.
+            bearing_strength (float, Tuple[float, float], optional): Bearing strengths of the plates. Defaults to
+                                                                     None (no bearing check).
+            distance (float, optional): Characteristic distance of the open-hole check, see
+                                        NotchedLaminate.strength_ratio. Defaults to None (no open-hole check).
+            method (str, optional): 'point' or 'average' stress criterion. Defaults to 'point'.
+            n_theta (int, optional): Angles around the hole. Defaults to 360.
+
+        Returns:
+            JointResult: Fastener loads, bypass loads, stresses and strength ratios.
+        '''
+
+        P = np.atleast_2d(np.asarray(Nx, dtype=float)) * self.width[:, None]
+
+        # (n_config, n_loads, n_fasteners)
+        F = P[..., None] * self.distribution[:, None]
+        transferred = np.cumsum(F, axis=-1)
+        bypass = np.stack([P[..., None] - transferred, transferred - F], axis=-1)
+
+        bearing_stress = F[..., None] / (self.diameter[:, None, :, None] * self.thickness[:, None, None])
+        bypass_stress = bypass / (self.width[:, None, None, None] * self.thickness[:, None, None])
+
+        result = JointResult(F, bypass, bearing_stress, bypass_stress)
+        if bearing_strength is None and distance is None:
+            return result
+
+        inverse = np.zeros(bypass.shape)
+        if bearing_strength is not None:
+            inverse += np.abs(bearing_stress) / np.broadcast_to(np.asarray(bearing_strength, dtype=float), 2)
+        if distance is not None:
+            inverse += 1 / self._bypass_ratio(bypass, distance, method, n_theta)
+
+        with np.errstate(divide='ignore'):
+            result.ratio = 1 / inverse
+
+        return result
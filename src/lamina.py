@@ -2,10 +2,11 @@ from material import Material
 
 import numpy as np
 import matplotlib.pyplot as plt
-from dataclasses import dataclass
+from dataclasses import field, replace
 from typing import Union, List
-from properties import StateProperties
+from properties import _value_type, _ValueType, StateProperties
 from compositeMaterial import CompositeMaterial
+from micromechanics import composite_material
 from conversion import (
     to_epsilon,
     to_gamma,
@@ -17,8 +18,8 @@ from conversion import (
 import copy
 
 
-@dataclass
-class LaminaProperties:
+@_value_type
+class LaminaProperties(_ValueType):
     material: Material = None
     material_fiber: Material = None
     material_matrix: Material = None
@@ -26,9 +27,16 @@ class LaminaProperties:
     Vol_m: float = 1.0
     thickness: float = 0.0
     orientation: float = 0.0
+    micromechanics: str = 'halpin_tsai'
+    _hash: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._freeze()
 
 
 class Lamina(CompositeMaterial):
+    __slots__ = ('props', 'local_state', 'matrices')
+
     def __init__(
         self,
         mat_fiber: Material = None,
@@ -38,6 +46,7 @@ class Lamina(CompositeMaterial):
         Vol_matrix: float = 1.0,
         thickness: float = 0.0,
         array_geometry: int = 1,
+        micromechanics: str = 'halpin_tsai',
     ):
         '''
         Create a single lamina using known fiber and matrix materials or assigned with a predetermined composite material.
@@ -50,6 +59,8 @@ class Lamina(CompositeMaterial):
             Vol_matrix (float, optional): Matrix volume fraction. Defaults to 1.0.
             thickness (float, optional): Lamina thickness. Defaults to 0.0.
             array_geometry (int, optional): Matrix array geometry constant.  1 = Hexagonal array, 2 = Square array. Defaults to 1.
+            micromechanics (str, optional): Micromechanics model of the composite, see micromechanics.available_models.
+                                            Defaults to 'halpin_tsai'.
         '''
 
         if not Vol_fiber:
@@ -60,9 +71,9 @@ class Lamina(CompositeMaterial):
         if mat_composite is None:
             if (mat_fiber is not None) & (mat_matrix is not None):
 
-                # Create composite from the fiber and matrix materials
-                material = self._create_composite(
-                    mat_fiber, mat_matrix, Vol_fiber, array_geometry
+                # Create composite from the fiber and matrix materials, memoized per model and volume fraction
+                material = composite_material(
+                    mat_fiber, mat_matrix, Vol_fiber, micromechanics, array_geometry
                 )
 
             elif mat_matrix is not None:
@@ -76,7 +87,7 @@ class Lamina(CompositeMaterial):
 
         # Set the lamina properties to the passed in values
         self.props = LaminaProperties(
-            material, mat_fiber, mat_matrix, Vol_fiber, Vol_matrix, thickness, 0,
+            material, mat_fiber, mat_matrix, Vol_fiber, Vol_matrix, thickness, 0, micromechanics,
         )
 
         # Initialize the stress and strain states
@@ -86,7 +97,15 @@ class Lamina(CompositeMaterial):
         self.matrices = ConversionMatrices(material)
 
     def copy(self):
-        return copy.deepcopy(self)
+        '''
+        Copy of the lamina that can be oriented independently. The immutable properties, material and state are
+        shared, only the orientation dependent matrices are copied.
+        '''
+
+        new = copy.copy(self)
+        new.matrices = copy.copy(self.matrices)
+
+        return new
 
     def set_orientation(self, theta_deg: float = 0.0) -> None:
         '''
@@ -97,7 +116,7 @@ class Lamina(CompositeMaterial):
         '''
 
         # Store orientation in radians
-        self.props.orientation = theta_deg * np.pi / 180
+        self.props = replace(self.props, orientation=theta_deg * np.pi / 180)
 
         # Updates transformation matrices with new orientation
         self.matrices.update_orientation(self.props.orientation)
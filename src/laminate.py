@@ -1,14 +1,18 @@
 import numpy as np
 from typing import List
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 from lamina import Lamina
 from properties import StateProperties
 from conversion import tensor_to_vec
+from stacking import parse_stacking
+from nonlinear import NonlinearLaminate
+from envelope import failure_envelope
+import clt
 
 
 class Laminate:
-    def __init__(self, length: int = 0, width: int = 0):
+    def __init__(self, length: int = 0, width: int = 0, shear_correction: float = 5 / 6):
 
         self.num_layers: int = 0
         self.thickness: int = 0
@@ -19,6 +23,32 @@ class Laminate:
         self.global_state: List[StateProperties] = []
         self.mid_plane_state: StateProperties = StateProperties()
         self._ABD: np.ndarray = None
+        self._ABDH: np.ndarray = None
+        self.shear_correction: float = shear_correction
+        self.symmetric: bool = False
+        self.balanced: bool = False
+
+    @classmethod
+    def from_stacking(
+        cls, notation: str, lamina: Lamina, length: int = 0, width: int = 0
+    ) -> 'Laminate':
+        '''
+        Creates a laminate from a stacking sequence in laminate code notation, e.g. '[0/±45/90]3s'.
+
+        Args:
+            notation (str): Stacking sequence. See stacking.parse_stacking for the supported notation.
+            lamina (Lamina): Lamina used for every ply.
+            length (int, optional): Laminate length. Defaults to 0.
+            width (int, optional): Laminate width. Defaults to 0.
+
+        Returns:
+            Laminate: The assembled laminate.
+        '''
+
+        lam = cls(length, width)
+        lam.add_stack(lamina, parse_stacking(notation))
+
+        return lam
 
     def __str__(self):
 
@@ -51,11 +81,47 @@ class Laminate:
         self.thickness += lamina_copy.props.thickness
         self.num_layers += 1
 
+        self._update()
+
+    def add_stack(self, new_lamina: Lamina, orientations_deg: np.ndarray) -> None:
+        '''
+        Adds several plies of the same lamina to the top of the laminate stack and assembles the ABD matrix once.
+        The orientation dependent matrices are computed once per distinct angle; every ply gets its own lamina object
+        and only shares the immutable properties and matrices with the plies of the same orientation.
+
+            Parameters:
+                new_lamina (Lamina):              the constructed lamina object to be added to the laminate.
+                orientations_deg (numpy.ndarray): orientation of every ply in degrees, ordered from the bottom ply.
+        '''
+
+        orientations_deg = np.asarray(orientations_deg, dtype=float)
+        angles, index = np.unique(orientations_deg, return_inverse=True)
+
+        # Orient one copy per distinct angle, the plies are copies of these that can be reoriented independently
+        oriented = []
+        for angle in angles:
+            lamina_copy = new_lamina.copy()
+            lamina_copy.set_orientation(angle)
+            oriented.append(lamina_copy)
+
+        self.lamina.extend(oriented[i].copy() for i in index.ravel())
+
+        # Update laminate properties
+        self.thickness += new_lamina.props.thickness * orientations_deg.size
+        self.num_layers += orientations_deg.size
+
+        self._update()
+
+    def _update(self) -> None:
+
         # Determine layer heights
         self.calc_heights()
 
-        # Construct the ABD matrix
-        self._ABD = self.ABD_matrix()
+        # Construct the ABD and transverse shear matrices and check for decoupled membrane and bending behaviour
+        self._ABDH = self.ABDH_matrix()
+        self._ABD = self._ABDH[:6, :6].copy()
+        self.symmetric = bool(clt.is_symmetric(self._ABD))
+        self.balanced = bool(clt.is_balanced(self._ABD))
 
     def calc_heights(self):
 
@@ -122,7 +188,73 @@ class Laminate:
     def apply_load(self, NM_matrix: np.ndarray) -> None:
 
         # Calculate the midplane strains due to the appllied loads and moments
-        self.mid_plane_state.strain = np.linalg.inv(self._ABD).dot(NM_matrix)
+        self.mid_plane_state = replace(self.mid_plane_state, strain=self.midplane_strain(NM_matrix))
+
+    def midplane_strain(self, NM_matrix: np.ndarray) -> np.ndarray:
+        '''
+        Solves for the midplane strains and curvatures of one or many applied loads. Symmetric laminates
+        (B = 0) solve the decoupled 3x3 membrane and bending systems instead of the full 6x6 system.
+        Resultants that include the transverse shear forces [Qy, Qx] are solved with the FSDT matrix ABDH.
+
+        Args:
+            NM_matrix (np.ndarray): Force and moment resultants with shape (6,) or (n_samples, 6), or with the
+                                    shear forces appended, (8,) or (n_samples, 8).
+
+        Returns:
+            np.ndarray: Midplane strains and curvatures (and transverse shear strains [g_yz, g_xz]) with the same
+                        shape as NM_matrix.
+        '''
+
+        if np.shape(NM_matrix)[-1] == 8:
+            return clt.solve_ABDH(
+                self._ABDH,
+                NM_matrix,
+                symmetric=self.symmetric,
+                balanced=self.symmetric and self.balanced,
+            )
+
+        return clt.solve_ABD(
+            self._ABD,
+            NM_matrix,
+            symmetric=self.symmetric,
+            balanced=self.symmetric and self.balanced,
+        )
+
+    def solve_nonlinear(self, NM_matrix: np.ndarray, shear_law, n_points: int = 2, **kwargs):
+        '''
+        Incremental-iterative solution with a nonlinear in-plane shear law of the plies. See
+        nonlinear.NonlinearLaminate.solve for the load path and solver options.
+
+        Args:
+            NM_matrix (np.ndarray): Final force and moment resultants with shape (6,) or (n_loads, 6), or a load
+                                    path with shape (n_steps, n_loads, 6).
+            shear_law (HahnTsai, RambergOsgood): Nonlinear shear law of the plies.
+            n_points (int, optional): Gauss points through the thickness of every ply. Defaults to 2.
+
+        Returns:
+            NonlinearResult: Strains, ply stresses and convergence of the load path.
+        '''
+
+        return NonlinearLaminate.from_laminate(self, shear_law, n_points).solve(NM_matrix, **kwargs)
+
+    def failure_envelope(self, strength, components=('Nx', 'Ny'), criterion: str = 'tsai_wu', **kwargs):
+        '''
+        First-ply failure envelope over two or three load resultants, or the envelope of a failure predicate of a
+        nonlinear or progressive analysis. See envelope.failure_envelope for the refinement options.
+
+        Args:
+            strength (PlyStrength): Ply strengths, None with a failure predicate fails=... only.
+            components (Sequence[Union[str, int]], optional): Load resultants, names of envelope.COMPONENTS or
+                                                               indices. Defaults to ('Nx', 'Ny').
+            criterion (str, optional): Failure criterion, see failure.strength_ratio. Defaults to 'tsai_wu'.
+
+        Returns:
+            FailureEnvelope: Rays, radii and critical plies of the envelope.
+        '''
+
+        Q_bar, _, T = self._ply_matrices()
+
+        return failure_envelope(self._ABD, Q_bar, T, self._z, strength, components, criterion, **kwargs)
 
     def get_state_at_height(self, z: int, layer: int = 1):
 
@@ -137,6 +269,54 @@ class Laminate:
         )
         return StateProperties(stress, strain)
 
+    def get_ply_stresses(self, NM_matrix: np.ndarray, local: bool = True) -> np.ndarray:
+        '''
+        Recovers the in-plane stresses at the mid-height of every ply for one or many applied loads.
+
+        Args:
+            NM_matrix (np.ndarray): Force and moment resultants [Nx, Ny, Nxy, Mx, My, Mxy]. Shape (6,) or (n_samples, 6).
+            local (bool, optional): Return the stresses in the lamina principal directions [s1, s2, t12]
+                                    instead of the laminate axes [sx, sy, txy]. Defaults to True.
+
+        Returns:
+            np.ndarray: Ply stresses with shape (n_samples, n_plies, 3).
+        '''
+
+        NM = np.atleast_2d(NM_matrix)
+
+        # Midplane strains and curvatures for every load sample
+        strain = self.midplane_strain(NM)
+
+        # Strain at the mid-height of each ply
+        z_mid = 0.5 * (self._z[1:] + self._z[:-1])
+        e = strain[:, None, :3] + z_mid[None, :, None] * strain[:, None, 3:]
+
+        Q_bar, _, T = self._ply_matrices()
+        stress = np.einsum('pij,npj->npi', Q_bar, e)
+
+        if local:
+            stress = np.einsum('pij,npj->npi', T, stress)
+
+        return stress
+
+    def transverse_shear_stress(self, Q: np.ndarray, n_points: int = 5):
+        '''
+        Recovers the through-thickness transverse shear stress profiles from the equilibrium equations for one or
+        many shear force resultants. See clt.transverse_shear_stress.
+
+        Args:
+            Q (np.ndarray): Transverse shear resultants [Qy, Qx] with shape (2,) or (n_samples, 2).
+            n_points (int, optional): Evaluation points per ply, including both ply faces. Defaults to 5.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Heights with shape (n_plies, n_points) and the stresses [t_yz, t_xz]
+                                           with shape (n_plies, n_points, 2) or (n_samples, n_plies, n_points, 2).
+        '''
+
+        Q_bar, _, _ = self._ply_matrices()
+
+        return clt.transverse_shear_stress(self._ABD, Q_bar, self._z, Q, n_points)
+
     def get_lamina(self, layer_num: int = None) -> Lamina:
         '''
         Returns the lamina object at the given layer or the collection of all lamina in the laminate stack.
@@ -152,32 +332,30 @@ class Laminate:
 
         return self.lamina[layer_num - 1]
 
-    def ABD_matrix(self) -> np.ndarray:
+    def _ply_matrices(self):
+        '''
+        Stacked ply matrices in stacking order: transformed reduced stiffness Q_bar (n_plies, 3, 3), transverse
+        shear stiffness (n_plies, 2, 2) and planar stress transformation T_2D (n_plies, 3, 3).
+        '''
 
-        A = np.zeros((3, 3))
-        B = np.zeros((3, 3))
-        D = np.zeros((3, 3))
+        Q_bar = np.stack([lamina.matrices.Q_bar_reduced for lamina in self.lamina])
+        Q_shear = np.stack([lamina.matrices.Q_bar[3:5, 3:5] for lamina in self.lamina])
+        T = np.stack([lamina.matrices.T_2D for lamina in self.lamina])
 
-        for i, lamina in enumerate(self.lamina, start=1):
-            # A matrix is working
-            A += lamina.matrices.Q_bar_reduced * (self._z[i] - self._z[i - 1])
+        return Q_bar, Q_shear, T
 
-            B += (
-                0.5
-                * lamina.matrices.Q_bar_reduced
-                * (self._z[i] ** 2 - self._z[i - 1] ** 2)
-            )
+    def ABD_matrix(self) -> np.ndarray:
 
-            D += (
-                (1 / 3)
-                * lamina.matrices.Q_bar_reduced
-                * (self._z[i] ** 3 - self._z[i - 1] ** 3)
-            )
+        Q_bar, _, _ = self._ply_matrices()
+
+        return clt.ABD_matrix(Q_bar, self._z)
 
-        ABD = np.zeros((6, 6))
-        ABD[:3, :3] = A
-        ABD[3:, :3] = ABD[:3, 3:] = B
-        ABD[3:, 3:] = D
+    def ABDH_matrix(self) -> np.ndarray:
+        '''
+        First-order shear deformation stiffness matrix with the transverse shear block H = [[A44, A45], [A45, A55]]
+        taken from the 23 and 13 terms of the full ply stiffness Q_bar and scaled by the shear correction factor.
+        '''
 
-        return ABD
+        Q_bar, Q_shear, _ = self._ply_matrices()
 
+        return clt.ABD_matrix(Q_bar, self._z, Q_shear, self.shear_correction)
@@ -1,28 +1,100 @@
 import numpy as np
-from dataclasses import dataclass
-from properties import type_check
+from dataclasses import field, replace
+from typing import Dict
+from properties import _value_type, _ValueType, PropertyCurve, readonly_vector
 
 
-@dataclass
-class MaterialProperties:
+# Material properties that can be given as functions of temperature and moisture concentration
+STATE_PROPERTIES = ('E', 'v', 'G', 'alpha', 'beta')
+
+
+@_value_type
+class MaterialProperties(_ValueType):
     E: np.ndarray = None
     v: np.ndarray = None
     G: np.ndarray = None
     alpha: np.ndarray = None
     beta: np.ndarray = None
     name: str = ''
+    curves: tuple = ()
+    _hash: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+
+        # Single values become vectors, arrays are copied and made read-only
+        for name in ('E', 'v', 'G', 'alpha', 'beta'):
+            object.__setattr__(self, name, readonly_vector(getattr(self, name)))
+
+        # Property curves are stored as sorted (name, curve) pairs
+        curves = dict(self.curves)
+        for name in curves:
+            if name not in STATE_PROPERTIES:
+                raise ValueError(f'Unknown property curve {name!r}, expected one of {list(STATE_PROPERTIES)}.')
+        object.__setattr__(self, 'curves', tuple(sorted(curves.items())))
+
+        self._freeze()
 
 
 class Material:
-    def __init__(self, E=None, v=None, G=None, alpha=None, beta=None, name=''):
+    __slots__ = ('props',)
+
+    def __init__(
+        self, E=None, v=None, G=None, alpha=None, beta=None, name='', curves: Dict[str, PropertyCurve] = None
+    ):
+        '''
+        Immutable material. Materials compare and hash by their properties, so they can be shared between plies
+        and used as cache keys.
 
-        props = MaterialProperties(E, v, G, alpha, beta, name)
-        props = type_check(props)
+        Properties that depend on temperature and moisture concentration are given as curves, e.g.
+        curves={'E': PropertyCurve(T, E_T), 'alpha': PropertyCurve(T, alpha_T)}. The constant properties are the
+        values at the reference state, see properties_at.
+        '''
+
+        curves = dict(curves or {})
+        props = MaterialProperties(E, v, G, alpha, beta, name, tuple(curves.items()))
 
         if np.sum(props.G) == 0:
-            props.G = props.E / (2 * (1 + props.v))
+            props = replace(props, G=props.E / (2 * (1 + props.v)))
+
+            # Isotropic shear moduli follow the E and v curves
+            if ('E' in curves or 'v' in curves) and 'G' not in curves:
+                grid = curves.get('E', curves.get('v'))
+                T, C = np.meshgrid(grid.T, grid.C, indexing='ij')
+                E_T = curves['E'](T, C) if 'E' in curves else props.E
+                v_T = curves['v'](T, C) if 'v' in curves else props.v
+                curves['G'] = PropertyCurve(grid.T, E_T / (2 * (1 + v_T)), grid.C)
+                props = replace(props, curves=tuple(curves.items()))
+
+        object.__setattr__(self, 'props', props)
+
+    @classmethod
+    def from_properties(cls, props: MaterialProperties) -> 'Material':
+        '''Material of existing properties, without repeating the conversions.'''
+
+        mat = cls.__new__(cls)
+        object.__setattr__(mat, 'props', props)
+
+        return mat
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable, create a new material instead.')
 
-        self.props = props
+    def __eq__(self, other):
+        if not isinstance(other, Material):
+            return NotImplemented
+        return self.props == other.props
+
+    def __hash__(self):
+        return hash(self.props)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return Material.from_properties, (self.props,)
 
     def __str__(self):
         desc = f'''
@@ -52,6 +124,40 @@ class Material:
         '''
         return desc
 
+    @property
+    def curves(self) -> Dict[str, PropertyCurve]:
+        '''Property curves by property name.'''
+
+        return dict(self.props.curves)
+
+    def properties_at(self, T, C=0.0) -> Dict[str, np.ndarray]:
+        '''
+        Properties at one or many temperature and moisture states. Properties without a curve keep their
+        constant value. Expansion coefficients are secant values, the free strain is alpha (T - T_ref).
+
+        Args:
+            T (float, np.ndarray): Temperatures with shape (...).
+            C (float, np.ndarray, optional): Moisture concentrations broadcastable against T. Defaults to 0.
+
+        Returns:
+            Dict[str, np.ndarray]: E, v, G, alpha and beta with shape (..., 3).
+        '''
+
+        shape = np.broadcast(np.asarray(T), np.asarray(C)).shape
+        curves = self.curves
+
+        return {
+            name: curves[name](T, C) if name in curves else np.broadcast_to(getattr(self.props, name), shape + (3,))
+            for name in STATE_PROPERTIES
+        }
+
+    def at(self, T: float, C: float = 0.0) -> 'Material':
+        '''Material with the constant properties of a single temperature and moisture state.'''
+
+        state = self.properties_at(float(T), float(C))
+
+        return Material(name=self.props.name, **state)
+
     def get_properties(self):
 
         return self.props.E, self.props.v, self.props.G
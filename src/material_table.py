@@ -0,0 +1,511 @@
+import numpy as np
+from typing import List, Union
+
+from material import Material
+from lamina import Lamina
+from laminate import Laminate
+from conversion import ConversionMatrices, tensor_to_vec, transformation_matrix_2D, transformation_matrix_3D
+from stacking import parse_stacking
+from properties import StateProperties, _interval
+import clt
+
+
+class MaterialTable:
+    def __init__(self):
+        '''
+        Table of the ply materials of one or many laminates. Every material is stored once with its orientation
+        independent invariants, plies refer to it by its integer id.
+        '''
+
+        self.materials: List[Material] = []
+        self.names: List[str] = []
+        self.thickness: List[float] = []
+
+        # Objects added to the table by identity, kept alive so that their ids stay unique
+        self._ids = {}
+        self._sources = []
+        self._arrays = None
+        self._states = {}
+
+    def __len__(self):
+        return len(self.materials)
+
+    def __contains__(self, item):
+        return id(item) in self._ids
+
+    def add(self, material: Union[Material, Lamina], thickness: float = None, name: str = None) -> int:
+        '''
+        Adds a material to the table. Adding the same object again returns its existing id.
+
+        Args:
+            material (Material, Lamina): Ply material, or a lamina providing the material and ply thickness.
+            thickness (float, optional): Default ply thickness of the material. Defaults to the lamina thickness.
+            name (str, optional): Material name. Defaults to the material name.
+
+        Returns:
+            int: Material id.
+        '''
+
+        if id(material) in self._ids:
+            return self._ids[id(material)]
+
+        if isinstance(material, Lamina):
+            mat = material.get_material()
+            thickness = material.props.thickness if thickness is None else thickness
+        else:
+            mat = material
+
+        idx = len(self.materials)
+        self._ids[id(material)] = idx
+        self._sources.append(material)
+
+        self.materials.append(mat)
+        self.names.append(name if name is not None else mat.props.name)
+        self.thickness.append(0.0 if thickness is None else float(thickness))
+        self._arrays = None
+        self._states = {}
+
+        return idx
+
+    def material_id(self, material: Union[int, str, Material, Lamina]) -> int:
+        '''Returns the id of a material given by id, name or object. Unknown objects are added to the table.'''
+
+        if isinstance(material, (int, np.integer)):
+            if not 0 <= material < len(self):
+                raise IndexError(f'Material id {material} is not in the table.')
+            return int(material)
+
+        if isinstance(material, str):
+            if material not in self.names:
+                raise KeyError(f'Unknown material {material!r}.')
+            return self.names.index(material)
+
+        return self.add(material)
+
+    def _invariants(self) -> dict:
+        '''Stacked per-material matrices, computed once and reused by every ply and laminate.'''
+
+        if self._arrays is None:
+            matrices = [ConversionMatrices(mat) for mat in self.materials]
+
+            self._arrays = {
+                'S': np.stack([m.S for m in matrices]),
+                'C': np.stack([m.C for m in matrices]),
+                'Q': np.stack([m.C_reduced for m in matrices]),
+                'G': np.stack([mat.props.G for mat in self.materials]).astype(float),
+                'alpha': np.stack([mat.props.alpha for mat in self.materials]).astype(float),
+                'beta': np.stack([mat.props.beta for mat in self.materials]).astype(float),
+                'thickness': np.array(self.thickness),
+            }
+
+        return self._arrays
+
+    def state_bins(self) -> tuple:
+        '''Sorted temperature and moisture breakpoints of all property curves of the table.'''
+
+        curves = [curve for mat in self.materials for _, curve in mat.props.curves]
+        T = np.unique(np.concatenate([curve.T for curve in curves])) if curves else np.zeros(1)
+        C = np.unique(np.concatenate([curve.C for curve in curves])) if curves else np.zeros(1)
+
+        return T, C
+
+    def state_invariants(self, T: np.ndarray, C: np.ndarray) -> dict:
+        '''
+        Reduced stiffness and expansion coefficients of every material at temperature and moisture states. Each
+        state is evaluated once and cached, the table is meant to be queried at a fixed set of state bins.
+
+        Args:
+            T (np.ndarray): Temperatures with shape (n_states,).
+            C (np.ndarray): Moisture concentrations with shape (n_states,).
+
+        Returns:
+            dict: Q (n_states, n_materials, 3, 3), alpha and beta (n_states, n_materials, 3).
+        '''
+
+        keys = list(zip(np.asarray(T, dtype=float).ravel().tolist(), np.asarray(C, dtype=float).ravel().tolist()))
+        missing = [key for key in dict.fromkeys(keys) if key not in self._states]
+
+        if missing:
+            T_new, C_new = np.array(missing).T
+            props = [mat.properties_at(T_new, C_new) for mat in self.materials]
+            stacked = {name: np.stack([p[name] for p in props], axis=1) for name in ('E', 'v', 'G', 'alpha', 'beta')}
+            Q = clt.reduced_stiffness(stacked['E'], stacked['v'], stacked['G'])
+
+            for k, key in enumerate(missing):
+                self._states[key] = (Q[k], stacked['alpha'][k], stacked['beta'][k])
+
+        Q, alpha, beta = (np.stack(values) for values in zip(*(self._states[key] for key in keys)))
+
+        return {'Q': Q, 'alpha': alpha, 'beta': beta}
+
+    @property
+    def S(self) -> np.ndarray:
+        '''Compliance matrices with shape (n_materials, 6, 6).'''
+        return self._invariants()['S']
+
+    @property
+    def C(self) -> np.ndarray:
+        '''Stiffness matrices with shape (n_materials, 6, 6).'''
+        return self._invariants()['C']
+
+    @property
+    def Q(self) -> np.ndarray:
+        '''Reduced (planar) stiffness matrices with shape (n_materials, 3, 3).'''
+        return self._invariants()['Q']
+
+    @property
+    def alpha(self) -> np.ndarray:
+        '''Thermal expansion coefficients [a1, a2, a3] with shape (n_materials, 3).'''
+        return self._invariants()['alpha']
+
+    @property
+    def beta(self) -> np.ndarray:
+        '''Moisture expansion coefficients [b1, b2, b3] with shape (n_materials, 3).'''
+        return self._invariants()['beta']
+
+
+class TableLaminate(Laminate):
+    def __init__(
+        self,
+        table: MaterialTable = None,
+        length: int = 0,
+        width: int = 0,
+        shear_correction: float = 5 / 6,
+    ):
+        '''
+        Laminate whose plies store an integer material id into a shared MaterialTable instead of an oriented
+        copy of their lamina. The ply matrices are evaluated once per distinct (material, orientation) pair and
+        gathered into the stack, so large mixed stacks such as sandwich panels (face sheets, adhesive and core)
+        assemble as fast as single material ones.
+
+        Args:
+            table (MaterialTable, optional): Material table. Defaults to a new, empty table.
+            length (int, optional): Laminate length. Defaults to 0.
+            width (int, optional): Laminate width. Defaults to 0.
+            shear_correction (float, optional): Transverse shear correction factor. Defaults to 5/6.
+        '''
+
+        super().__init__(length, width, shear_correction)
+
+        self.table: MaterialTable = MaterialTable() if table is None else table
+        self.material_ids: np.ndarray = np.zeros(0, dtype=int)
+        self.orientations: np.ndarray = np.zeros(0)
+        self.ply_thickness: np.ndarray = np.zeros(0)
+
+        self._matrices = None
+        self._compliance = None
+        self._environment = {}
+
+    @classmethod
+    def from_stacking(
+        cls,
+        notation: str,
+        lamina: Union[int, str, Material, Lamina],
+        length: int = 0,
+        width: int = 0,
+        table: MaterialTable = None,
+    ) -> 'TableLaminate':
+        '''
+        Creates a laminate of a single material from a stacking sequence. See stacking.parse_stacking.
+        '''
+
+        lam = cls(table, length, width)
+        lam.add_stack(lamina, parse_stacking(notation))
+
+        return lam
+
+    def __str__(self):
+
+        desc = f'''
+        - Layers: {self.num_layers}
+        - Materials: {'/'.join(self.table.names[i] or str(i) for i in self.material_ids)}
+        - Orientation:  {'/'.join(str(round(angle)) for angle in self.orientations)}
+        '''
+        return desc
+
+    def add_lamina(
+        self, new_lamina: Union[int, str, Material, Lamina], orientation_deg: float = 0, thickness: float = None
+    ) -> None:
+        '''
+        Adds a single ply to the top of the laminate stack.
+
+            Parameters:
+                new_lamina (int, str, Material, Lamina): material id, name or object. Objects are added to the table.
+                orientation_deg (float):                 orientation of the ply in degrees.
+                thickness (float, optional):             ply thickness. Defaults to the table thickness of the material.
+        '''
+
+        self.add_stack(new_lamina, [orientation_deg], thickness)
+
+    def add_stack(
+        self,
+        new_lamina: Union[int, str, Material, Lamina, np.ndarray],
+        orientations_deg: np.ndarray,
+        thickness: Union[float, np.ndarray] = None,
+    ) -> None:
+        '''
+        Adds several plies to the top of the laminate stack and assembles the ABD matrix once.
+
+            Parameters:
+                new_lamina (int, str, Material, Lamina, numpy.ndarray): material of all plies, or an array of
+                                                                        material ids with one entry per ply.
+                orientations_deg (numpy.ndarray):                       orientation of every ply in degrees,
+                                                                        ordered from the bottom ply.
+                thickness (float, numpy.ndarray, optional):             ply thicknesses. Defaults to the table
+                                                                        thickness of each material.
+        '''
+
+        orientations_deg = np.atleast_1d(np.asarray(orientations_deg, dtype=float)).ravel()
+
+        if isinstance(new_lamina, (np.ndarray, list, tuple)):
+            ids = np.asarray(new_lamina, dtype=int).ravel()
+            if ids.size and not (0 <= ids.min() and ids.max() < len(self.table)):
+                raise IndexError('Material ids must refer to materials in the table.')
+        else:
+            ids = np.full(orientations_deg.size, self.table.material_id(new_lamina))
+
+        ids, orientations_deg = np.broadcast_arrays(ids, orientations_deg)
+
+        if thickness is None:
+            thickness = self.table._invariants()['thickness'][ids]
+        thickness = np.broadcast_to(np.asarray(thickness, dtype=float), ids.shape)
+
+        if np.any(thickness <= 0):
+            raise ValueError('Ply thicknesses must be positive.')
+
+        self.material_ids = np.concatenate([self.material_ids, ids])
+        self.orientations = np.concatenate([self.orientations, orientations_deg])
+        self.ply_thickness = np.concatenate([self.ply_thickness, thickness])
+
+        # Update laminate properties
+        self.thickness = float(self.ply_thickness.sum())
+        self.num_layers = self.ply_thickness.size
+
+        self._update()
+
+    def _update(self) -> None:
+
+        self._matrices = None
+        self._compliance = None
+        self._environment = {}
+        super()._update()
+
+    def calc_heights(self):
+
+        self._z = clt.ply_heights(self.ply_thickness)
+
+    def _ply_matrices(self):
+        '''
+        Ply matrices gathered from the distinct (material, orientation) pairs of the stack. See Laminate._ply_matrices.
+        '''
+
+        if self._matrices is None:
+            table = self.table._invariants()
+
+            pairs, index = np.unique(
+                np.stack([self.material_ids, self.orientations], axis=-1), axis=0, return_inverse=True
+            )
+            ids = pairs[:, 0].astype(int)
+            theta = np.deg2rad(pairs[:, 1])
+
+            Q_bar = clt.transformed_reduced_stiffness(table['Q'][ids], theta)
+            Q_shear = clt.transformed_shear_stiffness(table['G'][ids], theta)
+            T = transformation_matrix_2D(theta)
+
+            index = index.ravel()
+            self._matrices = (Q_bar[index], Q_shear[index], T[index])
+
+        return self._matrices
+
+    def _ply_compliance(self) -> np.ndarray:
+        '''
+        Transformed 3D compliance matrices S_bar of every ply with shape (n_plies, 6, 6), evaluated once per distinct
+        (material, orientation) pair.
+        '''
+
+        if self._compliance is None:
+            pairs, index = np.unique(
+                np.stack([self.material_ids, self.orientations], axis=-1), axis=0, return_inverse=True
+            )
+            T = transformation_matrix_3D(np.deg2rad(pairs[:, 1]))
+            S_bar = np.swapaxes(T, -1, -2) @ self.table._invariants()['S'][pairs[:, 0].astype(int)] @ T
+
+            self._compliance = S_bar[index.ravel()]
+
+        return self._compliance
+
+    def apply_stress(self, global_stress_tensor: np.ndarray) -> None:
+        '''
+        Assign the global stress/strain state of every ply from the given applied stress. The plies hold no lamina
+        objects, so no local states are stored.
+
+            Parameters:
+                global_stress_tensor (numpy.ndarray):   Global stress tensor to be applied
+        '''
+
+        s_global = tensor_to_vec(global_stress_tensor)
+        e_global = self._ply_compliance() @ s_global
+
+        self.global_state = [StateProperties(s_global, e) for e in e_global]
+
+    def apply_strain(self, global_strain_tensor: np.ndarray) -> None:
+        '''
+        Assign the global stress/strain state of every ply from the given applied strain. The plies hold no lamina
+        objects, so no local states are stored.
+
+            Parameters:
+                global_strain_tensor (numpy.ndarray):   Global strain tensor to be applied
+        '''
+
+        e_global = tensor_to_vec(global_strain_tensor)
+        s_global = np.linalg.inv(self._ply_compliance()) @ e_global
+
+        self.global_state = [StateProperties(s, e_global) for s in s_global]
+
+    def get_state_at_height(self, z: int, layer: int = 1):
+        '''
+        In-plane strain and stress at height z of the given layer (1 based) from the mid-plane state.
+        '''
+
+        e = self.mid_plane_state.strain[:3]
+        k = self.mid_plane_state.strain[3:]
+
+        strain = e + z * k
+
+        stress = self._ply_matrices()[0][layer - 1].dot(strain)
+        print(f'\n Properties at Layer {layer} ({round(self.orientations[layer - 1], 0)})')
+        return StateProperties(stress, strain)
+
+    def get_lamina(self, layer_num: int = None):
+        '''
+        Returns the material of the given layer or of all layers in the stack. Index is 1 based.
+        '''
+
+        if not layer_num:
+            return [self.table.materials[i] for i in self.material_ids]
+
+        return self.table.materials[self.material_ids[layer_num - 1]]
+
+    def hygrothermal_resultants(
+        self, delta_T: Union[float, np.ndarray] = 0.0, delta_C: Union[float, np.ndarray] = 0.0
+    ) -> np.ndarray:
+        '''
+        Free expansion force and moment resultants of a uniform temperature and moisture change,
+
+            [N, M]_HT = sum Q_bar [alpha_bar dT + beta_bar dC] [z_k - z_k-1, (z_k^2 - z_k-1^2) / 2]
+
+        Args:
+            delta_T (float, np.ndarray): Temperature change with shape (...). Defaults to 0.
+            delta_C (float, np.ndarray): Moisture concentration change with shape (...). Defaults to 0.
+
+        Returns:
+            np.ndarray: Resultants [Nx, Ny, Nxy, Mx, My, Mxy] with shape (..., 6).
+        '''
+
+        table = self.table._invariants()
+        ids = self.material_ids
+
+        delta_T = np.asarray(delta_T, dtype=float)[..., None, None]
+        delta_C = np.asarray(delta_C, dtype=float)[..., None, None]
+
+        # Local free strains [e1, e2, g12], the resulting stresses are rotated into the laminate axes
+        T_inv = transformation_matrix_2D(-np.deg2rad(self.orientations))
+        e_free = table['alpha'][ids][:, [0, 1]] * delta_T + table['beta'][ids][:, [0, 1]] * delta_C
+        s_local = np.einsum('pij,...pj->...pi', table['Q'][ids][:, :, :2], e_free)
+        s_global = np.einsum('pij,...pj->...pi', T_inv, s_local)
+
+        z0, z1 = self._z[:-1], self._z[1:]
+        N = np.einsum('p,...pi->...i', z1 - z0, s_global)
+        M = np.einsum('p,...pi->...i', (z1 ** 2 - z0 ** 2) / 2, s_global)
+
+        return np.concatenate([N, M], axis=-1)
+
+    def _state_response(self, T: np.ndarray, C: np.ndarray) -> tuple:
+        '''
+        ABD matrices and the resultants per unit temperature and moisture change at state bins, each bin is
+        assembled once and cached. Returns ABD (n_states, 6, 6), K_T and K_C (n_states, 6).
+        '''
+
+        keys = list(zip(T.ravel().tolist(), C.ravel().tolist()))
+        missing = [key for key in dict.fromkeys(keys) if key not in self._environment]
+
+        if missing:
+            T_new, C_new = np.array(missing).T
+            state = self.table.state_invariants(T_new, C_new)
+            ids = self.material_ids
+            theta = np.deg2rad(self.orientations)
+
+            # Ply stiffnesses of all new states at once
+            Q = state['Q'][:, ids]
+            Q_bar = clt.transformed_reduced_stiffness(Q, theta)
+            ABD = clt.ABD_matrix(Q_bar, self._z)
+
+            # Resultants of a unit temperature or moisture change, see hygrothermal_resultants
+            T_inv = transformation_matrix_2D(-theta)
+            z0, z1 = self._z[:-1], self._z[1:]
+            K = []
+            for coefficient in (state['alpha'], state['beta']):
+                s_local = np.einsum('npij,npj->npi', Q[..., :2], coefficient[:, ids][..., :2])
+                s_global = np.einsum('pij,npj->npi', T_inv, s_local)
+                N = np.einsum('p,npi->ni', z1 - z0, s_global)
+                M = np.einsum('p,npi->ni', (z1 ** 2 - z0 ** 2) / 2, s_global)
+                K.append(np.concatenate([N, M], axis=-1))
+
+            for k, key in enumerate(missing):
+                self._environment[key] = (ABD[k], K[0][k], K[1][k])
+
+        ABD, K_T, K_C = (np.stack(values) for values in zip(*(self._environment[key] for key in keys)))
+
+        return ABD, K_T, K_C
+
+    def environmental_response(
+        self,
+        T: Union[float, np.ndarray],
+        C: Union[float, np.ndarray] = 0.0,
+        T_ref: float = 20.0,
+        C_ref: float = 0.0,
+        bins: tuple = None,
+    ) -> tuple:
+        '''
+        ABD matrices and free expansion resultants for many temperature and moisture states in one pass. Only
+        TableLaminate has an environmental response; the plies of a Laminate are added to a TableLaminate first.
+
+        The ply stiffnesses are evaluated at state bins (by default the breakpoints of the material property
+        curves) and cached, the laminate response of a state is interpolated bilinearly between the bins. Expansion
+        coefficients are secant values, the resultants are K_T(T, C) (T - T_ref) + K_C(T, C) (C - C_ref).
+
+        Args:
+            T (float, np.ndarray): Temperatures with shape (...).
+            C (float, np.ndarray, optional): Moisture concentrations broadcastable against T. Defaults to 0.
+            T_ref (float, optional): Stress free temperature. Defaults to 20.
+            C_ref (float, optional): Stress free moisture concentration. Defaults to 0.
+            bins (tuple, optional): Temperature and moisture bins (T_bins, C_bins). Defaults to
+                                    MaterialTable.state_bins.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: ABD matrices with shape (..., 6, 6) and resultants
+                                           [Nx, Ny, Nxy, Mx, My, Mxy] with shape (..., 6).
+        '''
+
+        T, C = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(C, dtype=float))
+        T_bins, C_bins = self.table.state_bins() if bins is None else (np.atleast_1d(b).astype(float) for b in bins)
+
+        i, s = _interval(T, T_bins)
+        j, t = _interval(C, C_bins)
+        i1, j1 = np.minimum(i + 1, len(T_bins) - 1), np.minimum(j + 1, len(C_bins) - 1)
+
+        # Laminate response at every bin, assembled once per bin
+        T_nodes, C_nodes = np.meshgrid(T_bins, C_bins, indexing='ij')
+        ABD_bins, K_T, K_C = (
+            x.reshape(T_nodes.shape + x.shape[1:]) for x in self._state_response(T_nodes, C_nodes)
+        )
+
+        # Bilinear combination of the four surrounding bins
+        ABD = np.zeros(T.shape + (6, 6))
+        NM = np.zeros(T.shape + (6,))
+        dT, dC = (T - T_ref)[..., None], (C - C_ref)[..., None]
+        for ti, tj, weight in ((i, j, (1 - s) * (1 - t)), (i, j1, (1 - s) * t), (i1, j, s * (1 - t)), (i1, j1, s * t)):
+            ABD += weight[..., None, None] * ABD_bins[ti, tj]
+            NM += weight[..., None] * (K_T[ti, tj] * dT + K_C[ti, tj] * dC)
+
+        return ABD, NM
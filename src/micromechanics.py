@@ -0,0 +1,294 @@
+'''
+Registry of micromechanics models predicting the effective lamina properties of a unidirectional composite from
+its fiber and matrix.
+
+Every model is a vectorized function with the signature of compositeMaterial.composite_properties,
+
+    model(E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m, Vol_f, array_geometry=1) -> E, v, G, alpha
+
+taking constituent properties with shape (..., 3) in the [23, 13, 12] (or [1, 2, 3]) convention of Material and
+fiber volume fractions with shape (...). Fibers are transversely isotropic about the 1 axis, matrices isotropic.
+
+    halpin_tsai   Rule of mixtures and Halpin-Tsai (the CompositeMaterial model)
+    mori_tanaka   Mori-Tanaka for aligned continuous fibers, Schapery thermal expansion
+    cca           Hashin's composite cylinder assemblage, G23 from the generalized self-consistent scheme
+                  (Christensen and Lo), Schapery thermal expansion
+    chamis        Chamis' simplified micromechanics equations
+
+New models are added with the register_model decorator.
+'''
+
+import numpy as np
+from functools import lru_cache
+from typing import Callable, Dict
+
+from material import Material
+from properties import PropertyCurve
+from compositeMaterial import composite_properties
+
+
+MODELS: Dict[str, Callable] = {}
+
+
+def register_model(name: str) -> Callable:
+    '''Decorator adding a micromechanics model to the registry under the given name.'''
+
+    def decorator(model: Callable) -> Callable:
+        MODELS[name] = model
+        return model
+
+    return decorator
+
+
+def available_models() -> list:
+    '''Names of the registered micromechanics models.'''
+
+    return list(MODELS)
+
+
+def get_model(name: str) -> Callable:
+    '''Returns the micromechanics model registered under the given name.'''
+
+    if name not in MODELS:
+        raise ValueError(f'Unknown micromechanics model {name!r}, expected one of {available_models()}.')
+
+    return MODELS[name]
+
+
+register_model('halpin_tsai')(composite_properties)
+
+
+def _constituents(E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m, Vol_f):
+    '''Broadcast float arrays of the constituent properties.'''
+
+    props = [np.asarray(p, dtype=float) for p in (E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m)]
+    return props + [np.asarray(Vol_f, dtype=float)]
+
+
+def _transverse_isotropic(E_1, E_2, v_12, v_23, G_12, G_23):
+    '''Stacks the engineering constants of a transversely isotropic material into Material vectors.'''
+
+    E = np.stack(np.broadcast_arrays(E_1, E_2, E_2), axis=-1)
+    v = np.stack(np.broadcast_arrays(v_23, v_12, v_12), axis=-1)
+    G = np.stack(np.broadcast_arrays(G_23, G_12, G_12), axis=-1)
+
+    return E, v, G
+
+
+def _schapery(E_1f, alpha_1f, alpha_2f, v_12f, E_m, alpha_m, v_m, Vol_f, E_1, v_12):
+    '''Schapery's thermal expansion coefficients [a1, a2, a3].'''
+
+    Vol_m = 1 - Vol_f
+    alpha_1 = (E_1f * alpha_1f * Vol_f + E_m * alpha_m * Vol_m) / E_1
+    alpha_2 = (1 + v_12f) * alpha_2f * Vol_f + (1 + v_m) * alpha_m * Vol_m - alpha_1 * v_12
+
+    return np.stack(np.broadcast_arrays(alpha_1, alpha_2, alpha_2), axis=-1)
+
+
+def _hashin(E_f, v_f, G_f, E_m, v_m, G_m, Vol_f):
+    '''
+    Axial modulus, axial Poisson's ratio, transverse (plane strain) bulk modulus and axial shear modulus of aligned
+    fibers, shared by the composite cylinder assemblage and Mori-Tanaka (Hill's relations).
+    '''
+
+    Vol_m = 1 - Vol_f
+
+    E_1f, E_2f, v_12f, v_23f = E_f[..., 0], E_f[..., 1], v_f[..., 2], v_f[..., 0]
+    G_12f = G_f[..., 2]
+
+    # Plane strain bulk moduli of the fiber and matrix
+    k_f = E_2f / (2 * (1 - v_23f - 2 * v_12f ** 2 * E_2f / E_1f))
+    k_m = E_m / (2 * (1 + v_m) * (1 - 2 * v_m))
+
+    denominator = Vol_f / k_m + Vol_m / k_f + 1 / G_m
+    E_1 = E_1f * Vol_f + E_m * Vol_m + 4 * Vol_f * Vol_m * (v_12f - v_m) ** 2 / denominator
+    v_12 = v_12f * Vol_f + v_m * Vol_m + Vol_f * Vol_m * (v_12f - v_m) * (1 / k_m - 1 / k_f) / denominator
+
+    k_23 = k_m + Vol_f / (1 / (k_f - k_m) + Vol_m / (k_m + G_m))
+    G_12 = G_m * (G_12f + G_m + Vol_f * (G_12f - G_m)) / (G_12f + G_m - Vol_f * (G_12f - G_m))
+
+    return E_1, v_12, k_23, G_12, k_f, k_m
+
+
+def _transverse(E_1, v_12, k_23, G_23):
+    '''Transverse modulus and Poisson's ratio from the plane strain bulk and transverse shear modulus.'''
+
+    m = 1 + 4 * k_23 * v_12 ** 2 / E_1
+    E_2 = 4 * k_23 * G_23 / (k_23 + m * G_23)
+    v_23 = (k_23 - m * G_23) / (k_23 + m * G_23)
+
+    return E_2, v_23
+
+
+@register_model('mori_tanaka')
+def mori_tanaka(E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m, Vol_f, array_geometry: int = 1):
+    '''
+    Mori-Tanaka estimate of aligned continuous fibers. The array geometry is not used.
+    '''
+
+    E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m, Vol_f = _constituents(
+        E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m, Vol_f
+    )
+    E_m, v_m, G_m, alpha_m = E_m[..., 0], v_m[..., 0], G_m[..., 0], alpha_m[..., 0]
+    Vol_m = 1 - Vol_f
+
+    E_1, v_12, k_23, G_12, _, k_m = _hashin(E_f, v_f, G_f, E_m, v_m, G_m, Vol_f)
+
+    G_23f = G_f[..., 0]
+    G_23 = G_m + Vol_f / (1 / (G_23f - G_m) + Vol_m * (k_m + 2 * G_m) / (2 * G_m * (k_m + G_m)))
+
+    E_2, v_23 = _transverse(E_1, v_12, k_23, G_23)
+    E, v, G = _transverse_isotropic(E_1, E_2, v_12, v_23, G_12, G_23)
+    alpha = _schapery(E_f[..., 0], alpha_f[..., 0], alpha_f[..., 1], v_f[..., 2], E_m, alpha_m, v_m, Vol_f, E_1, v_12)
+
+    return E, v, G, alpha
+
+
+@register_model('cca')
+def composite_cylinder_assemblage(E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m, Vol_f, array_geometry: int = 1):
+    '''
+    Hashin's composite cylinder assemblage with the transverse shear modulus of the generalized self-consistent
+    scheme, the positive root of
+
+        A (G23 / Gm)^2 + 2 B (G23 / Gm) + C = 0
+
+    The array geometry is not used.
+    '''
+
+    E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m, Vol_f = _constituents(
+        E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m, Vol_f
+    )
+    E_m, v_m, G_m, alpha_m = E_m[..., 0], v_m[..., 0], G_m[..., 0], alpha_m[..., 0]
+    c = Vol_f
+
+    E_1, v_12, k_23, G_12, k_f, k_m = _hashin(E_f, v_f, G_f, E_m, v_m, G_m, Vol_f)
+
+    # eta = 3 - 4 v of an isotropic phase, 1 + 2 G23 / k23 of the transversely isotropic fiber
+    G_23f = G_f[..., 0]
+    g = G_23f / G_m
+    eta_m = 3 - 4 * v_m
+    eta_f = 1 + 2 * G_23f / k_f
+
+    common = 3 * c * (1 - c) ** 2 * (g - 1) * (g + eta_f)
+    c3 = (g * eta_m - eta_f) * c ** 3
+    D = eta_m * g + (g - 1) * c + 1
+
+    A = common + (g * eta_m + eta_f * eta_m - c3) * (c * eta_m * (g - 1) - (g * eta_m + 1))
+    B = -common + 0.5 * D * ((eta_m - 1) * (g + eta_f) - 2 * c3) + 0.5 * c * (eta_m + 1) * (g - 1) * (g + eta_f + c3)
+    C = common + D * (g + eta_f + c3)
+
+    G_23 = G_m * (-B - np.sqrt(B ** 2 - A * C)) / A
+
+    E_2, v_23 = _transverse(E_1, v_12, k_23, G_23)
+    E, v, G = _transverse_isotropic(E_1, E_2, v_12, v_23, G_12, G_23)
+    alpha = _schapery(E_f[..., 0], alpha_f[..., 0], alpha_f[..., 1], v_f[..., 2], E_m, alpha_m, v_m, Vol_f, E_1, v_12)
+
+    return E, v, G, alpha
+
+
+@register_model('chamis')
+def chamis(E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m, Vol_f, array_geometry: int = 1):
+    '''
+    Chamis' simplified micromechanics equations (square array, square root of the fiber volume fraction). The array
+    geometry is not used.
+    '''
+
+    E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m, Vol_f = _constituents(
+        E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m, Vol_f
+    )
+    E_m, v_m, G_m, alpha_m = E_m[..., 0], v_m[..., 0], G_m[..., 0], alpha_m[..., 0]
+    Vol_m = 1 - Vol_f
+    root = np.sqrt(Vol_f)
+
+    E_1 = E_f[..., 0] * Vol_f + E_m * Vol_m
+    E_2 = E_m / (1 - root * (1 - E_m / E_f[..., 1]))
+    G_12 = G_m / (1 - root * (1 - G_m / G_f[..., 2]))
+    G_23 = G_m / (1 - root * (1 - G_m / G_f[..., 0]))
+    v_12 = v_f[..., 2] * Vol_f + v_m * Vol_m
+    v_23 = E_2 / (2 * G_23) - 1
+
+    E, v, G = _transverse_isotropic(E_1, E_2, v_12, v_23, G_12, G_23)
+
+    alpha_1 = (E_f[..., 0] * alpha_f[..., 0] * Vol_f + E_m * alpha_m * Vol_m) / E_1
+    alpha_2 = alpha_f[..., 1] * root + (1 - root) * (1 + Vol_f * v_m * E_f[..., 0] / E_1) * alpha_m
+    alpha = np.stack(np.broadcast_arrays(alpha_1, alpha_2, alpha_2), axis=-1)
+
+    return E, v, G, alpha
+
+
+@lru_cache(maxsize=1024)
+def _composite(model: str, mat_fiber: Material, mat_matrix: Material, Vol_f: float, array_geometry: int) -> Material:
+
+    fiber, matrix = mat_fiber.props, mat_matrix.props
+    E, v, G, alpha = get_model(model)(
+        fiber.E, fiber.v, fiber.G, fiber.alpha, matrix.E, matrix.v, matrix.G, matrix.alpha, Vol_f, array_geometry
+    )
+
+    return Material(E, v, G, alpha, curves=_composite_curves(model, mat_fiber, mat_matrix, Vol_f, array_geometry))
+
+
+def _composite_curves(
+    model: str, mat_fiber: Material, mat_matrix: Material, Vol_f: float, array_geometry: int
+) -> Dict[str, PropertyCurve]:
+    '''
+    Property curves of the composite. The constituents are evaluated on the union of the breakpoints of their
+    curves and the micromechanics model is applied at every state, so the composite curves are exact at the
+    breakpoints.
+    '''
+
+    curves = [curve for mat in (mat_fiber, mat_matrix) for curve in mat.curves.values()]
+    if not curves:
+        return {}
+
+    if 'beta' in mat_fiber.curves or 'beta' in mat_matrix.curves:
+        raise ValueError('Moisture expansion curves of the constituents are not supported by the micromechanics '
+                         'models, give the curve on the composite material instead.')
+
+    T = np.unique(np.concatenate([curve.T for curve in curves]))
+    C = np.unique(np.concatenate([curve.C for curve in curves]))
+    T_grid, C_grid = np.meshgrid(T, C, indexing='ij')
+
+    fiber, matrix = mat_fiber.properties_at(T_grid, C_grid), mat_matrix.properties_at(T_grid, C_grid)
+    values = get_model(model)(
+        fiber['E'], fiber['v'], fiber['G'], fiber['alpha'],
+        matrix['E'], matrix['v'], matrix['G'], matrix['alpha'], Vol_f, array_geometry,
+    )
+
+    # Constituent curves without moisture concentrations give temperature curves of the composite
+    C = None if np.array_equal(C, [0.0]) else C
+
+    return {
+        name: PropertyCurve(T, value if C is not None else value[:, 0], C)
+        for name, value in zip(('E', 'v', 'G', 'alpha'), values)
+    }
+
+
+def composite_material(
+    mat_fiber: Material, mat_matrix: Material, Vol_fiber: float, model: str = 'halpin_tsai', array_geometry: int = 1
+) -> Material:
+    '''
+    Effective composite material of a fiber and a matrix. Results are memoized per (fiber, matrix, fiber volume
+    fraction, model), materials are keyed by their content, so repeated lamina construction does not repeat the
+    micromechanics. The returned material is immutable and shared. Temperature and moisture curves of the
+    constituents give curves of the composite E, v, G and alpha.
+
+    Args:
+        mat_fiber (Material): Fiber material.
+        mat_matrix (Material): Matrix material.
+        Vol_fiber (float): Fiber volume fraction.
+        model (str, optional): Micromechanics model, see available_models. Defaults to 'halpin_tsai'.
+        array_geometry (int, optional): Halpin-Tsai geometric constant. 1 = Hexagonal array, 2 = Square array. Defaults to 1.
+
+    Returns:
+        Material: Composite material.
+    '''
+
+    get_model(model)
+
+    return _composite(model, mat_fiber, mat_matrix, float(Vol_fiber), int(array_geometry))
+
+
+def clear_cache() -> None:
+    '''Clears the memoized composite materials.'''
+
+    _composite.cache_clear()
@@ -0,0 +1,287 @@
+'''
+Incremental-iterative laminate analysis with nonlinear in-plane shear response of the plies.
+
+The plies are linear in the fiber and transverse directions and follow a nonlinear elastic shear law
+g12 = t12 / G12 + f(t12):
+
+    HahnTsai        f = S6666 t12^3
+    RambergOsgood   f = sign(t12) (|t12| / K)^n
+
+Load paths are applied in increments. Every increment is solved by Newton iterations on the mid-plane strains
+with the tangent ABD matrix integrated through the thickness with Gauss points in every ply. With the modified
+Newton method the tangent factorization is kept across iterations and increments and only refactorized when the
+convergence slows down. All load cases, plies and integration points are evaluated at once.
+'''
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Union
+
+from conversion import transformation_matrix_2D
+import clt
+
+
+@dataclass(frozen=True)
+class HahnTsai:
+    '''
+    Hahn-Tsai shear law g12 = t12 / G12 + S6666 t12^3.
+
+    Attributes:
+        S6666 (float, np.ndarray): Fourth order shear compliance, per ply when given as an array.
+    '''
+
+    S6666: Union[float, np.ndarray]
+
+    def nonlinear_strain(self, tau: np.ndarray):
+        '''Nonlinear shear strain f(t12) and its derivative.'''
+
+        tau2 = tau * tau
+
+        return self.S6666 * tau2 * tau, 3 * self.S6666 * tau2
+
+
+@dataclass(frozen=True)
+class RambergOsgood:
+    '''
+    Ramberg-Osgood shear law g12 = t12 / G12 + sign(t12) (|t12| / K)^n.
+
+    Attributes:
+        K (float, np.ndarray): Plastic strength coefficient, per ply when given as an array.
+        n (float, np.ndarray): Hardening exponent (n > 1), per ply when given as an array.
+    '''
+
+    K: Union[float, np.ndarray]
+    n: Union[float, np.ndarray]
+
+    def nonlinear_strain(self, tau: np.ndarray):
+        '''Nonlinear shear strain f(t12) and its derivative.'''
+
+        ratio = np.abs(tau) / self.K
+        power = ratio ** (self.n - 1)
+
+        return np.sign(tau) * ratio * power, self.n / self.K * power
+
+
+@dataclass
+class NonlinearResult:
+    '''
+    Load path response of the nonlinear laminate solver.
+
+    Attributes:
+        strain (np.ndarray): Mid-plane strains and curvatures with shape (n_steps, n_loads, 6).
+        ply_stress (np.ndarray): Thickness averaged ply stresses [s1, s2, t12] with shape
+                                 (n_steps, n_loads, n_plies, 3).
+        iterations (np.ndarray): Newton iterations of every increment with shape (n_steps,).
+        factorizations (int): Number of tangent factorizations.
+        converged (np.ndarray): Convergence of every load case with shape (n_loads,).
+    '''
+
+    strain: np.ndarray
+    ply_stress: np.ndarray
+    iterations: np.ndarray
+    factorizations: int
+    converged: np.ndarray
+
+
+class NonlinearLaminate:
+    def __init__(self, Q: np.ndarray, orientations_deg: np.ndarray, z: np.ndarray, shear_law, n_points: int = 2):
+        '''
+        Laminate with nonlinear in-plane shear plies.
+
+        Args:
+            Q (np.ndarray): Reduced ply stiffnesses in the lamina axes with shape (n_plies, 3, 3).
+            orientations_deg (np.ndarray): Ply orientations in degrees with shape (n_plies,).
+            z (np.ndarray): Ply interface heights with shape (n_plies + 1,).
+            shear_law (HahnTsai, RambergOsgood): Nonlinear shear law, parameters broadcast against the plies.
+            n_points (int, optional): Gauss points through the thickness of every ply. Defaults to 2.
+        '''
+
+        self.Q = np.asarray(Q, dtype=float)
+        self.shear_law = shear_law
+
+        # Transformations of the global stresses and strains, s_global = T_inv s_local, e_local = T_inv^T e_global
+        self.T_inv = transformation_matrix_2D(-np.deg2rad(np.asarray(orientations_deg, dtype=float)))
+
+        # Gauss points and weights of every ply
+        z = np.asarray(z, dtype=float)
+        xi, w = np.polynomial.legendre.leggauss(n_points)
+        half = 0.5 * (z[1:] - z[:-1])[:, None]
+        self.z_points = 0.5 * (z[1:] + z[:-1])[:, None] + half * xi
+        self.weights = half * w
+        self.thickness = z[1:] - z[:-1]
+
+        # [N, M] per unit thickness of a unit local stress at every integration point, [T_inv, z T_inv] with shape
+        # (n_plies, n_points, 6, 3). Its transpose maps [e0, k] to the local strains.
+        T_inv = np.broadcast_to(self.T_inv[:, None], self.z_points.shape + (3, 3))
+        resultant = np.concatenate([T_inv, self.z_points[..., None, None] * T_inv], axis=-2)
+        strain_map = np.swapaxes(resultant, -1, -2)
+
+        # Flattened over the integration points: shear strains, linear normal stresses [s1, s2] and resultants
+        n = self.z_points.size
+        self._gamma = strain_map[..., 2, :].reshape(n, 6)
+        self._normal = (self.Q[:, None, :2, :2] @ strain_map[..., :2, :]).reshape(n, 2, 6)
+        self._shear_vector = resultant[..., 2].reshape(n, 6)
+        self._shear_resultant = self.weights.reshape(n, 1) * self._shear_vector
+
+        # Resultants of the normal stresses are linear in the strains
+        self._normal_stiffness = np.einsum(
+            'n,nik,nkj->ij', self.weights.ravel(), resultant[..., :2].reshape(n, 6, 2), self._normal
+        )
+
+        # Linear ABD matrix for the tangent updates
+        self.ABD = clt.ABD_matrix(self.T_inv @ self.Q @ np.swapaxes(self.T_inv, -1, -2), z)
+
+        # Per point shear moduli and law parameters
+        self.G12 = np.broadcast_to(self.Q[:, 2, 2, None], self.z_points.shape).ravel()
+        self._law = type(shear_law)(
+            **{
+                name: np.broadcast_to(np.asarray(value, dtype=float).reshape(-1, 1), self.z_points.shape).ravel()
+                for name, value in vars(shear_law).items()
+            }
+        )
+
+    @classmethod
+    def from_laminate(cls, laminate, shear_law, n_points: int = 2) -> 'NonlinearLaminate':
+        '''Nonlinear model of the plies of a Laminate (or TableLaminate).'''
+
+        Q_bar, _, T = laminate._ply_matrices()
+        Q = T @ Q_bar @ np.swapaxes(T, -1, -2)
+
+        # T[0, 2] = 2 cs and T[0, 0] - T[1, 0] = c^2 - s^2
+        theta = 0.5 * np.rad2deg(np.arctan2(T[:, 0, 2], T[:, 0, 0] - T[:, 1, 0]))
+
+        return cls(Q, theta, laminate._z, shear_law, n_points)
+
+    def _shear_stress(self, gamma: np.ndarray, tau: np.ndarray, tol: float = 1e-12, max_iter: int = 50):
+        '''
+        Inverts the shear law for the shear stress by Newton iterations started from tau. Returns the shear stress
+        and the tangent shear modulus d t12 / d g12.
+        '''
+
+        G, law = self.G12, self._law
+
+        for _ in range(max_iter):
+            f, df = law.nonlinear_strain(tau)
+            residual = tau / G + f - gamma
+            tau = tau - residual / (1 / G + df)
+            if np.all(np.abs(residual) <= tol * (np.abs(gamma) + 1e-30)):
+                break
+
+        f, df = law.nonlinear_strain(tau)
+
+        return tau, 1 / (1 / G + df)
+
+    def response(self, strain: np.ndarray, tau: np.ndarray, tangent: bool = True):
+        '''
+        Force and moment resultants, tangent ABD matrices and shear stresses at the integration points.
+
+        Args:
+            strain (np.ndarray): Mid-plane strains and curvatures with shape (n_loads, 6).
+            tau (np.ndarray): Initial guess of the shear stresses with shape (n_loads, n_plies * n_points).
+            tangent (bool, optional): Assemble the tangent ABD matrices. Defaults to True.
+
+        Returns:
+            tuple: NM (n_loads, 6), tangent ABD (n_loads, 6, 6) or None, shear stresses (n_loads, n_plies * n_points).
+        '''
+
+        # The normal stresses are linear, only the shear stresses need the nonlinear law
+        tau, G_t = self._shear_stress(strain @ self._gamma.T, tau)
+        NM = strain @ self._normal_stiffness.T + tau @ self._shear_resultant
+
+        if not tangent:
+            return NM, None, tau
+
+        # Only the shear modulus changes, Q_bar_t = Q_bar + (G_t - G12) t t^T with the shear column t of T_inv
+        weighted = ((G_t - self.G12) * self.weights.ravel())[..., None] * self._shear_vector
+        ABD = self.ABD + np.swapaxes(weighted, -1, -2) @ self._shear_vector
+
+        return NM, ABD, tau
+
+    def ply_stresses(self, strain: np.ndarray, tau: np.ndarray) -> np.ndarray:
+        '''Thickness averaged local ply stresses [s1, s2, t12] with shape (n_loads, n_plies, 3).'''
+
+        normal = np.einsum('nkj,lj->lnk', self._normal, strain)
+        stress = np.concatenate([normal, tau[..., None]], axis=-1)
+        stress = stress.reshape(strain.shape[:1] + self.z_points.shape + (3,))
+
+        return np.einsum('pq,lpqi->lpi', self.weights, stress) / self.thickness[:, None]
+
+    def solve(
+        self,
+        NM: np.ndarray,
+        n_steps: int = 100,
+        method: str = 'modified',
+        tol: float = 1e-8,
+        max_iter: int = 50,
+        refactor_ratio: float = 0.25,
+    ) -> NonlinearResult:
+        '''
+        Applies a load path in increments.
+
+        Args:
+            NM (np.ndarray): Final resultants with shape (6,) or (n_loads, 6), applied proportionally in n_steps
+                             increments, or a full load path with shape (n_steps, n_loads, 6).
+            n_steps (int, optional): Number of proportional increments. Defaults to 100.
+            method (str, optional): 'newton' (tangent every iteration) or 'modified' (tangent factorization reused
+                                    until the residual decreases by less than refactor_ratio). Defaults to 'modified'.
+            tol (float, optional): Relative residual tolerance of every load case. Defaults to 1e-8.
+            max_iter (int, optional): Largest number of iterations per increment. Defaults to 50.
+            refactor_ratio (float, optional): Residual reduction per iteration below which the modified Newton
+                                              method keeps its factorization. Defaults to 0.25.
+
+        Returns:
+            NonlinearResult: Strains, ply stresses and convergence of the load path.
+        '''
+
+        if method not in ('newton', 'modified'):
+            raise ValueError(f'Unknown method {method!r}, expected newton or modified.')
+
+        NM = np.asarray(NM, dtype=float)
+        if NM.ndim < 3:
+            NM = np.linspace(0, 1, n_steps + 1)[1:, None, None] * np.atleast_2d(NM)[None]
+
+        n_steps, n_loads = NM.shape[:2]
+        scale = np.maximum(np.linalg.norm(NM, axis=-1).max(axis=0), 1e-30)
+
+        strain = np.zeros((n_loads, 6))
+        tau = np.zeros((n_loads, self.z_points.size))
+        compliance = None
+        factorizations = 0
+
+        result = NonlinearResult(
+            strain=np.zeros((n_steps, n_loads, 6)),
+            ply_stress=np.zeros((n_steps, n_loads, len(self.Q), 3)),
+            iterations=np.zeros(n_steps, dtype=int),
+            factorizations=0,
+            converged=np.ones(n_loads, dtype=bool),
+        )
+
+        for n in range(n_steps):
+            previous = np.inf
+
+            for iteration in range(max_iter + 1):
+                internal, _, tau = self.response(strain, tau, tangent=False)
+
+                residual = NM[n] - internal
+                norm = np.linalg.norm(residual, axis=-1) / scale
+                converged = norm <= tol
+                if np.all(converged) or iteration == max_iter:
+                    break
+
+                # Refactorize the tangent when the reduction of the residual stalls
+                if compliance is None or method == 'newton' or norm.max() > refactor_ratio * previous:
+                    _, ABD_t, tau = self.response(strain, tau)
+                    compliance = np.linalg.inv(ABD_t)
+                    factorizations += 1
+                previous = norm.max()
+
+                strain = strain + np.where(converged[:, None], 0, np.einsum('lij,lj->li', compliance, residual))
+
+            result.strain[n] = strain
+            result.ply_stress[n] = self.ply_stresses(strain, tau)
+            result.iterations[n] = iteration
+            result.converged &= converged
+
+        result.factorizations = factorizations
+
+        return result
@@ -0,0 +1,351 @@
+'''
+Open-hole strength of laminates from the anisotropic stress field around a circular hole.
+
+The laminate is treated as a homogeneous anisotropic plate with the effective in-plane compliance a = h (ABD^-1)
+[:3, :3]. Lekhnitskii's complex parameters mu_1, mu_2 are the roots with positive imaginary part of
+
+    a11 mu^4 - 2 a16 mu^3 + (2 a12 + a66) mu^2 - 2 a26 mu + a22 = 0
+
+and the stresses around a traction free hole of radius R in an infinite plate under the remote stresses s_inf are
+
+    sx = sx_inf + 2 Re[mu_1^2 P_1 + mu_2^2 P_2]
+    sy = sy_inf + 2 Re[P_1 + P_2]
+    txy = txy_inf - 2 Re[mu_1 P_1 + mu_2 P_2]
+
+with P_k = -A_k / (zeta_k sqrt(z_k^2 - R^2 (1 + mu_k^2))), z_k = x + mu_k y and the mapped exterior coordinates
+zeta_k. The stresses are linear in the remote stresses, so the field of every layup is stored as stress
+concentration matrices on the polar grid and applied to all load cases at once.
+
+Failure uses the characteristic distance criteria of Whitney and Nuismer, applied to the ply stresses of every
+angle around the hole: the point stress criterion at the distance d0 from the hole edge, and the average stress
+criterion with the stresses averaged over the distance a0. The notched strength ratio is the first-ply failure load
+factor over all angles.
+'''
+
+import numpy as np
+from typing import Sequence, Tuple
+
+from envelope import unit_ply_stresses
+from failure import PlyStrength, strength_ratio
+
+_UNIT_STRESSES = np.eye(3)
+
+
+def lekhnitskii_roots(compliance: np.ndarray, rtol: float = 1e-4) -> np.ndarray:
+    '''
+    Complex parameters of anisotropic plane stress with positive imaginary parts.
+
+    Args:
+        compliance (np.ndarray): Effective in-plane compliances [x, y, xy] with shape (..., 3, 3).
+        rtol (float, optional): Relative distance below which equal roots (in-plane isotropic laminates) are split
+                                symmetrically to this distance. The error of the split is of the order rtol^2.
+                                Defaults to 1e-4.
+
+    Returns:
+        np.ndarray: Roots mu_1, mu_2 with shape (..., 2).
+    '''
+
+    a = np.asarray(compliance, dtype=float)
+    coefficients = np.stack(
+        [-2 * a[..., 0, 2], 2 * a[..., 0, 1] + a[..., 2, 2], -2 * a[..., 1, 2], a[..., 1, 1]], axis=-1
+    ) / a[..., 0, 0, None]
+
+    # Batched companion matrices of the normalized quartic
+    companion = np.zeros(a.shape[:-2] + (4, 4))
+    companion[..., 0, :] = -coefficients
+    companion[..., [1, 2, 3], [0, 1, 2]] = 1
+    roots = np.linalg.eigvals(companion)
+
+    # Two roots of every conjugate pair
+    roots = np.take_along_axis(roots, np.argsort(-roots.imag, axis=-1)[..., :2], axis=-1)
+    roots = roots.real + 1j * np.abs(roots.imag)
+
+    mean = roots.mean(axis=-1, keepdims=True)
+    equal = np.abs(roots[..., :1] - roots[..., 1:]) < 2 * rtol * np.abs(mean)
+
+    return np.where(equal, mean * (1 + rtol * np.array([1, -1])), roots)
+
+
+def _mapping(mu: np.ndarray, rho: np.ndarray, theta: np.ndarray):
+    '''
+    Exterior mapping zeta = (z + s) / (1 - i mu), |zeta| >= 1, of the unit hole with s = sqrt(z^2 - 1 - mu^2) and
+    z = x + mu y on the polar grid. Returns zeta and s with shape (..., n_r, n_theta, 2).
+    '''
+
+    x = (rho[:, None] * np.cos(theta))[..., None]
+    y = (rho[:, None] * np.sin(theta))[..., None]
+
+    z = x + mu * y
+    s = np.sqrt(z * z - (1 + mu * mu))
+    s = np.where(np.abs(z + s) >= np.abs(z - s), s, -s)
+
+    return (z + s) / (1 - 1j * mu), s
+
+
+def _concentration(mu: np.ndarray, P: np.ndarray) -> np.ndarray:
+    '''Stress concentration matrices of the unit remote stresses from the terms P_k / A_k (..., 2).'''
+
+    # Coefficients A_k of the unit remote stresses [sx, sy, txy] from the traction free hole,
+    # A_1 + A_2 = -conj(c_1) / 2, mu_1 A_1 + mu_2 A_2 = -conj(c_2) / 2
+    c1 = np.array([0, 1, -1j])
+    c2 = np.array([1j, 0, -1])
+    mu1, mu2 = mu[..., None, 0], mu[..., None, 1]
+    A1 = (mu2 * c1 - c2) / (2 * (mu1 - mu2))
+    A = np.stack([A1, -0.5 * c1 - A1], axis=-1)
+
+    # (..., n_r, n_theta, load, k)
+    P = A * P[..., None, :]
+    mu = mu[..., None, :]
+    stress = 2 * np.stack([np.sum(mu * mu * P, axis=-1), np.sum(P, axis=-1), -np.sum(mu * P, axis=-1)], axis=-2)
+
+    return _UNIT_STRESSES + stress.real
+
+
+def stress_concentration(mu: np.ndarray, rho: np.ndarray, theta: np.ndarray) -> np.ndarray:
+    '''
+    Stresses around a traction free circular hole per unit remote stress.
+
+    Args:
+        mu (np.ndarray): Complex parameters with shape (..., 2).
+        rho (np.ndarray): Radii relative to the hole radius (rho >= 1) with shape (n_r,).
+        theta (np.ndarray): Angles from the x axis in radians with shape (n_theta,).
+
+    Returns:
+        np.ndarray: Stress concentration matrices with shape (..., n_r, n_theta, 3, 3), column j holds the stresses
+                    [sx, sy, txy] of the unit remote stress j.
+    '''
+
+    mu = np.asarray(mu)[..., None, None, :]
+    zeta, s = _mapping(mu, np.asarray(rho, dtype=float), np.asarray(theta, dtype=float))
+
+    return _concentration(mu, -1 / (zeta * s))
+
+
+def average_stress_concentration(mu: np.ndarray, rho: float, theta: np.ndarray) -> np.ndarray:
+    '''
+    Stresses averaged over the radial lines from the hole edge to the relative radius rho, per unit remote stress.
+    Along a radial line z_k = r (cos(theta) + mu_k sin(theta)), so the average of the derivatives of the potentials
+    A_k / zeta_k is their difference between the ends of the line.
+
+    Args:
+        mu (np.ndarray): Complex parameters with shape (..., 2).
+        rho (float): End of the radial lines relative to the hole radius (rho > 1).
+        theta (np.ndarray): Angles from the x axis in radians with shape (n_theta,).
+
+    Returns:
+        np.ndarray: Stress concentration matrices with shape (..., n_theta, 3, 3).
+    '''
+
+    mu = np.asarray(mu)[..., None, None, :]
+    theta = np.asarray(theta, dtype=float)
+    zeta, _ = _mapping(mu, np.array([1.0, rho]), theta)
+    direction = np.cos(theta)[:, None] + mu[..., 0, :, :] * np.sin(theta)[:, None]
+
+    difference = 1 / zeta[..., 1, :, :] - 1 / zeta[..., 0, :, :]
+
+    return _concentration(mu[..., 0, :, :], difference / (direction * (rho - 1)))
+
+
+def _polar(stress: np.ndarray, theta: np.ndarray) -> np.ndarray:
+    '''Stresses [sr, s_theta, t_r_theta] in the polar axes of the angles theta.'''
+
+    c, s = np.cos(theta), np.sin(theta)
+    sx, sy, txy = stress[..., 0], stress[..., 1], stress[..., 2]
+
+    return np.stack(
+        [
+            sx * c * c + sy * s * s + 2 * txy * s * c,
+            sx * s * s + sy * c * c - 2 * txy * s * c,
+            (sy - sx) * s * c + txy * (c * c - s * s),
+        ],
+        axis=-1,
+    )
+
+
+class NotchedLaminate:
+    def __init__(
+        self,
+        ABD: np.ndarray,
+        Q_bar: np.ndarray,
+        T: np.ndarray,
+        z: np.ndarray,
+        strength: PlyStrength = None,
+        criterion: str = 'tsai_wu',
+    ):
+        '''
+        Infinite plates with a circular hole for one or many layups with the same number of plies.
+
+        Args:
+            ABD (np.ndarray): Laminate stiffness matrices with shape (n_layups, 6, 6) or (6, 6).
+            Q_bar (np.ndarray): Transformed reduced ply stiffnesses with shape (n_layups, n_plies, 3, 3).
+            T (np.ndarray): Planar stress transformations of the plies with shape (n_layups, n_plies, 3, 3).
+            z (np.ndarray): Ply interface heights with shape (n_layups, n_plies + 1).
+            strength (PlyStrength, optional): Ply strengths for the notched strength ratios. Defaults to None.
+            criterion (str, optional): Failure criterion, see failure.strength_ratio. Defaults to 'tsai_wu'.
+        '''
+
+        self.ABD = np.asarray(ABD, dtype=float).reshape(-1, 6, 6)
+        n = len(self.ABD)
+        self.Q_bar = np.asarray(Q_bar, dtype=float).reshape((n, -1, 3, 3))
+        self.T = np.asarray(T, dtype=float).reshape((n, -1, 3, 3))
+        self.z = np.asarray(z, dtype=float).reshape(n, -1)
+        self.strength = strength
+        self.criterion = criterion
+
+        # Effective in-plane compliance of the homogenized plate, free curvatures of unsymmetric layups included
+        self.thickness = self.z[:, -1] - self.z[:, 0]
+        self.compliance = self.thickness[:, None, None] * np.linalg.inv(self.ABD)[:, :3, :3]
+        self.mu = lekhnitskii_roots(self.compliance)
+
+        # Local ply stresses per unit laminate stress (N = h s) at the bottom and top of every ply. Faces with equal
+        # matrices, e.g. both faces of the plies of symmetric layups or repeated orientations, fail together and are
+        # kept once, padded to the same count for all layups.
+        influence = unit_ply_stresses(self.ABD, self.Q_bar, self.T, self.z)[..., :3]
+        influence = influence * self.thickness[:, None, None, None]
+        influence = np.moveaxis(influence, 0, 1).reshape(n, -1, 3, 3)
+
+        distinct = []
+        for matrices in influence:
+            scale = np.abs(matrices).max()
+            _, index = np.unique(np.round(matrices.reshape(-1, 9) / scale, 10), axis=0, return_index=True)
+            distinct.append(np.sort(index))
+
+        count = max(len(index) for index in distinct)
+        index = np.stack([np.pad(index, (0, count - len(index)), mode='edge') for index in distinct])
+        self._ply_influence = np.take_along_axis(influence, index[..., None, None], axis=1)
+
+    @classmethod
+    def from_laminates(cls, laminates: Sequence, strength: PlyStrength = None, criterion: str = 'tsai_wu'):
+        '''
+        Open-hole models of Laminate objects. Layups with fewer plies are padded with zero thickness copies of
+        their top ply, which repeat the stresses of its top face.
+        '''
+
+        n_plies = max(lam.num_layers for lam in laminates)
+        ABD, Q_bar, T, z = [], [], [], []
+
+        for lam in laminates:
+            Q, _, T_2D = lam._ply_matrices()
+            pad = n_plies - len(Q)
+            ABD.append(lam.ABD_matrix())
+            Q_bar.append(np.concatenate([Q, np.repeat(Q[-1:], pad, axis=0)]))
+            T.append(np.concatenate([T_2D, np.repeat(T_2D[-1:], pad, axis=0)]))
+            z.append(np.concatenate([lam._z, np.repeat(lam._z[-1:], pad)]))
+
+        return cls(np.stack(ABD), np.stack(Q_bar), np.stack(T), np.stack(z), strength, criterion)
+
+    @property
+    def n_layups(self) -> int:
+        return len(self.ABD)
+
+    def _remote_stress(self, N: np.ndarray) -> np.ndarray:
+        '''Remote laminate stresses N / h with shape (n_layups, n_loads, 3).'''
+
+        N = np.atleast_2d(np.asarray(N, dtype=float))
+
+        return N[None] / self.thickness[:, None, None]
+
+    def stress_field(self, N: np.ndarray, radius: float, r: np.ndarray, theta_deg: np.ndarray) -> np.ndarray:
+        '''
+        Laminate average stresses [sx, sy, txy] on a polar grid around the hole.
+
+        Args:
+            N (np.ndarray): Remote force resultants [Nx, Ny, Nxy] with shape (3,) or (n_loads, 3).
+            radius (float): Hole radius.
+            r (np.ndarray): Radii of the grid (r >= radius) with shape (n_r,).
+            theta_deg (np.ndarray): Angles of the grid from the x axis in degrees with shape (n_theta,).
+
+        Returns:
+            np.ndarray: Stresses with shape (n_layups, n_loads, n_r, n_theta, 3).
+        '''
+
+        rho = np.atleast_1d(np.asarray(r, dtype=float)) / radius
+        K = stress_concentration(self.mu, rho, np.deg2rad(np.atleast_1d(theta_deg)))
+
+        return np.einsum('nrtij,nlj->nlrti', K, self._remote_stress(N))
+
+    def hole_edge_stress(self, N: np.ndarray, theta_deg: np.ndarray) -> np.ndarray:
+        '''
+        Tangential stress at the hole edge, the only non-zero stress of the traction free edge. Independent of the
+        hole radius.
+
+        Args:
+            N (np.ndarray): Remote force resultants [Nx, Ny, Nxy] with shape (3,) or (n_loads, 3).
+            theta_deg (np.ndarray): Angles from the x axis in degrees with shape (n_theta,).
+
+        Returns:
+            np.ndarray: Tangential stresses with shape (n_layups, n_loads, n_theta).
+        '''
+
+        theta = np.deg2rad(np.atleast_1d(theta_deg))
+
+        return _polar(self.stress_field(N, 1.0, 1.0, theta_deg)[:, :, 0], theta)[..., 1]
+
+    def _characteristic_concentration(
+        self, layups: np.ndarray, radius: float, distance: float, method: str, theta: np.ndarray
+    ) -> np.ndarray:
+        '''Stress concentration matrices at (point) or averaged over (average) the characteristic distance.'''
+
+        if method == 'point':
+            return stress_concentration(self.mu[layups], [1 + distance / radius], theta)[:, 0]
+
+        return average_stress_concentration(self.mu[layups], 1 + distance / radius, theta)
+
+    def strength_ratio(
+        self,
+        N: np.ndarray,
+        radius: float,
+        distance: float,
+        method: str = 'point',
+        n_theta: int = 360,
+        chunk: int = 8,
+        layups: np.ndarray = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        Notched first-ply failure load factors with a characteristic distance criterion. The ply stresses at the
+        bottom and top of every ply follow from the laminate stresses at every angle around the hole. The ply
+        strengths are common to all plies.
+
+        Args:
+            N (np.ndarray): Remote force resultants [Nx, Ny, Nxy] with shape (3,) or (n_loads, 3).
+            radius (float): Hole radius.
+            distance (float): Characteristic distance from the hole edge, d0 (point) or a0 (average).
+            method (str, optional): 'point' or 'average' stress criterion. Defaults to 'point'.
+            n_theta (int, optional): Angles around the hole. Defaults to 360.
+            chunk (int, optional): Layups evaluated at once, limits the memory of the ply stresses. Defaults to 8.
+            layups (np.ndarray, optional): Indices of the layups to evaluate. Defaults to all layups.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Load factors and critical angles in degrees, both with shape
+                                           (n_layups, n_loads), or (len(layups), n_loads).
+        '''
+
+        if method not in ('point', 'average'):
+            raise ValueError(f'Unknown characteristic distance criterion {method!r}, expected point or average.')
+        if self.strength is None:
+            raise ValueError('Notched strength ratios need ply strengths.')
+
+        theta = np.linspace(0, 2 * np.pi, n_theta, endpoint=False)
+        layups = np.arange(self.n_layups) if layups is None else np.asarray(layups, dtype=int)
+        remote = self._remote_stress(N)[layups]
+
+        ratio = np.zeros(remote.shape[:2])
+        angle = np.zeros(remote.shape[:2])
+
+        for start in range(0, len(layups), chunk):
+            rows = slice(start, start + chunk)
+            selected = layups[rows]
+            K = self._characteristic_concentration(selected, radius, distance, method, theta)
+
+            # Batched matrix products, stresses (chunk, n_loads, n_theta, 3) and ply stresses of the distinct faces
+            stress = (remote[rows, :, None, None, :] @ np.swapaxes(K, -1, -2)[:, None])[..., 0, :]
+            influence = np.swapaxes(self._ply_influence[selected], -1, -2).transpose(0, 2, 1, 3)
+            influence = influence.reshape(len(K), 3, -1)
+            ply_stress = (stress.reshape(len(K), -1, 3) @ influence).reshape(stress.shape[:3] + (-1, 3))
+
+            R = strength_ratio(ply_stress, self.strength, self.criterion).min(axis=-1)
+            critical = np.argmin(R, axis=-1)
+            ratio[rows] = np.take_along_axis(R, critical[..., None], axis=-1)[..., 0]
+            angle[rows] = np.rad2deg(theta[critical])
+
+        return ratio, angle
@@ -0,0 +1,460 @@
+'''
+Discrete stacking sequence optimization: a genetic algorithm with permutation local search over a set of ply
+angles, minimizing laminate weight under strength (first-ply failure) and buckling constraints.
+
+Designs are encoded as genes of ply groups, 0 for an empty group and k for the k-th angle. With balanced=True every
+group holds a +-theta pair (theta, theta for 0 and 90 degree plies), with symmetric=True the genes describe the
+half stack from the outer surface to the mid-plane. Empty groups have zero thickness, so all designs share one
+padded array layout and whole populations are analyzed in a single vectorized CLT evaluation. Results are memoized
+by the canonical (compacted) gene sequence, duplicate candidates are not analyzed again.
+'''
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+from lamina import Lamina
+from laminate import Laminate
+from conversion import transformation_matrix_2D
+from failure import PlyStrength, strength_ratio
+from plate import bending_stiffness
+from ritz import ritz_basis
+import ritz
+import clt
+
+
+@dataclass
+class OptimizationResult:
+    '''
+    Best design found by the stacking sequence optimizer.
+
+    Attributes:
+        genes (np.ndarray): Gene sequence of the design.
+        angles (np.ndarray): Ply orientations in degrees of the full stack, bottom first.
+        weight (float): Areal weight, or laminate thickness when no density was given.
+        strength_ratio (float): First-ply failure load factor over all load cases, divided by the safety factor.
+        buckling_ratio (float): Critical buckling load factor over all load cases.
+        feasible (bool): All constraints are satisfied.
+        history (List[float]): Best fitness of every generation.
+        evaluations (int): Number of distinct designs analyzed.
+        cache_hits (int): Number of candidates answered from the memo table.
+    '''
+
+    genes: np.ndarray
+    angles: np.ndarray
+    weight: float
+    strength_ratio: float
+    buckling_ratio: float
+    feasible: bool
+    history: List[float] = field(default_factory=list)
+    evaluations: int = 0
+    cache_hits: int = 0
+
+
+@dataclass
+class _Island:
+    '''Population, random state and memo table of one island of the genetic algorithm.'''
+
+    population: np.ndarray
+    rng: np.random.Generator
+    fitness: np.ndarray = None
+    memo: Dict[bytes, tuple] = field(default_factory=dict)
+    history: List[float] = field(default_factory=list)
+    evaluations: int = 0
+    cache_hits: int = 0
+
+
+class StackingOptimizer:
+    def __init__(
+        self,
+        lamina: Lamina,
+        angles: Sequence[float] = (0, 45, 90),
+        max_plies: int = 32,
+        NM: np.ndarray = None,
+        strength: PlyStrength = None,
+        criterion: str = 'tsai_wu',
+        safety_factor: float = 1.0,
+        length: float = None,
+        width: float = None,
+        boundary: str = 'SSSS',
+        n_terms: int = 6,
+        symmetric: bool = True,
+        balanced: bool = True,
+        max_contiguous: int = 4,
+        density: float = None,
+    ):
+        '''
+        Weight minimization of a laminate made of a single lamina over a discrete set of ply angles.
+
+        Args:
+            lamina (Lamina): Ply material and thickness.
+            angles (Sequence[float], optional): Candidate ply angles in degrees. With balanced=True an off-axis angle
+                                                stands for a +-theta pair. Defaults to (0, 45, 90).
+            max_plies (int, optional): Largest number of plies of the full stack. Defaults to 32.
+            NM (np.ndarray, optional): Design load cases [Nx, Ny, Nxy, Mx, My, Mxy] with shape (6,) or
+                                       (n_loads, 6). Defaults to no load.
+            strength (PlyStrength, optional): Ply strengths of the strength constraint. Defaults to None (no
+                                              strength constraint).
+            criterion (str, optional): Failure criterion, see failure.strength_ratio. Defaults to 'tsai_wu'.
+            safety_factor (float, optional): Required first-ply failure load factor. Defaults to 1.
+            length (float, optional): Plate length of the buckling constraint. Defaults to None (no buckling).
+            width (float, optional): Plate width of the buckling constraint. Defaults to None.
+            boundary (str, optional): Plate edge conditions, see ritz.ritz_basis. Defaults to 'SSSS'.
+            n_terms (int, optional): Ritz functions per direction. Defaults to 6.
+            symmetric (bool, optional): Only symmetric stacks. Defaults to True.
+            balanced (bool, optional): Only balanced stacks, off-axis plies come in +-theta pairs. Defaults to True.
+            max_contiguous (int, optional): Largest number of adjacent plies of the same angle, None for no limit.
+                                            Defaults to 4.
+            density (float, optional): Ply density for the areal weight. Defaults to None (weight is the thickness).
+        '''
+
+        self.lamina = lamina
+        self.angles = np.asarray(angles, dtype=float)
+        self.symmetric = symmetric
+        self.balanced = balanced
+        self.max_contiguous = max_contiguous
+
+        # Ply groups of every gene, row 0 is the empty group
+        if balanced:
+            groups = [[angle, -angle] if angle % 90 else [angle, angle] for angle in self.angles]
+        else:
+            groups = [[angle] for angle in self.angles]
+        group_size = len(groups[0])
+
+        self.group_angles = np.array([[np.nan] * group_size] + groups)
+        self.n_genes = max_plies // (group_size * (2 if symmetric else 1))
+        if self.n_genes < 1:
+            raise ValueError('max_plies is too small for a single ply group.')
+
+        # Distinct ply angles of the designs, plies store an index into them (-1 for empty)
+        self.ply_angles, index = np.unique(self.group_angles[1:], return_inverse=True)
+        self.group_index = np.vstack([np.full(group_size, -1), index.reshape(-1, group_size)])
+
+        # Ply matrices evaluated once per distinct angle
+        theta = np.deg2rad(self.ply_angles)
+        Q = lamina.matrices.C_reduced
+        self._Q_bar = clt.transformed_reduced_stiffness(Q, theta)
+        self._local = transformation_matrix_2D(theta) @ self._Q_bar
+        self.ply_thickness = float(lamina.props.thickness)
+        self.ply_weight = self.ply_thickness * (1.0 if density is None else density)
+
+        self.NM = np.zeros((1, 6)) if NM is None else np.atleast_2d(np.asarray(NM, dtype=float))
+        self.strength = strength
+        self.criterion = criterion
+        self.safety_factor = safety_factor
+
+        self._basis = ritz_basis(length, width, boundary, n_terms) if length is not None else None
+
+        self.max_weight = self.n_genes * group_size * (2 if symmetric else 1) * self.ply_weight
+
+    def _plies(self, genes: np.ndarray) -> np.ndarray:
+        '''Ply angle indices of the full stacks, -1 for empty plies, with shape (n_designs, max_plies).'''
+
+        plies = self.group_index[genes].reshape(len(genes), -1)
+
+        if self.symmetric:
+            plies = np.concatenate([plies, plies[:, ::-1]], axis=-1)
+
+        return plies
+
+    def canonical(self, genes: np.ndarray) -> np.ndarray:
+        '''Gene sequences with the empty groups moved to the end. Empty groups have no thickness, so both describe
+        the same laminate.'''
+
+        genes = np.atleast_2d(np.asarray(genes))
+        order = np.argsort(genes == 0, axis=-1, kind='stable')
+
+        return np.take_along_axis(genes, order, axis=-1)
+
+    def _contiguous(self, plies: np.ndarray) -> np.ndarray:
+        '''Longest run of adjacent plies with the same angle, empty plies removed.'''
+
+        order = np.argsort(plies < 0, axis=-1, kind='stable')
+        plies = np.take_along_axis(plies, order, axis=-1)
+
+        run = np.ones(len(plies), dtype=int)
+        longest = run.copy()
+        for k in range(1, plies.shape[1]):
+            same = (plies[:, k] == plies[:, k - 1]) & (plies[:, k] >= 0)
+            run = np.where(same, run + 1, 1)
+            longest = np.maximum(longest, run)
+
+        return longest
+
+    def evaluate(self, genes: np.ndarray) -> Dict[str, np.ndarray]:
+        '''
+        Analyzes a population of designs at once.
+
+        Args:
+            genes (np.ndarray): Gene sequences with shape (n_designs, n_genes).
+
+        Returns:
+            Dict[str, np.ndarray]: weight, strength_ratio, buckling_ratio, contiguous, feasible and fitness
+                                   (lower is better), each with shape (n_designs,).
+        '''
+
+        genes = np.atleast_2d(np.asarray(genes, dtype=int))
+        n = len(genes)
+
+        plies = self._plies(genes)
+        present = plies >= 0
+        n_plies = present.sum(axis=-1)
+        valid = n_plies > 0
+
+        strength = np.zeros(n)
+        buckling = np.zeros(n)
+
+        if np.any(valid):
+            p = plies[valid]
+            thickness = np.where(p >= 0, self.ply_thickness, 0.0)
+            z = clt.ply_heights(thickness)
+            ABD = clt.ABD_matrix(self._Q_bar[p], z)
+
+            # First-ply failure at the top and bottom of every ply, empty plies never fail
+            if self.strength is not None:
+                strain = clt.solve_ABD(ABD[:, None], self.NM[None])
+                z_ply = np.stack([z[:, :-1], z[:, 1:]], axis=-1)
+                e = strain[:, :, None, None, :3] + z_ply[:, None, :, :, None] * strain[:, :, None, None, 3:]
+                stress = np.einsum('npij,nlpsj->nlpsi', self._local[p], e)
+                R = strength_ratio(stress, self.strength, self.criterion)
+                R = np.where((p >= 0)[:, None, :, None], R, np.inf)
+                strength[valid] = R.min(axis=(1, 2, 3)) / self.safety_factor
+            else:
+                strength[valid] = np.inf
+
+            # Buckling load factor of every load case with in-plane compression
+            if self._basis is not None:
+                D = bending_stiffness(ABD)
+                factors = np.full(len(p), np.inf)
+                for load in -self.NM[:, :3]:
+                    if not (np.any(load[:2] > 0) or load[2] != 0):
+                        continue
+                    lam = ritz.buckling(D, self._basis, load)[..., 0]
+                    factors = np.minimum(factors, np.where(lam > 0, lam, np.inf))
+                buckling[valid] = factors
+            else:
+                buckling[valid] = np.inf
+
+        contiguous = self._contiguous(plies)
+        weight = n_plies * self.ply_weight
+
+        # Weight objective with penalties on the constraint violations, the margin breaks ties between equal weights
+        violation = np.maximum(1 - strength, 0) + np.maximum(1 - buckling, 0)
+        if self.max_contiguous is not None:
+            violation = violation + np.maximum(contiguous - self.max_contiguous, 0)
+        violation = np.where(valid, violation, 10.0)
+
+        feasible = violation == 0
+        margin = np.minimum(np.minimum(strength, buckling), 2.0) - 1
+        fitness = weight / self.max_weight + 10 * violation - np.where(feasible, margin, 0) * self.ply_weight / (
+            10 * self.max_weight
+        )
+
+        return {
+            'weight': weight,
+            'strength_ratio': strength,
+            'buckling_ratio': buckling,
+            'contiguous': contiguous,
+            'feasible': feasible,
+            'fitness': fitness,
+        }
+
+    def _fitness(self, island: _Island, genes: np.ndarray) -> np.ndarray:
+        '''Fitness of candidates through the island memo table, only new canonical designs are analyzed.'''
+
+        genes = self.canonical(genes)
+        unique, inverse = np.unique(genes, axis=0, return_inverse=True)
+        keys = [row.tobytes() for row in unique]
+
+        missing = [i for i, key in enumerate(keys) if key not in island.memo]
+        if missing:
+            result = self.evaluate(unique[missing])
+            for k, i in enumerate(missing):
+                island.memo[keys[i]] = tuple(result[name][k] for name in _MEMO_FIELDS)
+
+        island.evaluations += len(missing)
+        island.cache_hits += len(genes) - len(missing)
+
+        fitness = np.array([island.memo[key][0] for key in keys])
+
+        return fitness[inverse.ravel()]
+
+    def _local_search(self, island: _Island, genes: np.ndarray, fitness: float):
+        '''Best improving swap of two genes (a permutation of the ply groups) of a design, all swaps at once.'''
+
+        i, j = np.triu_indices(self.n_genes, 1)
+        keep = genes[i] != genes[j]
+        i, j = i[keep], j[keep]
+        if len(i) == 0:
+            return genes, fitness
+
+        candidates = np.repeat(genes[None], len(i), axis=0)
+        rows = np.arange(len(i))
+        candidates[rows, i], candidates[rows, j] = genes[j], genes[i]
+
+        values = self._fitness(island, candidates)
+        best = values.argmin()
+
+        if values[best] < fitness:
+            return self.canonical(candidates[best])[0], values[best]
+
+        return genes, fitness
+
+    def _generation(self, island: _Island, mutation_rate: float, n_elite: int) -> None:
+
+        rng = island.rng
+        population, fitness = island.population, island.fitness
+        n_pop, n_genes = population.shape
+
+        # Binary tournament selection
+        contenders = rng.integers(0, n_pop, (n_pop, 2))
+        winners = np.where(fitness[contenders[:, 0]] <= fitness[contenders[:, 1]], contenders[:, 0], contenders[:, 1])
+        parents = population[winners]
+
+        # One point crossover of consecutive parents
+        cut = rng.integers(1, max(n_genes, 2), n_pop // 2)
+        mask = np.arange(n_genes)[None] < cut[:, None]
+        first, second = parents[0:2 * (n_pop // 2):2], parents[1:2 * (n_pop // 2):2]
+        children = parents.copy()
+        children[0:2 * (n_pop // 2):2] = np.where(mask, first, second)
+        children[1:2 * (n_pop // 2):2] = np.where(mask, second, first)
+
+        # Gene mutation, an empty gene removes a ply group and a new angle adds one
+        mutate = rng.random(children.shape) < mutation_rate
+        children = np.where(mutate, rng.integers(0, len(self.group_angles), children.shape), children)
+        children = self.canonical(children)
+
+        child_fitness = self._fitness(island, children)
+
+        # Elitism, the best designs survive and are improved by permutation local search
+        elite = np.argsort(fitness)[:n_elite]
+        elite_genes, elite_fitness = population[elite].copy(), fitness[elite].copy()
+        for k in range(n_elite):
+            elite_genes[k], elite_fitness[k] = self._local_search(island, elite_genes[k], elite_fitness[k])
+
+        worst = np.argsort(child_fitness)[::-1][:n_elite]
+        children[worst], child_fitness[worst] = elite_genes, elite_fitness
+
+        island.population, island.fitness = children, child_fitness
+        island.history.append(float(child_fitness.min()))
+
+    def _new_island(self, population_size: int, seed) -> _Island:
+
+        rng = np.random.default_rng(seed)
+        population = self.canonical(rng.integers(0, len(self.group_angles), (population_size, self.n_genes)))
+        island = _Island(population, rng)
+        island.fitness = self._fitness(island, population)
+
+        return island
+
+    def run(
+        self,
+        generations: int = 100,
+        population_size: int = 50,
+        mutation_rate: float = 0.05,
+        n_elite: int = 2,
+        islands: int = 1,
+        processes: int = 0,
+        migration_interval: int = 10,
+        n_migrants: int = 2,
+        seed=None,
+    ) -> OptimizationResult:
+        '''
+        Runs the genetic algorithm.
+
+        Args:
+            generations (int, optional): Number of generations. Defaults to 100.
+            population_size (int, optional): Designs per island. Defaults to 50.
+            mutation_rate (float, optional): Mutation probability of every gene. Defaults to 0.05.
+            n_elite (int, optional): Best designs kept and locally improved every generation. Defaults to 2.
+            islands (int, optional): Number of independent populations. Defaults to 1.
+            processes (int, optional): Worker processes evolving the islands in parallel, 0 to run them in this
+                                       process. Defaults to 0.
+            migration_interval (int, optional): Generations between migrations. Defaults to 10.
+            n_migrants (int, optional): Best designs sent to the next island (ring topology). Defaults to 2.
+            seed (int, optional): Random seed. Defaults to None.
+
+        Returns:
+            OptimizationResult: Best design over all islands.
+        '''
+
+        seeds = np.random.SeedSequence(seed).spawn(islands)
+        state = [self._new_island(population_size, s) for s in seeds]
+
+        pool = ProcessPoolExecutor(processes) if processes and islands > 1 else None
+
+        try:
+            done = 0
+            while done < generations:
+                epoch = min(migration_interval, generations - done)
+                args = (mutation_rate, n_elite, epoch)
+
+                if pool is not None:
+                    state = list(pool.map(self._evolve, state, *zip(*[args] * len(state))))
+                else:
+                    state = [self._evolve(island, *args) for island in state]
+
+                done += epoch
+                if islands > 1 and done < generations:
+                    self._migrate(state, n_migrants)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return self._result(state)
+
+    def _evolve(self, island: _Island, mutation_rate: float, n_elite: int, generations: int) -> _Island:
+
+        for _ in range(generations):
+            self._generation(island, mutation_rate, n_elite)
+
+        return island
+
+    def _migrate(self, state: List[_Island], n_migrants: int) -> None:
+        '''The best designs of every island replace the worst designs of the next island.'''
+
+        migrants = [island.population[np.argsort(island.fitness)[:n_migrants]].copy() for island in state]
+
+        for k, island in enumerate(state):
+            incoming = migrants[k - 1]
+            worst = np.argsort(island.fitness)[::-1][:len(incoming)]
+            island.population[worst] = incoming
+            island.fitness[worst] = self._fitness(island, incoming)
+
+    def _result(self, state: List[_Island]) -> OptimizationResult:
+
+        best_island = min(state, key=lambda island: island.fitness.min())
+        genes = best_island.population[best_island.fitness.argmin()]
+        _, weight, strength, buckling, feasible = best_island.memo[self.canonical(genes)[0].tobytes()]
+
+        return OptimizationResult(
+            genes=genes,
+            angles=self.stack_angles(genes),
+            weight=float(weight),
+            strength_ratio=float(strength),
+            buckling_ratio=float(buckling),
+            feasible=bool(feasible),
+            history=[min(values) for values in zip(*(island.history for island in state))],
+            evaluations=sum(island.evaluations for island in state),
+            cache_hits=sum(island.cache_hits for island in state),
+        )
+
+    def stack_angles(self, genes: np.ndarray) -> np.ndarray:
+        '''Ply orientations in degrees of the full stack of a design, bottom first.'''
+
+        plies = self._plies(self.canonical(genes))[0]
+
+        return self.ply_angles[plies[plies >= 0]]
+
+    def laminate(self, genes: np.ndarray, length: int = 0, width: int = 0) -> Laminate:
+        '''Builds the Laminate of a design.'''
+
+        lam = Laminate(length, width)
+        lam.add_stack(self.lamina, self.stack_angles(genes))
+
+        return lam
+
+
+# Values stored in the memo table per canonical design
+_MEMO_FIELDS = ('fitness', 'weight', 'strength_ratio', 'buckling_ratio', 'feasible')
@@ -0,0 +1,294 @@
+import numpy as np
+from typing import Union, Sequence
+
+from laminate import Laminate
+import ritz
+from ritz import ritz_basis
+
+
+def bending_stiffness(laminate: Union[Laminate, Sequence[Laminate], np.ndarray]) -> np.ndarray:
+    '''
+    Returns the plate bending stiffness of one or many laminates. Unsymmetric laminates use the reduced
+    bending stiffness D* = D - B A^-1 B.
+
+    Args:
+        laminate (Laminate, Sequence[Laminate], np.ndarray): Laminate(s), ABD matrices (..., 6, 6) or D matrices (..., 3, 3).
+
+    Returns:
+        np.ndarray: Bending stiffness matrices with shape (..., 3, 3).
+    '''
+
+    if isinstance(laminate, Laminate):
+        ABD = laminate._ABD
+    elif isinstance(laminate, (list, tuple)) and isinstance(laminate[0], Laminate):
+        ABD = np.stack([lam._ABD for lam in laminate])
+    else:
+        ABD = np.asarray(laminate, dtype=float)
+
+    if ABD.shape[-1] == 3:
+        return ABD
+
+    A, B, D = ABD[..., :3, :3], ABD[..., :3, 3:], ABD[..., 3:, 3:]
+
+    return D - B @ np.linalg.solve(A, B)
+
+
+def _plate_dimensions(laminate, length, width):
+
+    if length is None or width is None:
+        laminates = [laminate] if isinstance(laminate, Laminate) else laminate
+
+        if not all(isinstance(lam, Laminate) for lam in laminates):
+            raise ValueError('length and width are required unless Laminate objects are given.')
+
+        dimensions = {(lam.length, lam.width) for lam in laminates}
+        if len(dimensions) != 1:
+            raise ValueError('All laminates must have the same length and width.')
+
+        (lam_length, lam_width), = dimensions
+        length = lam_length if length is None else length
+        width = lam_width if width is None else width
+
+    if not (length > 0 and width > 0):
+        raise ValueError('Plate length and width must be positive.')
+
+    return float(length), float(width)
+
+
+def _orthotropic_terms(D, a, b, m_max, n_max):
+    '''Bending stiffness term and half wave ratios of the simply supported plate for every mode (m, n).'''
+
+    m = np.arange(1, m_max + 1)[:, None]
+    n = np.arange(1, n_max + 1)[None, :]
+
+    alpha = m * np.pi / a
+    beta = n * np.pi / b
+
+    D = D[..., None, None, :, :]
+    stiffness = (
+        D[..., 0, 0] * alpha ** 4
+        + 2 * (D[..., 0, 1] + 2 * D[..., 2, 2]) * alpha ** 2 * beta ** 2
+        + D[..., 1, 1] * beta ** 4
+    )
+
+    return stiffness, alpha, beta
+
+
+def buckling_specially_orthotropic(
+    laminate,
+    length: float = None,
+    width: float = None,
+    load_ratio: float = 0.0,
+    m_max: int = 10,
+    n_max: int = 10,
+    return_modes: bool = False,
+):
+    '''
+    Closed form critical buckling load of simply supported, specially orthotropic (D16 = D26 = 0) plates under
+    biaxial compression Nx and Ny = load_ratio * Nx. Evaluated for all mode numbers and laminates at once.
+
+        Nx_cr = min_mn  [D11 a_m^4 + 2 (D12 + 2 D66) a_m^2 b_n^2 + D22 b_n^4] / (a_m^2 + k b_n^2),   a_m = m pi / a,  b_n = n pi / b
+
+    Args:
+        laminate: Laminate(s), ABD or D matrices. See bending_stiffness.
+        length (float, optional): Plate length a (x direction). Defaults to Laminate.length.
+        width (float, optional): Plate width b (y direction). Defaults to Laminate.width.
+        load_ratio (float, optional): Ratio k = Ny / Nx. Defaults to 0 (uniaxial).
+        m_max (int, optional): Highest number of half waves in x. Defaults to 10.
+        n_max (int, optional): Highest number of half waves in y. Defaults to 10.
+        return_modes (bool, optional): Also return the critical (m, n). Defaults to False.
+
+    Returns:
+        np.ndarray: Critical compressive Nx (force per unit width) with shape (...). Modes with a non-positive
+                    denominator (tension dominated) are excluded.
+    '''
+
+    a, b = _plate_dimensions(laminate, length, width)
+    stiffness, alpha, beta = _orthotropic_terms(bending_stiffness(laminate), a, b, m_max, n_max)
+
+    denom = alpha ** 2 + load_ratio * beta ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        N = np.where(denom > 0, stiffness / denom, np.inf)
+
+    flat = N.reshape(N.shape[:-2] + (-1,))
+    idx = flat.argmin(axis=-1)
+    N_cr = np.take_along_axis(flat, idx[..., None], axis=-1)[..., 0]
+
+    if return_modes:
+        m, n = np.unravel_index(idx, (m_max, n_max))
+        return N_cr, m + 1, n + 1
+
+    return N_cr
+
+
+def frequencies_specially_orthotropic(
+    laminate,
+    mass_per_area: Union[float, np.ndarray],
+    length: float = None,
+    width: float = None,
+    n_modes: int = 5,
+    m_max: int = 10,
+    n_max: int = 10,
+):
+    '''
+    Closed form natural frequencies of simply supported, specially orthotropic plates.
+
+        w_mn = sqrt([D11 a_m^4 + 2 (D12 + 2 D66) a_m^2 b_n^2 + D22 b_n^4] / rho_h)
+
+    Args:
+        laminate: Laminate(s), ABD or D matrices. See bending_stiffness.
+        mass_per_area (float, np.ndarray): Areal mass rho * h, broadcastable against the laminates.
+        length (float, optional): Plate length a. Defaults to Laminate.length.
+        width (float, optional): Plate width b. Defaults to Laminate.width.
+        n_modes (int, optional): Number of frequencies returned. Defaults to 5.
+        m_max (int, optional): Highest number of half waves in x. Defaults to 10.
+        n_max (int, optional): Highest number of half waves in y. Defaults to 10.
+
+    Returns:
+        np.ndarray: Lowest natural frequencies in Hz with shape (..., n_modes).
+    '''
+
+    a, b = _plate_dimensions(laminate, length, width)
+    stiffness, _, _ = _orthotropic_terms(bending_stiffness(laminate), a, b, m_max, n_max)
+
+    rho_h = np.asarray(mass_per_area, dtype=float)[..., None, None]
+    omega = np.sqrt(stiffness / rho_h)
+
+    omega = np.sort(omega.reshape(omega.shape[:-2] + (-1,)), axis=-1)[..., :n_modes]
+
+    return omega / (2 * np.pi)
+
+
+def buckling_ritz(
+    laminate,
+    length: float = None,
+    width: float = None,
+    load: Sequence[float] = (1.0, 0.0, 0.0),
+    boundary: str = 'SSSS',
+    n_terms: int = 8,
+    n_modes: int = 1,
+    method: str = 'dense',
+) -> np.ndarray:
+    '''
+    Rayleigh-Ritz buckling load factors of general (anisotropic, D16 and D26 included) laminated plates.
+
+    Args:
+        laminate: Laminate(s), ABD or D matrices. See bending_stiffness.
+        length (float, optional): Plate length a. Defaults to Laminate.length.
+        width (float, optional): Plate width b. Defaults to Laminate.width.
+        load (Sequence[float], optional): Reference in-plane load [Nx, Ny, Nxy], compression positive. Defaults to (1, 0, 0).
+        boundary (str, optional): Edge conditions of the edges x = 0, y = 0, x = a, y = b. Defaults to 'SSSS'.
+        n_terms (int, optional): Ritz functions per direction. Defaults to 8.
+        n_modes (int, optional): Number of load factors returned. Defaults to 1.
+        method (str, optional): Eigensolver, 'dense', 'sparse' or 'lobpcg'. See ritz.buckling. Defaults to 'dense'.
+
+    Returns:
+        np.ndarray: Critical load multipliers of the reference load with shape (..., n_modes), or (...) for a single mode.
+    '''
+
+    a, b = _plate_dimensions(laminate, length, width)
+    D = bending_stiffness(laminate)
+
+    factors = ritz.buckling(D, ritz_basis(a, b, boundary, n_terms), load, n_modes, method)
+
+    return factors[..., 0] if n_modes == 1 else factors
+
+
+def frequencies_ritz(
+    laminate,
+    mass_per_area: Union[float, np.ndarray],
+    length: float = None,
+    width: float = None,
+    boundary: str = 'SSSS',
+    n_terms: int = 8,
+    n_modes: int = 5,
+    method: str = 'dense',
+) -> np.ndarray:
+    '''
+    Rayleigh-Ritz natural frequencies of general laminated plates.
+
+    Args:
+        laminate: Laminate(s), ABD or D matrices. See bending_stiffness.
+        mass_per_area (float, np.ndarray): Areal mass rho * h, broadcastable against the laminates.
+        length (float, optional): Plate length a. Defaults to Laminate.length.
+        width (float, optional): Plate width b. Defaults to Laminate.width.
+        boundary (str, optional): Edge conditions of the edges x = 0, y = 0, x = a, y = b. Defaults to 'SSSS'.
+        n_terms (int, optional): Ritz functions per direction. Defaults to 8.
+        n_modes (int, optional): Number of frequencies returned. Defaults to 5.
+        method (str, optional): Eigensolver, 'dense', 'sparse' or 'lobpcg'. See ritz.frequencies. Defaults to 'dense'.
+
+    Returns:
+        np.ndarray: Lowest natural frequencies in Hz with shape (..., n_modes).
+    '''
+
+    a, b = _plate_dimensions(laminate, length, width)
+    D = bending_stiffness(laminate)
+
+    return ritz.frequencies(D, ritz_basis(a, b, boundary, n_terms), mass_per_area, n_modes, method)
+
+
+class Plate:
+    def __init__(
+        self,
+        laminate: Laminate,
+        length: float = None,
+        width: float = None,
+        boundary: str = 'SSSS',
+        mass_per_area: float = None,
+    ):
+        '''
+        Rectangular laminated plate using the laminate dimensions (Laminate.length, Laminate.width).
+
+        Args:
+            laminate (Laminate): Laminate of the plate.
+            length (float, optional): Plate length a. Defaults to Laminate.length.
+            width (float, optional): Plate width b. Defaults to Laminate.width.
+            boundary (str, optional): Edge conditions (F, S or C) of the edges x = 0, y = 0, x = a, y = b. Defaults to 'SSSS'.
+            mass_per_area (float, optional): Areal mass rho * h, required for natural frequencies. Defaults to None.
+        '''
+
+        self.laminate = laminate
+        self.length, self.width = _plate_dimensions(laminate, length, width)
+        self.boundary: str = boundary.upper()
+        self.mass_per_area = mass_per_area
+
+    @property
+    def specially_orthotropic(self) -> bool:
+        '''True if the bending-twisting coupling terms D16 and D26 vanish.'''
+
+        D = bending_stiffness(self.laminate)
+
+        return bool(max(abs(D[0, 2]), abs(D[1, 2])) <= 1e-10 * abs(D).max())
+
+    def buckling_load(self, Nx: float = 1.0, Ny: float = 0.0, Nxy: float = 0.0, n_terms: int = 8) -> float:
+        '''
+        Critical load multiplier of the reference load [Nx, Ny, Nxy] (compression positive). The closed form solution
+        is used for simply supported, specially orthotropic plates without shear load, Rayleigh-Ritz otherwise.
+        '''
+
+        if self.boundary == 'SSSS' and Nxy == 0 and Nx > 0 and self.specially_orthotropic:
+            N_cr = buckling_specially_orthotropic(
+                self.laminate, self.length, self.width, load_ratio=Ny / Nx
+            )
+            return float(N_cr / Nx)
+
+        return float(
+            buckling_ritz(
+                self.laminate, self.length, self.width, (Nx, Ny, Nxy), self.boundary, n_terms
+            )
+        )
+
+    def natural_frequencies(self, n_modes: int = 5, n_terms: int = 8) -> np.ndarray:
+        '''Lowest natural frequencies in Hz.'''
+
+        if self.mass_per_area is None:
+            raise ValueError('mass_per_area is required for natural frequencies.')
+
+        if self.boundary == 'SSSS' and self.specially_orthotropic:
+            return frequencies_specially_orthotropic(
+                self.laminate, self.mass_per_area, self.length, self.width, n_modes
+            )
+
+        return frequencies_ritz(
+            self.laminate, self.mass_per_area, self.length, self.width, self.boundary, n_terms, n_modes
+        )
@@ -0,0 +1,113 @@
+'''
+Floating point precision policy of the batched CLT engines (Monte Carlo, bulk layup analysis and the NumPy compute
+backend).
+
+    double  float64 throughout (default)
+    single  float32 throughout, the ABD solve is equilibrated but not refined
+    mixed   ply stiffnesses and the ABD matrix in float64, solved with a float32 Cholesky factorization plus one
+            float64 refinement step, ply stresses recovered and stored in float32
+
+Single precision halves the memory traffic of the ply level arrays, which dominates large sweeps. Measured
+against float64 (benchmarks.precision_study) the single policy keeps ABD, moduli, strains and ply stresses to a
+relative error of about 2e-6. The mixed policy keeps the ABD matrix, moduli and strains at float64 accuracy and
+only rounds the stored ply stresses to float32. The float32 factorization is vectorized over the batch and reused
+by the load cases and the refinement step, which makes single about 1.3 times as fast as double and mixed about
+as fast as double in that benchmark; mixed saves memory rather than time.
+The policy is selected with set_precision, the use_precision context manager or the COMPYSITE_PRECISION
+environment variable.
+'''
+
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PrecisionPolicy:
+    '''
+    Attributes:
+        name (str): Policy name.
+        dtype (type): Storage type of the ply stresses and type of the stress recovery.
+        accumulate (type): Type of the ply stiffnesses, the ABD matrix and the mid-plane strains.
+        refine (int): Float64 refinement steps of the single precision ABD solve.
+    '''
+
+    name: str
+    dtype: type
+    accumulate: type
+    refine: int = 0
+
+    def cast(self, values) -> np.ndarray:
+        '''Converts to the storage type, without copying when it already matches.'''
+
+        return np.asarray(values).astype(self.dtype, copy=False)
+
+
+POLICIES = {
+    'double': PrecisionPolicy('double', np.float64, np.float64),
+    'single': PrecisionPolicy('single', np.float32, np.float32),
+    'mixed': PrecisionPolicy('mixed', np.float32, np.float64, refine=1),
+}
+
+_policy: PrecisionPolicy = None
+
+
+def set_precision(policy: Union[str, PrecisionPolicy] = None) -> PrecisionPolicy:
+    '''
+    Selects the precision policy.
+
+    Args:
+        policy (str, PrecisionPolicy, optional): 'double', 'single', 'mixed' or a custom policy. Defaults to the
+                                                 COMPYSITE_PRECISION environment variable, or 'double'.
+
+    Returns:
+        PrecisionPolicy: The selected policy.
+    '''
+
+    global _policy
+
+    _policy = resolve(policy if policy is not None else os.environ.get('COMPYSITE_PRECISION', 'double'))
+
+    return _policy
+
+
+def resolve(policy: Union[str, PrecisionPolicy] = None) -> PrecisionPolicy:
+    '''Returns the given policy, looked up by name, or the current policy if None.'''
+
+    if policy is None:
+        return get_precision()
+
+    if isinstance(policy, PrecisionPolicy):
+        return policy
+
+    if policy not in POLICIES:
+        raise ValueError(f'Unknown precision {policy!r}, expected one of {list(POLICIES)}.')
+
+    return POLICIES[policy]
+
+
+def get_precision() -> PrecisionPolicy:
+    '''The current precision policy.'''
+
+    if _policy is None:
+        set_precision()
+
+    return _policy
+
+
+@contextmanager
+def use_precision(policy: Union[str, PrecisionPolicy]):
+    '''Temporarily selects a precision policy.'''
+
+    global _policy
+
+    previous = _policy
+    set_precision(policy)
+
+    try:
+        yield _policy
+    finally:
+        _policy = previous
@@ -1,15 +1,94 @@
+import sys
 import numpy as np
-from dataclasses import dataclass, fields
+from dataclasses import dataclass, field, fields, replace
 
 
-@dataclass
-class StateProperties:
+def _value_type(cls):
+    '''
+    Frozen dataclass with __slots__ (Python 3.10 and later) and content based equality. The hash is computed once
+    from the content key of the instance, see _ValueType.
+    '''
+
+    if sys.version_info >= (3, 10):
+        return dataclass(frozen=True, eq=False, slots=True)(cls)
+
+    return dataclass(frozen=True, eq=False)(cls)
+
+
+def readonly_vector(values) -> np.ndarray:
+    '''
+    Float vector that can not be modified in place. Single values are repeated for the 3 principal directions and
+    None gives zeros, as in type_check.
+    '''
+
+    if values is None:
+        values = np.zeros(3)
+    elif isinstance(values, (float, int)):
+        values = np.ones(3) * values
+
+    values = np.array(values, dtype=float)
+    values.setflags(write=False)
+
+    return values
+
+
+def _key(value):
+    '''Hashable content of a field value.'''
+
+    if isinstance(value, np.ndarray):
+        return value.shape, value.tobytes()
+
+    return value
+
+
+class _ValueType:
+    '''Equality and hashing of value types by content. Instances are immutable, copies return the instance.'''
+
+    __slots__ = ()
+
+    def _key(self) -> tuple:
+        return tuple(_key(getattr(self, f.name)) for f in fields(self) if f.compare)
+
+    def _freeze(self) -> None:
+        object.__setattr__(self, '_hash', hash((type(self).__name__, self._key())))
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._hash == other._hash and self._key() == other._key()
+
+    def __hash__(self):
+        return self._hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+@_value_type
+class StateProperties(_ValueType):
     stress: np.ndarray = None
     strain: np.ndarray = None
+    _hash: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+
+        for name in ('stress', 'strain'):
+            values = getattr(self, name)
+            if values is not None:
+                values = np.array(values, dtype=float)
+                values.setflags(write=False)
+                object.__setattr__(self, name, values)
+
+        self._freeze()
 
     def __str__(self):
         return f'''
-        Stress: 
+        Stress:
         {self.stress[0]}, {self.stress[1]}, {self.stress[2]}
 
         Strain:
@@ -17,6 +96,74 @@ class StateProperties:
         '''
 
 
+def _interval(x: np.ndarray, nodes: np.ndarray):
+    '''Lower node index and linear weight of the upper node for every value, clamped to the node range.'''
+
+    x = np.asarray(x, dtype=float)
+
+    if len(nodes) == 1:
+        return np.zeros(x.shape, dtype=int), np.zeros(x.shape)
+
+    x = np.clip(x, nodes[0], nodes[-1])
+    k = np.clip(np.searchsorted(nodes, x, side='right') - 1, 0, len(nodes) - 2)
+
+    return k, (x - nodes[k]) / (nodes[k + 1] - nodes[k])
+
+
+@_value_type
+class PropertyCurve(_ValueType):
+    '''
+    Tabulated material property vector as a function of temperature, and optionally moisture concentration.
+    Values are interpolated linearly (bilinearly) and held constant outside the table.
+
+    Attributes:
+        T (np.ndarray): Increasing temperatures with shape (n_T,).
+        values (np.ndarray): Property vectors [23, 13, 12] (or [1, 2, 3]) with shape (n_T, 3), or (n_T, n_C, 3) with
+                             moisture concentrations. Single values per state are repeated for the 3 directions.
+        C (np.ndarray, optional): Increasing moisture concentrations with shape (n_C,). Defaults to None.
+    '''
+
+    T: np.ndarray = None
+    values: np.ndarray = None
+    C: np.ndarray = None
+    _hash: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+
+        T = np.atleast_1d(np.array(self.T, dtype=float))
+        C = np.zeros(1) if self.C is None else np.atleast_1d(np.array(self.C, dtype=float))
+        values = np.array(self.values, dtype=float)
+
+        shape = (len(T),) if self.C is None else (len(T), len(C))
+        if values.shape == shape:
+            values = np.repeat(values[..., None], 3, axis=-1)
+        if self.C is None:
+            values = values[:, None]
+
+        if values.shape != (len(T), len(C), 3):
+            raise ValueError(f'Property curve values must have shape {shape} or {shape + (3,)}.')
+        if np.any(np.diff(T) <= 0) or np.any(np.diff(C) <= 0):
+            raise ValueError('Property curve temperatures and concentrations must be increasing.')
+
+        for name, array in (('T', T), ('values', values), ('C', C)):
+            array.setflags(write=False)
+            object.__setattr__(self, name, array)
+
+        self._freeze()
+
+    def __call__(self, T, C=0.0) -> np.ndarray:
+        '''Property vectors at the given states with shape (..., 3).'''
+
+        T, C = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(C, dtype=float))
+        i, s = _interval(T, self.T)
+        j, t = _interval(C, self.C)
+        i1, j1 = np.minimum(i + 1, len(self.T) - 1), np.minimum(j + 1, len(self.C) - 1)
+        s, t = s[..., None], t[..., None]
+
+        v = self.values
+        return (1 - s) * ((1 - t) * v[i, j] + t * v[i, j1]) + s * ((1 - t) * v[i1, j] + t * v[i1, j1])
+
+
 def type_check(properties):
     '''
     Create vectors for variables that are passed in as single values
@@ -25,20 +172,19 @@ def type_check(properties):
         properties (Properties): Lamina or material properties object to check.
 
     Returns:
-        Properties: Properties object with all attributes being vectors of the appropriate length.
+        Properties: Properties object with all attributes being vectors of the appropriate length. The given
+                    object is not modified, a new object is returned when a value had to be converted.
     '''
     p = properties
+    updates = {}
 
-    for field in fields(properties):
-        arg = getattr(p, field.name)
-
-        if isinstance(arg, (float, int)):
-            setattr(p, field.name, np.ones(3) * arg)
+    for f in fields(properties):
+        if not f.init:
+            continue
 
-        elif arg is None:
-            setattr(p, field.name, np.zeros(3))
+        arg = getattr(p, f.name)
 
-        else:
-            pass
+        if isinstance(arg, (float, int)) or arg is None:
+            updates[f.name] = readonly_vector(arg)
 
-    return p
+    return replace(p, **updates) if updates else p
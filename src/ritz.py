@@ -0,0 +1,370 @@
+import numpy as np
+from numpy.polynomial import legendre
+from functools import lru_cache
+from typing import Sequence, Union
+
+try:
+    from scipy import sparse
+    from scipy.sparse import linalg as sparse_linalg
+except ImportError:
+    sparse = None
+
+
+# Order of the boundary factor x^p for each edge condition: Free, Simply supported, Clamped
+_EDGE_ORDER = {'F': 0, 'S': 1, 'C': 2}
+
+
+def _basis_1D(n_terms: int, left: str, right: str, points: np.ndarray) -> np.ndarray:
+    '''
+    Values and first two derivatives of the Ritz functions x^p (1 - x)^q P_i(2x - 1) on [0, 1], where the edge
+    exponents p and q enforce the geometric boundary conditions.
+
+    Returns:
+        np.ndarray: Array with shape (3, n_terms, n_points) holding the 0th, 1st and 2nd derivatives.
+    '''
+
+    p, q = _EDGE_ORDER[left], _EDGE_ORDER[right]
+    x = points
+    t = 2 * x - 1
+
+    # Boundary factor and its derivatives
+    g = x ** p * (1 - x) ** q
+    g1 = (
+        (p * x ** max(p - 1, 0) * (1 - x) ** q if p else 0)
+        - (q * x ** p * (1 - x) ** max(q - 1, 0) if q else 0)
+    )
+    g2 = (
+        (p * (p - 1) * x ** max(p - 2, 0) * (1 - x) ** q if p > 1 else 0)
+        - (2 * p * q * x ** max(p - 1, 0) * (1 - x) ** max(q - 1, 0) if p and q else 0)
+        + (q * (q - 1) * x ** p * (1 - x) ** max(q - 2, 0) if q > 1 else 0)
+    )
+
+    # Legendre polynomials and derivatives with respect to x (dt/dx = 2)
+    P = np.empty((3, n_terms, x.size))
+    for i in range(n_terms):
+        c = np.zeros(i + 1)
+        c[i] = 1
+        P[0, i] = legendre.legval(t, c)
+        P[1, i] = 2 * legendre.legval(t, legendre.legder(c, 1))
+        P[2, i] = 4 * legendre.legval(t, legendre.legder(c, 2))
+
+    f = np.empty_like(P)
+    f[0] = g * P[0]
+    f[1] = g1 * P[0] + g * P[1]
+    f[2] = g2 * P[0] + 2 * g1 * P[1] + g * P[2]
+
+    return f
+
+
+def _basis_integrals(n_terms: int, left: str, right: str) -> np.ndarray:
+    '''
+    One dimensional integrals E[r, s, i, j] = int_0^1 f_i^(r) f_j^(s) dx for derivative orders r, s = 0, 1, 2.
+    '''
+
+    # Gauss-Legendre quadrature, exact for the polynomial products
+    nodes, weights = legendre.leggauss(n_terms + 6)
+    x = 0.5 * (nodes + 1)
+    w = 0.5 * weights
+
+    f = _basis_1D(n_terms, left, right, x)
+
+    return np.einsum('rik,sjk,k->rsij', f, f, w)
+
+
+def ritz_matrices(length: float, width: float, boundary: str = 'SSSS', n_terms: int = 8):
+    '''
+    Rayleigh-Ritz integral matrices of a rectangular plate.
+
+    The deflection is w = sum_ij c_ij X_i(x / a) Y_j(y / b). The stiffness matrix of any laminate is the D weighted
+    sum K = sum_pq D_pq I_pq and the geometric stiffness is Kg = Nx G_x + Ny G_y + Nxy G_xy.
+
+    Args:
+        length (float): Plate length a.
+        width (float): Plate width b.
+        boundary (str, optional): Edge conditions (F, S or C) of the edges x = 0, y = 0, x = a and y = b. Defaults to 'SSSS'.
+        n_terms (int, optional): Number of Ritz functions per direction. Defaults to 8.
+
+    Returns:
+        I (np.ndarray): Bending integrals with shape (3, 3, N, N), N = n_terms^2.
+        G (np.ndarray): Geometric integrals for [Nx, Ny, Nxy] with shape (3, N, N).
+        M (np.ndarray): Mass integral with shape (N, N).
+    '''
+
+    boundary = boundary.upper()
+    if len(boundary) != 4 or any(e not in _EDGE_ORDER for e in boundary):
+        raise ValueError(f'Boundary must be four of F, S or C: {boundary!r}')
+
+    a, b = float(length), float(width)
+    X = _basis_integrals(n_terms, boundary[0], boundary[2])
+    Y = _basis_integrals(n_terms, boundary[1], boundary[3])
+
+    # Curvatures [w_xx, w_yy, 2 w_xy] as (x derivative order, y derivative order, scale)
+    curvature = [(2, 0, 1 / a ** 2), (0, 2, 1 / b ** 2), (1, 1, 2 / (a * b))]
+
+    N = n_terms ** 2
+    I = np.empty((3, 3, N, N))
+    for p, (rx, ry, sp) in enumerate(curvature):
+        for q, (sx, sy, sq) in enumerate(curvature):
+            I[p, q] = a * b * sp * sq * np.kron(X[rx, sx], Y[ry, sy])
+
+    G = np.empty((3, N, N))
+    G[0] = b / a * np.kron(X[1, 1], Y[0, 0])
+    G[1] = a / b * np.kron(X[0, 0], Y[1, 1])
+    G[2] = np.kron(X[1, 0], Y[0, 1]) + np.kron(X[0, 1], Y[1, 0])
+
+    M = a * b * np.kron(X[0, 0], Y[0, 0])
+
+    return I, G, M
+
+
+class RitzBasis:
+    def __init__(
+        self, length: float, width: float, boundary: str = 'SSSS', n_terms: int = 8, drop_tol: float = 1e-13
+    ):
+        '''
+        Precomputed Rayleigh-Ritz integrals of a rectangular plate. The integrals only depend on the plate dimensions,
+        boundary conditions and number of terms, so any number of layups is assembled from them as D weighted sums.
+        Use ritz_basis to obtain a cached instance.
+
+        The stiffness, geometric and mass integrals share one sparsity pattern (entries below drop_tol times the
+        largest entry of every matrix are exact zeros of the quadrature) which is stored in coordinate form, so
+        assembling a sparse matrix is a single small matrix product.
+
+        Args:
+            length (float): Plate length a.
+            width (float): Plate width b.
+            boundary (str, optional): Edge conditions (F, S or C) of the edges x = 0, y = 0, x = a and y = b. Defaults to 'SSSS'.
+            n_terms (int, optional): Number of Ritz functions per direction. Defaults to 8.
+            drop_tol (float, optional): Relative magnitude below which integrals are treated as zero. Defaults to 1e-13.
+        '''
+
+        self.length, self.width = float(length), float(width)
+        self.boundary: str = boundary.upper()
+        self.n_terms: int = n_terms
+
+        I, G, M = ritz_matrices(self.length, self.width, self.boundary, n_terms)
+        N = self.size = n_terms ** 2
+
+        # Dense integrals, flattened so that K = D.ravel() @ I
+        self.I = I.reshape(9, N * N)
+        self.G = G.reshape(3, N * N)
+        self.M = M
+
+        # Shared sparsity pattern of all integrals
+        stacked = np.concatenate([I.reshape(9, N, N), G, M[None]])
+        scale = np.abs(stacked).max(axis=(1, 2), keepdims=True)
+        mask = (np.abs(stacked) > drop_tol * scale).any(axis=0)
+
+        self.rows, self.cols = np.nonzero(mask)
+        self._I_data = I.reshape(9, N, N)[:, self.rows, self.cols]
+        self._G_data = G[:, self.rows, self.cols]
+        self._M_data = M[self.rows, self.cols]
+        self.density: float = mask.mean()
+
+        # Cached arrays are shared between callers
+        for array in (self.I, self.G, self.M, self._I_data, self._G_data, self._M_data):
+            array.flags.writeable = False
+
+    def stiffness(self, D: np.ndarray) -> np.ndarray:
+        '''
+        Dense bending stiffness matrices.
+
+        Args:
+            D (np.ndarray): Bending stiffness matrices with shape (..., 3, 3).
+
+        Returns:
+            np.ndarray: Stiffness matrices with shape (..., N, N).
+        '''
+
+        D = np.asarray(D, dtype=float)
+
+        return (D.reshape(D.shape[:-2] + (9,)) @ self.I).reshape(D.shape[:-2] + (self.size, self.size))
+
+    def geometric(self, load: Sequence[float]) -> np.ndarray:
+        '''Dense geometric stiffness matrix of the in-plane load [Nx, Ny, Nxy] (compression positive).'''
+
+        return (np.asarray(load, dtype=float) @ self.G).reshape(self.size, self.size)
+
+    def _sparse(self, data: np.ndarray):
+
+        _require_scipy()
+
+        return sparse.csr_matrix((data, (self.rows, self.cols)), shape=(self.size, self.size))
+
+    def stiffness_sparse(self, D: np.ndarray):
+        '''Sparse (CSR) bending stiffness matrix of a single 3x3 D matrix.'''
+
+        return self._sparse(np.asarray(D, dtype=float).ravel() @ self._I_data)
+
+    def geometric_sparse(self, load: Sequence[float]):
+        '''Sparse (CSR) geometric stiffness matrix of the in-plane load [Nx, Ny, Nxy].'''
+
+        return self._sparse(np.asarray(load, dtype=float) @ self._G_data)
+
+    def mass_sparse(self):
+        '''Sparse (CSR) mass integral matrix (multiply by the areal mass).'''
+
+        return self._sparse(self._M_data)
+
+
+@lru_cache(maxsize=32)
+def ritz_basis(length: float, width: float, boundary: str = 'SSSS', n_terms: int = 8) -> RitzBasis:
+    '''
+    Returns the cached Ritz basis integrals for the given plate dimensions, boundary conditions and number of terms.
+    '''
+
+    return RitzBasis(length, width, boundary.upper(), n_terms)
+
+
+def _require_scipy():
+
+    if sparse is None:
+        raise ImportError('The sparse and lobpcg solvers require scipy. Use method="dense" instead.')
+
+
+def _dense_generalized(A, B, n_modes, largest):
+    '''
+    Extreme eigenpairs of A x = mu B x with B positive definite, batched over leading dimensions.
+    '''
+
+    L_inv = np.linalg.inv(np.linalg.cholesky(B))
+    mu, y = np.linalg.eigh(L_inv @ A @ np.swapaxes(L_inv, -1, -2))
+
+    if largest:
+        mu, y = mu[..., ::-1], y[..., ::-1]
+
+    x = np.swapaxes(L_inv, -1, -2) @ y[..., :n_modes]
+
+    return mu[..., :n_modes], x
+
+
+def _iterative_generalized(A_list, B_list, n_modes, method, tol):
+    '''
+    Largest eigenpairs of A x = mu B x with B positive definite for a sequence of (sparse) matrix pairs.
+
+    'sparse' uses ARPACK. 'lobpcg' preconditions every problem with the factorization of the first B and starts
+    from the eigenvectors of the previous problem, so similar layups converge in a few iterations.
+    '''
+
+    _require_scipy()
+
+    mus, xs = [], []
+    X, preconditioner = None, None
+
+    for A, B in zip(A_list, B_list):
+
+        if method == 'sparse':
+            mu, x = sparse_linalg.eigsh(A, n_modes, M=B, which='LA', tol=tol)
+
+        elif method == 'lobpcg':
+            if preconditioner is None:
+                lu = sparse_linalg.splu(B.tocsc())
+                preconditioner = sparse_linalg.LinearOperator(B.shape, lu.solve)
+
+            if X is None:
+                X = np.random.default_rng(0).standard_normal((A.shape[0], n_modes + 1))
+
+            mu, x = sparse_linalg.lobpcg(
+                A, X, B=B, M=preconditioner, largest=True, tol=tol, maxiter=200
+            )
+            X = x
+
+        else:
+            raise ValueError(f'Unknown eigensolver method: {method}')
+
+        order = np.argsort(mu)[::-1][:n_modes]
+
+        mus.append(mu[order])
+        xs.append(x[:, order])
+
+    return np.array(mus), np.array(xs)
+
+
+def buckling(
+    D: np.ndarray,
+    basis: RitzBasis,
+    load: Sequence[float] = (1.0, 0.0, 0.0),
+    n_modes: int = 1,
+    method: str = 'dense',
+    tol: float = 1e-8,
+    return_modes: bool = False,
+):
+    '''
+    Buckling load multipliers from K c = lambda Kg c, solved as Kg c = (1 / lambda) K c for the largest values.
+
+    Args:
+        D (np.ndarray): Bending stiffness matrices with shape (..., 3, 3).
+        basis (RitzBasis): Plate integrals, see ritz_basis.
+        load (Sequence[float], optional): Reference load [Nx, Ny, Nxy], compression positive. Defaults to (1, 0, 0).
+        n_modes (int, optional): Number of load multipliers. Defaults to 1.
+        method (str, optional): 'dense' (batched numpy), 'sparse' (ARPACK) or 'lobpcg'. Defaults to 'dense'.
+        tol (float, optional): Convergence tolerance of the iterative solvers. Defaults to 1e-8.
+        return_modes (bool, optional): Also return the Ritz coefficients of the mode shapes. Defaults to False.
+
+    Returns:
+        np.ndarray: Load multipliers with shape (..., n_modes), and optionally the mode coefficients (..., N, n_modes).
+    '''
+
+    D = np.asarray(D, dtype=float)
+
+    if method == 'dense':
+        mu, x = _dense_generalized(basis.geometric(load), basis.stiffness(D), n_modes, largest=True)
+    else:
+        batch = D.reshape(-1, 3, 3)
+        Kg = basis.geometric_sparse(load)
+        mu, x = _iterative_generalized(
+            [Kg] * len(batch), [basis.stiffness_sparse(d) for d in batch], n_modes, method, tol
+        )
+        mu = mu.reshape(D.shape[:-2] + (n_modes,))
+        x = x.reshape(D.shape[:-2] + x.shape[-2:])
+
+    with np.errstate(divide='ignore'):
+        factors = np.where(mu > 0, 1 / mu, np.inf)
+
+    return (factors, x) if return_modes else factors
+
+
+def frequencies(
+    D: np.ndarray,
+    basis: RitzBasis,
+    mass_per_area: Union[float, np.ndarray],
+    n_modes: int = 5,
+    method: str = 'dense',
+    tol: float = 1e-8,
+    return_modes: bool = False,
+):
+    '''
+    Natural frequencies from K c = w^2 rho_h M c.
+
+    Args:
+        D (np.ndarray): Bending stiffness matrices with shape (..., 3, 3).
+        basis (RitzBasis): Plate integrals, see ritz_basis.
+        mass_per_area (float, np.ndarray): Areal mass rho * h, broadcastable against the layups.
+        n_modes (int, optional): Number of frequencies. Defaults to 5.
+        method (str, optional): 'dense' (batched numpy), 'sparse' (ARPACK) or 'lobpcg'. Defaults to 'dense'.
+        tol (float, optional): Convergence tolerance of the iterative solvers. Defaults to 1e-8.
+        return_modes (bool, optional): Also return the Ritz coefficients of the mode shapes. Defaults to False.
+
+    Returns:
+        np.ndarray: Frequencies in Hz with shape (..., n_modes), and optionally the mode coefficients (..., N, n_modes).
+    '''
+
+    D = np.asarray(D, dtype=float)
+
+    if method == 'dense':
+        omega2, x = _dense_generalized(basis.stiffness(D), basis.M, n_modes, largest=False)
+    else:
+        batch = D.reshape(-1, 3, 3)
+        M = basis.mass_sparse()
+
+        # Solved as M c = (1 / w^2) K c so that the lowest frequencies are the largest eigenvalues
+        mu, x = _iterative_generalized(
+            [M] * len(batch), [basis.stiffness_sparse(d) for d in batch], n_modes, method, tol
+        )
+        omega2 = 1 / mu.reshape(D.shape[:-2] + (n_modes,))
+        x = x.reshape(D.shape[:-2] + x.shape[-2:])
+
+    rho_h = np.asarray(mass_per_area, dtype=float)[..., None]
+    f = np.sqrt(np.maximum(omega2, 0) / rho_h) / (2 * np.pi)
+
+    return (f, x) if return_modes else f
@@ -0,0 +1,483 @@
+'''
+Local laminate analysis service speaking JSON lines over a Unix socket or stdin/stdout.
+
+Every request is a single JSON object on one line,
+
+    {"id": 1,
+     "laminate": {"materials": {"cf": {"E": [...], "v": [...], "G": [...], "thickness": 1.25e-4}},
+                  "stacking": "[0/±45/90]s", "material": "cf"},
+     "loads": [[Nx, Ny, Nxy, Mx, My, Mxy], ...],
+     "outputs": ["strain", "ply_stress"]}
+
+where the plies may also be listed explicitly as "plies": [["cf", 0], ["core", 0, 0.01], ...]. The response
+echoes the id and holds the requested outputs, or an "error" message.
+
+Concurrent requests are coalesced into micro-batches. Requests on the same laminate share one vectorized
+solve, built laminates are kept in an LRU keyed by the hash of their definition, and large batches are
+evaluated in a process pool where every worker keeps its own warm cache.
+'''
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import numpy as np
+
+from material import Material
+from material_table import MaterialTable, TableLaminate
+from stacking import parse_stacking
+
+
+OUTPUTS = ('strain', 'ply_stress', 'ABD', 'ABDH')
+
+
+class RequestError(ValueError):
+    pass
+
+
+def definition_key(definition: dict) -> str:
+    '''Hash of the canonical JSON form of a laminate definition.'''
+
+    text = json.dumps(definition, sort_keys=True, separators=(',', ':'))
+
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def build_laminate(definition: dict) -> TableLaminate:
+    '''
+    Creates a laminate from its JSON definition.
+
+    Args:
+        definition (dict): Materials by name with E, v, G and optionally alpha, beta and thickness, and either
+                           a "stacking" sequence with a single "material" or a list of "plies" as
+                           [material, angle] or [material, angle, thickness]. Optional "length", "width" and
+                           "shear_correction".
+
+    Returns:
+        TableLaminate: The assembled laminate.
+    '''
+
+    try:
+        table = MaterialTable()
+        for name, props in definition['materials'].items():
+            material = Material(
+                np.asarray(props['E'], dtype=float),
+                np.asarray(props['v'], dtype=float),
+                np.asarray(props.get('G', 0), dtype=float),
+                props.get('alpha'),
+                props.get('beta'),
+                name=name,
+            )
+            table.add(material, props.get('thickness'), name)
+
+        lam = TableLaminate(
+            table,
+            definition.get('length', 0),
+            definition.get('width', 0),
+            definition.get('shear_correction', 5 / 6),
+        )
+
+        if 'stacking' in definition:
+            lam.add_stack(definition['material'], parse_stacking(definition['stacking']))
+        else:
+            plies = definition['plies']
+            ids = [table.material_id(ply[0]) for ply in plies]
+            angles = [ply[1] for ply in plies]
+            thickness = [ply[2] if len(ply) > 2 else table.thickness[i] for ply, i in zip(plies, ids)]
+            lam.add_stack(ids, angles, thickness)
+
+    except (KeyError, IndexError, TypeError, ValueError) as err:
+        raise RequestError(f'Invalid laminate definition: {err!r}') from err
+
+    return lam
+
+
+class LaminateCache:
+    def __init__(self, maxsize: int = 256):
+        '''
+        Least recently used cache of built laminates keyed by definition hash.
+
+        Args:
+            maxsize (int, optional): Number of laminates kept. Defaults to 256.
+        '''
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: str, definition: dict) -> TableLaminate:
+
+        lam = self._data.get(key)
+
+        if lam is not None:
+            self.hits += 1
+            self._data.move_to_end(key)
+            return lam
+
+        self.misses += 1
+        lam = build_laminate(definition)
+
+        self._data[key] = lam
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+        return lam
+
+
+# Cache of a pool worker, warm for the lifetime of the worker and sized by _init_worker
+_CACHE = LaminateCache()
+
+
+def _init_worker(cache_size: int) -> None:
+    _CACHE.maxsize = cache_size
+
+
+def evaluate_batch(jobs: List[tuple], cache: LaminateCache = None) -> List[dict]:
+    '''
+    Evaluates a micro-batch of requests. Requests on the same laminate are solved together by stacking their
+    load cases into one vectorized call. A failing laminate only fails the requests on that laminate.
+
+    Args:
+        jobs (List[tuple]): (key, definition, loads, outputs) of every request.
+        cache (LaminateCache, optional): Cache of built laminates. Defaults to the cache of the process.
+
+    Returns:
+        List[dict]: Result or {"error": message} for every request, in order.
+    '''
+
+    cache = _CACHE if cache is None else cache
+    results = [None] * len(jobs)
+
+    groups = {}
+    for i, (key, definition, loads, outputs) in enumerate(jobs):
+        groups.setdefault(key, []).append(i)
+
+    for key, members in groups.items():
+        try:
+            _evaluate_group(cache.get(key, jobs[members[0]][1]), jobs, members, results)
+        except RequestError as err:
+            for i in members:
+                results[i] = {'error': str(err)}
+        except Exception as err:
+            for i in members:
+                results[i] = {'error': f'{type(err).__name__}: {err}'}
+
+    return results
+
+
+def _evaluate_group(lam: TableLaminate, jobs: List[tuple], members: List[int], results: List[dict]) -> None:
+    '''Solves the requests on one laminate and stores their responses in results.'''
+
+    # Stack the load cases of all requests that need them, split by width (6 resultants or 8 with shear)
+    for width in (6, 8):
+        rows = [i for i in members if len(jobs[i][2]) and jobs[i][2].shape[-1] == width]
+        if not rows:
+            continue
+
+        loads = np.concatenate([jobs[i][2] for i in rows])
+        strain = lam.midplane_strain(loads)
+        needs_stress = any('ply_stress' in jobs[i][3] for i in rows)
+        stress = lam.get_ply_stresses(loads[:, :6]) if needs_stress else None
+
+        start = 0
+        for i in rows:
+            stop = start + len(jobs[i][2])
+            results[i] = {'strain': strain[start:stop]}
+            if needs_stress and 'ply_stress' in jobs[i][3]:
+                results[i]['ply_stress'] = stress[start:stop]
+            start = stop
+
+    for i in members:
+        result = results[i] if results[i] is not None else {}
+        outputs = jobs[i][3]
+
+        response = {}
+        for name in outputs:
+            if name == 'ABD':
+                response[name] = lam._ABD.tolist()
+            elif name == 'ABDH':
+                response[name] = lam._ABDH.tolist()
+            elif name in result:
+                response[name] = result[name].tolist()
+
+        results[i] = response
+
+
+def _encode(result: dict) -> str:
+    '''Standard JSON, results with NaN or infinite values are replaced by an error.'''
+
+    try:
+        return json.dumps(result, allow_nan=False)
+    except ValueError:
+        return json.dumps({'error': 'Result is not finite, the laminate is singular or the loads overflow.'})
+
+
+def _evaluate_encoded(jobs: List[tuple], cache: LaminateCache = None) -> List[str]:
+    return [_encode(result) for result in evaluate_batch(jobs, cache)]
+
+
+def parse_request(request: dict) -> tuple:
+    '''Validates a request and returns its (key, definition, loads, outputs) job.'''
+
+    if not isinstance(request, dict) or 'laminate' not in request:
+        raise RequestError('Request must be an object with a "laminate" definition.')
+
+    definition = request['laminate']
+    outputs = tuple(request.get('outputs', ('strain',)))
+
+    unknown = set(outputs) - set(OUTPUTS)
+    if unknown:
+        raise RequestError(f'Unknown outputs {sorted(unknown)}, expected any of {list(OUTPUTS)}.')
+
+    try:
+        loads = np.asarray(request.get('loads', []), dtype=float)
+    except (TypeError, ValueError) as err:
+        raise RequestError(f'Invalid loads: {err}') from err
+
+    if loads.size == 0:
+        loads = np.zeros((0, 6))
+    elif loads.ndim == 1:
+        loads = loads[None]
+
+    if loads.ndim != 2 or loads.shape[-1] not in (6, 8):
+        raise RequestError('Loads must have 6 [N, M] or 8 [N, M, Qy, Qx] components.')
+
+    return definition_key(definition), definition, loads, outputs
+
+
+class AnalysisService:
+    def __init__(
+        self,
+        max_batch: int = 256,
+        max_delay: float = 0.002,
+        processes: int = 0,
+        pool_threshold: int = 20_000,
+        cache_size: int = 256,
+    ):
+        '''
+        Coalesces concurrent analysis requests into micro-batches.
+
+        Args:
+            max_batch (int, optional): Largest number of requests in a batch. Defaults to 256.
+            max_delay (float, optional): Longest time in seconds a request waits for the batch to fill. Defaults to 0.002.
+            processes (int, optional): Worker processes for large batches, 0 evaluates every batch in the event loop
+                                       process. Defaults to 0.
+            pool_threshold (int, optional): Load cases in a batch above which it is sent to the process pool.
+                                            Defaults to 20000.
+            cache_size (int, optional): Laminates kept in the LRU cache of the service and of every pool worker.
+                                        Defaults to 256.
+        '''
+
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.processes = processes
+        self.pool_threshold = pool_threshold
+
+        self.cache_size = cache_size
+        self.cache = LaminateCache(cache_size)
+
+        self._queue: asyncio.Queue = None
+        self._worker: asyncio.Task = None
+        self._pool: ProcessPoolExecutor = None
+
+        self.batches = 0
+        self.requests = 0
+
+    async def start(self) -> None:
+
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+        if self.processes:
+            self._pool = ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=(self.cache_size,))
+
+    async def stop(self) -> None:
+
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def submit(self, request: dict) -> dict:
+        '''
+        Queues a request and waits for its response.
+
+        Args:
+            request (dict): Decoded request.
+
+        Returns:
+            dict: Response with the request id and the requested outputs, or an error message.
+        '''
+
+        response = {'id': request.get('id') if isinstance(request, dict) else None}
+        response.update(json.loads(await self._submit_encoded(request)))
+
+        return response
+
+    async def _submit_encoded(self, request: dict) -> str:
+        '''Queues a request and returns the JSON encoded response body without the id.'''
+
+        try:
+            job = parse_request(request)
+        except RequestError as err:
+            return json.dumps({'error': str(err)})
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((job, future))
+
+        return await future
+
+    async def _run(self) -> None:
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+
+            # Collect more requests until the batch is full or the oldest request has waited long enough
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            jobs = [job for job, _ in batch]
+            n_loads = sum(len(job[2]) for job in jobs)
+
+            # Results are encoded where they are computed, JSON encoding is a large share of the work
+            try:
+                if self._pool is not None and n_loads >= self.pool_threshold:
+                    results = await loop.run_in_executor(self._pool, _evaluate_encoded, jobs)
+                else:
+                    results = _evaluate_encoded(jobs, self.cache)
+            except Exception as err:
+                results = [json.dumps({'error': f'{type(err).__name__}: {err}'})] * len(batch)
+
+            self.batches += 1
+            self.requests += len(batch)
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def handle_line(self, line: bytes) -> bytes:
+        '''Answers a single JSON line.'''
+
+        try:
+            request = json.loads(line)
+        except ValueError as err:
+            return (json.dumps({'id': None, 'error': f'Invalid JSON: {err}'}) + '\n').encode()
+
+        request_id = json.dumps(request.get('id') if isinstance(request, dict) else None)
+        body = await self._submit_encoded(request)
+
+        # Splice the id into the encoded body
+        if body == '{}':
+            return f'{{"id": {request_id}}}\n'.encode()
+
+        return f'{{"id": {request_id}, {body[1:]}\n'.encode()
+
+    async def _serve_stream(self, readline, write) -> None:
+        '''Answers every line of a stream concurrently, responses are written as soon as they are ready.'''
+
+        tasks = set()
+
+        async def answer(line):
+            write(await self.handle_line(line))
+
+        while True:
+            line = await readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+
+            task = asyncio.create_task(answer(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def serve_unix(self, path: str) -> None:
+        '''Serves JSON lines on a Unix domain socket until cancelled.'''
+
+        async def client(reader, writer):
+            try:
+                await self._serve_stream(reader.readline, writer.write)
+                await writer.drain()
+            except (asyncio.CancelledError, ConnectionError):
+                # Server shutdown or client gone
+                pass
+            finally:
+                writer.close()
+
+        if os.path.exists(path):
+            os.unlink(path)
+
+        server = await asyncio.start_unix_server(client, path=path)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self) -> None:
+        '''Serves JSON lines from stdin to stdout until stdin is closed.'''
+
+        loop = asyncio.get_running_loop()
+
+        # Blocking reads in a thread work for pipes, files and terminals alike
+        async def readline():
+            return await loop.run_in_executor(None, sys.stdin.buffer.readline)
+
+        def write(data: bytes):
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+
+        await self._serve_stream(readline, write)
+
+
+async def _main(args) -> None:
+
+    async with AnalysisService(args.max_batch, args.max_delay, args.processes) as service:
+        if args.socket:
+            await service.serve_unix(args.socket)
+        else:
+            await service.serve_stdio()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Laminate analysis service (JSON lines).')
+    parser.add_argument('--socket', help='Unix socket path, serves stdin/stdout if omitted.')
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--max-delay', type=float, default=0.002)
+    parser.add_argument('--processes', type=int, default=0)
+
+    asyncio.run(_main(parser.parse_args()))
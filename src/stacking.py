@@ -0,0 +1,172 @@
+import re
+import numpy as np
+from typing import List
+
+
+# Tokens of the stacking sequence notation
+_TOKEN = re.compile(
+    r'\s*(?:(?P<open>[\[(])|(?P<close>[\])])|(?P<sep>/)|(?P<repeat>_\d+)|'
+    r'(?P<ply>(?:±|∓|\+-|-\+)?[+-]?\d+(?:\.\d*)?[\u0304\u0305]?)|(?P<sym>[sS])|(?P<total>[tT]))'
+)
+
+# Combining macron or overline marking the mid-plane ply
+_BAR = '\u0304\u0305'
+
+# A bare number directly after a closing bracket or the symmetry mark is a repetition count
+_COUNT = re.compile(r'\s*(?P<repeat>\d+)')
+
+
+class StackingSequenceError(ValueError):
+    pass
+
+
+def _tokenize(notation: str) -> List[tuple]:
+
+    tokens = []
+    pos = 0
+    notation = notation.strip()
+
+    while pos < len(notation):
+        match = None
+        if tokens and tokens[-1][0] in ('close', 'sym'):
+            match = _COUNT.match(notation, pos)
+        if match is None:
+            match = _TOKEN.match(notation, pos)
+
+        if match is None or match.end() == pos:
+            raise StackingSequenceError(
+                f'Unexpected character {notation[pos]!r} at position {pos} in {notation!r}'
+            )
+
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+
+    return tokens
+
+
+def _ply_angles(token: str) -> List[float]:
+    '''Expands a single ply token such as 45, -30, +-45 or a barred mid-plane ply.'''
+
+    token = token.rstrip(_BAR)
+
+    if token.startswith(('±', '+-')):
+        angle = float(token.lstrip('±+-'))
+        return [angle, -angle]
+
+    if token.startswith(('∓', '-+')):
+        angle = float(token.lstrip('∓-+'))
+        return [-angle, angle]
+
+    return [float(token)]
+
+
+def parse_stacking(notation: str) -> np.ndarray:
+    '''
+    Expands a stacking sequence given in laminate code notation into the ply orientations.
+
+    Supported notation:
+        [0/90/45]        Plies listed from the bottom to the top of the laminate
+        [0_2/90]         Repeated plies (subscript written with an underscore)
+        [0/±45/90]       Angle-ply pairs, ± (or +-) expands to +45/-45 and ∓ (or -+) to -45/+45
+        [0/(±45)2/90]    Repeated groups in parentheses
+        [0/90]3          Repetition of the whole sequence
+        [0/45/90]s       Symmetric laminate, the sequence is mirrored about the mid-plane
+        [0/90]3s         Repeated and then mirrored
+        [0/45/90̄]s       Barred (U+0304 or U+0305) last ply is the mid-plane ply and is not duplicated
+        [0/45/90]T       Total laminate (no symmetry)
+
+    Args:
+        notation (str): Stacking sequence, e.g. '[0/±45/90]3s'.
+
+    Returns:
+        np.ndarray: Ply orientations in degrees ordered from the bottom ply.
+    '''
+
+    tokens = _tokenize(notation)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else (None, None)
+
+    def repeat_count():
+        nonlocal pos
+        kind, value = peek()
+        if kind == 'repeat':
+            pos += 1
+            return int(value.lstrip('_'))
+        return 1
+
+    def sequence(closing: str):
+        '''Parses plies and groups up to the closing bracket.'''
+        nonlocal pos
+        angles, barred = [], False
+
+        while True:
+            kind, value = peek()
+
+            if kind == 'ply':
+                pos += 1
+                plies = _ply_angles(value)
+                barred = value.endswith(tuple(_BAR))
+                angles.extend(plies * repeat_count())
+
+            elif kind == 'open' and value == '(':
+                pos += 1
+                group, _ = sequence(')')
+                angles.extend(group * repeat_count())
+                barred = False
+
+            else:
+                raise StackingSequenceError(f'Expected a ply angle in {notation!r}')
+
+            kind, value = peek()
+            pos += 1
+
+            if kind == 'sep':
+                continue
+
+            if kind == 'close' and value == closing:
+                return angles, barred
+
+            raise StackingSequenceError(f'Expected "/" or "{closing}" in {notation!r}')
+
+    kind, value = peek()
+    if kind != 'open' or value != '[':
+        raise StackingSequenceError(f'Stacking sequence must start with "[": {notation!r}')
+    pos += 1
+
+    angles, barred = sequence(']')
+    angles = angles * repeat_count()
+
+    kind, _ = peek()
+    if kind == 'sym':
+        pos += 1
+        mirror = angles[:-1] if barred else angles
+        angles = angles + mirror[::-1]
+        angles = angles * repeat_count()
+
+    elif kind == 'total':
+        pos += 1
+
+    if pos != len(tokens):
+        raise StackingSequenceError(f'Unexpected trailing characters in {notation!r}')
+
+    return np.array(angles, dtype=float)
+
+
+def is_symmetric_sequence(angles: np.ndarray) -> bool:
+    '''Returns True if the ply orientations mirror about the mid-plane.'''
+
+    angles = np.asarray(angles)
+
+    return bool(np.all(angles == angles[::-1]))
+
+
+def is_balanced_sequence(angles: np.ndarray) -> bool:
+    '''Returns True if every off-axis ply (not 0 or 90 degrees) has a matching ply of opposite orientation.'''
+
+    angles = np.asarray(angles, dtype=float)
+    off_axis = angles[(angles % 90) != 0]
+
+    return bool(np.array_equal(np.sort(off_axis), np.sort(-off_axis)))
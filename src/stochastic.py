@@ -0,0 +1,386 @@
+import numpy as np
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Union
+
+import clt
+from material import Material
+from precision import PrecisionPolicy, resolve
+from micromechanics import get_model
+
+
+# Random variables that are sampled once per sample (material level) or once per ply
+_MATERIAL_VARIABLES = ('E_f', 'v_f', 'G_f', 'alpha_f', 'E_m', 'v_m', 'G_m', 'alpha_m', 'Vol_f')
+_PLY_VARIABLES = ('thickness', 'angle')
+
+
+@dataclass
+class Scatter:
+    '''
+    Scatter of a single input variable.
+
+    Attributes:
+        std (float): Standard deviation (normal) or half width (uniform). Relative to the nominal value
+                     when relative is True, otherwise in the units of the variable (degrees for angles).
+        distribution (str, optional): 'normal' or 'uniform'. Defaults to 'normal'.
+        relative (bool, optional): Scatter given as a coefficient of variation. Defaults to True.
+    '''
+
+    std: float
+    distribution: str = 'normal'
+    relative: bool = True
+
+
+class RunningStatistics:
+    def __init__(self):
+        '''
+        Streaming mean, standard deviation and extrema of array valued samples. Batches are combined with
+        the parallel (Chan et al.) update so memory does not depend on the number of samples.
+        '''
+
+        self.n: int = 0
+        self.mean: np.ndarray = None
+        self._m2: np.ndarray = None
+        self.min: np.ndarray = None
+        self.max: np.ndarray = None
+
+    def update(self, samples: np.ndarray) -> None:
+        '''
+        Adds a batch of samples.
+
+        Args:
+            samples (np.ndarray): Samples with shape (n_samples, ...).
+        '''
+
+        n = len(samples)
+        if n == 0:
+            return
+
+        # Moments are accumulated in float64 for single precision samples as well
+        mean = samples.mean(axis=0, dtype=np.float64)
+        m2 = ((samples - mean) ** 2).sum(axis=0)
+
+        self._combine(n, mean, m2, samples.min(axis=0), samples.max(axis=0))
+
+    def merge(self, other: 'RunningStatistics') -> None:
+        '''Combines the statistics of another (independent) set of samples.'''
+
+        if other.n:
+            self._combine(other.n, other.mean, other._m2, other.min, other.max)
+
+    def _combine(self, n, mean, m2, lower, upper):
+
+        if self.n == 0:
+            self.n, self.mean, self._m2, self.min, self.max = n, mean, m2, lower, upper
+            return
+
+        total = self.n + n
+        delta = mean - self.mean
+
+        self.mean = self.mean + delta * n / total
+        self._m2 = self._m2 + m2 + delta ** 2 * self.n * n / total
+        self.min = np.minimum(self.min, lower)
+        self.max = np.maximum(self.max, upper)
+        self.n = total
+
+    @property
+    def std(self) -> np.ndarray:
+        '''Sample standard deviation.'''
+
+        return np.sqrt(self._m2 / max(self.n - 1, 1))
+
+    def __str__(self):
+        return f'''
+        Samples: {self.n}
+        Mean:    {self.mean}
+        Std:     {self.std}
+        '''
+
+
+@dataclass
+class MonteCarloResult:
+    '''
+    Statistics of the stochastic laminate analysis.
+
+    Attributes:
+        ABD (RunningStatistics): ABD matrix entries, shape (6, 6).
+        moduli (RunningStatistics): Effective in-plane laminate properties [Ex, Ey, Gxy, vxy].
+        strain (RunningStatistics): Midplane strains and curvatures, shape (n_loads, 6).
+        ply_stress (RunningStatistics): Mid-ply stresses in the lamina axes, shape (n_loads, n_plies, 3).
+    '''
+
+    ABD: RunningStatistics = field(default_factory=RunningStatistics)
+    moduli: RunningStatistics = field(default_factory=RunningStatistics)
+    strain: RunningStatistics = field(default_factory=RunningStatistics)
+    ply_stress: RunningStatistics = field(default_factory=RunningStatistics)
+
+    def merge(self, other: 'MonteCarloResult') -> None:
+
+        self.ABD.merge(other.ABD)
+        self.moduli.merge(other.moduli)
+        self.strain.merge(other.strain)
+        self.ply_stress.merge(other.ply_stress)
+
+
+def _norm_ppf(p: np.ndarray) -> np.ndarray:
+    '''
+    Inverse of the standard normal cumulative distribution (Acklam's rational approximation, relative
+    error below 1.2e-9).
+    '''
+
+    a = (-3.969683028665376e01, 2.209460984245205e02, -2.759285104469687e02,
+         1.383577518672690e02, -3.066479806614716e01, 2.506628277459239e00)
+    b = (-5.447609879822406e01, 1.615858368580409e02, -1.556989798598866e02,
+         6.680131188771972e01, -1.328068155288572e01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e00,
+         -2.549732539343734e00, 4.374664141464968e00, 2.938163982698783e00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e00,
+         3.754408661907416e00)
+
+    p = np.clip(np.asarray(p, dtype=float), 1e-300, 1 - 1e-16)
+    x = np.empty_like(p)
+
+    # Central region
+    q = p - 0.5
+    r = q * q
+    x[:] = (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q / (
+        ((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1
+    )
+
+    # Tails
+    tail = np.minimum(p, 1 - p) < 0.02425
+    if tail.any():
+        pt = np.minimum(p[tail], 1 - p[tail])
+        t = np.sqrt(-2 * np.log(pt))
+        xt = (((((c[0] * t + c[1]) * t + c[2]) * t + c[3]) * t + c[4]) * t + c[5]) / (
+            (((d[0] * t + d[1]) * t + d[2]) * t + d[3]) * t + 1
+        )
+        x[tail] = np.where(p[tail] < 0.5, xt, -xt)
+
+    return x
+
+
+class MonteCarloLaminate:
+    def __init__(
+        self,
+        mat_fiber: Material,
+        mat_matrix: Material,
+        Vol_fiber: float,
+        thickness: float,
+        orientations_deg: np.ndarray,
+        NM_matrix: np.ndarray = None,
+        array_geometry: int = 1,
+        scatter: Dict[str, Scatter] = None,
+        precision: Union[str, PrecisionPolicy] = None,
+        micromechanics: str = 'halpin_tsai',
+    ):
+        '''
+        Stochastic laminate analysis. Scatter in the constituent properties, fiber volume fraction, ply thickness
+        and ply misalignment is propagated through the micromechanics, the ABD matrix and the load solution with
+        all samples of a chunk evaluated as one array computation.
+
+        Args:
+            mat_fiber (Material): Nominal fiber material.
+            mat_matrix (Material): Nominal matrix material.
+            Vol_fiber (float): Nominal fiber volume fraction.
+            thickness (float): Nominal ply thickness.
+            orientations_deg (np.ndarray): Nominal ply orientations in degrees.
+            NM_matrix (np.ndarray, optional): Load cases with shape (6,) or (n_loads, 6). Defaults to no load.
+            array_geometry (int, optional): Halpin-Tsai geometric constant. Defaults to 1.
+            scatter (Dict[str, Scatter], optional): Scatter per variable. Valid names are E_f, v_f, G_f, alpha_f,
+                                                    E_m, v_m, G_m, alpha_m, Vol_f, thickness and angle.
+            precision (str, PrecisionPolicy, optional): Precision of the laminate analysis, see precision.py.
+                                                        Defaults to the current policy.
+            micromechanics (str, optional): Micromechanics model, see micromechanics.available_models.
+                                            Defaults to 'halpin_tsai'.
+        '''
+
+        self.nominal = {
+            'E_f': mat_fiber.props.E,
+            'v_f': mat_fiber.props.v,
+            'G_f': mat_fiber.props.G,
+            'alpha_f': mat_fiber.props.alpha,
+            'E_m': mat_matrix.props.E,
+            'v_m': mat_matrix.props.v,
+            'G_m': mat_matrix.props.G,
+            'alpha_m': mat_matrix.props.alpha,
+            'Vol_f': np.array(Vol_fiber, dtype=float),
+        }
+
+        self.orientations_deg = np.asarray(orientations_deg, dtype=float)
+        self.nominal['angle'] = self.orientations_deg
+        self.nominal['thickness'] = np.full(self.orientations_deg.shape, float(thickness))
+
+        if NM_matrix is None:
+            NM_matrix = np.zeros(6)
+        self.NM = np.atleast_2d(np.asarray(NM_matrix, dtype=float))
+
+        # Unknown models fail here rather than in the worker processes
+        get_model(micromechanics)
+
+        self.array_geometry: int = array_geometry
+        self.micromechanics: str = micromechanics
+        self.precision = precision
+        self.scatter: Dict[str, Scatter] = {}
+
+        for name, s in (scatter or {}).items():
+            self.add_scatter(name, s)
+
+    def add_scatter(self, name: str, scatter: Union[Scatter, float]) -> None:
+        '''
+        Assigns the scatter of an input variable.
+
+        Args:
+            name (str): Variable name.
+            scatter (Scatter, float): Scatter definition or a coefficient of variation for a normal distribution.
+        '''
+
+        if name not in _MATERIAL_VARIABLES + _PLY_VARIABLES:
+            raise KeyError(f'Unknown random variable: {name}')
+
+        if not isinstance(scatter, Scatter):
+            scatter = Scatter(float(scatter), relative=(name != 'angle'))
+
+        if scatter.distribution not in ('normal', 'uniform'):
+            raise ValueError(f'Unknown distribution: {scatter.distribution}')
+
+        self.scatter[name] = scatter
+
+    def sample(self, n_samples: int, seed=None, latin_hypercube: bool = False) -> Dict[str, np.ndarray]:
+        '''
+        Draws input samples.
+
+        Args:
+            n_samples (int): Number of samples.
+            seed (int, np.random.SeedSequence, optional): Random seed. Defaults to None.
+            latin_hypercube (bool, optional): Stratify every random variable with Latin hypercube sampling. Defaults to False.
+
+        Returns:
+            Dict[str, np.ndarray]: Sampled variables with shape (n_samples, *nominal_shape).
+        '''
+
+        rng = np.random.default_rng(seed)
+        samples = {}
+
+        for name, nominal in self.nominal.items():
+            shape = (n_samples,) + np.shape(nominal)
+            s = self.scatter.get(name)
+
+            if s is None or s.std == 0:
+                samples[name] = np.broadcast_to(nominal, shape)
+                continue
+
+            # Uniform variates on [0, 1), stratified per variable for Latin hypercube sampling
+            if latin_hypercube:
+                strata = np.broadcast_to(np.arange(n_samples).reshape((-1,) + (1,) * (len(shape) - 1)), shape)
+                strata = rng.permuted(strata, axis=0)
+                u = (strata + rng.random(shape)) / n_samples
+            else:
+                u = rng.random(shape)
+
+            if s.distribution == 'normal':
+                z = _norm_ppf(u) if latin_hypercube else rng.standard_normal(shape)
+            else:
+                z = 2 * u - 1
+
+            samples[name] = nominal * (1 + s.std * z) if s.relative else nominal + s.std * z
+
+        return samples
+
+    def evaluate(self, samples: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        '''
+        Evaluates the full analysis chain for a batch of samples.
+
+        Args:
+            samples (Dict[str, np.ndarray]): Input samples as returned by sample.
+
+        Returns:
+            Dict[str, np.ndarray]: ABD (n, 6, 6), moduli (n, 4), strain (n, n_loads, 6) and ply_stress (n, n_loads, n_plies, 3).
+        '''
+
+        # Micromechanics for every sample
+        E, v, G, _ = get_model(self.micromechanics)(
+            samples['E_f'], samples['v_f'], samples['G_f'], samples['alpha_f'],
+            samples['E_m'], samples['v_m'], samples['G_m'], samples['alpha_m'],
+            samples['Vol_f'], self.array_geometry,
+        )
+
+        policy = resolve(self.precision)
+
+        # Ply stiffnesses and laminate stiffness in the accumulation precision
+        theta = samples['angle'].astype(policy.accumulate) * np.pi / 180
+        Q = clt.reduced_stiffness(*(np.asarray(x).astype(policy.accumulate) for x in (E, v, G)))
+        Q_bar = clt.transformed_reduced_stiffness(Q[:, None], theta)
+
+        z = clt.ply_heights(samples['thickness'].astype(policy.accumulate))
+        ABD = clt.ABD_matrix(Q_bar, z)
+
+        # Effective in-plane properties from the membrane compliance
+        h = z[:, -1] - z[:, 0]
+        a = np.linalg.inv(ABD[:, :3, :3])
+        moduli = np.stack(
+            [1 / (h * a[:, 0, 0]), 1 / (h * a[:, 1, 1]), 1 / (h * a[:, 2, 2]), -a[:, 0, 1] / a[:, 0, 0]],
+            axis=-1,
+        )
+
+        # Load response for every load case, ply stresses are recovered in the storage precision
+        strain = clt.solve_ABD(ABD[:, None], self.NM[None], refine=policy.refine)
+        e_0 = policy.cast(strain)
+        z_mid = policy.cast(0.5 * (z[:, 1:] + z[:, :-1]))
+        e = e_0[:, :, None, :3] + z_mid[:, None, :, None] * e_0[:, :, None, 3:]
+        stress = np.einsum('npij,nlpj->nlpi', policy.cast(Q_bar), e)
+        stress = np.einsum('npij,nlpj->nlpi', clt.transformation_matrix_2D(policy.cast(theta)), stress)
+
+        return {'ABD': ABD, 'moduli': moduli, 'strain': strain, 'ply_stress': stress}
+
+    def _run_chunk(self, n_samples: int, seed, latin_hypercube: bool) -> MonteCarloResult:
+
+        outputs = self.evaluate(self.sample(n_samples, seed, latin_hypercube))
+
+        result = MonteCarloResult()
+        for name, values in outputs.items():
+            getattr(result, name).update(values)
+
+        return result
+
+    def run(
+        self,
+        n_samples: int,
+        seed: int = None,
+        chunk_size: int = 10000,
+        latin_hypercube: bool = False,
+        processes: int = None,
+    ) -> MonteCarloResult:
+        '''
+        Runs the Monte Carlo analysis. Samples are evaluated in chunks and only streaming statistics are kept,
+        so memory is bounded by the chunk size. Every chunk has its own seed spawned from the given seed, which
+        makes results independent of the number of processes.
+
+        Args:
+            n_samples (int): Total number of samples.
+            seed (int, optional): Random seed. Defaults to None.
+            chunk_size (int, optional): Samples evaluated per array computation. Defaults to 10000.
+            latin_hypercube (bool, optional): Latin hypercube sampling within every chunk. Defaults to False.
+            processes (int, optional): Evaluate chunks in a process pool with this many workers. Defaults to None (serial).
+
+        Returns:
+            MonteCarloResult: Statistics of the outputs.
+        '''
+
+        sizes = [min(chunk_size, n_samples - i) for i in range(0, n_samples, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+        result = MonteCarloResult()
+
+        if processes and processes > 1:
+            with ProcessPoolExecutor(processes) as pool:
+                chunks = pool.map(
+                    self._run_chunk, sizes, seeds, [latin_hypercube] * len(sizes)
+                )
+                for chunk in chunks:
+                    result.merge(chunk)
+        else:
+            for size, s in zip(sizes, seeds):
+                result.merge(self._run_chunk(size, s, latin_hypercube))
+
+        return result
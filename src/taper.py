@@ -0,0 +1,212 @@
+'''
+Tapered (ply drop) laminates analyzed at many stations at once.
+
+A tapered laminate is a master stack of plies and a ply presence mask with one row per station. Dropped plies
+have zero thickness at a station, so the plies above them close the gap and the mid-plane moves to the centre of
+the remaining stack. Stations with the same presence mask share one ABD matrix, and plies with the same material
+and orientation share one transformed stiffness, so the z-integrals reduce to a single product of the masked
+thickness moments with the distinct ply stiffnesses.
+'''
+
+import numpy as np
+from typing import Union
+
+from material import Material
+from lamina import Lamina
+from material_table import MaterialTable, TableLaminate
+import clt
+
+
+class TaperedLaminate:
+    def __init__(
+        self,
+        table: MaterialTable,
+        materials: Union[int, str, Material, Lamina, np.ndarray],
+        orientations_deg: np.ndarray,
+        mask: np.ndarray,
+        thickness: Union[float, np.ndarray] = None,
+        stations: np.ndarray = None,
+    ):
+        '''
+        Tapered laminate defined by a master stack and the plies present at every station.
+
+        Args:
+            table (MaterialTable): Material table of the plies.
+            materials (int, str, Material, Lamina, np.ndarray): Material of all plies, or material ids with one
+                                                                 entry per ply of the master stack.
+            orientations_deg (np.ndarray): Ply orientations in degrees of the master stack, bottom ply first.
+            mask (np.ndarray): Ply presence with shape (n_stations, n_plies).
+            thickness (float, np.ndarray, optional): Ply thicknesses of the master stack. Defaults to the table
+                                                     thickness of each material.
+            stations (np.ndarray, optional): Station coordinates with shape (n_stations,). Defaults to the
+                                             station index.
+        '''
+
+        # The master stack uses the ply bookkeeping of a table laminate
+        self.master = TableLaminate(table)
+        self.master.add_stack(materials, orientations_deg, thickness)
+        self.table = self.master.table
+
+        mask = np.atleast_2d(np.asarray(mask, dtype=bool))
+        if mask.shape[-1] != self.master.num_layers:
+            raise ValueError(
+                f'The ply mask has {mask.shape[-1]} plies, the master stack has {self.master.num_layers}.'
+            )
+
+        self.mask: np.ndarray = mask
+        self.stations: np.ndarray = (
+            np.arange(len(mask), dtype=float) if stations is None else np.asarray(stations, dtype=float)
+        )
+        if self.stations.shape != (len(mask),):
+            raise ValueError('There must be one station coordinate per row of the ply mask.')
+
+        # Distinct ply drop configurations, stations refer to them by index
+        self.sections, self.section_index = np.unique(mask, axis=0, return_inverse=True)
+        self.section_index = self.section_index.ravel()
+
+        self._ABD = None
+
+    @classmethod
+    def from_drop_positions(
+        cls,
+        table: MaterialTable,
+        materials: Union[int, str, Material, Lamina, np.ndarray],
+        orientations_deg: np.ndarray,
+        drop_positions: np.ndarray,
+        stations: np.ndarray,
+        thickness: Union[float, np.ndarray] = None,
+    ) -> 'TaperedLaminate':
+        '''
+        Creates a tapered laminate whose plies end at the given spanwise positions. A ply is present at the
+        stations before its drop position, use inf for continuous plies.
+
+        Args:
+            drop_positions (np.ndarray): Spanwise position at which every ply of the master stack terminates.
+            stations (np.ndarray): Station coordinates with shape (n_stations,).
+
+        See TaperedLaminate for the other arguments.
+        '''
+
+        stations = np.asarray(stations, dtype=float)
+        mask = stations[:, None] < np.asarray(drop_positions, dtype=float)[None]
+
+        return cls(table, materials, orientations_deg, mask, thickness, stations)
+
+    @property
+    def num_stations(self) -> int:
+        return len(self.mask)
+
+    @property
+    def ply_thickness(self) -> np.ndarray:
+        '''Ply thicknesses at every station, zero for dropped plies, with shape (n_stations, n_plies).'''
+        return self.mask * self.master.ply_thickness
+
+    @property
+    def thickness(self) -> np.ndarray:
+        '''Laminate thickness at every station with shape (n_stations,).'''
+        return self.ply_thickness.sum(axis=-1)
+
+    @property
+    def z(self) -> np.ndarray:
+        '''Ply interface heights from the station mid-plane with shape (n_stations, n_plies + 1).'''
+        return clt.ply_heights(self.ply_thickness)
+
+    def ABD_matrix(self) -> np.ndarray:
+        '''
+        ABD matrices of all stations with shape (n_stations, 6, 6), assembled once per distinct ply drop section.
+        '''
+
+        if self._ABD is None:
+            Q_bar, _, _ = self.master._ply_matrices()
+
+            # Plies with the same material and orientation share their stiffness
+            _, pair, index = np.unique(
+                np.stack([self.master.material_ids, self.master.orientations], axis=-1),
+                axis=0,
+                return_index=True,
+                return_inverse=True,
+            )
+            index = index.ravel()
+
+            z = clt.ply_heights(self.sections * self.master.ply_thickness)
+            z0, z1 = z[:, :-1], z[:, 1:]
+            h = np.stack([z1 - z0, (z1 ** 2 - z0 ** 2) / 2, (z1 ** 3 - z0 ** 3) / 3], axis=1)
+
+            # Thickness moments summed per distinct ply stiffness, then one product for all sections
+            h_pair = np.zeros(h.shape[:2] + (len(pair),))
+            np.add.at(h_pair, (slice(None), slice(None), index), h)
+            A, B, D = np.moveaxis(np.einsum('smk,kij->smij', h_pair, Q_bar[pair]), 1, 0)
+
+            ABD = np.zeros((len(self.sections), 6, 6))
+            ABD[:, :3, :3] = A
+            ABD[:, :3, 3:] = B
+            ABD[:, 3:, :3] = B
+            ABD[:, 3:, 3:] = D
+
+            self._ABD = ABD
+
+        return self._ABD[self.section_index]
+
+    def midplane_strain(self, NM_matrix: np.ndarray) -> np.ndarray:
+        '''
+        Solves the station loads for the mid-plane strains and curvatures in one batched call.
+
+        Args:
+            NM_matrix (np.ndarray): Force and moment resultants with shape (6,) (the same load at every station),
+                                    (n_stations, 6) or (n_loads, n_stations, 6).
+
+        Returns:
+            np.ndarray: Mid-plane strains and curvatures with shape (n_stations, 6) or (n_loads, n_stations, 6).
+        '''
+
+        NM = np.asarray(NM_matrix, dtype=float)
+
+        # A single load is solved once per section
+        if NM.ndim == 1:
+            self.ABD_matrix()
+            return clt.solve_ABD(self._ABD, NM)[self.section_index]
+
+        if NM.shape[-2] != self.num_stations:
+            raise ValueError(f'Expected loads for {self.num_stations} stations, got {NM.shape[-2]}.')
+
+        return clt.solve_ABD(self.ABD_matrix(), NM)
+
+    def get_ply_stresses(self, NM_matrix: np.ndarray, local: bool = True) -> np.ndarray:
+        '''
+        Recovers the in-plane stresses at the mid-height of every ply of every station.
+
+        Args:
+            NM_matrix (np.ndarray): Force and moment resultants, see midplane_strain.
+            local (bool, optional): Return the stresses in the lamina principal directions [s1, s2, t12]
+                                    instead of the laminate axes [sx, sy, txy]. Defaults to True.
+
+        Returns:
+            np.ndarray: Ply stresses with shape (..., n_stations, n_plies, 3), NaN for dropped plies.
+        '''
+
+        strain = self.midplane_strain(NM_matrix)
+
+        z = self.z
+        z_mid = 0.5 * (z[:, 1:] + z[:, :-1])
+        e = strain[..., None, :3] + z_mid[..., None] * strain[..., None, 3:]
+
+        # Strain to stress matrices of every ply, with the rotation into the lamina axes folded in
+        Q_bar, _, T = self.master._ply_matrices()
+        M = T @ Q_bar if local else Q_bar
+
+        # Broadcast sum over the strain components, much faster than a batched 3x3 product
+        stress = M[..., 0] * e[..., None, 0] + M[..., 1] * e[..., None, 1] + M[..., 2] * e[..., None, 2]
+
+        return np.where(self.mask[..., None], stress, np.nan)
+
+    def station(self, index: int) -> TableLaminate:
+        '''Builds the laminate of the plies present at a single station.'''
+
+        present = self.mask[index]
+
+        lam = TableLaminate(self.table, self.master.length, self.master.width, self.master.shear_correction)
+        lam.add_stack(
+            self.master.material_ids[present], self.master.orientations[present], self.master.ply_thickness[present]
+        )
+
+        return lam
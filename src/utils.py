@@ -1,225 +1,106 @@
 from typing import Union
 import numpy as np
-from dataclasses import fields
 
-
-def R_x(theta_rad):
-    '''Rotation matrix about the x-axis'''
-    return np.array(
-        [
-            [1, 0, 0],
-            [0, np.cos(theta_rad), -np.sin(theta_rad)],
-            [0, np.sin(theta_rad), np.cos(theta_rad)],
-        ]
-    )
-
-
-def R_y(theta_rad):
-    '''Rotation matrix about the y-axis'''
-    return np.array(
-        [
-            [np.cos(theta_rad), 0, np.sin(theta_rad)],
-            [0, 1, 0],
-            [-np.sin(theta_rad), 0, np.cos(theta_rad)],
-        ]
-    )
-
-
-def R_z(theta_rad):
-    '''Rotation matrix about the z-axis'''
-    return np.array(
-        [
-            [np.cos(theta_rad), -np.sin(theta_rad), 0],
-            [np.sin(theta_rad), np.cos(theta_rad), 0],
-            [0, 0, 1],
-        ]
-    )
-
-
-def T_x(theta_rad):
-    '''Transformation matrix about the x-axis'''
-    return np.array(
-        [
-            [1, 0, 0],
-            [0, np.cos(theta_rad), np.cos(np.pi / 2 - theta_rad)],
-            [0, np.cos(theta_rad + np.pi / 2), np.cos(theta_rad)],
-        ]
-    )
-
-
-def T_y(theta_rad):
-    '''Transformation matrix about the y-axis'''
-    return np.array(
-        [
-            [np.cos(theta_rad), 0, np.cos(theta_rad + np.pi / 2)],
-            [0, 1, 0],
-            [np.cos(np.pi / 2 - theta_rad), 0, np.cos(theta_rad)],
-        ]
-    )
-
-
-def T_z(theta_rad):
-    '''Transformation matrix about the z-axis'''
-    return np.array(
-        [
-            [np.cos(theta_rad), np.cos(np.pi / 2 - theta_rad), 0],
-            [np.cos(theta_rad + np.pi / 2), np.cos(theta_rad), 0],
-            [0, 0, 1],
-        ]
-    )
-
-
-def create_tensor_3D(_11, _22, _33, _23=0, _13=0, _12=0):
-    """Create a 3D tensor given the x, y, z, xy, xz, yz values"""
-    return np.array([[_11, _12, _13], [_12, _22, _23], [_13, _23, _33]])
-
-
-def tensor_to_vec(tensor):
-    '''Create a vector from a given 3D tensor'''
-    return np.array([*np.diag(tensor), tensor[1, 2], tensor[0, 2], tensor[0, 1]])
-
-
-def transformation_3D(tensor, rot_matrix, theta, theta_radians=False):
+# Tensor helpers live in the conversion module, re-exported here for existing imports
+from conversion import (
+    R_x,
+    R_y,
+    R_z,
+    T_x,
+    T_y,
+    T_z,
+    create_tensor_3D,
+    tensor_to_vec,
+    transformation_3D,
+    to_gamma,
+    to_epsilon,
+)
+
+# type_check lives in the properties module, re-exported here for existing imports
+from properties import type_check  # noqa: F401
+
+
+def principal_angle_2D(tensor: np.ndarray) -> np.ndarray:
     '''
-    Return the transformed 3D tensor. Shear outputs are in terms of epsilon.
+    Returns the principal angle of the tensor in degrees. Accepts a single tensor or a stack of tensors,
+    only the in-plane (x, y) components are used.
 
         Parameters:
-            tensor (numpy.ndarray):        Cauchy tensor
-            rot_matrix (numpy.ndarray):    Rotation matrix
-            theta (float):                 Angle of rotation
-            radians (bool):                True if theta is given in radians 
-
+            tensor (numpy.ndarray):  Cauchy tensor(s) with shape (..., 2, 2) or (..., 3, 3)
         Returns:
-            prime (numpy.ndarray):   Transformed matrix
+            theta_p (numpy.ndarray):  Principal angle measure between coordinate axes and principal axes in degrees,
+                                      in the range (-45, 45]. Equal normal components with a shear component
+                                      give +45 degrees and a hydrostatic state gives 0 degrees.
     '''
+    _tensor = np.asarray(tensor)
 
-    _tensor = tensor.copy()
+    _x = _tensor[..., 0, 0]
+    _y = _tensor[..., 1, 1]
+    _xy = _tensor[..., 0, 1]
 
-    # Convert to radians and evaluate the rotation matrix
-    _theta = theta if theta_radians else theta * np.pi / 180
-    _R = rot_matrix(_theta)
+    # arctan2 remains defined when the normal components are equal
+    _theta_p = 0.5 * np.arctan2(2 * _xy, _x - _y)
 
-    # Transformation equation
-    _prime = _R.dot(_tensor).dot(_R.T)
-
-    return _prime
-
-
-def principal_angle_2D(tensor: np.ndarray) -> float:
-    '''
-    Returns the principal angle of the tensor in degrees.
-
-        Parameters:
-            tensor (numpy.ndarray):  Cauchy tensor
-        Returns:
-            theta_p (numpy.ndarray):  Principal angle measure between coordinate axes and principal axes in degrees
-    '''
-    _tensor = tensor.copy()
-
-    _x = _tensor[0, 0]
-    _y = _tensor[1, 1]
-    _xy = _tensor[0, 1]
-
-    _theta_p = 0.5 * np.arctan(2 * _xy / (_x - _y))
+    # Map to the range of the principal angle (-pi/4, pi/4]
+    _theta_p = np.where(_theta_p > np.pi / 4, _theta_p - np.pi / 2, _theta_p)
+    _theta_p = np.where(_theta_p <= -np.pi / 4, _theta_p + np.pi / 2, _theta_p)
 
     return _theta_p * 180 / np.pi
 
 
-def principal_stress_3D(stress_tensor: np.ndarray) -> Union[np.ndarray, np.ndarray]:
+def principal_stress_2D(stress_tensor: np.ndarray) -> Union[np.ndarray, np.ndarray]:
     '''
-    Returns the three principal stresses of a given tensor and their corresponding direction vectors.
+    Returns the in-plane principal stresses and their direction vectors from the closed form solution.
+    Accepts a single tensor or a stack of tensors, only the in-plane (x, y) components are used.
 
         Parameters:
-            stress_tensor (numpy.ndarray):  Stress tensor
+            stress_tensor (numpy.ndarray):  Stress tensor(s) with shape (..., 2, 2) or (..., 3, 3)
         Returns:
-            p_val (numpy.ndarray):  Array of ordered principal stress in descending value 
-            p_vec (numpy.ndarray):  Array of corresponding direction vectors
-    '''
-    _stress_tensor = stress_tensor.copy()
-
-    # Principal stresses and thier corresponding vectors
-    _e_val, _e_vec = np.linalg.eig(_stress_tensor)
-
-    # Sort the principal stresses in ascending order
-    _p3, _p2, _p1 = np.sort(_e_val)
-
-    # Correlate the sorted stresses with their vectors
-    _e_val_l = _e_val.tolist()
-    _p1_index, _p2_index, _p3_index = (
-        _e_val_l.index(_p1),
-        _e_val_l.index(_p2),
-        _e_val_l.index(_p3),
-    )
-    _p1_vec, _p2_vec, _p3_vec = (
-        _e_vec[:, _p1_index],
-        _e_vec[:, _p2_index],
-        _e_vec[:, _p3_index],
-    )
-
-    # Assembble two vectors containing the principal stresses and their dirctional vectors
-    _p_val, _p_vec = np.array([_p1, _p2, _p3]), np.array([_p1_vec, _p2_vec, _p3_vec])
-
-    return _p_val, _p_vec
-
-
-def to_gamma(strain_tensor) -> np.ndarray:
+            p_val (numpy.ndarray):  Principal stresses in descending order with shape (..., 2)
+            p_vec (numpy.ndarray):  Corresponding unit direction vectors with shape (..., 2, 2), p_vec[..., i, :] belongs to p_val[..., i]
     '''
-    Converts a given strain tensor into a matrix with shear strain in terms of gamma.
+    _tensor = np.asarray(stress_tensor)
 
-    Parameters:
-        strain_tensor (np.ndarray): Strain tensor in terms of epsilon.
+    _x = _tensor[..., 0, 0]
+    _y = _tensor[..., 1, 1]
+    _xy = _tensor[..., 0, 1]
 
-    Returns:
-        gamma_matrix (np.ndarray):  Strain matrix in terms of gamma.
-    '''
-    _strain_tensor = strain_tensor.copy()
+    # Mohr's circle center and radius
+    _center = 0.5 * (_x + _y)
+    _radius = np.hypot(0.5 * (_x - _y), _xy)
 
-    _gamma_matrix = _strain_tensor + (_strain_tensor - _strain_tensor * np.eye(3))
+    _p_val = np.stack([_center + _radius, _center - _radius], axis=-1)
 
-    return _gamma_matrix
+    # Direction of the major principal stress, the coordinate axes are returned for a hydrostatic state
+    _theta = 0.5 * np.arctan2(2 * _xy, _x - _y)
+    _c, _s = np.cos(_theta), np.sin(_theta)
 
-
-def to_epsilon(strain_matrix) -> np.ndarray:
-    '''
-    Converts a given strain matrix into a strain tensor with shear strain in terms of gamma.
-
-    Parameters:
-        strain_matrix (np.ndarray): Strain matrix in terms of gamma.
-
-    Returns:
-        epsilon_tensor (np.ndarray):  Strain tensor in terms of epsilon.
-    '''
-    _strain_matrix = strain_matrix.copy()
-
-    _epsilon_tensor = _strain_matrix * np.eye(3) + 0.5 * (
-        _strain_matrix - _strain_matrix * np.eye(3)
+    _p_vec = np.stack(
+        [np.stack([_c, _s], axis=-1), np.stack([-_s, _c], axis=-1)], axis=-2
     )
 
-    return _epsilon_tensor
+    return _p_val, _p_vec
 
 
-def type_check(properties):
+def principal_stress_3D(stress_tensor: np.ndarray) -> Union[np.ndarray, np.ndarray]:
     '''
-    Create vectors for variables that are passed in as single values
-
-    Args:
-        properties (Properties): Lamina or material properties object to check.
+    Returns the three principal stresses of a given tensor and their corresponding direction vectors.
+    Accepts a single tensor or a stack of tensors. Repeated principal stresses return an orthonormal
+    set of direction vectors.
 
-    Returns:
-        Properties: Properties object with all attributes being vectors of the appropriate length.
+        Parameters:
+            stress_tensor (numpy.ndarray):  Stress tensor(s) with shape (..., 3, 3)
+        Returns:
+            p_val (numpy.ndarray):  Array of ordered principal stress in descending value with shape (..., 3)
+            p_vec (numpy.ndarray):  Array of corresponding direction vectors with shape (..., 3, 3), p_vec[..., i, :] belongs to p_val[..., i]
     '''
-    p = properties
+    _stress_tensor = np.asarray(stress_tensor, dtype=float)
 
-    for field in fields(properties):
-        arg = getattr(p, field.name)
+    # Symmetric eigenvalue problem, eigenvalues are returned in ascending order with matching columns
+    _e_val, _e_vec = np.linalg.eigh(_stress_tensor)
 
-        if isinstance(arg, (float, int)):
-            setattr(p, field.name, np.ones(3) * arg)
+    # Reverse into descending order and return the vectors as rows
+    _p_val = _e_val[..., ::-1]
+    _p_vec = np.swapaxes(_e_vec[..., ::-1], -1, -2)
 
-        elif arg is None:
-            setattr(p, field.name, np.zeros(3))
-
-        else:
-            pass
-
-    return p
+    return _p_val, _p_vec
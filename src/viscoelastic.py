@@ -0,0 +1,247 @@
+'''
+Linear viscoelastic laminates with a Prony series matrix.
+
+The relaxation modulus of the matrix is a Prony series E(t) = E_inf + sum E_i exp(-t / tau_i) with a constant
+Poisson's ratio. Ply stiffnesses follow from the micromechanics model at every time (quasi-elastic
+correspondence) and are fitted with a Prony series on the same relaxation times. Since the ABD matrix is linear in
+the ply stiffnesses, the laminate relaxation matrix is a Prony series as well,
+
+    ABD(t) = ABD_inf + sum ABD_i exp(-t / tau_i)
+
+and the hereditary integral N(t) = int ABD(t - s) de/ds ds is stepped recursively with one internal variable per
+relaxation time, so the cost grows linearly with the number of time steps.
+'''
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+from material import Material
+from micromechanics import get_model
+from conversion import transformation_matrix_2D
+import clt
+
+
+@dataclass(frozen=True)
+class PronySeries:
+    '''
+    Isotropic viscoelastic material with the relaxation modulus E(t) = E_inf + sum E_i exp(-t / tau_i).
+
+    Attributes:
+        E_inf (float): Long term (equilibrium) modulus.
+        moduli (Tuple[float, ...]): Prony moduli E_i.
+        tau (Tuple[float, ...]): Relaxation times tau_i.
+        v (float, optional): Poisson's ratio, constant in time. Defaults to 0.35.
+        alpha (float, optional): Thermal expansion coefficient. Defaults to 0.
+    '''
+
+    E_inf: float
+    moduli: Tuple[float, ...]
+    tau: Tuple[float, ...]
+    v: float = 0.35
+    alpha: float = 0.0
+
+    def __post_init__(self):
+
+        object.__setattr__(self, 'moduli', tuple(float(E) for E in np.atleast_1d(self.moduli)))
+        object.__setattr__(self, 'tau', tuple(float(tau) for tau in np.atleast_1d(self.tau)))
+
+        if len(self.moduli) != len(self.tau):
+            raise ValueError('A Prony series needs one relaxation time per modulus.')
+        if min(self.tau) <= 0:
+            raise ValueError('Relaxation times must be positive.')
+
+    def modulus(self, t: np.ndarray) -> np.ndarray:
+        '''Relaxation modulus E(t) with the shape of t.'''
+
+        t = np.asarray(t, dtype=float)[..., None]
+
+        return self.E_inf + np.sum(np.array(self.moduli) * np.exp(-t / np.array(self.tau)), axis=-1)
+
+    def material(self, t: float = 0.0) -> Material:
+        '''Elastic material with the relaxation modulus at time t, t = 0 is the instantaneous material.'''
+
+        return Material(float(self.modulus(t)), self.v, 0, self.alpha)
+
+
+def _step_factors(dt: float, tau: np.ndarray):
+    '''
+    Decay exp(-dt / tau) of the internal variables over a time step and weight gamma of the strain increment,
+    gamma = tau / dt (1 - exp(-dt / tau)) for a strain rate that is constant within the step.
+    '''
+
+    decay = np.exp(-dt / tau)
+    gamma = tau / dt * (1 - decay) if dt > 0 else np.ones_like(tau)
+
+    return decay, gamma
+
+
+class ViscoelasticLaminate:
+    def __init__(
+        self,
+        mat_fiber: Material,
+        matrix: PronySeries,
+        Vol_fiber: float,
+        thickness: float,
+        orientations_deg: Sequence[float],
+        micromechanics: str = 'halpin_tsai',
+        array_geometry: int = 1,
+        n_fit: int = 200,
+    ):
+        '''
+        Laminate of unidirectional plies with an elastic fiber and a viscoelastic matrix.
+
+        Args:
+            mat_fiber (Material): Fiber material.
+            matrix (PronySeries): Viscoelastic matrix.
+            Vol_fiber (float): Fiber volume fraction.
+            thickness (float): Ply thickness.
+            orientations_deg (Sequence[float]): Ply orientations in degrees, bottom first.
+            micromechanics (str, optional): Micromechanics model, see micromechanics.available_models.
+                                            Defaults to 'halpin_tsai'.
+            array_geometry (int, optional): Halpin-Tsai geometric constant. Defaults to 1.
+            n_fit (int, optional): Logarithmically spaced times of the ply Prony fit. Defaults to 200.
+        '''
+
+        get_model(micromechanics)
+
+        self.mat_fiber = mat_fiber
+        self.matrix = matrix
+        self.Vol_fiber = float(Vol_fiber)
+        self.micromechanics = micromechanics
+        self.array_geometry = array_geometry
+        self.tau = np.array(matrix.tau)
+
+        # Ply stiffness relaxation on the matrix relaxation times, Q(t) = Q_inf + sum Q_i exp(-t / tau_i)
+        t = np.concatenate([[0.0], np.logspace(np.log10(self.tau.min()) - 2, np.log10(self.tau.max()) + 2, n_fit)])
+        Q = self.ply_stiffness(t)
+        basis = np.concatenate([np.ones((len(t), 1)), np.exp(-t[:, None] / self.tau)], axis=1)
+        coefficients = np.linalg.lstsq(basis, Q.reshape(len(t), 9), rcond=None)[0]
+        self.Q_terms = coefficients.reshape(-1, 3, 3)
+        self.fit_error = float(np.abs(basis @ coefficients - Q.reshape(len(t), 9)).max() / np.abs(Q).max())
+
+        # Ply matrices of every relaxation term and the laminate relaxation terms
+        self.orientations = np.asarray(orientations_deg, dtype=float)
+        theta = np.deg2rad(self.orientations)
+        self.Q_bar_terms = clt.transformed_reduced_stiffness(self.Q_terms[:, None], theta)
+        self.T = transformation_matrix_2D(theta)
+        self._z = clt.ply_heights(np.full(len(theta), float(thickness)))
+        self.ABD_terms = clt.ABD_matrix(self.Q_bar_terms, self._z)
+
+    @property
+    def num_layers(self) -> int:
+        return len(self.orientations)
+
+    def ply_stiffness(self, t: np.ndarray) -> np.ndarray:
+        '''Reduced ply stiffness at the given times from the micromechanics model, shape (..., 3, 3).'''
+
+        E_m = self.matrix.modulus(t)[..., None] * np.ones(3)
+        v_m = np.full_like(E_m, self.matrix.v)
+        G_m = E_m / (2 * (1 + v_m))
+        alpha_m = np.full_like(E_m, self.matrix.alpha)
+
+        fiber = self.mat_fiber.props
+        E, v, G, _ = get_model(self.micromechanics)(
+            fiber.E, fiber.v, fiber.G, fiber.alpha, E_m, v_m, G_m, alpha_m, self.Vol_fiber, self.array_geometry
+        )
+
+        return clt.reduced_stiffness(E, v, G)
+
+    def ABD_matrix(self, t: np.ndarray) -> np.ndarray:
+        '''Relaxation ABD matrices at the given times with shape (..., 6, 6).'''
+
+        t = np.asarray(t, dtype=float)[..., None]
+        weights = np.concatenate([np.ones(t.shape), np.exp(-t / self.tau)], axis=-1)
+
+        return np.einsum('...k,kij->...ij', weights, self.ABD_terms)
+
+    def solve(self, times: np.ndarray, NM_history: np.ndarray, ply_stress: bool = False, local: bool = True):
+        '''
+        Mid-plane strains (creep) of a load history with the recursive hereditary integral update. The laminate is
+        unloaded and undeformed before the first time, the strain rate is constant within every time step.
+
+        Args:
+            times (np.ndarray): Increasing times with shape (n_steps,).
+            NM_history (np.ndarray): Force and moment resultants with shape (n_steps, ..., 6), any number of load
+                                     cases in the middle dimensions.
+            ply_stress (bool, optional): Also recover the ply stresses at the mid-height of every ply.
+                                         Defaults to False.
+            local (bool, optional): Ply stresses in the lamina axes [s1, s2, t12] instead of the laminate axes.
+                                    Defaults to True.
+
+        Returns:
+            np.ndarray: Mid-plane strains and curvatures with shape (n_steps, ..., 6), and optionally the ply stresses
+                        with shape (n_steps, ..., n_plies, 3).
+        '''
+
+        times = np.asarray(times, dtype=float)
+        NM = np.asarray(NM_history, dtype=float)
+        if NM.shape[0] != len(times):
+            raise ValueError('NM_history needs one load per time.')
+
+        ABD_inf, ABD_i = self.ABD_terms[0], self.ABD_terms[1:]
+        Q_inf, Q_i = self.Q_bar_terms[0], self.Q_bar_terms[1:]
+        if local:
+            Q_inf, Q_i = self.T @ Q_inf, self.T @ Q_i
+        z_mid = 0.5 * (self._z[1:] + self._z[:-1])
+
+        strain = np.zeros(NM.shape)
+        stress = np.zeros(NM.shape[:-1] + (self.num_layers, 3)) if ply_stress else None
+
+        # Internal (hereditary) strain variables of every relaxation time
+        h = np.zeros((len(self.tau),) + NM.shape[1:])
+        previous = np.zeros(NM.shape[1:])
+        compliance = {}
+
+        for n in range(len(times)):
+            dt = times[n] - times[n - 1] if n else 0.0
+            decay, gamma = _step_factors(dt, self.tau)
+
+            # The tangent matrix only depends on the time step, it is inverted once per distinct step
+            key = round(dt, 12)
+            if key not in compliance:
+                compliance[key] = np.linalg.inv(ABD_inf + np.einsum('k,kij->ij', gamma, ABD_i))
+
+            decay = decay.reshape((-1,) + (1,) * previous.ndim)
+            gamma = gamma.reshape(decay.shape)
+
+            # N_n = ABD_inf e_n + sum ABD_i h_i,n with h_i,n = decay_i h_i,n-1 + gamma_i (e_n - e_n-1)
+            rhs = NM[n] - np.einsum('kij,k...j->...i', ABD_i, decay * h - gamma * previous)
+            current = rhs @ compliance[key].T
+
+            h = decay * h + gamma * (current - previous)
+            strain[n] = previous = current
+
+            if ply_stress:
+                e = current[..., None, :3] + z_mid[:, None] * current[..., None, 3:]
+                e_h = h[..., None, :3] + z_mid[:, None] * h[..., None, 3:]
+                stress[n] = np.einsum('pij,...pj->...pi', Q_inf, e) + np.einsum('kpij,k...pj->...pi', Q_i, e_h)
+
+        return (strain, stress) if ply_stress else strain
+
+
+def _convolution_solve(laminate: ViscoelasticLaminate, times: np.ndarray, NM_history: np.ndarray) -> np.ndarray:
+    '''
+    Reference solution of ViscoelasticLaminate.solve summing the full hereditary integral at every step, with a
+    cost quadratic in the number of steps. Uses the same linear strain interpolation, so both agree to round-off.
+    '''
+
+    times = np.asarray(times, dtype=float)
+    NM = np.asarray(NM_history, dtype=float)
+    ABD_inf, ABD_i, tau = laminate.ABD_terms[0], laminate.ABD_terms[1:], laminate.tau
+
+    dt = np.diff(times, prepend=times[0])
+    gamma = np.array([_step_factors(step, tau)[1] for step in dt])
+    increments = np.zeros(NM.shape)
+    strain = np.zeros(NM.shape)
+
+    for n in range(len(times)):
+        # Relaxation matrix averaged over every earlier step, ABD_inf + sum ABD_i exp(-(t_n - t_k) / tau) gamma_k
+        weights = np.exp(-(times[n] - times[:n + 1, None]) / tau) * gamma[:n + 1]
+        kernels = ABD_inf + np.einsum('mk,kij->mij', weights, ABD_i)
+
+        history = np.einsum('mij,m...j->...i', kernels[:n], increments[:n])
+        increments[n] = (NM[n] - history) @ np.linalg.inv(kernels[n]).T
+        strain[n] = strain[n - 1] + increments[n] if n else increments[n]
+
+    return strain
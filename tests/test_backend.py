@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import backend
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+
+
+def _laminate(code: str) -> Laminate:
+
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    return Laminate.from_stacking(code, Lamina(mat_composite=carbon, thickness=0.125e-3))
+
+
+@pytest.fixture
+def reset_backend(monkeypatch):
+
+    monkeypatch.setattr(backend, '_backend', None)
+    yield monkeypatch
+
+
+def test_loop_kernel_matches_numpy():
+
+    assert backend.check_equivalence(n_layups=10, n_plies=6, n_loads=3) < 1e-10
+
+
+@pytest.mark.parametrize('name', backend.available_backends())
+def test_backends_match_the_laminate(name):
+
+    lam = _laminate('[0/±45/90]s')
+    NM = np.array([[1e5, -2e4, 3e3, 10, -5, 1], [0, 1e4, 0, 0, 2, 0]])
+
+    ABD, strain, stress = backend.analyze(*backend.laminate_arrays(lam), NM[None], backend=name)
+
+    np.testing.assert_allclose(ABD[0], lam.ABD_matrix(), rtol=1e-10, atol=1e-6)
+    np.testing.assert_allclose(strain[0], lam.midplane_strain(NM), rtol=1e-10, atol=1e-16)
+    np.testing.assert_allclose(stress[0], lam.get_ply_stresses(NM), rtol=1e-10, atol=1e-3)
+
+
+def test_environment_falls_back_to_numpy_without_numba(reset_backend):
+
+    reset_backend.setattr(backend, 'numba', None)
+    reset_backend.setenv('COMPYSITE_BACKEND', 'numba')
+
+    with pytest.warns(UserWarning, match='numba'):
+        assert backend.get_backend() == 'numpy'
+
+    lam = _laminate('[0/90]s')
+    ABD, _, _ = backend.analyze(*backend.laminate_arrays(lam), np.zeros((1, 1, 6)))
+    np.testing.assert_allclose(ABD[0], lam.ABD_matrix(), rtol=1e-10, atol=1e-6)
+
+    with pytest.raises(ImportError):
+        backend.set_backend('numba')
+    with pytest.raises(ValueError):
+        backend.set_backend('cuda')
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from bulk_io import LOAD_COLUMNS, LayupBatch, analyze_loads, read_columns, read_table, write_table
+from lamina import Lamina
+from material import Material
+from material_table import MaterialTable, TableLaminate
+
+ANGLES = {0: [0, 45, -45, 90, 90, -45, 45, 0], 1: [30, -30, 0, 0, -30, 30], 2: [0, 90, 0]}
+
+
+def _table() -> MaterialTable:
+
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    table = MaterialTable()
+    table.add(Lamina(mat_composite=carbon, thickness=0.125e-3))
+
+    return table
+
+
+def _plies() -> dict:
+
+    layup = np.concatenate([np.full(len(angles), key) for key, angles in ANGLES.items()])
+    angle = np.concatenate([angles for angles in ANGLES.values()]).astype(float)
+
+    return {'layup': layup, 'material': np.zeros(layup.size, dtype=int), 'angle': angle}
+
+
+@pytest.mark.parametrize('ext', ['.csv', '.npy', '.npz'])
+def test_tables_round_trip(tmp_path, ext):
+
+    columns = {'layup': np.arange(10), 'material': np.zeros(10, dtype=int), 'angle': np.linspace(-90, 90, 10)}
+    path = str(tmp_path / f'plies{ext}')
+    write_table(path, columns)
+
+    table = read_table(path)
+    assert list(table) == list(columns)
+    for name, values in columns.items():
+        np.testing.assert_allclose(table[name], values)
+        assert table[name].dtype.kind == values.dtype.kind
+
+
+def test_csv_column_types_do_not_depend_on_the_chunk(tmp_path):
+
+    # The first chunk holds integral angles and loads only
+    path = str(tmp_path / 'loads.csv')
+    write_table(path, {'layup': np.arange(6), 'angle': [0.0, 90.0, 45.0, 22.5, 0.0, 30.5], 'Nx': [1e3, 2e3, 0, 0, 1.5, 2]})
+
+    chunks = list(read_columns(path, chunk_rows=2))
+
+    assert len(chunks) == 3
+    for chunk in chunks:
+        assert chunk['layup'].dtype == np.int64
+        assert chunk['angle'].dtype == np.float64 and chunk['Nx'].dtype == np.float64
+
+
+def test_layup_batch_matches_table_laminates(tmp_path):
+
+    table = _table()
+    plies = _plies()
+
+    # Shuffled rows with their stacking positions
+    plies['ply'] = np.concatenate([np.arange(len(angles)) for angles in ANGLES.values()])
+    order = np.random.default_rng(0).permutation(len(plies['layup']))
+    write_table(str(tmp_path / 'plies.csv'), {name: values[order] for name, values in plies.items()})
+
+    batch = LayupBatch.read(str(tmp_path / 'plies.csv'), table, chunk_rows=5)
+    assert len(batch) == 3
+
+    loads = np.random.default_rng(1).normal(size=(7, 6)) * [1e5, 1e5, 1e4, 10, 10, 1]
+    layup = np.array([2, 0, 1, 1, 0, 2, 0])
+
+    for i in range(len(layup)):
+        lam = TableLaminate(table)
+        lam.add_stack(0, ANGLES[layup[i]])
+
+        np.testing.assert_allclose(batch.ABD[batch.index(layup[i])], lam.ABD_matrix(), rtol=1e-10, atol=1e-6)
+        np.testing.assert_allclose(batch.midplane_strain(layup[i : i + 1], loads[i : i + 1])[0],
+                                   lam.midplane_strain(loads[i]), rtol=1e-8, atol=1e-18)
+
+        stress = batch.ply_stresses(layup[i : i + 1], loads[i : i + 1])[0]
+        n = len(ANGLES[layup[i]])
+        np.testing.assert_allclose(stress[:n], lam.get_ply_stresses(loads[i : i + 1])[0], rtol=1e-8, atol=1e-3)
+        np.testing.assert_array_equal(stress[n:], 0)
+
+    with pytest.raises(KeyError):
+        batch.index([3])
+
+
+def test_analyze_loads_streams_the_results(tmp_path):
+
+    batch = LayupBatch(**_plies(), table=_table())
+    loads = {'layup': np.array([0, 2, 1, 0]), **{name: np.full(4, 1e4) for name in LOAD_COLUMNS}}
+    write_table(str(tmp_path / 'loads.npy'), loads)
+
+    n = analyze_loads(batch, str(tmp_path / 'loads.npy'), str(tmp_path / 'ply.npz'), str(tmp_path / 'strain.csv'),
+                      chunk_rows=3)
+    assert n == 4
+
+    strain = read_table(str(tmp_path / 'strain.csv'))
+    np.testing.assert_array_equal(strain['case'], np.arange(4))
+    NM = np.full((4, 6), 1e4)
+    np.testing.assert_allclose(np.column_stack([strain[name] for name in ('e_x', 'e_y', 'g_xy')]),
+                               batch.midplane_strain(loads['layup'], NM)[:, :3], rtol=1e-8)
+
+    ply = read_table(str(tmp_path / 'ply.npz'))
+    assert len(ply['case']) == 8 + 3 + 6 + 8
+    np.testing.assert_array_equal(ply['ply'][:8], np.arange(1, 9))
+
+
+def test_layup_batch_rejects_empty_batches():
+
+    with pytest.raises(ValueError):
+        LayupBatch([], [], [], thickness=[])
@@ -0,0 +1,68 @@
+import numpy as np
+
+from calibration import OUTPUTS, PARAMETERS, calibrate, constituent_materials, constituent_parameters, micromechanics
+from compositeMaterial import composite_properties
+from material import Material
+
+FIBER = Material(np.array([233, 23.1, 23.1]) * 1e9, np.array([0.2, 0.4, 0.4]), np.array([8.27, 8.96, 8.96]) * 1e9,
+                 np.array([-0.54, 10.1, 10.1]) * 1e-6)
+MATRIX = Material(4.62e9, 0.36, 0, 41.4e-6)
+VOL_F = np.array([0.45, 0.52, 0.58, 0.63, 0.7])
+
+
+def test_forward_model_matches_composite_properties():
+
+    fiber, matrix = constituent_materials(constituent_parameters(FIBER, MATRIX))
+    values = micromechanics(constituent_parameters(FIBER, MATRIX), VOL_F)
+
+    E, v, G, alpha = composite_properties(
+        *fiber.get_properties(), fiber.get_expansion_properties()[0],
+        *matrix.get_properties(), matrix.get_expansion_properties()[0], VOL_F,
+    )
+    expected = np.stack([E[:, 0], E[:, 1], v[:, 2], v[:, 0], G[:, 2], G[:, 0], alpha[:, 0], alpha[:, 1]], axis=-1)
+
+    assert values.shape == (len(VOL_F), len(OUTPUTS))
+    np.testing.assert_allclose(values, expected, rtol=1e-12)
+
+
+def test_jacobian_matches_finite_differences():
+
+    params = constituent_parameters(FIBER, MATRIX)
+    _, J = micromechanics(params, VOL_F, jacobian=True)
+
+    for k, name in enumerate(PARAMETERS):
+        h = 1e-6 * abs(float(params[name]))
+        upper = micromechanics({**params, name: params[name] + h}, VOL_F)
+        lower = micromechanics({**params, name: params[name] - h}, VOL_F)
+        fd = (upper - lower) / (2 * h)
+
+        np.testing.assert_allclose(J[..., k], fd, rtol=1e-5, atol=1e-8 * np.abs(fd).max() + 1e-300, err_msg=name)
+
+
+def test_fit_recovers_the_constituents():
+
+    truth = constituent_parameters(FIBER, MATRIX)
+    measured = dict(zip(OUTPUTS, micromechanics(truth, VOL_F).T))
+    del measured['v23']
+
+    # Start from constituents 20 percent off, the fiber transverse properties and the matrix are fitted
+    free = ['E2_f', 'G12_f', 'alpha2_f', 'E_m', 'v_m', 'alpha_m']
+    start = {name: value * (1.2 if name in free else 1.0) for name, value in truth.items()}
+    result = calibrate(VOL_F, measured, *constituent_materials(start), free=free)
+
+    assert bool(result.converged) and float(result.cost) < 1e-20
+    for name in free:
+        np.testing.assert_allclose(result.params[name], truth[name], rtol=1e-6, err_msg=name)
+    np.testing.assert_allclose(result.residual[..., OUTPUTS.index('v23')], 0)
+
+
+def test_independent_fits_are_batched():
+
+    truth = constituent_parameters(FIBER, MATRIX)
+    E_m = np.array([3e9, 4.62e9, 6e9])
+    data = micromechanics({**truth, 'E_m': E_m[:, None]}, VOL_F)
+
+    result = calibrate(VOL_F, data, FIBER, MATRIX, free=['E_m'])
+
+    assert result.params['E_m'].shape == (3,) and np.all(result.converged)
+    np.testing.assert_allclose(result.params['E_m'], E_m, rtol=1e-8)
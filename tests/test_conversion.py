@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+import conversion
+from conversion import (
+    create_tensor_3D,
+    tensor_to_vec,
+    to_epsilon,
+    to_gamma,
+    transformation_3D,
+    transformation_matrix_2D,
+    transformation_matrix_3D,
+    vec_to_tensor,
+)
+
+# Single angle matrices written out as in the original scalar helpers
+REFERENCE = {
+    'R_x': lambda t: np.array([[1, 0, 0], [0, np.cos(t), -np.sin(t)], [0, np.sin(t), np.cos(t)]]),
+    'R_y': lambda t: np.array([[np.cos(t), 0, np.sin(t)], [0, 1, 0], [-np.sin(t), 0, np.cos(t)]]),
+    'R_z': lambda t: np.array([[np.cos(t), -np.sin(t), 0], [np.sin(t), np.cos(t), 0], [0, 0, 1]]),
+    'T_x': lambda t: np.array(
+        [[1, 0, 0], [0, np.cos(t), np.cos(np.pi / 2 - t)], [0, np.cos(t + np.pi / 2), np.cos(t)]]
+    ),
+    'T_y': lambda t: np.array(
+        [[np.cos(t), 0, np.cos(t + np.pi / 2)], [0, 1, 0], [np.cos(np.pi / 2 - t), 0, np.cos(t)]]
+    ),
+    'T_z': lambda t: np.array(
+        [[np.cos(t), np.cos(np.pi / 2 - t), 0], [np.cos(t + np.pi / 2), np.cos(t), 0], [0, 0, 1]]
+    ),
+}
+
+THETA = np.deg2rad(np.linspace(-180, 180, 25)).reshape(5, 5)
+
+
+def _tensors(shape) -> np.ndarray:
+
+    s = np.random.default_rng(1).normal(size=shape + (3, 3))
+    return s + np.swapaxes(s, -1, -2)
+
+
+@pytest.mark.parametrize('name', sorted(REFERENCE))
+def test_axis_matrices_match_the_scalar_reference(name):
+
+    stacked = getattr(conversion, name)(THETA)
+
+    assert stacked.shape == THETA.shape + (3, 3)
+    for index in np.ndindex(THETA.shape):
+        np.testing.assert_allclose(stacked[index], REFERENCE[name](THETA[index]), atol=1e-15)
+
+
+def test_transformation_3D_of_a_stack_matches_single_tensors():
+
+    tensor = _tensors(THETA.shape)
+    theta = np.rad2deg(THETA)
+    prime = transformation_3D(tensor, conversion.T_z, theta)
+
+    for index in np.ndindex(THETA.shape):
+        R = REFERENCE['T_z'](THETA[index])
+        np.testing.assert_allclose(prime[index], R @ tensor[index] @ R.T, atol=1e-14)
+
+    out = np.empty_like(tensor)
+    assert transformation_3D(tensor, conversion.T_z, theta, out=out) is out
+    np.testing.assert_array_equal(out, prime)
+
+
+def _voigt_reference(t: float) -> np.ndarray:
+    '''The original ConversionMatrices.transformation_matrix_3D of a single angle.'''
+
+    c, s = np.cos(t), np.sin(t)
+
+    return np.array(
+        [
+            [c ** 2, s ** 2, 0, 0, 0, 2 * c * s],
+            [s ** 2, c ** 2, 0, 0, 0, -2 * c * s],
+            [0, 0, 1, 0, 0, 0],
+            [0, 0, 0, c, s, 0],
+            [0, 0, 0, -s, c, 0],
+            [-c * s, c * s, 0, 0, 0, c ** 2 - s ** 2],
+        ]
+    )
+
+
+def test_voigt_transformations_match_the_reference():
+
+    T_3D = transformation_matrix_3D(THETA)
+    T_2D = transformation_matrix_2D(THETA)
+    planar = np.array([0, 1, 5])
+
+    for index in np.ndindex(THETA.shape):
+        np.testing.assert_allclose(T_3D[index], _voigt_reference(THETA[index]), atol=1e-15)
+        np.testing.assert_allclose(T_2D[index], _voigt_reference(THETA[index])[planar[:, None], planar], atol=1e-15)
+
+    # The in-plane stresses transform like the tensor rotated with T_z
+    tensor = _tensors(THETA.shape)
+    rotated = tensor_to_vec(transformation_3D(tensor, conversion.T_z, THETA, theta_radians=True))
+    np.testing.assert_allclose(np.einsum('...ij,...j->...i', T_2D, tensor_to_vec(tensor)[..., planar]),
+                               rotated[..., planar], atol=1e-14)
+
+    assert transformation_matrix_2D(THETA.astype(np.float32)).dtype == np.float32
+
+
+def test_voigt_and_strain_conversions():
+
+    tensor = _tensors((4, 2))
+    vec = tensor_to_vec(tensor)
+
+    np.testing.assert_array_equal(vec_to_tensor(vec), tensor)
+    np.testing.assert_array_equal(create_tensor_3D(*np.moveaxis(vec, -1, 0)), tensor)
+    np.testing.assert_array_equal(vec[1, 0], [tensor[1, 0, 0, 0], tensor[1, 0, 1, 1], tensor[1, 0, 2, 2],
+                                              tensor[1, 0, 1, 2], tensor[1, 0, 0, 2], tensor[1, 0, 0, 1]])
+
+    # The original helpers doubled (gamma) or halved (epsilon) the off-diagonal entries
+    off_diagonal = 1 - np.eye(3)
+    np.testing.assert_allclose(to_gamma(tensor), tensor + tensor * off_diagonal)
+    np.testing.assert_allclose(to_epsilon(tensor), tensor * np.eye(3) + 0.5 * tensor * off_diagonal)
+    np.testing.assert_allclose(to_gamma(vec), tensor_to_vec(to_gamma(tensor)))
+    np.testing.assert_allclose(to_epsilon(to_gamma(vec)), vec)
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from envelope import unit_ply_stresses
+from failure import PlyStrength, strength_ratio
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+
+STRENGTH = PlyStrength(1.5e9, 1.2e9, 50e6, 200e6, 70e6)
+
+
+def _laminate() -> Laminate:
+
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    return Laminate.from_stacking('[0/±45/90]s', Lamina(mat_composite=carbon, thickness=0.125e-3))
+
+
+def _strength_ratio(lam: Laminate, NM: np.ndarray) -> np.ndarray:
+    '''Strength ratio at the bottom and top of every ply, with shape (n_loads, 2, n_plies).'''
+
+    Q_bar, _, T = lam._ply_matrices()
+    stress = np.einsum('fpij,nj->nfpi', unit_ply_stresses(lam.ABD_matrix(), Q_bar, T, lam._z), NM)
+
+    return strength_ratio(stress, STRENGTH)
+
+
+def test_2D_envelope_points_fail_at_unit_strength_ratio():
+
+    lam = _laminate()
+    env = lam.failure_envelope(STRENGTH, ('Nx', 'Ny'))
+
+    R = _strength_ratio(lam, env.NM)
+    np.testing.assert_allclose(R.min(axis=(1, 2)), 1, rtol=1e-10)
+    np.testing.assert_allclose(R.min(axis=1)[np.arange(len(R)), env.critical_ply], 1, rtol=1e-10)
+
+    # Rays are ordered by angle and refined beyond the initial directions
+    angle = np.mod(np.arctan2(env.directions[:, 1], env.directions[:, 0]), 2 * np.pi)
+    assert np.all(np.diff(angle) > 0) and len(env.radius) > 32
+
+    # Along the axes the envelope passes through the uniaxial first-ply failure loads
+    tension = lam.failure_envelope(STRENGTH, ('Nx', 'Ny'), scale=[1.0, 1.0], n_directions=4, max_level=0)
+    np.testing.assert_allclose(tension.radius[np.argmax(tension.directions[:, 0])],
+                               _strength_ratio(lam, np.array([[1.0, 0, 0, 0, 0, 0]])).min(), rtol=1e-10)
+
+
+def test_3D_envelope_is_a_closed_outward_surface():
+
+    lam = _laminate()
+    env = lam.failure_envelope(STRENGTH, ('Nx', 'Nxy', 'Mx'), max_level=3)
+
+    R = _strength_ratio(lam, env.NM)
+    np.testing.assert_allclose(R.min(axis=(1, 2)), 1, rtol=1e-10)
+    np.testing.assert_allclose(np.linalg.norm(env.directions, axis=-1), 1, rtol=1e-12)
+
+    # Every edge is shared by exactly two triangles with opposite orientation, the mesh is a closed sphere
+    triangles = env.triangles
+    edges = np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]])
+    directed = {tuple(edge) for edge in edges}
+    assert len(directed) == len(edges)
+    assert all((j, i) in directed for i, j in directed)
+
+    n_vertices, n_edges = len(env.directions), len(edges) // 2
+    assert n_vertices - n_edges + len(triangles) == 2
+    np.testing.assert_array_equal(np.unique(triangles), np.arange(n_vertices))
+
+    # Outward orientation, the triangles enclose the unit sphere
+    a, b, c = (env.directions[triangles[:, k]] for k in range(3))
+    volume = np.einsum('ni,ni->n', a, np.cross(b, c)) / 6
+    assert np.all(volume > 0) and volume.sum() == pytest.approx(4 / 3 * np.pi, rel=2e-2)
+
+
+def test_failure_predicate_matches_the_closed_form():
+
+    lam = _laminate()
+
+    def fails(NM):
+        return _strength_ratio(lam, NM).min(axis=(1, 2)) <= 1
+
+    closed = lam.failure_envelope(STRENGTH, ('Ny', 'Nxy'), n_directions=16, max_level=0)
+    bisected = lam.failure_envelope(
+        STRENGTH, ('Ny', 'Nxy'), fails=fails, n_directions=16, max_level=0, radial_tol=1e-6
+    )
+
+    np.testing.assert_allclose(bisected.radius, closed.radius, rtol=2e-6)
+    assert np.all(bisected.critical_ply == -1)
+
+
+def test_invalid_components():
+
+    lam = _laminate()
+
+    with pytest.raises(ValueError):
+        lam.failure_envelope(STRENGTH, ('Nx', 'Nz'))
+    with pytest.raises(ValueError):
+        lam.failure_envelope(STRENGTH, ('Nx', 'Nx'))
+    with pytest.raises(ValueError):
+        lam.failure_envelope(None, ('Nx', 'Ny'))
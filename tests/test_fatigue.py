@@ -0,0 +1,122 @@
+import time
+
+import numpy as np
+
+from fatigue import FatigueDamage, RainflowCounter, SNCurve, rainflow
+
+
+def _rainflow_reference(x: np.ndarray) -> list:
+    '''Sequential four-point rainflow count of a single channel, (range, mean, count) of every cycle.'''
+
+    points = [x[0]]
+    for value in x[1:]:
+        if value == points[-1]:
+            continue
+        if len(points) > 1 and (points[-1] - points[-2]) * (value - points[-1]) > 0:
+            points[-1] = value
+        else:
+            points.append(value)
+
+    cycles, stack = [], []
+    for point in points:
+        stack.append(point)
+        while len(stack) >= 4:
+            s1, s2, s3, s4 = stack[-4:]
+            inner = abs(s3 - s2)
+            if inner > abs(s2 - s1) or inner > abs(s4 - s3):
+                break
+            cycles.append((inner, 0.5 * (s2 + s3), 1.0))
+            del stack[-3:-1]
+
+    cycles += [(abs(b - a), 0.5 * (a + b), 0.5) for a, b in zip(stack[:-1], stack[1:])]
+
+    return sorted(cycles)
+
+
+def _ring_down(n: int) -> np.ndarray:
+    '''Damped oscillation converging on zero followed by a large excursion, which closes every cycle at its end.'''
+
+    t = np.arange(n)
+    return np.append(np.exp(-3 * t / n) * (-1.0) ** t, [5.0, -5.0])
+
+
+def _assert_matches_reference(history: np.ndarray, cycles) -> None:
+
+    channels = history.reshape(len(history), -1)
+
+    for channel in range(channels.shape[1]):
+        selected = cycles.channels == channel
+        counted = sorted(zip(cycles.ranges[selected], cycles.means[selected], cycles.counts[selected]))
+        np.testing.assert_allclose(counted, _rainflow_reference(channels[:, channel]))
+
+
+def test_rainflow_matches_sequential_reference():
+
+    rng = np.random.default_rng(1)
+    history = np.round(rng.normal(size=(400, 2, 3)), 1)
+
+    _assert_matches_reference(history, rainflow(history))
+
+
+def test_rainflow_ring_down_matches_reference():
+
+    ring_down = _ring_down(2000)
+    noise = np.round(np.random.default_rng(3).normal(size=ring_down.size), 1)
+    history = np.stack([ring_down, noise, ring_down[::-1]], axis=1)
+
+    _assert_matches_reference(history, rainflow(history))
+
+
+def test_rainflow_ring_down_is_linear():
+
+    def duration(n):
+        history = _ring_down(n)[:, None]
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            rainflow(history)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    duration(1000)
+
+    # Four times the samples, a quadratic count would take sixteen times as long
+    assert duration(80_000) < 10 * duration(20_000)
+
+
+def test_rainflow_counter_chunks_match_full_history():
+
+    history = np.random.default_rng(2).normal(size=(300, 4))
+
+    counter = RainflowCounter(4)
+    chunks = [counter.update(chunk) for chunk in np.array_split(history, 7)]
+    ranges = np.concatenate([c.ranges for c in chunks] + [counter.residual().ranges])
+
+    np.testing.assert_allclose(np.sort(ranges), np.sort(rainflow(history).ranges))
+
+
+def test_rainflow_counter_accepts_empty_chunks():
+
+    history = np.random.default_rng(4).normal(size=(50, 2, 3))
+
+    counter = RainflowCounter(6)
+    assert counter.update(np.zeros((0, 2, 3))).ranges.size == 0
+
+    full = counter.update(history)
+    assert counter.update(np.zeros((0, 2, 3))).ranges.size == 0
+    ranges = np.concatenate([full.ranges, counter.residual().ranges])
+
+    np.testing.assert_allclose(np.sort(ranges), np.sort(rainflow(history).ranges))
+
+
+def test_fatigue_damage_of_constant_amplitude():
+
+    curve = SNCurve(S_f=1e3, m=10)
+    damage = FatigueDamage([curve] * 3, n_plies=1, mean_correction=None)
+
+    # 100 full cycles of amplitude 500 and a half cycle at each end
+    history = np.zeros((201, 1, 3))
+    history[:, 0, 0] = 500 * (-1.0) ** np.arange(201)
+    damage.update(history)
+
+    np.testing.assert_allclose(damage.damage[0], [100 * 0.5 ** 10, 0, 0])
@@ -0,0 +1,72 @@
+import numpy as np
+
+import clt
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+
+# Shear moduli [G23, G13, G12]
+G = np.array([3.5, 7.17, 7.17]) * 1e9
+
+
+def _ply() -> Lamina:
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), G)
+    return Lamina(mat_composite=carbon, thickness=0.125e-3)
+
+
+def test_ABDH_of_a_cross_ply():
+
+    lam = Laminate.from_stacking('[0/90]2s', _ply())
+    ABDH = lam.ABDH_matrix()
+    h = 8 * 0.125e-3
+
+    np.testing.assert_allclose(ABDH[:6, :6], lam.ABD_matrix(), rtol=1e-12)
+    np.testing.assert_array_equal(ABDH[:6, 6:], 0)
+
+    # Half the plies carry G23 and half G13 in each transverse shear direction
+    H = 5 / 6 * h * 0.5 * (G[0] + G[1])
+    np.testing.assert_allclose(ABDH[6:, 6:], H * np.eye(2), rtol=1e-12, atol=1e-6)
+
+
+def test_ABDH_of_a_rotated_ply():
+
+    lam = Laminate.from_stacking('[30]', _ply())
+    c, s = np.cos(np.pi / 6), np.sin(np.pi / 6)
+    C = np.array([[G[0] * c ** 2 + G[1] * s ** 2, (G[0] - G[1]) * c * s],
+                  [(G[0] - G[1]) * c * s, G[0] * s ** 2 + G[1] * c ** 2]])
+
+    np.testing.assert_allclose(lam.ABDH_matrix()[6:, 6:], 5 / 6 * 0.125e-3 * C, rtol=1e-12)
+
+    Q = np.array([[200.0, -50.0], [0, 10.0]])
+    strain = clt.solve_ABDH(lam.ABDH_matrix(), np.concatenate([np.zeros((2, 6)), Q], axis=-1))
+    np.testing.assert_allclose(strain[:, 6:], np.linalg.solve(5 / 6 * 0.125e-3 * C, Q.T).T, rtol=1e-10)
+
+
+def test_isotropic_shear_stress_is_parabolic():
+
+    ply = Lamina(mat_composite=Material(70e9, 0.3, 0), thickness=0.5e-3)
+    lam = Laminate.from_stacking('[0/45/90/-45]s', ply)
+    h = 8 * 0.5e-3
+
+    z, tau = lam.transverse_shear_stress([300.0, 1000.0], n_points=7)
+    parabola = 1.5 / h * (1 - 4 * z ** 2 / h ** 2)
+
+    np.testing.assert_allclose(tau[..., 0], 300 * parabola, rtol=1e-8, atol=1e-6)
+    np.testing.assert_allclose(tau[..., 1], 1000 * parabola, rtol=1e-8, atol=1e-6)
+
+
+def test_shear_stress_resultants_of_a_laminate():
+
+    lam = Laminate.from_stacking('[0/±45/90]s', _ply())
+    Q = np.array([[400.0, -100.0], [0, 250.0]])
+
+    z, tau = lam.transverse_shear_stress(Q, n_points=9)
+
+    # The profiles vanish at both surfaces, are continuous at the interfaces and integrate to the resultants
+    np.testing.assert_allclose(tau[:, 0, 0], 0, atol=1e-9 * np.abs(tau).max())
+    np.testing.assert_allclose(tau[:, -1, -1], 0, atol=1e-9 * np.abs(tau).max())
+    np.testing.assert_allclose(tau[:, 1:, 0], tau[:, :-1, -1], rtol=1e-12, atol=1e-9)
+    # Simpson's rule is exact for the parabolic profile within each ply
+    t = z[:, -1] - z[:, 0]
+    resultant = (t[:, None] / 6 * (tau[:, :, 0] + 4 * tau[:, :, 4] + tau[:, :, -1])).sum(axis=-2)
+    np.testing.assert_allclose(resultant, Q, rtol=1e-10, atol=1e-8)
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from failure import PlyStrength
+from joint import BoltedJoint, huth_flexibility
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+from notched import NotchedLaminate
+
+STRENGTH = PlyStrength(1.5e9, 1.2e9, 50e6, 200e6, 70e6)
+
+
+def _plates(strength: PlyStrength = None) -> NotchedLaminate:
+
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    ply = Lamina(mat_composite=carbon, thickness=0.125e-3)
+    thin = Laminate.from_stacking('[0/±45/90]s', ply)
+    thick = Laminate.from_stacking('[0/±45/90]2s', ply)
+
+    return NotchedLaminate.from_laminates([thin, thick], strength)
+
+
+def test_two_fastener_joint_matches_closed_form():
+
+    plates = _plates()
+    joint = BoltedJoint(plates, plates, 2, 25e-3, 30e-3, 6e-3, 110e9, layups_1=[0, 1, 0], layups_2=[1, 0, 0])
+
+    # Loop compatibility F1 (c2 + C) = F2 (c1 + C) with the segment compliances c and fastener flexibility C
+    c = 1 / joint.plate_stiffness[:, 0]
+    C = joint.flexibility[:, 0]
+    F1 = (c[:, 0] + C) / (c[:, 0] + c[:, 1] + 2 * C)
+
+    np.testing.assert_allclose(joint.distribution, np.stack([F1, 1 - F1], axis=-1), rtol=1e-10)
+    np.testing.assert_allclose(joint.distribution[2], [0.5, 0.5])
+
+
+def test_load_distribution_of_a_fastener_row():
+
+    plates = _plates()
+    joint = BoltedJoint(plates, plates, 4, 25e-3, 30e-3, [[6e-3] * 4, [4e-3, 6e-3, 6e-3, 8e-3]], 110e9,
+                        layups_1=[0, 0], layups_2=[0, 0])
+
+    np.testing.assert_allclose(joint.distribution.sum(axis=-1), 1, rtol=1e-12)
+
+    # Equal plates load the outer fasteners most, symmetrically
+    F = joint.distribution[0]
+    np.testing.assert_allclose(F, F[::-1], rtol=1e-10)
+    assert F[0] > F[1]
+
+    # A stiffer (larger) fastener attracts more load
+    assert joint.distribution[1, 3] > F[3] and joint.distribution[1, 0] < F[0]
+
+
+def test_huth_flexibility():
+
+    single = huth_flexibility(2e-3, 60e9, 2e-3, 60e9, 6e-3, 110e9)
+    expected = (4e-3 / 12e-3) ** (2 / 3) * 4.2 * (2 / (2e-3 * 60e9) + 1 / (2e-3 * 110e9))
+
+    assert single == pytest.approx(expected, rel=1e-12)
+    assert huth_flexibility(2e-3, 60e9, 2e-3, 60e9, 6e-3, 110e9, 'double') < single
+
+    with pytest.raises(ValueError):
+        huth_flexibility(2e-3, 60e9, 2e-3, 60e9, 6e-3, 110e9, joint_type='welded')
+    with pytest.raises(ValueError):
+        huth_flexibility(2e-3, 60e9, 2e-3, 60e9, 6e-3, 110e9, shear='triple')
+
+
+def test_bearing_and_bypass_loads():
+
+    plates = _plates()
+    joint = BoltedJoint(plates, plates, 3, 25e-3, 30e-3, 6e-3, 110e9, layups_1=[0], layups_2=[1])
+    result = joint.solve([1e5, -2e5])
+
+    P = np.array([1e5, -2e5]) * 30e-3
+    F = result.fastener_load[0]
+    np.testing.assert_allclose(F, P[:, None] * joint.distribution[0], rtol=1e-12)
+
+    # Plate 1 carries the full load before the first fastener, plate 2 after the last one
+    np.testing.assert_allclose(result.bypass_load[0, :, 0, 0] + F[:, 0], P, rtol=1e-12)
+    np.testing.assert_allclose(result.bypass_load[0, :, -1, 1] + F[:, -1], P, rtol=1e-12)
+    np.testing.assert_allclose(result.bypass_load[0, :, 0, 1], 0, atol=1e-9)
+
+    np.testing.assert_allclose(result.bearing_stress[0, ..., 0], F / (6e-3 * plates.thickness[0]), rtol=1e-12)
+    np.testing.assert_allclose(result.bearing_stress[0, ..., 1], F / (6e-3 * plates.thickness[1]), rtol=1e-12)
+    assert result.ratio is None
+
+
+def test_bearing_bypass_interaction():
+
+    plates = _plates(STRENGTH)
+    joint = BoltedJoint(plates, plates, 3, 25e-3, 30e-3, 6e-3, 110e9, layups_1=[0], layups_2=[1])
+    Nx = np.array([1e5, -2e5])
+
+    bearing = joint.solve(Nx, bearing_strength=(600e6, 700e6))
+    np.testing.assert_allclose(bearing.ratio[..., 0], 600e6 / np.abs(bearing.bearing_stress[..., 0]), rtol=1e-12)
+
+    combined = joint.solve(Nx, bearing_strength=(600e6, 700e6), distance=1e-3)
+    bypass = combined.bypass_load[0, :, 1, 0] / 30e-3
+    open_hole = plates.strength_ratio(np.stack([bypass, 0 * bypass, 0 * bypass], -1), 3e-3, 1e-3, layups=[0])[0][0]
+
+    expected = 1 / (1 / bearing.ratio[0, :, 1, 0] + 1 / open_hole)
+    np.testing.assert_allclose(combined.ratio[0, :, 1, 0], expected, rtol=1e-10)
+    assert np.all(combined.strength_ratio < bearing.strength_ratio)
+
+    fastener, plate = combined.critical
+    np.testing.assert_allclose(combined.ratio[0, [0, 1], fastener[0], plate[0]], combined.strength_ratio[0])
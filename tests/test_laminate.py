@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import clt
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+from stacking import StackingSequenceError, parse_stacking
+
+
+def _ply() -> Lamina:
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    return Lamina(mat_composite=carbon, thickness=0.125e-3)
+
+
+@pytest.mark.parametrize('notation, expected', [
+    ('[0/90/45]', [0, 90, 45]),
+    ('[0_2/90]', [0, 0, 90]),
+    ('[0/±45/90]', [0, 45, -45, 90]),
+    ('[0/(∓30)2]', [0, -30, 30, -30, 30]),
+    ('[0/90]2s', [0, 90, 0, 90, 90, 0, 90, 0]),
+    ('[0/45/90̄]s', [0, 45, 90, 45, 0]),
+    ('[0/45]T', [0, 45]),
+])
+def test_parse_stacking(notation, expected):
+
+    np.testing.assert_array_equal(parse_stacking(notation), expected)
+
+
+@pytest.mark.parametrize('notation', ['0/90', '[0/90', '[0//90]', '[0/90]x'])
+def test_parse_stacking_rejects_malformed_codes(notation):
+
+    with pytest.raises(StackingSequenceError):
+        parse_stacking(notation)
+
+
+def test_from_stacking_matches_ply_by_ply_assembly():
+
+    lam = Laminate.from_stacking('[0/±45/90]s', _ply())
+
+    reference = Laminate()
+    for angle in [0, 45, -45, 90, 90, -45, 45, 0]:
+        reference.add_lamina(_ply(), angle)
+
+    np.testing.assert_allclose(lam.ABD_matrix(), reference.ABD_matrix(), rtol=1e-12, atol=1e-12)
+    assert lam.symmetric and lam.balanced
+    assert not Laminate.from_stacking('[0/45]T', _ply()).symmetric
+
+
+def test_symmetric_fast_path_matches_coupled_solve():
+
+    lam = Laminate.from_stacking('[0/±45/90]s', _ply())
+    NM = np.array([[1e5, -2e4, 3e3, 10, -5, 1], [0, 1e4, 0, 0, 2, 0]])
+
+    expected = clt.solve_ABD(lam.ABD_matrix(), NM)
+    np.testing.assert_allclose(lam.midplane_strain(NM), expected, rtol=1e-10, atol=1e-16)
+
+
+def test_add_stack_plies_are_independent():
+
+    lam = Laminate()
+    lam.add_stack(_ply(), [0, 45, 45, 0])
+    lam.lamina[1].set_orientation(-45)
+
+    assert len({id(lamina) for lamina in lam.lamina}) == 4
+    np.testing.assert_allclose([np.rad2deg(l.props.orientation) for l in lam.lamina], [0, -45, 45, 0])
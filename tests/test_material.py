@@ -0,0 +1,70 @@
+import copy
+import dataclasses
+import pickle
+
+import numpy as np
+import pytest
+
+from lamina import Lamina
+from material import Material
+from properties import StateProperties
+
+
+def _carbon() -> Material:
+    return Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+
+
+def test_material_value_semantics():
+
+    mat = _carbon()
+    same = _carbon()
+
+    assert mat == same and hash(mat) == hash(same)
+    assert mat != Material(70e9, 0.3, 0)
+    assert copy.copy(mat) is mat and copy.deepcopy(mat) is mat
+
+    restored = pickle.loads(pickle.dumps(mat))
+    assert restored == mat and hash(restored) == hash(mat)
+
+    with pytest.raises(AttributeError):
+        mat.props = same.props
+    with pytest.raises(AttributeError):
+        mat.props.E = np.ones(3)
+    with pytest.raises(ValueError):
+        mat.props.E[0] = 1.0
+
+
+def test_material_keeps_no_reference_to_its_inputs():
+
+    E = np.array([181, 10.3, 10.3]) * 1e9
+    mat = Material(E, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    E[0] = 0
+
+    assert mat.props.E[0] == 181e9 and mat == _carbon()
+    assert {mat: 1}[_carbon()] == 1
+
+
+def test_lamina_shares_its_immutable_properties():
+
+    ply = Lamina(mat_composite=_carbon(), thickness=0.125e-3)
+    rotated = ply.copy()
+    rotated.set_orientation(45)
+
+    assert rotated.props.material is ply.props.material
+    assert ply.props.orientation == 0 and rotated.props.orientation == pytest.approx(np.pi / 4)
+    assert rotated.props == dataclasses.replace(ply.props, orientation=rotated.props.orientation)
+    assert not hasattr(ply, '__dict__')
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        ply.props.thickness = 1.0
+
+
+def test_state_properties_are_read_only():
+
+    stress = np.eye(3)
+    state = StateProperties(stress, 2 * stress)
+    stress[0, 0] = 5
+
+    assert state.stress[0, 0] == 1 and state == StateProperties(np.eye(3), 2 * np.eye(3))
+    with pytest.raises(ValueError):
+        state.strain[0, 0] = 0
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from conversion import create_tensor_3D
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+from material_table import MaterialTable, TableLaminate
+
+
+def _ply() -> Lamina:
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    return Lamina(mat_composite=carbon, thickness=0.125e-3)
+
+
+def test_sandwich_matches_ply_by_ply_laminate():
+
+    face = _ply()
+    core = Lamina(mat_composite=Material(0.2e9, 0.3, 0), thickness=10e-3)
+
+    table = MaterialTable()
+    panel = TableLaminate(table)
+    panel.add_stack(face, [0, 45, -45, 90])
+    panel.add_lamina(table.add(core, name='core'))
+    panel.add_stack(face, [90, -45, 45, 0])
+
+    reference = Laminate()
+    reference.add_stack(face, [0, 45, -45, 90])
+    reference.add_lamina(core)
+    reference.add_stack(face, [90, -45, 45, 0])
+
+    assert len(table) == 2 and panel.num_layers == 9
+    np.testing.assert_array_equal(panel.material_ids, [0, 0, 0, 0, 1, 0, 0, 0, 0])
+    assert panel.thickness == pytest.approx(reference.thickness)
+    np.testing.assert_allclose(panel.ABD_matrix(), reference.ABD_matrix(), rtol=1e-10, atol=1e-6)
+    np.testing.assert_allclose(panel.ABDH_matrix(), reference.ABDH_matrix(), rtol=1e-10, atol=1e-6)
+
+
+def test_material_lookup():
+
+    table = MaterialTable()
+    ply = _ply()
+
+    assert table.add(ply, name='cf') == table.add(ply) == table.material_id('cf') == 0
+    assert ply in table and table.thickness[0] == 0.125e-3
+
+    with pytest.raises(KeyError):
+        table.material_id('glass')
+    with pytest.raises(IndexError):
+        table.material_id(1)
+    with pytest.raises(IndexError):
+        TableLaminate(table).add_stack([0, 1], [0, 90])
+    with pytest.raises(ValueError):
+        TableLaminate(table).add_stack(0, [0, 90], thickness=0)
+
+
+def test_hygrothermal_resultants_of_an_isotropic_ply():
+
+    E, v, alpha, h = 70e9, 0.3, 23e-6, 2e-3
+    ply = Lamina(mat_composite=Material(E, v, 0, alpha), thickness=h)
+    lam = TableLaminate.from_stacking('[30]', ply)
+
+    NM = lam.hygrothermal_resultants(delta_T=np.array([-100.0, 50.0]))
+    N = E * alpha * h / (1 - v) * np.array([-100.0, 50.0])
+
+    np.testing.assert_allclose(NM[:, :2], np.stack([N, N], axis=-1), rtol=1e-10)
+    np.testing.assert_allclose(NM[:, 2:], 0, atol=1e-6)
+
+
+def test_table_laminate_states_match_laminate():
+
+    lam = Laminate.from_stacking('[0/45/-45/90]s', _ply())
+    table = TableLaminate.from_stacking('[0/45/-45/90]s', _ply())
+
+    stress = create_tensor_3D(1e6, 2e6, 0, 0, 0, 3e5)
+    for method, load in (('apply_stress', stress), ('apply_strain', stress * 1e-9)):
+        getattr(lam, method)(load)
+        getattr(table, method)(load)
+
+        assert len(table.global_state) == lam.num_layers
+        for expected, state in zip(lam.global_state, table.global_state):
+            np.testing.assert_allclose(state.stress, expected.stress, rtol=1e-10, atol=1e-6)
+            np.testing.assert_allclose(state.strain, expected.strain, rtol=1e-10, atol=1e-18)
+
+    NM = np.array([1e5, 0, 2e4, 1, 0, 0])
+    lam.apply_load(NM)
+    table.apply_load(NM)
+    np.testing.assert_allclose(table.get_state_at_height(1e-4, 3).stress, lam.get_state_at_height(1e-4, 3).stress)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+import micromechanics
+from micromechanics import available_models, composite_material, get_model, register_model
+from material import Material
+from properties import PropertyCurve
+
+# Transversely isotropic fiber with a consistent G23 = E2 / (2 (1 + v23)), properties in [23, 13, 12] order
+E_F = np.array([233, 23.1, 23.1]) * 1e9
+V_F = np.array([0.25, 0.2, 0.2])
+G_F = np.array([23.1 / 2.5, 8.96, 8.96]) * 1e9
+E_M, NU_M = 4.62e9, 0.36
+
+
+def _constituents(alpha_f):
+
+    G_m = E_M / (2 * (1 + NU_M))
+    matrix = [np.full(3, value) for value in (E_M, NU_M, G_m, 41.4e-6)]
+
+    return (E_F, V_F, G_F, np.asarray(alpha_f, dtype=float), *matrix)
+
+
+@pytest.mark.parametrize('model', available_models())
+def test_volume_fraction_limits_recover_the_constituents(model):
+
+    # Schapery's transverse expansion only reduces to the fiber value for isotropic fiber expansion
+    constituents = _constituents(np.full(3, 5e-6))
+
+    for Vol_f, expected in ((0.0, constituents[4:]), (1.0, constituents[:4])):
+        for name, value, reference in zip('EvGa', get_model(model)(*constituents, Vol_f), expected):
+            np.testing.assert_allclose(value, reference, rtol=1e-12, err_msg=f'{model} {name} at V_f = {Vol_f}')
+
+
+@pytest.mark.parametrize('model', available_models())
+def test_models_are_bounded_by_the_constituents(model):
+
+    Vol_f = np.linspace(0.05, 0.95, 19)
+    E, v, G, _ = get_model(model)(*_constituents([-0.54e-6, 10.1e-6, 10.1e-6]), Vol_f)
+
+    assert E.shape == (19, 3)
+    assert np.all(np.diff(E, axis=0) > 0) and np.all(np.diff(G, axis=0) > 0)
+    assert np.all((E > E_M) & (E < E_F)) and np.all((G > E_M / (2 * (1 + NU_M))) & (G < G_F))
+
+    # The axial modulus follows the rule of mixtures
+    np.testing.assert_allclose(E[:, 0], E_F[0] * Vol_f + E_M * (1 - Vol_f), rtol=1e-3)
+
+
+def test_registered_models_are_used_by_the_materials():
+
+    calls = []
+
+    @register_model('test_rule_of_mixtures')
+    def rule_of_mixtures(E_f, v_f, G_f, alpha_f, E_m, v_m, G_m, alpha_m, Vol_f, array_geometry=1):
+        calls.append(Vol_f)
+        mix = [np.asarray(f) * Vol_f + np.asarray(m) * (1 - Vol_f) for f, m in ((E_f, E_m), (v_f, v_m), (G_f, G_m),
+                                                                              (alpha_f, alpha_m))]
+        return tuple(mix)
+
+    try:
+        fiber = Material(E_F, V_F, G_F)
+        matrix = Material(E_M, NU_M, 0, 0, curves={'E': PropertyCurve([20, 120], [E_M, 0.5 * E_M])})
+        composite = composite_material(fiber, matrix, 0.5, 'test_rule_of_mixtures')
+
+        np.testing.assert_allclose(composite.props.E, 0.5 * (E_F + E_M))
+        np.testing.assert_allclose(composite.at(120).props.E, 0.5 * (E_F + 0.5 * E_M))
+
+        # Memoized per model, fiber, matrix and volume fraction
+        n_calls = len(calls)
+        assert composite_material(fiber, matrix, 0.5, 'test_rule_of_mixtures') is composite
+        assert len(calls) == n_calls
+    finally:
+        del micromechanics.MODELS['test_rule_of_mixtures']
+        micromechanics.clear_cache()
+
+    with pytest.raises(ValueError):
+        get_model('test_rule_of_mixtures')
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+from nonlinear import HahnTsai, NonlinearLaminate, RambergOsgood
+
+NM = np.array([[0, 0, 3e4, 0, 0, 0], [2e4, 0, 1e4, 0, 0, 0], [0, 0, 1e4, 0, 0, 2]])
+
+
+def _laminate(code: str = '[0/±45/90]2s') -> Laminate:
+
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    return Laminate.from_stacking(code, Lamina(mat_composite=carbon, thickness=0.125e-3))
+
+
+def test_linear_shear_law_matches_classical_lamination_theory():
+
+    lam = _laminate()
+    result = lam.solve_nonlinear(NM, HahnTsai(0.0), n_steps=4)
+
+    np.testing.assert_allclose(result.strain[-1], lam.midplane_strain(NM), rtol=1e-10, atol=1e-16)
+    np.testing.assert_allclose(result.strain[1], 0.5 * lam.midplane_strain(NM), rtol=1e-10, atol=1e-16)
+
+    # Stresses are linear through a ply, the thickness average is the mid-height stress
+    stress = lam.get_ply_stresses(NM)
+    np.testing.assert_allclose(result.ply_stress[-1], stress, rtol=1e-8, atol=1e-8 * np.abs(stress).max())
+
+    # A linear response converges in a single iteration with a single factorization
+    assert np.all(result.converged) and np.all(result.iterations == 1) and result.factorizations == 1
+
+
+def test_small_loads_are_linear():
+
+    lam = _laminate()
+    result = lam.solve_nonlinear(1e-3 * NM, HahnTsai(2e-25), n_steps=1)
+
+    np.testing.assert_allclose(result.strain[-1], lam.midplane_strain(1e-3 * NM), rtol=1e-8, atol=1e-18)
+
+
+@pytest.mark.parametrize('law', [HahnTsai(2e-25), RambergOsgood(80e6, 5.0)])
+def test_unidirectional_shear_follows_the_shear_law(law):
+
+    lam = _laminate('[0]4')
+    h = lam.thickness
+    N = np.array([[0, 0, 5e3, 0, 0, 0], [0, 0, -1e4, 0, 0, 0]])
+
+    result = lam.solve_nonlinear(N, law, n_steps=10)
+
+    tau = N[:, 2] / h
+    expected = tau / 7.17e9 + law.nonlinear_strain(tau)[0]
+    np.testing.assert_allclose(result.strain[-1, :, 2], expected, rtol=1e-7)
+    np.testing.assert_allclose(result.ply_stress[-1, :, :, 2], np.repeat(tau[:, None], 4, axis=-1), rtol=1e-8)
+    assert abs(result.strain[-1, 0, 2]) > 1.01 * abs(tau[0] / 7.17e9)
+
+
+def test_modified_newton_matches_newton():
+
+    lam = _laminate()
+    law = HahnTsai(2e-25)
+    loads = 10 * NM
+
+    newton = lam.solve_nonlinear(loads, law, n_steps=20, method='newton')
+    modified = lam.solve_nonlinear(loads, law, n_steps=20, method='modified')
+
+    assert np.all(newton.converged) and np.all(modified.converged)
+    np.testing.assert_allclose(modified.strain, newton.strain, rtol=1e-6, atol=1e-7 * np.abs(newton.strain).max())
+    assert modified.factorizations < newton.factorizations
+
+    with pytest.raises(ValueError):
+        NonlinearLaminate.from_laminate(lam, law).solve(loads, method='secant')
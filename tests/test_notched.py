@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from failure import PlyStrength, strength_ratio
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+from notched import NotchedLaminate, average_stress_concentration, stress_concentration
+
+STRENGTH = PlyStrength(1.5e9, 1.2e9, 50e6, 200e6, 70e6)
+
+
+def _laminates() -> list:
+
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    ply = Lamina(mat_composite=carbon, thickness=0.125e-3)
+    return [Laminate.from_stacking(code, ply) for code in ('[0/±45/90]s', '[0/90]2s', '[0/30/-60]s')]
+
+
+def test_notched_isotropic_plate_matches_kirsch():
+
+    ply = Lamina(mat_composite=Material(70e9, 0.3, 0), thickness=1e-3)
+    notched = NotchedLaminate.from_laminates([Laminate.from_stacking('[0/45/90]s', ply)])
+
+    theta = np.linspace(0, 180, 37)
+    stress = notched.hole_edge_stress([1e5, 0, 0], theta)[0, 0] / (1e5 / notched.thickness[0])
+
+    np.testing.assert_allclose(stress, 1 - 2 * np.cos(2 * np.deg2rad(theta)), atol=1e-6)
+    assert stress.max() == pytest.approx(3.0)
+
+
+def test_orthotropic_stress_concentration_factor():
+
+    notched = NotchedLaminate.from_laminates(_laminates()[1:2])
+    a = notched.compliance[0]
+    Ex, Ey, Gxy, vxy = 1 / a[0, 0], 1 / a[1, 1], 1 / a[2, 2], -a[0, 1] / a[0, 0]
+
+    K = notched.hole_edge_stress([1.0, 0, 0], 90.0)[0, 0, 0] * notched.thickness[0]
+
+    assert K == pytest.approx(1 + np.sqrt(2 * (np.sqrt(Ex / Ey) - vxy) + Ex / Gxy), rel=1e-10)
+
+
+def test_hole_edge_is_traction_free_and_the_field_decays():
+
+    notched = NotchedLaminate.from_laminates(_laminates())
+    N = np.array([[1e5, -2e4, 3e4]])
+    theta = np.linspace(0, 360, 73)
+
+    edge = notched.stress_field(N, 3e-3, 3e-3, theta)[:, 0, 0]
+    c, s = np.cos(np.deg2rad(theta)), np.sin(np.deg2rad(theta))
+    sr = edge[..., 0] * c * c + edge[..., 1] * s * s + 2 * edge[..., 2] * s * c
+    trt = (edge[..., 1] - edge[..., 0]) * s * c + edge[..., 2] * (c * c - s * s)
+    np.testing.assert_allclose(sr, 0, atol=1e-8 * np.abs(edge).max())
+    np.testing.assert_allclose(trt, 0, atol=1e-8 * np.abs(edge).max())
+
+    far = notched.stress_field(N, 3e-3, 3.0, theta)[:, 0, 0]
+    np.testing.assert_allclose(far, np.broadcast_to((N[0] / notched.thickness[:, None])[:, None], far.shape), rtol=1e-4)
+
+
+def test_average_stress_is_the_mean_over_the_radial_lines():
+
+    notched = NotchedLaminate.from_laminates(_laminates())
+    theta = np.linspace(0, 2 * np.pi, 12, endpoint=False)
+    rho = 1.5
+
+    x, w = np.polynomial.legendre.leggauss(40)
+    K = stress_concentration(notched.mu, 1 + (rho - 1) * (x + 1) / 2, theta)
+    mean = np.einsum('r,nrtij->ntij', w / 2, K)
+
+    np.testing.assert_allclose(average_stress_concentration(notched.mu, rho, theta), mean, rtol=1e-8, atol=1e-10)
+
+
+def test_notched_strength_tends_to_the_unnotched_strength():
+
+    laminates = _laminates()
+    notched = NotchedLaminate.from_laminates(laminates, STRENGTH)
+    N = np.array([[1e5, 0, 0], [0, -1e5, 5e4]])
+
+    NM = np.concatenate([N, np.zeros((2, 3))], axis=-1)
+    unnotched = np.array([strength_ratio(lam.get_ply_stresses(NM), STRENGTH).min(axis=-1) for lam in laminates])
+
+    point, _ = notched.strength_ratio(N, 1e-3, 10.0, 'point', n_theta=720)
+    np.testing.assert_allclose(point, unnotched, rtol=1e-3)
+
+    # The hole weakens the laminate, the stresses averaged up to a0 lie between those at the edge and at a0
+    near, angle = notched.strength_ratio(N, 3e-3, 1e-3, 'point')
+    edge, _ = notched.strength_ratio(N, 3e-3, 1e-9, 'point')
+    average, _ = notched.strength_ratio(N, 3e-3, 1e-3, 'average')
+    assert np.all(near < unnotched) and np.all((edge < average) & (average < near))
+    assert angle.shape == (3, 2) and np.all((angle >= 0) & (angle < 360))
+
+    # Chunks and layup subsets give the same ratios
+    np.testing.assert_allclose(notched.strength_ratio(N, 3e-3, 1e-3, chunk=1)[0], near, rtol=1e-12)
+    np.testing.assert_allclose(notched.strength_ratio(N, 3e-3, 1e-3, layups=[2])[0], near[2:], rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        notched.strength_ratio(N, 3e-3, 1e-3, 'maximum')
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from failure import PlyStrength, strength_ratio
+from lamina import Lamina
+from material import Material
+from optimizer import StackingOptimizer
+from plate import buckling_ritz
+
+STRENGTH = PlyStrength(1.5e9, 1.2e9, 50e6, 200e6, 70e6)
+NM = np.array([[-200e3, 0, 0, 0, 0, 0], [0, 100e3, 50e3, 0, 0, 0]])
+
+
+def _optimizer(**kwargs) -> StackingOptimizer:
+
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    ply = Lamina(mat_composite=carbon, thickness=0.125e-3)
+    return StackingOptimizer(ply, (0, 45, 90), 32, NM, STRENGTH, length=0.5, width=0.3, n_terms=5, **kwargs)
+
+
+def test_vectorized_evaluation_matches_laminate_objects():
+
+    opt = _optimizer()
+    genes = np.random.default_rng(0).integers(0, 4, (20, opt.n_genes))
+    genes[0] = [1, 2, 3, 0, 0, 0, 0, 0]
+    result = opt.evaluate(genes)
+
+    for row, strength, buckling in zip(genes, result['strength_ratio'], result['buckling_ratio']):
+        lam = opt.laminate(row, 0.5, 0.3)
+
+        # Symmetric stacks under in-plane loads have uniform ply stresses through the thickness
+        assert strength == pytest.approx(strength_ratio(lam.get_ply_stresses(NM), STRENGTH).min(), rel=1e-10)
+        assert buckling == pytest.approx(buckling_ritz(lam, load=-NM[0, :3], n_terms=5), rel=1e-8)
+
+    np.testing.assert_allclose(result['weight'], 2 * 2 * 0.125e-3 * (genes > 0).sum(axis=-1))
+
+
+def test_empty_groups_do_not_change_the_design():
+
+    opt = _optimizer()
+    genes = np.array([[0, 1, 0, 2, 3, 0, 0, 1], [1, 2, 3, 1, 0, 0, 0, 0]])
+
+    np.testing.assert_array_equal(opt.canonical(genes[0]), genes[1:])
+    np.testing.assert_array_equal(opt.stack_angles(genes[0]), opt.stack_angles(genes[1]))
+
+    result = opt.evaluate(genes)
+    for name in ('weight', 'strength_ratio', 'buckling_ratio', 'fitness'):
+        assert result[name][0] == result[name][1]
+
+
+def test_contiguous_ply_limit():
+
+    opt = _optimizer(max_contiguous=2)
+    result = opt.evaluate([[1, 1, 2, 3, 0, 0, 0, 0], [1, 2, 1, 2, 0, 0, 0, 0]])
+
+    # Balanced 0 degree groups hold two plies, two adjacent groups make a run of four
+    np.testing.assert_array_equal(result['contiguous'], [4, 2])
+    assert not result['feasible'][0]
+
+
+def test_run_finds_a_feasible_design_reproducibly():
+
+    opt = _optimizer()
+    result = opt.run(generations=15, population_size=20, islands=2, migration_interval=5, seed=3)
+    again = opt.run(generations=15, population_size=20, islands=2, migration_interval=5, seed=3)
+
+    assert result.feasible and result.strength_ratio >= 1 and result.buckling_ratio >= 1
+    assert result.weight == pytest.approx(0.125e-3 * len(result.angles))
+    np.testing.assert_array_equal(result.genes, again.genes)
+
+    # Elitism never loses the best design and the memo table answers repeated candidates
+    assert len(result.history) == 15 and np.all(np.diff(result.history) <= 0)
+    assert result.cache_hits > 0
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+from plate import Plate, bending_stiffness, buckling_specially_orthotropic, frequencies_specially_orthotropic
+
+E, NU, H = 70e9, 0.3, 2e-3
+
+
+def _isotropic(length: float = 0.4, width: float = 0.3) -> Laminate:
+
+    ply = Lamina(mat_composite=Material(E, NU, 0), thickness=H / 4)
+    return Laminate.from_stacking('[0/90]s', ply, length, width)
+
+
+def _carbon(code: str) -> Laminate:
+
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    return Laminate.from_stacking(code, Lamina(mat_composite=carbon, thickness=0.125e-3), 0.5, 0.25)
+
+
+def test_isotropic_plate_matches_the_textbook_solutions():
+
+    D = E * H ** 3 / (12 * (1 - NU ** 2))
+    np.testing.assert_allclose(bending_stiffness(_isotropic())[0, 0], D, rtol=1e-12)
+
+    # A square plate buckles in a single half wave with k = 4
+    N_cr, m, n = buckling_specially_orthotropic(_isotropic(0.3, 0.3), return_modes=True)
+    assert N_cr == pytest.approx(4 * np.pi ** 2 * D / 0.3 ** 2, rel=1e-12)
+    assert (m, n) == (1, 1)
+
+    # k = (m b / a + a / (m b))^2 is lowest for three half waves at an aspect ratio of 2.5
+    _, m, _ = buckling_specially_orthotropic(_isotropic(0.75, 0.3), return_modes=True)
+    assert m == 3
+
+    rho_h = 2700 * H
+    f = frequencies_specially_orthotropic(_isotropic(), rho_h, n_modes=2)
+    np.testing.assert_allclose(f[0], np.pi / 2 * (1 / 0.4 ** 2 + 1 / 0.3 ** 2) * np.sqrt(D / rho_h), rtol=1e-12)
+    assert f[1] > f[0]
+
+
+def test_batched_laminates_match_single_laminates():
+
+    laminates = [_carbon('[0/90]2s'), _carbon('[0_2/90_2]s'), _carbon('[90/0]2s')]
+    batched = buckling_specially_orthotropic(laminates, load_ratio=0.5)
+
+    np.testing.assert_allclose(batched, [buckling_specially_orthotropic(lam, load_ratio=0.5) for lam in laminates])
+    np.testing.assert_allclose(buckling_specially_orthotropic(np.stack([lam.ABD_matrix() for lam in laminates]),
+                                                              0.5, 0.25, load_ratio=0.5), batched)
+
+
+def test_plate_uses_the_laminate_dimensions():
+
+    lam = _carbon('[0/90]2s')
+    plate = Plate(lam, mass_per_area=0.2)
+
+    assert plate.specially_orthotropic
+    assert plate.buckling_load(Nx=2.0) == pytest.approx(buckling_specially_orthotropic(lam) / 2)
+    np.testing.assert_allclose(plate.natural_frequencies(3), frequencies_specially_orthotropic(lam, 0.2, n_modes=3))
+
+    with pytest.raises(ValueError):
+        buckling_specially_orthotropic(Laminate.from_stacking('[0/90]s', lam.lamina[0]))
+    with pytest.raises(ValueError):
+        Plate(lam).natural_frequencies()
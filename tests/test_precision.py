@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import backend
+import clt
+import precision
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+
+
+def _laminate(code: str) -> Laminate:
+
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    return Laminate.from_stacking(code, Lamina(mat_composite=carbon, thickness=0.125e-3))
+
+
+ABD = np.stack([_laminate(code).ABD_matrix() for code in ('[0/45/90]', '[0/±45/90]s')])
+NM = np.array([[1e5, -2e4, 3e3, 10, -5, 1], [0, 1e4, 0, 0, 2, 0]])
+
+
+def test_mixed_precision_solve_matches_double():
+
+    expected = clt.solve_ABD(ABD[:, None], NM[None])
+
+    strain = clt.solve_ABD(ABD[:, None], NM[None], refine=1)
+    np.testing.assert_allclose(strain, expected, rtol=1e-10, atol=1e-16)
+
+    symmetric = clt.solve_ABD(ABD[1], NM, symmetric=True, refine=1)
+    np.testing.assert_allclose(symmetric, expected[1], rtol=1e-10, atol=1e-16)
+
+
+def test_single_precision_solve_is_equilibrated():
+
+    expected = clt.solve_ABD(ABD[:, None], NM[None])
+    strain = clt.solve_ABD(ABD[:, None].astype(np.float32), NM[None].astype(np.float32))
+
+    # Membrane and bending terms differ by eight orders of magnitude, the scaled solve keeps float32 accuracy
+    assert strain.dtype == np.float32
+    scale = np.abs(expected).max(axis=-1, keepdims=True)
+    np.testing.assert_allclose(strain, expected, rtol=0, atol=1e-5 * scale.max())
+    assert np.all(np.abs(strain - expected) <= 1e-5 * scale)
+
+
+def test_policies_of_the_backend():
+
+    lam = _laminate('[0/±45/90]s')
+    arrays = backend.laminate_arrays(lam)
+    _, expected, stress = backend.analyze(*arrays, NM[None], precision='double')
+
+    for name, dtype, rtol in (('single', np.float32, 1e-5), ('mixed', np.float64, 1e-12)):
+        with precision.use_precision(name) as policy:
+            assert precision.get_precision() is policy
+            _, strain, ply_stress = backend.analyze(*arrays, NM[None])
+
+        assert strain.dtype == dtype and ply_stress.dtype == np.float32
+        np.testing.assert_allclose(strain, expected, rtol=rtol, atol=rtol * np.abs(expected).max())
+        np.testing.assert_allclose(ply_stress, stress, rtol=1e-5, atol=1e-5 * np.abs(stress).max())
+
+    assert precision.get_precision().name == 'double'
+    with pytest.raises(ValueError):
+        precision.resolve('half')
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from material import Material
+from material_table import MaterialTable, TableLaminate
+from micromechanics import composite_material
+from properties import PropertyCurve
+
+T = np.array([-55.0, 20.0, 80.0, 120.0])
+E = np.array([181, 10.3, 10.3]) * 1e9
+G = np.array([3.7, 7.17, 7.17]) * 1e9
+
+
+def _material() -> Material:
+
+    curves = {
+        'E': PropertyCurve(T, np.array([[1.02, 1.1, 1.1], [1, 1, 1], [0.98, 0.85, 0.85], [0.95, 0.7, 0.7]]) * E),
+        'G': PropertyCurve(T, np.array([1.1, 1.0, 0.8, 0.6])[:, None] * G),
+    }
+    return Material(E, [0.4, 0.28, 0.28], G, np.array([-0.02, 23, 23]) * 1e-6, [0, 0.6e-2, 0.6e-2], curves=curves)
+
+
+def test_property_curve_interpolation():
+
+    curve = PropertyCurve([0, 100], [1.0, 3.0])
+
+    np.testing.assert_allclose(curve(25), [1.5, 1.5, 1.5])
+    np.testing.assert_allclose(curve([-50, 50, 200])[:, 0], [1.0, 2.0, 3.0])
+
+    # Bilinear in temperature and moisture concentration
+    wet = PropertyCurve([0, 100], [[1.0, 0.5], [3.0, 1.5]], C=[0, 0.02])
+    np.testing.assert_allclose(wet(50, 0.01), [1.5, 1.5, 1.5])
+    np.testing.assert_allclose(wet([0, 100], 0.02)[:, 0], [0.5, 1.5])
+
+    assert curve == PropertyCurve([0, 100], [1.0, 3.0]) and hash(curve) == hash(PropertyCurve([0, 100], [1, 3]))
+    with pytest.raises(ValueError):
+        curve.values[0, 0, 0] = 0
+
+
+def test_invalid_property_curves():
+
+    with pytest.raises(ValueError):
+        PropertyCurve([0, 100, 50], [1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        PropertyCurve([0, 100], [1.0, 2.0, 3.0])
+
+
+def test_material_at_a_state():
+
+    mat = _material()
+
+    np.testing.assert_allclose(mat.at(50).props.E, 0.5 * (E + np.array([0.98, 0.85, 0.85]) * E))
+    np.testing.assert_allclose(mat.at(20).props.G, G)
+    np.testing.assert_array_equal(mat.at(50).props.v, mat.props.v)
+
+    state = mat.properties_at(np.array([[-55.0], [120.0]]), np.zeros((1, 3)))
+    assert state['E'].shape == (2, 3, 3) and state['alpha'].shape == (2, 3, 3)
+
+    # Isotropic shear moduli follow the modulus curve
+    iso = Material(70e9, 0.3, 0, curves={'E': PropertyCurve([20, 120], [70e9, 60e9])})
+    assert iso.at(120).props.G[0] == pytest.approx(60e9 / 2.6)
+
+
+def test_environmental_response_matches_the_material_states():
+
+    mat = _material()
+    table = MaterialTable()
+    lam = TableLaminate.from_stacking('[0/±45/90]s', table.add(mat, thickness=0.125e-3), table=table)
+
+    ABD, NM = lam.environmental_response(T)
+    for k, t in enumerate(T):
+        state = MaterialTable()
+        reference = TableLaminate.from_stacking('[0/±45/90]s', state.add(mat.at(t), thickness=0.125e-3), table=state)
+        np.testing.assert_allclose(ABD[k], reference.ABD_matrix(), rtol=1e-10, atol=1e-6)
+
+    # Linear interpolation between the bins, no free expansion at the reference state
+    ABD_mid, _ = lam.environmental_response(50.0)
+    np.testing.assert_allclose(ABD_mid, 0.5 * (ABD[1] + ABD[2]), rtol=1e-10, atol=1e-6)
+    np.testing.assert_allclose(NM[1], 0, atol=1e-9)
+    assert NM[0, 0] != 0
+
+
+def test_composite_carries_constituent_curves():
+
+    fiber = Material(np.array([233, 23.1, 23.1]) * 1e9, np.array([0.4, 0.2, 0.2]), np.array([8.27, 8.96, 8.96]) * 1e9)
+    matrix = Material(4.62e9, 0.36, 0, 41e-6, curves={'E': PropertyCurve(T, np.array([5.0, 4.62, 4.0, 3.0]) * 1e9)})
+
+    composite = composite_material(fiber, matrix, 0.6)
+    assert set(composite.curves) == {'E', 'v', 'G', 'alpha'}
+
+    for t in T:
+        expected = composite_material(fiber, matrix.at(t), 0.6).props
+        actual = composite.at(t).props
+        for name in ('E', 'v', 'G', 'alpha'):
+            np.testing.assert_allclose(getattr(actual, name), getattr(expected, name), rtol=1e-12)
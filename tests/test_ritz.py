@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+from plate import buckling_ritz, buckling_specially_orthotropic, frequencies_ritz, frequencies_specially_orthotropic
+from ritz import ritz_basis
+
+
+def _laminate(code: str) -> Laminate:
+
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    return Laminate.from_stacking(code, Lamina(mat_composite=carbon, thickness=0.125e-3))
+
+
+def test_ritz_buckling_matches_closed_form():
+
+    lam = _laminate('[0/90/0/90]s')
+    closed_form = buckling_specially_orthotropic(lam, 0.3, 0.2)
+    factor = buckling_ritz(lam, 0.3, 0.2, n_terms=10)
+
+    assert factor == pytest.approx(closed_form, rel=1e-3)
+
+
+def test_ritz_frequencies_match_closed_form():
+
+    lam = _laminate('[0/90/0/90]s')
+    closed_form = frequencies_specially_orthotropic(lam, 1.6, 0.3, 0.2, n_modes=3)
+
+    np.testing.assert_allclose(frequencies_ritz(lam, 1.6, 0.3, 0.2, n_terms=10, n_modes=3), closed_form, rtol=1e-3)
+
+
+def test_clamped_edges_stiffen_the_plate():
+
+    lam = _laminate('[0/±45/90]s')
+    factors = [buckling_ritz(lam, 0.3, 0.2, boundary=boundary) for boundary in ('SSSS', 'CSCS', 'CCCC')]
+
+    assert factors[0] < factors[1] < factors[2]
+
+
+@pytest.mark.parametrize('method', ['sparse', 'lobpcg'])
+def test_iterative_solvers_match_dense(method):
+
+    pytest.importorskip('scipy')
+
+    D = np.stack([_laminate(code).ABD_matrix()[3:, 3:] for code in ('[0/±45/90]s', '[±30/0]s', '[45/-45/0/90]')])
+    load = (1.0, 0.5, 0.2)
+
+    dense = buckling_ritz(D, 0.3, 0.2, load, n_modes=2)
+    np.testing.assert_allclose(buckling_ritz(D, 0.3, 0.2, load, n_modes=2, method=method), dense, rtol=1e-5)
+
+    dense = frequencies_ritz(D, 1.6, 0.3, 0.2, n_modes=3)
+    np.testing.assert_allclose(frequencies_ritz(D, 1.6, 0.3, 0.2, n_modes=3, method=method), dense, rtol=1e-5)
+
+
+def test_basis_integrals_are_cached_and_read_only():
+
+    basis = ritz_basis(0.3, 0.2, 'SSSS', 6)
+
+    assert ritz_basis(0.3, 0.2, 'SSSS', 6) is basis
+    with pytest.raises(ValueError):
+        basis.I[0] = 0
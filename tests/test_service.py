@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+from service import AnalysisService, LaminateCache, RequestError, evaluate_batch, parse_request
+
+MATERIAL = {'E': [140e9, 10e9, 10e9], 'v': [0.3, 0.3, 0.3], 'G': [5e9, 5e9, 5e9], 'thickness': 1.25e-4}
+GOOD = {'materials': {'cf': MATERIAL}, 'stacking': '[0/90]s', 'material': 'cf'}
+OTHER = {'materials': {'cf': MATERIAL}, 'stacking': '[0/45]s', 'material': 'cf'}
+
+
+def _reference(code: str) -> Laminate:
+
+    material = Material(*(np.array(MATERIAL[name]) for name in ('E', 'v', 'G')))
+    return Laminate.from_stacking(code, Lamina(mat_composite=material, thickness=MATERIAL['thickness']))
+
+
+def test_batched_requests_match_single_laminates():
+
+    loads = [[[1e5, 0, 0, 0, 0, 0]], [[0, 2e4, 0, 1, 0, 0], [5e3, 0, 1e3, 0, 0, 0]], [[0, 0, 0, 0, 3, 0]]]
+    requests = [
+        {'laminate': GOOD, 'loads': loads[0]},
+        {'laminate': OTHER, 'loads': loads[1], 'outputs': ['strain', 'ply_stress', 'ABD']},
+        {'laminate': GOOD, 'loads': loads[2], 'outputs': ['ply_stress']},
+    ]
+
+    cache = LaminateCache()
+    results = evaluate_batch([parse_request(request) for request in requests], cache)
+
+    # Both requests on the first laminate share one cached build
+    assert len(cache) == 2 and cache.misses == 2
+
+    good, other = _reference('[0/90]s'), _reference('[0/45]s')
+    np.testing.assert_allclose(results[0]['strain'], good.midplane_strain(np.array(loads[0])), rtol=1e-10)
+    np.testing.assert_allclose(results[1]['strain'], other.midplane_strain(np.array(loads[1])), rtol=1e-10)
+    np.testing.assert_allclose(results[1]['ply_stress'], other.get_ply_stresses(np.array(loads[1])), rtol=1e-10,
+                               atol=1e-6)
+    np.testing.assert_allclose(results[1]['ABD'], other.ABD_matrix(), rtol=1e-10, atol=1e-6)
+    assert set(results[2]) == {'ply_stress'}
+
+
+@pytest.mark.parametrize('request_', [
+    [],
+    {'loads': [[0] * 6]},
+    {'laminate': GOOD, 'loads': [[0] * 5]},
+    {'laminate': GOOD, 'outputs': ['displacement']},
+])
+def test_invalid_requests_are_rejected(request_):
+
+    with pytest.raises(RequestError):
+        parse_request(request_)
+
+
+def test_service_isolates_failing_laminates_and_non_finite_results():
+
+    # A failure while solving one laminate only fails the requests on that laminate
+    cache = LaminateCache()
+    jobs = [parse_request({'laminate': definition, 'loads': [[1e5, 0, 0, 0, 0, 0]]}) for definition in (GOOD, OTHER)]
+    cache.get(jobs[1][0], OTHER).midplane_strain = lambda NM: 1 / 0
+
+    results = evaluate_batch(jobs, cache)
+    assert 'strain' in results[0] and 'ZeroDivisionError' in results[1]['error']
+
+    async def run():
+        async with AnalysisService(cache_size=3) as service:
+            assert service.cache.maxsize == 3
+            return await service.handle_line(json.dumps({'id': 1, 'laminate': GOOD, 'loads': [[np.inf] * 6]}).encode())
+
+    response = json.loads(asyncio.run(run()), parse_constant=lambda name: pytest.fail(f'Non-standard JSON {name}'))
+    assert response['id'] == 1 and 'error' in response
+
+
+def test_concurrent_requests_are_coalesced():
+
+    async def run():
+        async with AnalysisService(max_batch=64, max_delay=0.05) as service:
+            requests = [{'id': i, 'laminate': GOOD, 'loads': [[1e3 * (i + 1), 0, 0, 0, 0, 0]]} for i in range(20)]
+            responses = await asyncio.gather(*(service.submit(request) for request in requests))
+            return service, responses
+
+    service, responses = asyncio.run(run())
+
+    assert [response['id'] for response in responses] == list(range(20))
+    assert service.requests == 20 and service.batches < 20
+    strain = np.array([response['strain'][0] for response in responses])
+    np.testing.assert_allclose(strain, np.arange(1, 21)[:, None] * strain[0], rtol=1e-10, atol=1e-20)
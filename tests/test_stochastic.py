@@ -0,0 +1,67 @@
+import numpy as np
+
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+from stochastic import MonteCarloLaminate, Scatter
+
+ANGLES = [0, 45, -45, 90, 90, -45, 45, 0]
+NM = np.array([[1e5, 0, 0, 0, 0, 0], [0, 2e4, 5e3, 1, 0, 0]])
+
+
+def _constituents():
+
+    fiber = Material(np.array([233, 23.1, 23.1]) * 1e9, np.array([0.4, 0.2, 0.2]), np.array([8.27, 8.96, 8.96]) * 1e9)
+    matrix = Material(4.62e9, 0.36, 0)
+
+    return fiber, matrix
+
+
+def _monte_carlo() -> MonteCarloLaminate:
+
+    mc = MonteCarloLaminate(*_constituents(), 0.61, 0.125e-3, ANGLES, NM_matrix=NM)
+    mc.add_scatter('E_f', 0.05)
+    mc.add_scatter('Vol_f', Scatter(0.02, 'uniform'))
+    mc.add_scatter('angle', 1.0)
+
+    return mc
+
+
+def test_zero_scatter_reproduces_the_deterministic_laminate():
+
+    fiber, matrix = _constituents()
+    mc = MonteCarloLaminate(fiber, matrix, 0.61, 0.125e-3, ANGLES, NM_matrix=NM, scatter={'E_f': 0.0})
+    result = mc.run(10, seed=1)
+
+    lam = Laminate()
+    lam.add_stack(Lamina(mat_fiber=fiber, mat_matrix=matrix, Vol_fiber=0.61, thickness=0.125e-3), ANGLES)
+
+    np.testing.assert_allclose(result.ABD.mean, lam.ABD_matrix(), rtol=1e-10, atol=1e-6)
+    np.testing.assert_allclose(result.strain.mean, lam.midplane_strain(NM), rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(result.ABD.std, 0, atol=1e-6)
+    np.testing.assert_array_equal(result.ABD.min, result.ABD.max)
+
+
+def test_results_do_not_depend_on_the_process_pool():
+
+    mc = _monte_carlo()
+    serial = mc.run(2000, seed=3, chunk_size=500, latin_hypercube=True)
+    pooled = mc.run(2000, seed=3, chunk_size=500, latin_hypercube=True, processes=2)
+
+    for name in ('ABD', 'moduli', 'strain', 'ply_stress'):
+        np.testing.assert_array_equal(getattr(pooled, name).mean, getattr(serial, name).mean)
+        np.testing.assert_array_equal(getattr(pooled, name).std, getattr(serial, name).std)
+
+    assert serial.moduli.n == 2000 and np.all(serial.moduli.std > 0)
+
+
+def test_chunked_statistics_match_a_single_batch():
+
+    mc = _monte_carlo()
+    result = mc.run(1000, seed=5, chunk_size=1000)
+
+    # The single chunk is sampled with the first seed spawned from the run seed
+    samples = mc.evaluate(mc.sample(1000, np.random.SeedSequence(5).spawn(1)[0]))
+
+    np.testing.assert_allclose(result.moduli.mean, samples['moduli'].mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(result.moduli.std, samples['moduli'].std(axis=0, ddof=1), rtol=1e-10)
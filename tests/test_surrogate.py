@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from material import Material
+from surrogate import N_ABD, ABDSurface
+
+ANGLES = [0, 'theta', '-theta', 90, 90, '-theta', 'theta', 0]
+
+
+def _surface(n_theta: int = 19, n_Vol_f: int = 7) -> ABDSurface:
+
+    fiber = Material(np.array([233, 23.1, 23.1]) * 1e9, np.array([0.4, 0.2, 0.2]), np.array([8.27, 8.96, 8.96]) * 1e9)
+    matrix = Material(4.62e9, 0.36, 0)
+    grid = {'theta': np.linspace(0, 90, n_theta), 'Vol_f': np.linspace(0.4, 0.7, n_Vol_f), 'scale': np.linspace(0.8, 1.2, 4)}
+
+    return ABDSurface(fiber, matrix, ANGLES, 0.125e-3, grid)
+
+
+def _points(n: int = 500) -> np.ndarray:
+
+    rng = np.random.default_rng(0)
+    return np.stack([rng.uniform(0, 90, n), rng.uniform(0.4, 0.7, n), rng.uniform(0.8, 1.2, n)], axis=-1)
+
+
+def _relative_error(values: np.ndarray, exact: np.ndarray) -> np.ndarray:
+    '''Error of the A11, A22, D11 and moduli columns relative to their largest value.'''
+
+    columns = [0, 6, 15, N_ABD, N_ABD + 1, N_ABD + 2, N_ABD + 3]
+    return np.abs(values - exact)[..., columns] / np.abs(exact[..., columns]).max(axis=0)
+
+
+def test_table_nodes_are_reproduced():
+
+    surface = _surface()
+    nodes = surface._nodes().reshape(-1, 3)
+
+    values = surface.values.reshape(-1, N_ABD + 4)
+
+    np.testing.assert_allclose(surface.query(nodes), values, rtol=1e-12)
+    assert _relative_error(surface.query(nodes, 'cubic'), values).max() < 1e-12
+
+
+def test_interpolation_accuracy():
+
+    surface = _surface()
+    points = _points()
+    exact = surface.evaluate(points)
+
+    assert _relative_error(surface.query(points), exact).max() < 1e-2
+    assert _relative_error(surface.query(points, 'cubic'), exact).max() < 5e-4
+
+    # The spline is exact in the thickness scale (A and D are polynomials of degree 1 and 3)
+    points[:, :2] = surface._nodes()[3, 2, 0, :2]
+    assert _relative_error(surface.query(points, 'cubic'), surface.evaluate(points)).max() < 1e-12
+
+
+def test_cubic_error_converges_with_the_fourth_power_of_the_spacing():
+
+    points = _points()
+    coarse, fine = _surface(10, 7), _surface(19, 13)
+
+    e_coarse = _relative_error(coarse.query(points, 'cubic'), coarse.evaluate(points)).max()
+    e_fine = _relative_error(fine.query(points, 'cubic'), fine.evaluate(points)).max()
+
+    assert e_coarse / e_fine > 10
+
+
+@pytest.mark.parametrize('method', ['linear', 'cubic'])
+def test_error_estimate(method):
+
+    surface = _surface(37, 13)
+    points = _points()
+
+    values, estimate = surface.query(points, method, return_error=True)
+    error = np.abs(values - surface.evaluate(points))[:, [0, 6, 15, N_ABD]]
+    estimate = estimate[:, [0, 6, 15, N_ABD]]
+
+    # An estimate, not a bound: it has the magnitude of the error without being far below it
+    assert np.all(error <= 1.5 * estimate + 1e-9 * np.abs(values[:, [0, 6, 15, N_ABD]]))
+    assert np.median(estimate / np.maximum(error, 1e-300)) < 100
+
+
+def test_refine_only_evaluates_new_nodes():
+
+    surface = _surface(10, 4)
+    reference = _surface(19, 4)
+
+    assert surface.refine('theta') == 9 * 4 * 4
+    assert surface.refine('theta', [0, 45]) == 0
+
+    np.testing.assert_array_equal(surface.axes['theta'], reference.axes['theta'])
+    np.testing.assert_allclose(surface.values, reference.values, rtol=1e-14)
+    np.testing.assert_allclose(surface.error, reference.error, rtol=1e-12)
+
+    points = _points(50)
+    np.testing.assert_allclose(surface.query(points, 'cubic'), reference.query(points, 'cubic'), rtol=1e-12)
+
+
+def test_saved_table_is_memory_mapped(tmp_path):
+
+    surface = _surface(10, 4)
+    points = _points(50)
+    surface.save(str(tmp_path))
+
+    loaded = ABDSurface.load(str(tmp_path))
+    assert isinstance(loaded.values, np.memmap) and isinstance(loaded.error, np.memmap)
+    assert loaded.names == surface.names and loaded.angles == surface.angles
+
+    for method in ('linear', 'cubic'):
+        expected = surface.query(points, method, return_error=True)
+        for a, b in zip(loaded.query(points, method, return_error=True), expected):
+            np.testing.assert_allclose(a, b, rtol=1e-14)
+
+    # The layup definition is stored with the table, a loaded table can evaluate and be refined
+    np.testing.assert_allclose(loaded.evaluate(points), surface.evaluate(points), rtol=1e-14)
+    assert loaded.refine('Vol_f') == 10 * 3 * 4
+    assert not isinstance(loaded.values, np.memmap)
+
+
+def test_invalid_grids_and_methods():
+
+    surface = _surface(10, 4)
+
+    with pytest.raises(ValueError):
+        surface.query(_points(1), 'quintic')
+    with pytest.raises(ValueError):
+        ABDSurface(surface.mat_fiber, surface.mat_matrix, ANGLES, 0.125e-3, {'theta': [0, 45, 90]}).query([[30]], 'cubic')
+    with pytest.raises(ValueError):
+        ABDSurface(surface.mat_fiber, surface.mat_matrix, ANGLES, 0.125e-3, {'theta': [0, 45, 30]})
+    with pytest.raises(ValueError):
+        ABDSurface(surface.mat_fiber, surface.mat_matrix, ['phi'], 0.125e-3, {'theta': [0, 45]})
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from lamina import Lamina
+from material import Material
+from material_table import MaterialTable
+from taper import TaperedLaminate
+
+ANGLES = [0, 45, -45, 90, 0, 90, -45, 45, 0]
+DROPS = [np.inf, 0.8, np.inf, 0.3, 0.5, np.inf, 0.3, 0.8, np.inf]
+
+
+def _taper() -> TaperedLaminate:
+
+    carbon = Material(np.array([181, 10.3, 10.3]) * 1e9, np.array([0, 0.28, 0.28]), np.array([1, 7.17, 7.17]) * 1e9)
+    ply = Lamina(mat_composite=carbon, thickness=0.125e-3)
+    return TaperedLaminate.from_drop_positions(MaterialTable(), ply, ANGLES, DROPS, np.linspace(0, 1, 11))
+
+
+def test_tapered_ABD_matches_stations():
+
+    taper = _taper()
+
+    ABD = taper.ABD_matrix()
+    for i in range(taper.num_stations):
+        np.testing.assert_allclose(ABD[i], taper.station(i).ABD_matrix(), rtol=1e-10, atol=1e-6)
+
+
+def test_plies_end_at_their_drop_positions():
+
+    taper = _taper()
+
+    np.testing.assert_array_equal(taper.mask.sum(axis=-1), [9, 9, 9, 7, 7, 6, 6, 6, 4, 4, 4])
+    np.testing.assert_allclose(taper.thickness, taper.mask.sum(axis=-1) * 0.125e-3)
+    np.testing.assert_allclose(taper.z[:, 0], -taper.thickness / 2)
+
+    # Stations with the same ply drops share one section
+    assert len(taper.sections) == 4
+
+
+def test_tapered_ply_stresses_match_stations():
+
+    taper = _taper()
+    NM = np.array([1e5, -2e4, 3e4, 5, -3, 1])
+
+    stress = taper.get_ply_stresses(NM)
+    for i in range(taper.num_stations):
+        present = taper.mask[i]
+        np.testing.assert_allclose(stress[i, present], taper.station(i).get_ply_stresses(NM)[0], rtol=1e-9, atol=1e-3)
+        assert np.all(np.isnan(stress[i, ~present]))
+
+    # Station loads give the same strains as the load repeated at every station
+    loads = np.broadcast_to(NM, (2, taper.num_stations, 6))
+    np.testing.assert_allclose(taper.midplane_strain(loads)[1], taper.midplane_strain(NM), rtol=1e-12)
+
+
+def test_mask_must_match_the_master_stack():
+
+    carbon = Material(70e9, 0.3, 0)
+    with pytest.raises(ValueError):
+        TaperedLaminate(MaterialTable(), carbon, [0, 90, 0], np.ones((2, 4)), 1e-3)
+    with pytest.raises(ValueError):
+        TaperedLaminate(MaterialTable(), carbon, [0, 90, 0], np.ones((2, 3)), 1e-3, stations=[0, 1, 2])
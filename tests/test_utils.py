@@ -0,0 +1,45 @@
+import numpy as np
+
+from utils import principal_angle_2D, principal_stress_2D, principal_stress_3D
+
+
+def _stresses(n: int) -> np.ndarray:
+
+    s = np.random.default_rng(1).normal(size=(n, 3, 3))
+    return s + np.swapaxes(s, -1, -2)
+
+
+def test_principal_stress_3D_diagonalizes_a_stack():
+
+    stress = _stresses(50)
+    p_val, p_vec = principal_stress_3D(stress)
+
+    assert np.all(np.diff(p_val, axis=-1) <= 0)
+    np.testing.assert_allclose(np.einsum('nij,njk,nlk->nil', p_vec, stress, p_vec), np.eye(3) * p_val[:, None], atol=1e-12)
+
+    # Repeated principal stresses still give orthonormal directions
+    p_val, p_vec = principal_stress_3D(np.diag([2.0, 2.0, -1.0]))
+    np.testing.assert_allclose(p_val, [2, 2, -1])
+    np.testing.assert_allclose(p_vec @ p_vec.T, np.eye(3), atol=1e-15)
+
+
+def test_principal_stress_2D_matches_eigenvalues():
+
+    stress = _stresses(50)
+    p_val, p_vec = principal_stress_2D(stress)
+
+    np.testing.assert_allclose(p_val, np.linalg.eigvalsh(stress[:, :2, :2])[:, ::-1], rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(np.einsum('nij,njk,nlk->nil', p_vec, stress[:, :2, :2], p_vec),
+                               np.eye(2) * p_val[:, None], atol=1e-12)
+
+    # The principal angle is the direction of one of the principal stresses
+    theta = np.deg2rad(principal_angle_2D(stress))
+    assert np.all(np.abs(theta) <= np.pi / 4)
+    direction = np.stack([np.cos(theta), np.sin(theta)], axis=-1)
+    np.testing.assert_allclose(np.abs(np.einsum('nij,nj->ni', p_vec, direction)).max(axis=-1), 1, rtol=1e-12)
+
+
+def test_principal_angle_of_equal_normal_components():
+
+    np.testing.assert_allclose(principal_angle_2D(np.array([[[1.0, 2.0], [2.0, 1.0]], [[1.0, -2.0], [-2.0, 1.0]]])), 45)
+    assert principal_angle_2D(np.eye(2)) == 0
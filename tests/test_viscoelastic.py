@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from lamina import Lamina
+from laminate import Laminate
+from material import Material
+from viscoelastic import PronySeries, ViscoelasticLaminate, _convolution_solve
+
+FIBER = Material(np.array([233, 23.1, 23.1]) * 1e9, np.array([0.4, 0.2, 0.2]), np.array([8.27, 8.96, 8.96]) * 1e9)
+MATRIX = PronySeries(1.5e9, (1.0e9, 0.8e9, 0.6e9), (10.0, 1e3, 1e5), v=0.36)
+ANGLES = [0, 45, -45, 90, 90, -45, 45, 0]
+
+
+def _elastic(t: float) -> Laminate:
+    '''Elastic laminate with the matrix modulus at time t.'''
+
+    ply = Lamina(mat_fiber=FIBER, mat_matrix=MATRIX.material(t), Vol_fiber=0.6, thickness=0.125e-3)
+    lam = Laminate()
+    lam.add_stack(ply, ANGLES)
+
+    return lam
+
+
+def test_prony_series_limits():
+
+    assert MATRIX.modulus(0) == pytest.approx(3.9e9)
+    assert MATRIX.modulus(1e9) == pytest.approx(1.5e9)
+    assert MATRIX.material(0).props.E[0] == pytest.approx(3.9e9)
+
+    with pytest.raises(ValueError):
+        PronySeries(1e9, (1e9, 1e9), (1.0,))
+    with pytest.raises(ValueError):
+        PronySeries(1e9, (1e9,), (0.0,))
+
+
+def test_relaxation_limits_match_the_elastic_laminates():
+
+    lam = ViscoelasticLaminate(FIBER, MATRIX, 0.6, 0.125e-3, ANGLES)
+    assert lam.fit_error < 1e-3
+
+    # Instantaneous response with the unrelaxed matrix, equilibrium response with E_inf
+    for t in (0.0, 1e9):
+        reference = _elastic(t).ABD_matrix()
+        np.testing.assert_allclose(lam.ABD_matrix(t), reference, rtol=1e-3, atol=1e-3 * np.abs(reference).max())
+
+
+def test_creep_starts_elastic_and_ends_at_equilibrium():
+
+    lam = ViscoelasticLaminate(FIBER, MATRIX, 0.6, 0.125e-3, ANGLES)
+    times = np.concatenate([[0], np.logspace(-1, 8, 400)])
+    NM = np.broadcast_to([1e4, 2e3, 3e3, 0, 0, 0], (len(times), 6))
+
+    strain = lam.solve(times, NM)
+
+    np.testing.assert_allclose(strain[0], np.linalg.solve(lam.ABD_matrix(0), NM[0]), rtol=1e-10, atol=1e-18)
+    np.testing.assert_allclose(strain[-1], np.linalg.solve(lam.ABD_matrix(1e12), NM[0]), rtol=1e-6, atol=1e-15)
+
+    # Creep under a constant load never recovers
+    assert np.all(np.diff(strain[:, [0, 2]], axis=0) >= -1e-12 * np.abs(strain).max())
+    assert strain[-1, 2] > 1.05 * strain[0, 2]
+
+
+def test_recursive_update_matches_the_convolution():
+
+    lam = ViscoelasticLaminate(FIBER, MATRIX, 0.6, 0.125e-3, ANGLES)
+    rng = np.random.default_rng(0)
+    times = np.cumsum(rng.uniform(0, 200, 60))
+    NM = rng.normal(size=(60, 3, 6)) * 1e3
+
+    strain, stress = lam.solve(times, NM, ply_stress=True)
+    reference = _convolution_solve(lam, times, NM)
+
+    np.testing.assert_allclose(strain, reference, rtol=1e-9, atol=1e-12 * np.abs(reference).max())
+    assert stress.shape == (60, 3, len(ANGLES), 3)
+
+    with pytest.raises(ValueError):
+        lam.solve(times[:-1], NM)